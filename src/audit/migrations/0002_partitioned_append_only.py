@@ -0,0 +1,138 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:04
+
+import django.contrib.postgres.indexes
+import django.utils.timezone
+from django.db import migrations, models
+
+# Rebuild audit_event as a table range-partitioned by month on created_at.
+# The primary key must contain the partition key, hence (id, created_at);
+# ids stay unique through the identity sequence. Partitions cover the
+# existing data up to three months ahead (audit.partitions keeps that
+# window rolling); audit_event_default catches anything outside it.
+# UPDATE is rejected: the audit trail is append-only, retention removes
+# whole partitions.
+PARTITION_SQL = """
+ALTER TABLE audit_event RENAME TO audit_event_unpartitioned;
+
+CREATE TABLE audit_event (
+    LIKE audit_event_unpartitioned
+        INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE audit_event_default PARTITION OF audit_event DEFAULT;
+
+DO $$
+DECLARE
+    month date;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', COALESCE((SELECT min(created_at) FROM audit_event_unpartitioned), now())),
+            date_trunc('month', now()) + interval '3 months',
+            interval '1 month'
+        )::date
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF audit_event FOR VALUES FROM (%L) TO (%L)',
+            'audit_event_y' || to_char(month, 'YYYY') || 'm' || to_char(month, 'MM'),
+            month,
+            month + interval '1 month'
+        );
+    END LOOP;
+END
+$$;
+
+INSERT INTO audit_event SELECT * FROM audit_event_unpartitioned;
+SELECT setval(
+    pg_get_serial_sequence('audit_event', 'id'),
+    COALESCE((SELECT max(id) FROM audit_event), 0) + 1,
+    false
+);
+DROP TABLE audit_event_unpartitioned;
+
+CREATE INDEX audit_tenant_time_idx ON audit_event (tenant_id, created_at);
+CREATE INDEX audit_resource_idx ON audit_event (resource_type, resource_id);
+CREATE INDEX audit_created_brin ON audit_event
+    USING brin (created_at) WITH (autosummarize = on);
+
+CREATE FUNCTION audit_event_append_only() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'audit_event is append-only';
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER audit_event_no_update
+    BEFORE UPDATE ON audit_event
+    FOR EACH STATEMENT EXECUTE FUNCTION audit_event_append_only();
+"""
+
+UNPARTITION_SQL = """
+DROP TRIGGER IF EXISTS audit_event_no_update ON audit_event;
+DROP FUNCTION IF EXISTS audit_event_append_only();
+
+ALTER TABLE audit_event RENAME TO audit_event_partitioned;
+
+CREATE TABLE audit_event (
+    LIKE audit_event_partitioned
+        INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS
+);
+INSERT INTO audit_event SELECT * FROM audit_event_partitioned;
+SELECT setval(
+    pg_get_serial_sequence('audit_event', 'id'),
+    COALESCE((SELECT max(id) FROM audit_event), 0) + 1,
+    false
+);
+DROP TABLE audit_event_partitioned CASCADE;
+
+ALTER TABLE audit_event ADD PRIMARY KEY (id);
+CREATE INDEX audit_tenant_time_idx ON audit_event (tenant_id, created_at);
+CREATE INDEX audit_resource_idx ON audit_event (resource_type, resource_id);
+CREATE INDEX audit_created_brin ON audit_event
+    USING brin (created_at) WITH (autosummarize = on);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditevent',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='auditevent',
+            name='event_type',
+            field=models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete'), ('view', 'View'), ('login', 'Login'), ('logout', 'Logout'), ('export', 'Export'), ('import', 'Import'), ('approve', 'Approve'), ('reject', 'Reject'), ('other', 'Other')], default='other', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='auditevent',
+            name='resource_id',
+            field=models.UUIDField(blank=True, help_text='ID of the affected resource', null=True),
+        ),
+        migrations.AlterField(
+            model_name='auditevent',
+            name='resource_type',
+            field=models.CharField(help_text="Type of resource (e.g., 'Risk', 'Action', 'Document')", max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='auditevent',
+            name='tenant_id',
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='auditevent',
+            name='user_id',
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='auditevent',
+            index=django.contrib.postgres.indexes.BrinIndex(autosummarize=True, fields=['created_at'], name='audit_created_brin'),
+        ),
+        migrations.RunSQL(PARTITION_SQL, UNPARTITION_SQL),
+    ]
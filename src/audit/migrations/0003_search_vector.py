@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.expressions
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+# Trigram index over the id text (audit.models.ID_TEXT_SQL) so partial
+# resource/user/request ids match with LIKE '%…%' without a scan.
+ID_TRGM_SQL = """
+CREATE INDEX audit_id_text_trgm ON audit_event USING gin (
+    (COALESCE(resource_id::text, '') || ' ' || COALESCE(user_id::text, '') || ' ' || request_id)
+    gin_trgm_ops
+);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0002_partitioned_append_only'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='auditevent',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.RawSQL('setweight(to_tsvector(\'simple\'::regconfig, resource_type || \' \' || event_type), \'A\') || setweight(to_tsvector(\'simple\'::regconfig, COALESCE(resource_id::text, \'\') || \' \' || COALESCE(user_id::text, \'\') || \' \' || request_id), \'B\') || setweight(jsonb_to_tsvector(\'simple\'::regconfig, details, \'["string", "numeric"]\'), \'C\')', ()), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='auditevent',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='audit_search_gin'),
+        ),
+        migrations.RunSQL(ID_TRGM_SQL, "DROP INDEX IF EXISTS audit_id_text_trgm;"),
+    ]
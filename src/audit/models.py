@@ -2,11 +2,34 @@
 Audit models for tracking user actions and system events.
 
 Provides comprehensive audit logging for compliance and debugging.
+
+``audit_event`` is append-only and range-partitioned by month on
+``created_at`` (migration 0002, maintained by ``audit.partitions``).
+Free-text search runs on the generated ``search_vector`` (``audit.search``).
 """
 
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.expressions import RawSQL
 from django.utils import timezone
 
+# Ids as one text — trigram-indexed (migration 0003) for partial id search.
+ID_TEXT_SQL = (
+    "COALESCE(resource_id::text, '') || ' ' || COALESCE(user_id::text, '') || ' ' || request_id"
+)
+
+# Weighted document: A = resource/event type, B = ids, C = detail values.
+# jsonb_to_tsvector indexes the string and numeric values of the details,
+# not their keys. Must stay IMMUTABLE (explicit regconfig) to be generated.
+SEARCH_DOCUMENT_SQL = (
+    "setweight(to_tsvector('simple'::regconfig,"
+    " resource_type || ' ' || event_type), 'A')"
+    f" || setweight(to_tsvector('simple'::regconfig, {ID_TEXT_SQL}), 'B')"
+    " || setweight(jsonb_to_tsvector('simple'::regconfig, details,"
+    " '[\"string\", \"numeric\"]'), 'C')"
+)
+
 
 class AuditEvent(models.Model):
     """
@@ -29,24 +52,21 @@ class AuditEvent(models.Model):
         REJECT = "reject", "Reject"
         OTHER = "other", "Other"
 
-    tenant_id = models.UUIDField(db_index=True, null=True, blank=True)
-    user_id = models.UUIDField(db_index=True, null=True, blank=True)
+    tenant_id = models.UUIDField(null=True, blank=True)
+    user_id = models.UUIDField(null=True, blank=True)
 
     event_type = models.CharField(
         max_length=50,
         choices=EventType.choices,
         default=EventType.OTHER,
-        db_index=True,
     )
     resource_type = models.CharField(
         max_length=100,
-        db_index=True,
         help_text="Type of resource (e.g., 'Risk', 'Action', 'Document')",
     )
     resource_id = models.UUIDField(
         null=True,
         blank=True,
-        db_index=True,
         help_text="ID of the affected resource",
     )
 
@@ -72,7 +92,14 @@ class AuditEvent(models.Model):
         help_text="Client user agent",
     )
 
-    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    # Partition key — filter on ranges of it (not __date) for pruning.
+    created_at = models.DateTimeField(default=timezone.now)
+
+    search_vector = models.GeneratedField(
+        expression=RawSQL(SEARCH_DOCUMENT_SQL, ()),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         db_table = "audit_event"
@@ -86,6 +113,12 @@ class AuditEvent(models.Model):
                 fields=["resource_type", "resource_id"],
                 name="audit_resource_idx",
             ),
+            BrinIndex(
+                fields=["created_at"],
+                name="audit_created_brin",
+                autosummarize=True,
+            ),
+            GinIndex(fields=["search_vector"], name="audit_search_gin"),
         ]
 
     def __str__(self) -> str:
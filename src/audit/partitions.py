@@ -0,0 +1,164 @@
+"""Monthly partitions of ``audit_event`` — pre-creation and retention.
+
+Partitions are named ``audit_event_yYYYYmMM`` and cover one UTC month;
+``audit_event_default`` catches rows outside the pre-created window.
+``maintain_partitions`` (Celery beat, daily) keeps ``AUDIT_PARTITIONS_AHEAD``
+months ahead and retires months older than ``AUDIT_RETENTION_MONTHS``:
+expired partitions are detached and renamed to ``audit_archive_yYYYYmMM``
+(``AUDIT_ARCHIVE_EXPIRED``, e.g. for pg_dump to cold storage) or dropped.
+
+Without partitioning (e.g. a test database built from the models)
+retention falls back to batched DELETEs.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import UTC, date, datetime
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+TABLE = "audit_event"
+DEFAULT_PARTITION = "audit_event_default"
+_PARTITION_RE = re.compile(r"^audit_event_y(\d{4})m(\d{2})$")
+_DELETE_BATCH = 10_000
+
+
+def _month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [TABLE])
+        row = cursor.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def list_partitions() -> dict[date, str]:
+    """Attached monthly partitions by month (the default partition excluded)."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid"
+            " WHERE i.inhparent = to_regclass(%s)",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        match = _PARTITION_RE.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def ensure_partitions(months_ahead: int | None = None, today: date | None = None) -> list[str]:
+    """Create missing partitions from the current month ``months_ahead`` ahead."""
+    if not is_partitioned():
+        return []
+    if months_ahead is None:
+        months_ahead = getattr(settings, "AUDIT_PARTITIONS_AHEAD", 3)
+    current = _month_start(today or timezone.now().date())
+    existing = list_partitions()
+
+    created = []
+    for offset in range(months_ahead + 1):
+        month = _add_months(current, offset)
+        if month in existing:
+            continue
+        name = partition_name(month)
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TABLE {name} PARTITION OF {TABLE}"
+                    f" FOR VALUES FROM ({_bound(month)}) TO ({_bound(_add_months(month, 1))})"
+                )
+        except DatabaseError:
+            # Rows for this month already sit in the default partition.
+            logger.exception("[Audit] Could not create partition %s", name)
+            continue
+        created.append(name)
+    if created:
+        logger.info("[Audit] Created partitions: %s", ", ".join(created))
+    return created
+
+
+def expire_partitions(
+    retention_months: int | None = None,
+    archive: bool | None = None,
+    today: date | None = None,
+) -> dict:
+    """Retire audit months older than ``retention_months`` (0 = keep forever)."""
+    if retention_months is None:
+        retention_months = getattr(settings, "AUDIT_RETENTION_MONTHS", 120)
+    if archive is None:
+        archive = getattr(settings, "AUDIT_ARCHIVE_EXPIRED", True)
+    stats = {"archived": [], "dropped": [], "deleted": 0, "cutoff": None}
+    if retention_months <= 0:
+        return stats
+
+    cutoff = _add_months(_month_start(today or timezone.now().date()), -retention_months)
+    stats["cutoff"] = cutoff.isoformat()
+
+    if not is_partitioned():
+        stats["deleted"] = _delete_before(datetime(cutoff.year, cutoff.month, 1, tzinfo=UTC))
+        return stats
+
+    for month, name in sorted(list_partitions().items()):
+        if _add_months(month, 1) > cutoff:
+            break
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+            if archive:
+                archived = name.replace(TABLE, "audit_archive", 1)
+                cursor.execute(f"ALTER TABLE {name} RENAME TO {archived}")
+                stats["archived"].append(archived)
+            else:
+                cursor.execute(f"DROP TABLE {name}")
+                stats["dropped"].append(name)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < {_bound(cutoff)}")
+        stats["deleted"] = cursor.rowcount
+    logger.info("[Audit] Retention applied: %s", stats)
+    return stats
+
+
+def _delete_before(cutoff: datetime) -> int:
+    from audit.models import AuditEvent
+
+    deleted = 0
+    while True:
+        ids = list(
+            AuditEvent.objects.filter(created_at__lt=cutoff).values_list("id", flat=True)[
+                :_DELETE_BATCH
+            ]
+        )
+        if not ids:
+            return deleted
+        deleted += AuditEvent.objects.filter(id__in=ids).delete()[0]
+
+
+def maintain_partitions() -> dict:
+    """Daily maintenance: pre-create upcoming months, then apply retention."""
+    return {"created": ensure_partitions(), **expire_partitions()}
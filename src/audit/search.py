@@ -0,0 +1,78 @@
+"""Audit event search — full text, partial ids, filters and ranking.
+
+Free text runs against the generated, GIN-indexed ``search_vector``
+(prefix match per term, ``simple`` config, so ids and German words stay
+unstemmed). Terms that look like an id fragment additionally match the
+trigram-indexed id text. Combined with the tenant and a ``created_at``
+range, PostgreSQL prunes partitions first and intersects the indexes.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+
+from audit.models import ID_TEXT_SQL, AuditEvent
+from audit.services import filter_audit_events, get_audit_events
+
+_ID_FRAGMENT_RE = re.compile(r"^[0-9a-f-]{4,36}$", re.IGNORECASE)
+_MIN_ID_FRAGMENT = 4
+
+
+def to_prefix_tsquery(text: str) -> str:
+    """``foo bar-1`` → ``'foo':* & 'bar-1':*`` (terms quoted, AND-ed)."""
+    terms = [term for term in text.split() if re.search(r"\w", term)]
+    return " & ".join("'" + term.replace("\\", "\\\\").replace("'", "''") + "':*" for term in terms)
+
+
+def text_filter(text: str) -> tuple[Q, SearchQuery | None]:
+    """Filter for free text plus the tsquery used for ranking (None if empty)."""
+    raw = to_prefix_tsquery(text)
+    if not raw:
+        return Q(), None
+    query = SearchQuery(raw, search_type="raw", config="simple")
+    condition = Q(search_vector=query)
+    fragment = text.strip().lower()
+    if _ID_FRAGMENT_RE.match(fragment) and len(fragment.replace("-", "")) >= _MIN_ID_FRAGMENT:
+        condition |= Q(id_text__contains=fragment)
+    return condition, query
+
+
+def apply_text_search(qs, text: str, rank: bool = False):
+    """Restrict ``qs`` to events matching ``text``; optionally annotate ``rank``."""
+    condition, query = text_filter(text)
+    if query is None:
+        return qs
+    qs = qs.alias(id_text=RawSQL(ID_TEXT_SQL, ())).filter(condition)
+    if rank:
+        qs = qs.annotate(rank=SearchRank(F("search_vector"), query))
+    return qs
+
+
+def search_audit_events(
+    tenant_id,
+    text: str = "",
+    *,
+    event_type: str = "",
+    resource_type: str = "",
+    date_from: date | str | None = None,
+    date_to: date | str | None = None,
+    limit: int = 200,
+) -> list[AuditEvent]:
+    """Matching events — best rank first when searching text, else newest first."""
+    params = {
+        "event_type": event_type,
+        "resource_type": resource_type,
+        "date_from": str(date_from or ""),
+        "date_to": str(date_to or ""),
+    }
+    qs = filter_audit_events(get_audit_events(tenant_id), params)
+    if text.strip():
+        qs = apply_text_search(qs, text, rank=True).order_by("-rank", "-created_at")
+    else:
+        qs = qs.order_by("-created_at")
+    return list(qs[:limit])
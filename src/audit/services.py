@@ -2,20 +2,74 @@
 
 from __future__ import annotations
 
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+RESOURCE_TYPES_CACHE_TTL = 600  # seconds
+_RESOURCE_TYPES_KEY = "audit:resource_types:{}"
+
 
 def get_audit_events(tenant_id):
     """Return AuditEvent queryset for a tenant."""
     from audit.models import AuditEvent
 
-    return AuditEvent.objects.filter(tenant_id=tenant_id)
+    return AuditEvent.objects.filter(tenant_id=tenant_id).defer("search_vector")
 
 
 def get_audit_resource_types(tenant_id):
-    """Return distinct resource_type values for a tenant (for filter dropdowns)."""
+    """Return distinct resource_type values for a tenant (for filter dropdowns).
+
+    Cached briefly: the DISTINCT walks the tenant's whole history.
+    """
     from audit.models import AuditEvent
 
-    return (
-        AuditEvent.objects.filter(tenant_id=tenant_id)
-        .values_list("resource_type", flat=True)
-        .distinct()[:50]
+    return cache.get_or_set(
+        _RESOURCE_TYPES_KEY.format(tenant_id),
+        lambda: list(
+            AuditEvent.objects.filter(tenant_id=tenant_id)
+            .values_list("resource_type", flat=True)
+            .distinct()[:50]
+        ),
+        RESOURCE_TYPES_CACHE_TTL,
     )
+
+
+def _day_start(value: str | None, days: int = 0) -> datetime | None:
+    try:
+        day = parse_date(value or "")
+    except ValueError:
+        return None
+    if day is None:
+        return None
+    return timezone.make_aware(datetime.combine(day + timedelta(days=days), time.min))
+
+
+def filter_audit_events(qs, params, search: bool = False):
+    """Apply the audit log filters (event_type, resource_type, date range, q).
+
+    Dates become half-open ranges on the raw ``created_at`` column
+    (``>= from 00:00``, ``< to+1 00:00``) so PostgreSQL prunes the monthly
+    partitions and can use the BRIN index; invalid dates are ignored.
+    ``q`` is matched through the search index (``audit.search``).
+    """
+    event_type = params.get("event_type")
+    resource_type = params.get("resource_type")
+    start = _day_start(params.get("date_from"))
+    end = _day_start(params.get("date_to"), days=1)
+
+    if event_type:
+        qs = qs.filter(event_type=event_type)
+    if resource_type:
+        qs = qs.filter(resource_type=resource_type)
+    if start:
+        qs = qs.filter(created_at__gte=start)
+    if end:
+        qs = qs.filter(created_at__lt=end)
+    if search:
+        from audit.search import apply_text_search
+
+        qs = apply_text_search(qs, params.get("q", ""))
+    return qs
@@ -0,0 +1,15 @@
+"""Audit Celery tasks."""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="audit.tasks.maintain_partitions")
+def maintain_audit_partitions() -> dict:
+    """Daily beat: pre-create audit_event partitions and apply retention."""
+    from audit.partitions import maintain_partitions
+
+    return maintain_partitions()
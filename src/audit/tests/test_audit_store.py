@@ -0,0 +1,119 @@
+"""Tests for the buffered audit writer, partition helpers and range filters."""
+
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from django.utils import timezone
+
+from audit.models import AuditEvent
+from audit.partitions import _add_months, ensure_partitions, expire_partitions, partition_name
+from audit.services import filter_audit_events
+from common.context import buffered_audit_events, emit_audit_event
+
+TENANT_ID = uuid.uuid4()
+
+
+def _emit(n=0):
+    emit_audit_event(
+        tenant_id=TENANT_ID,
+        category="compliance",
+        action="update",
+        entity_type="Risk",
+        entity_id=uuid.uuid4(),
+        payload={"n": n},
+    )
+
+
+@pytest.mark.django_db
+class TestBufferedAuditEvents:
+    def test_should_write_immediately_without_buffer(self):
+        _emit()
+        assert AuditEvent.objects.filter(tenant_id=TENANT_ID).count() == 1
+
+    def test_should_flush_buffer_with_one_insert(self, django_assert_max_num_queries):
+        with django_assert_max_num_queries(6):
+            with buffered_audit_events() as events:
+                for n in range(25):
+                    _emit(n)
+                assert len(events) == 25
+                assert not AuditEvent.objects.filter(tenant_id=TENANT_ID).exists()
+        assert AuditEvent.objects.filter(tenant_id=TENANT_ID).count() == 25
+
+    def test_should_join_outer_buffer(self):
+        with buffered_audit_events() as outer:
+            with buffered_audit_events() as inner:
+                _emit()
+            assert inner is outer
+            assert not AuditEvent.objects.filter(tenant_id=TENANT_ID).exists()
+        assert AuditEvent.objects.filter(tenant_id=TENANT_ID).count() == 1
+
+    def test_should_discard_buffer_on_error(self):
+        with pytest.raises(RuntimeError), buffered_audit_events():
+            _emit()
+            raise RuntimeError("abort")
+        _emit()  # buffer is gone: written directly
+        assert AuditEvent.objects.filter(tenant_id=TENANT_ID).count() == 1
+
+
+class TestPartitionNaming:
+    def test_should_step_months_across_years(self):
+        assert _add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert _add_months(date(2026, 1, 1), -13) == date(2024, 12, 1)
+
+    def test_should_name_partition_by_month(self):
+        assert partition_name(date(2026, 3, 1)) == "audit_event_y2026m03"
+
+
+@pytest.mark.django_db
+class TestRetentionWithoutPartitions:
+    def test_should_not_create_partitions_on_plain_table(self):
+        assert ensure_partitions() == []
+
+    def test_should_delete_events_beyond_retention(self):
+        old = AuditEvent.objects.create(
+            tenant_id=TENANT_ID,
+            resource_type="Risk",
+            created_at=timezone.now() - timedelta(days=400),
+        )
+        recent = AuditEvent.objects.create(tenant_id=TENANT_ID, resource_type="Risk")
+
+        stats = expire_partitions(retention_months=12)
+
+        assert stats["deleted"] == 1
+        assert not AuditEvent.objects.filter(pk=old.pk).exists()
+        assert AuditEvent.objects.filter(pk=recent.pk).exists()
+
+    def test_should_keep_everything_when_retention_disabled(self):
+        AuditEvent.objects.create(
+            tenant_id=TENANT_ID,
+            resource_type="Risk",
+            created_at=timezone.now() - timedelta(days=4000),
+        )
+        assert expire_partitions(retention_months=0)["deleted"] == 0
+        assert AuditEvent.objects.filter(tenant_id=TENANT_ID).exists()
+
+
+@pytest.mark.django_db
+class TestFilterAuditEvents:
+    def test_should_filter_raw_created_at_range(self):
+        qs = filter_audit_events(
+            AuditEvent.objects.all(), {"date_from": "2026-01-01", "date_to": "2026-01-31"}
+        )
+        sql = str(qs.query)
+        assert "::date" not in sql
+        assert '"audit_event"."created_at" >=' in sql
+        assert '"audit_event"."created_at" <' in sql
+
+    def test_should_include_whole_end_day(self):
+        today = timezone.localdate()
+        AuditEvent.objects.create(tenant_id=TENANT_ID, resource_type="Risk")
+        qs = filter_audit_events(
+            AuditEvent.objects.filter(tenant_id=TENANT_ID),
+            {"date_from": str(today), "date_to": str(today)},
+        )
+        assert qs.count() == 1
+
+    def test_should_ignore_invalid_dates(self):
+        qs = filter_audit_events(AuditEvent.objects.all(), {"date_from": "2026-02-30"})
+        assert "WHERE" not in str(qs.query)
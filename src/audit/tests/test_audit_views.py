@@ -97,7 +97,7 @@ class TestAuditLogCsvExportView:
         req = _req(rf, fixture_user, TENANT_ID)
         resp = AuditLogCsvExportView.as_view()(req)
         assert resp.status_code == 200
-        content = resp.content.decode("utf-8")
+        content = b"".join(resp.streaming_content).decode("utf-8")
         assert "Zeitpunkt" in content
         assert "Audit" in content
 
@@ -0,0 +1,145 @@
+"""Tests for audit/export.py and the streaming / async export views."""
+
+import gzip
+import json
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.test import RequestFactory
+from django.utils import timezone
+
+from audit.export import iter_audit_rows, stream_audit_export
+from audit.models import AuditEvent
+from audit.views import AuditExportJobView, AuditLogCsvExportView
+
+TENANT_ID = uuid.uuid4()
+
+
+def _events(n, same_time=False):
+    base = timezone.now()
+    return AuditEvent.objects.bulk_create(
+        AuditEvent(
+            tenant_id=TENANT_ID,
+            event_type="update",
+            resource_type="Risk",
+            details={"n": i, "text": "Prüfung"},
+            created_at=base if same_time else base - timedelta(seconds=i),
+        )
+        for i in range(n)
+    )
+
+
+@pytest.fixture
+def fixture_user(db):
+    from tests.factories import UserFactory
+
+    return UserFactory()
+
+
+@pytest.mark.django_db
+class TestIterAuditRows:
+    def test_should_page_through_all_rows_newest_first(self, django_assert_num_queries):
+        _events(7)
+        with django_assert_num_queries(3):
+            rows = list(iter_audit_rows(AuditEvent.objects.filter(tenant_id=TENANT_ID), 3))
+        assert [r["details"]["n"] for r in rows] == list(range(7))
+
+    def test_should_not_skip_rows_sharing_a_timestamp(self):
+        _events(5, same_time=True)
+        rows = list(iter_audit_rows(AuditEvent.objects.filter(tenant_id=TENANT_ID), 2))
+        assert len({r["id"] for r in rows}) == 5
+
+
+@pytest.mark.django_db
+class TestStreamAuditExport:
+    def test_should_write_ndjson_lines(self):
+        _events(3)
+        body = b"".join(stream_audit_export(AuditEvent.objects.all(), "ndjson"))
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        assert len(lines) == 3
+        assert lines[0]["details"]["text"] == "Prüfung"
+
+    def test_should_gzip_csv(self):
+        _events(3)
+        body = b"".join(stream_audit_export(AuditEvent.objects.all(), "csv", compress=True))
+        text = gzip.decompress(body).decode()
+        assert text.startswith("Zeitpunkt;")
+        assert len(text.splitlines()) == 4
+
+    def test_should_reject_unknown_format(self):
+        with pytest.raises(ValueError):
+            stream_audit_export(AuditEvent.objects.all(), "xml")
+
+
+@pytest.mark.django_db
+class TestAuditExportViews:
+    def _req(self, user, method="get", data=None):
+        request = getattr(RequestFactory(), method)("/audit/export/csv/", data or {})
+        request.user = user
+        request.tenant_id = TENANT_ID
+        return request
+
+    def test_should_stream_full_history(self, fixture_user):
+        _events(5001)
+        resp = AuditLogCsvExportView.as_view()(self._req(fixture_user))
+        assert resp.streaming
+        assert len(b"".join(resp.streaming_content).splitlines()) == 5002
+
+    def test_should_stream_gzip_ndjson(self, fixture_user):
+        _events(2)
+        resp = AuditLogCsvExportView.as_view()(
+            self._req(fixture_user, data={"format": "ndjson", "gzip": "1"})
+        )
+        assert resp["Content-Disposition"] == 'attachment; filename="audit_log.ndjson.gz"'
+        assert len(gzip.decompress(b"".join(resp.streaming_content)).splitlines()) == 2
+
+    def test_should_queue_async_export_job(self, fixture_user, django_capture_on_commit_callbacks):
+        from reporting.models import ExportJob
+
+        with (
+            patch("reporting.tasks.process_export_job.delay") as delay,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            resp = AuditLogCsvExportView.as_view()(
+                self._req(fixture_user, "post", {"format": "ndjson", "gzip": "1"})
+            )
+
+        assert resp.status_code == 202
+        job = ExportJob.objects.get(pk=json.loads(resp.content)["job_id"])
+        assert job.export_type == "audit.log.ndjson"
+        assert job.params_json == {"format": "ndjson", "gzip": True}
+        delay.assert_called_once_with(str(job.pk))
+
+    def test_should_upload_export_to_s3(self, fixture_user):
+        from reporting.models import ExportJob
+        from reporting.tasks import process_export_job
+
+        _events(3)
+        job = ExportJob.objects.create(
+            tenant_id=TENANT_ID,
+            requested_by_user_id=fixture_user.pk,
+            export_type="audit.log.csv",
+            params_json={"format": "csv", "gzip": True},
+            params_hash="h",
+        )
+        uploaded = {}
+
+        def upload_fileobj(fileobj, bucket, key, ExtraArgs):
+            uploaded[key] = fileobj.read()
+
+        with patch("common.s3.s3_client") as client:
+            client.return_value.upload_fileobj.side_effect = upload_fileobj
+            process_export_job.run(str(job.pk))
+
+        job.refresh_from_db()
+        assert job.status == ExportJob.Status.DONE
+        assert job.output_s3_key.endswith("/audit_log.csv.gz")
+        assert len(gzip.decompress(uploaded[job.output_s3_key]).splitlines()) == 4
+        assert job.output_size_bytes == len(uploaded[job.output_s3_key])
+
+        with patch("common.s3.s3_client") as client:
+            client.return_value.generate_presigned_url.return_value = "https://s3/x"
+            resp = AuditExportJobView.as_view()(self._req(fixture_user), job_id=job.pk)
+        assert json.loads(resp.content)["download_url"] == "https://s3/x"
@@ -0,0 +1,74 @@
+"""Tests for audit/search.py — full text, partial ids, filters, ranking."""
+
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from audit.models import AuditEvent
+from audit.search import search_audit_events, to_prefix_tsquery
+
+TENANT_ID = uuid.uuid4()
+
+
+def _event(resource_type="Risk", details=None, **kwargs):
+    return AuditEvent.objects.create(
+        tenant_id=kwargs.pop("tenant_id", TENANT_ID),
+        event_type=kwargs.pop("event_type", "update"),
+        resource_type=resource_type,
+        details=details or {},
+        **kwargs,
+    )
+
+
+class TestToPrefixTsquery:
+    def test_should_quote_and_join_terms(self):
+        assert to_prefix_tsquery("Prüf bar-1") == "'Prüf':* & 'bar-1':*"
+
+    def test_should_escape_quotes_and_drop_punctuation(self):
+        assert to_prefix_tsquery("o'neil & !") == "'o''neil':*"
+
+
+@pytest.mark.django_db
+class TestSearchAuditEvents:
+    def test_should_match_detail_values_by_prefix(self):
+        hit = _event(details={"title": "Prüfung überfällig"})
+        _event(details={"title": "Freigabe"})
+
+        assert search_audit_events(TENANT_ID, "prüf") == [hit]
+
+    def test_should_rank_resource_type_above_details(self):
+        in_details = _event(resource_type="Risk", details={"note": "substance"})
+        in_type = _event(resource_type="substance")
+
+        assert search_audit_events(TENANT_ID, "substance") == [in_type, in_details]
+
+    def test_should_match_partial_resource_id(self):
+        resource_id = uuid.uuid4()
+        hit = _event(resource_id=resource_id)
+        _event(resource_id=uuid.uuid4())
+
+        fragment = str(resource_id)[10:20]
+        assert search_audit_events(TENANT_ID, fragment.upper()) == [hit]
+
+    def test_should_combine_text_with_filters(self):
+        old = timezone.now() - timedelta(days=40)
+        _event(details={"title": "Prüfung"}, created_at=old)
+        _event(details={"title": "Prüfung"}, event_type="create")
+        hit = _event(details={"title": "Prüfung"})
+        _event(details={"title": "Prüfung"}, tenant_id=uuid.uuid4())
+
+        results = search_audit_events(
+            TENANT_ID,
+            "prüfung",
+            event_type="update",
+            date_from=(timezone.now() - timedelta(days=7)).date(),
+        )
+
+        assert results == [hit]
+
+    def test_should_list_newest_first_without_text(self):
+        older = _event(created_at=timezone.now() - timedelta(hours=1))
+        newer = _event()
+        assert search_audit_events(TENANT_ID) == [newer, older]
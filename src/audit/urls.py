@@ -2,7 +2,7 @@
 
 from django.urls import path
 
-from audit.views import AuditLogCsvExportView, AuditLogView
+from audit.views import AuditExportJobView, AuditLogCsvExportView, AuditLogView
 
 app_name = "audit"
 
@@ -13,4 +13,9 @@ urlpatterns = [
         AuditLogCsvExportView.as_view(),
         name="export-csv",
     ),
+    path(
+        "export/jobs/<int:job_id>/",
+        AuditExportJobView.as_view(),
+        name="export-job",
+    ),
 ]
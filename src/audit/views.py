@@ -1,15 +1,25 @@
-"""Audit log viewer — filterable list with CSV export."""
+"""Audit log viewer — filterable list with streaming CSV/NDJSON export."""
 
-import csv
-import io
+import hashlib
+import json
 
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpRequest, HttpResponse
-from django.shortcuts import render
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, render
 from django.views import View
 
+from audit.export import (
+    CONTENT_TYPES,
+    FORMAT_CSV,
+    FORMATS,
+    export_filename,
+    stream_audit_export,
+)
 from audit.models import AuditEvent
-from audit.services import get_audit_events, get_audit_resource_types
+from audit.search import search_audit_events
+from audit.services import filter_audit_events, get_audit_events, get_audit_resource_types
 
 
 class AuditLogView(LoginRequiredMixin, View):
@@ -19,27 +29,21 @@ class AuditLogView(LoginRequiredMixin, View):
 
     def get(self, request: HttpRequest) -> HttpResponse:
         tenant_id = getattr(request, "tenant_id", None)
-        qs = get_audit_events(tenant_id)
 
-        # Filters
         event_type = request.GET.get("event_type")
         resource_type = request.GET.get("resource_type")
         date_from = request.GET.get("date_from")
         date_to = request.GET.get("date_to")
         search = request.GET.get("q", "").strip()
 
-        if event_type:
-            qs = qs.filter(event_type=event_type)
-        if resource_type:
-            qs = qs.filter(resource_type__icontains=resource_type)
-        if date_from:
-            qs = qs.filter(created_at__date__gte=date_from)
-        if date_to:
-            qs = qs.filter(created_at__date__lte=date_to)
-        if search:
-            qs = qs.filter(details__icontains=search)
-
-        events = qs.order_by("-created_at")[:200]
+        events = search_audit_events(
+            tenant_id,
+            search,
+            event_type=event_type or "",
+            resource_type=resource_type or "",
+            date_from=date_from,
+            date_to=date_to,
+        )
 
         # Distinct values for filter dropdowns
         event_types = AuditEvent.EventType.choices
@@ -64,58 +68,79 @@ class AuditLogView(LoginRequiredMixin, View):
 
 
 class AuditLogCsvExportView(LoginRequiredMixin, View):
-    """Export filtered audit log as CSV."""
+    """Export the filtered audit log — streamed, or as an async ExportJob.
+
+    GET streams the full history (``?format=csv|ndjson``, ``?gzip=1``).
+    POST queues a ``reporting.ExportJob`` that uploads the file to S3;
+    poll ``AuditExportJobView`` for its download link.
+    """
+
+    def _options(self, params) -> tuple[str, bool]:
+        fmt = params.get("format", FORMAT_CSV)
+        return (fmt if fmt in FORMATS else FORMAT_CSV), params.get("gzip") == "1"
 
     def get(self, request: HttpRequest) -> HttpResponse:
         tenant_id = getattr(request, "tenant_id", None)
-        qs = get_audit_events(tenant_id)
+        qs = filter_audit_events(get_audit_events(tenant_id), request.GET, search=True)
+        fmt, compress = self._options(request.GET)
 
-        event_type = request.GET.get("event_type")
-        resource_type = request.GET.get("resource_type")
-        date_from = request.GET.get("date_from")
-        date_to = request.GET.get("date_to")
+        response = StreamingHttpResponse(
+            stream_audit_export(qs, fmt, compress),
+            content_type="application/gzip" if compress else CONTENT_TYPES[fmt],
+        )
+        filename = export_filename(fmt, compress)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def post(self, request: HttpRequest) -> HttpResponse:
+        from reporting.models import ExportJob
+        from reporting.tasks import process_export_job
 
-        if event_type:
-            qs = qs.filter(event_type=event_type)
-        if resource_type:
-            qs = qs.filter(resource_type__icontains=resource_type)
-        if date_from:
-            qs = qs.filter(created_at__date__gte=date_from)
-        if date_to:
-            qs = qs.filter(created_at__date__lte=date_to)
-
-        events = qs.order_by("-created_at")[:5000]
-
-        buf = io.StringIO()
-        writer = csv.writer(buf, delimiter=";")
-        writer.writerow(
-            [
-                "Zeitpunkt",
-                "Typ",
-                "Ressource",
-                "Ressource-ID",
-                "Benutzer-ID",
-                "IP-Adresse",
-                "Details",
-            ]
+        tenant_id = getattr(request, "tenant_id", None)
+        if tenant_id is None:
+            return JsonResponse({"error": "Missing tenant"}, status=403)
+        fmt, compress = self._options(request.POST)
+        params = {
+            key: request.POST[key]
+            for key in ("event_type", "resource_type", "date_from", "date_to", "q")
+            if request.POST.get(key)
+        }
+        params.update(format=fmt, gzip=compress)
+
+        job = ExportJob.objects.create(
+            tenant_id=tenant_id,
+            requested_by_user_id=request.user.pk,
+            export_type=f"audit.log.{fmt}",
+            params_json=params,
+            params_hash=hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest(),
+        )
+        transaction.on_commit(lambda: process_export_job.delay(str(job.pk)))
+        return JsonResponse(
+            {"job_id": job.pk, "status": job.status},
+            status=202,
         )
 
-        for ev in events:
-            writer.writerow(
-                [
-                    ev.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    ev.event_type,
-                    ev.resource_type,
-                    str(ev.resource_id or ""),
-                    str(ev.user_id or ""),
-                    ev.ip_address or "",
-                    str(ev.details)[:500],
-                ]
-            )
 
-        response = HttpResponse(
-            buf.getvalue(),
-            content_type="text/csv; charset=utf-8",
+class AuditExportJobView(LoginRequiredMixin, View):
+    """Status of an async audit export; presigned S3 link once done."""
+
+    def get(self, request: HttpRequest, job_id: int) -> HttpResponse:
+        from reporting.models import ExportJob
+
+        job = get_object_or_404(
+            ExportJob,
+            pk=job_id,
+            tenant_id=getattr(request, "tenant_id", None),
+            export_type__startswith="audit.log.",
         )
-        response["Content-Disposition"] = 'attachment; filename="audit_log.csv"'
-        return response
+        data = {"job_id": job.pk, "status": job.status, "error": job.error}
+        if job.status == ExportJob.Status.DONE and job.output_s3_key:
+            from common.s3 import s3_client
+
+            data["size_bytes"] = job.output_size_bytes
+            data["download_url"] = s3_client().generate_presigned_url(
+                "get_object",
+                Params={"Bucket": settings.S3_BUCKET, "Key": job.output_s3_key},
+                ExpiresIn=3600,
+            )
+        return JsonResponse(data)
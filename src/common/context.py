@@ -9,6 +9,8 @@ from __future__ import annotations
 
 import contextvars
 import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from uuid import UUID
 
@@ -19,6 +21,9 @@ _tenant_slug: contextvars.ContextVar[str | None] = contextvars.ContextVar(
 )
 _user_id: contextvars.ContextVar[UUID | None] = contextvars.ContextVar("user_id", default=None)
 _request_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("request_id", default=None)
+_audit_buffer: contextvars.ContextVar[list | None] = contextvars.ContextVar(
+    "audit_buffer", default=None
+)
 
 
 @dataclass(frozen=True)
@@ -60,12 +65,33 @@ def set_request_id(request_id: str | None = None) -> str:
     return request_id
 
 
+def _rls_state_matches(connection, tenant_id: UUID | None, service_account: bool) -> bool:
+    """True if this DB session already carries the given RLS variables.
+
+    Only trusted outside atomic blocks: a rollback reverts session ``SET``.
+    """
+    state = getattr(connection, "_rls_session_state", None)
+    return (
+        state is not None
+        and not connection.in_atomic_block
+        and state[0] is connection.connection
+        and state[1:] == (tenant_id, service_account)
+    )
+
+
+def _remember_rls_state(connection, tenant_id: UUID | None, service_account: bool) -> None:
+    connection._rls_session_state = (
+        None if connection.in_atomic_block else (connection.connection, tenant_id, service_account)
+    )
+
+
 def set_db_tenant(tenant_id: UUID | None) -> None:
     """Set PostgreSQL session variable for RLS (ADR-003 §4.3).
 
-    Uses session-scoped ``SET`` (not ``SET LOCAL``) so the
-    variable persists across autocommit queries until the
-    next request resets it via middleware.
+    Uses session-scoped ``set_config(..., false)`` (not ``SET LOCAL``) so
+    the variable persists across autocommit queries until the next
+    request resets it via middleware. Both variables are written in one
+    round trip, and not at all if the connection already carries them.
     No-op on SQLite (test environment).
 
     Also resets ``app.is_service_account`` to ``false`` — normal
@@ -75,16 +101,16 @@ def set_db_tenant(tenant_id: UUID | None) -> None:
 
     if connection.vendor != "postgresql":
         return
+    if _rls_state_matches(connection, tenant_id, False):
+        return
 
     with connection.cursor() as cursor:
-        if tenant_id is not None:
-            cursor.execute(
-                "SET app.tenant_id = %s",
-                [str(tenant_id)],
-            )
-        else:
-            cursor.execute("RESET app.tenant_id")
-        cursor.execute("SET app.is_service_account = 'false'")
+        cursor.execute(
+            "SELECT set_config('app.tenant_id', %s, false),"
+            " set_config('app.is_service_account', 'false', false)",
+            ["" if tenant_id is None else str(tenant_id)],
+        )
+    _remember_rls_state(connection, tenant_id, False)
 
 
 def set_db_service_account(enabled: bool = True) -> None:
@@ -112,6 +138,7 @@ def set_db_service_account(enabled: bool = True) -> None:
             "SET app.is_service_account = %s",
             ["true" if enabled else "false"],
         )
+    connection._rls_session_state = None
 
 
 def clear_context() -> None:
@@ -141,19 +168,59 @@ def emit_audit_event(
 
     Creates an AuditEvent record for tracking user actions.
     Falls back to context for tenant_id/user_id if not provided.
+    Inside ``buffered_audit_events()`` the record is only collected.
     """
     from audit.models import AuditEvent
 
     ctx = get_context()
-    AuditEvent.objects.create(
+    event = AuditEvent(
         tenant_id=tenant_id or ctx.tenant_id,
         user_id=user_id or ctx.user_id,
         event_type=action or "other",
         resource_type=entity_type or category,
         resource_id=entity_id,
         details=payload or {},
-        request_id=ctx.request_id,
+        request_id=ctx.request_id or "",
     )
+    buffer = _audit_buffer.get()
+    if buffer is not None:
+        buffer.append(event)
+        return
+    event.save(force_insert=True)
+    _invalidate_tenant_caches(event.tenant_id, event.resource_type)
+
+
+@contextmanager
+def buffered_audit_events(batch_size: int = 500) -> Iterator[list]:
+    """
+    Collect the audit events of a bulk operation and write them at once.
+
+    Runs the block in ``transaction.atomic()``; ``emit_audit_event`` calls
+    inside it are buffered and flushed with one INSERT per ``batch_size``
+    right before the block commits, so events and business writes commit
+    or roll back together. Nested blocks join the outermost buffer.
+    """
+    if _audit_buffer.get() is not None:
+        yield _audit_buffer.get()
+        return
+
+    from django.db import transaction
+
+    from audit.models import AuditEvent
+
+    events: list = []
+    token = _audit_buffer.set(events)
+    try:
+        with transaction.atomic():
+            yield events
+            _audit_buffer.reset(token)
+            token = None
+            AuditEvent.objects.bulk_create(events, batch_size=batch_size)
+            for tenant_id, source in {(e.tenant_id, e.resource_type) for e in events}:
+                _invalidate_tenant_caches(tenant_id, source)
+    finally:
+        if token is not None:
+            _audit_buffer.reset(token)
 
 
 def emit_outbox_event(
@@ -173,10 +240,61 @@ def emit_outbox_event(
     from outbox.models import OutboxMessage
 
     ctx = get_context()
-    OutboxMessage.objects.create(
+    msg = OutboxMessage.objects.create(
         tenant_id=tenant_id or ctx.tenant_id,
         topic=topic,
         payload=payload or {},
         aggregate_type=aggregate_type,
         aggregate_id=aggregate_id,
     )
+    _invalidate_tenant_caches(msg.tenant_id, topic, outboxed=True)
+
+
+def emit_outbox_events(events: list[dict], batch_size: int = 500) -> int:
+    """
+    Bulk variant of ``emit_outbox_event`` — one INSERT per batch.
+
+    Each event is a dict with the keyword arguments of
+    ``emit_outbox_event``. Returns the number of messages written.
+    """
+    from outbox.models import OutboxMessage
+
+    ctx = get_context()
+    messages = [
+        OutboxMessage(
+            tenant_id=event.get("tenant_id") or ctx.tenant_id,
+            topic=event.get("topic", ""),
+            payload=event.get("payload") or {},
+            aggregate_type=event.get("aggregate_type") or "",
+            aggregate_id=event.get("aggregate_id"),
+        )
+        for event in events
+    ]
+    OutboxMessage.objects.bulk_create(messages, batch_size=batch_size)
+    for tenant_id, topic in {(m.tenant_id, m.topic) for m in messages}:
+        _invalidate_tenant_caches(tenant_id, topic, outboxed=True)
+    return len(messages)
+
+
+def _invalidate_tenant_caches(
+    tenant_id: UUID | None, source: str = "", outboxed: bool = False
+) -> None:
+    """Invalidate derived per-tenant KPI state for a business mutation.
+
+    Every business mutation emits an audit and/or outbox event, so this
+    is the single hook that keeps the dashboard KPI cache and the KPI
+    rollup coherent. The rollup is recomputed by the outbox consumer:
+    outbox events (``outboxed``) reach it directly, audit events enqueue
+    a ``kpi.refresh`` message. The cache is dropped once the writer commits.
+    """
+    if tenant_id is None:
+        return
+
+    from django.db import transaction
+
+    from dashboard.rollup import families_for, request_refresh
+    from dashboard.services import invalidate_compliance_kpis
+
+    if not outboxed:
+        request_refresh(tenant_id, families_for(source))
+    transaction.on_commit(lambda: invalidate_compliance_kpis(tenant_id))
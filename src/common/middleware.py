@@ -1,10 +1,15 @@
 """Middleware for Risk-Hub."""
 
+import functools
 import uuid
+from dataclasses import dataclass
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
 
 try:
     from platform_context.middleware import HealthBypassMiddleware  # noqa: F401
@@ -23,12 +28,41 @@ except ImportError:
                 return HttpResponse("ok\n", content_type="text/plain")
             return self.get_response(request)
 
+
 from common.context import (
     set_db_tenant,
     set_request_id,
     set_tenant,
     set_user_id,
 )
+from common.tenant import ResolvedTenant
+from tenancy.lookup import TenantRef, get_tenant_ref_by_slug, get_tenant_ref_by_tenant_id
+
+
+@dataclass(frozen=True)
+class _TenantSettings:
+    base_domains: tuple[str, ...]
+    allow_localhost: bool
+    reserved_subdomains: frozenset[str]
+
+
+@functools.cache
+def _tenant_settings() -> _TenantSettings:
+    """TENANT_* settings, read once (reset on ``setting_changed``)."""
+    base_domains = list(getattr(settings, "TENANT_BASE_DOMAINS", []))
+    if not base_domains:
+        base_domains = [getattr(settings, "TENANT_BASE_DOMAIN", "localhost")]
+    return _TenantSettings(
+        base_domains=tuple(d.lower() for d in base_domains),
+        allow_localhost=getattr(settings, "TENANT_ALLOW_LOCALHOST", False),
+        reserved_subdomains=frozenset(getattr(settings, "TENANT_RESERVED_SUBDOMAINS", ["www"])),
+    )
+
+
+@receiver(setting_changed)
+def _reset_tenant_settings(setting, **kwargs):
+    if setting.startswith("TENANT_"):
+        _tenant_settings.cache_clear()
 
 
 def _parse_subdomain(host: str, base_domain: str) -> str | None:
@@ -70,6 +104,40 @@ def _sync_platform_context(
         pass
 
 
+def _lazy_organization(tenant_id):
+    """Organization instance, loaded only if a view actually touches it."""
+
+    def load():
+        from tenancy.models import Organization
+
+        return Organization.objects.get(tenant_id=tenant_id)
+
+    return SimpleLazyObject(load)
+
+
+def _bind_tenant(
+    request: HttpRequest,
+    tenant_id=None,
+    slug=None,
+    ref: TenantRef | None = None,
+    source: str = "none",
+) -> None:
+    """Bind the resolved tenant to context, DB session and request."""
+    set_tenant(tenant_id, slug)
+    set_db_tenant(tenant_id)
+    org = None
+    if ref is not None:
+        org = _lazy_organization(ref.tenant_id)
+        request.tenant = org
+        request.tenant_slug = slug
+    if tenant_id is not None:
+        request.tenant_id = tenant_id
+    request.resolved_tenant = ResolvedTenant(
+        tenant_id, slug, org, source, is_readonly=ref is not None and ref.is_readonly
+    )
+    _sync_platform_context(tenant_id=tenant_id, slug=slug)
+
+
 class RequestContextMiddleware(MiddlewareMixin):
     """Set up request context (request_id, user_id)."""
 
@@ -100,41 +168,16 @@ class SubdomainTenantMiddleware(MiddlewareMixin):
         self,
         request: HttpRequest,
     ) -> HttpResponse | None:
-        base_domains = list(
-            getattr(settings, "TENANT_BASE_DOMAINS", []),
-        )
-        if not base_domains:
-            base_domains = [
-                getattr(
-                    settings,
-                    "TENANT_BASE_DOMAIN",
-                    "localhost",
-                ),
-            ]
-        allow_localhost = getattr(
-            settings,
-            "TENANT_ALLOW_LOCALHOST",
-            False,
-        )
-        reserved_subdomains = set(
-            getattr(
-                settings,
-                "TENANT_RESERVED_SUBDOMAINS",
-                ["www"],
-            )
-        )
+        conf = _tenant_settings()
 
         host = request.get_host().split(":")[0].lower()
-        if host in {d.lower() for d in base_domains}:
+        if host in conf.base_domains:
             # Check for X-Tenant-ID header first (API clients / tests)
             header_tenant = request.headers.get("X-Tenant-Id")
             if header_tenant:
                 try:
                     tenant_uuid = uuid.UUID(header_tenant)
-                    set_tenant(tenant_uuid, None)
-                    set_db_tenant(tenant_uuid)
-                    request.tenant_id = tenant_uuid
-                    _sync_platform_context(tenant_id=tenant_uuid)
+                    _bind_tenant(request, tenant_uuid, source="header")
                     return None
                 except (ValueError, TypeError):
                     pass
@@ -144,26 +187,17 @@ class SubdomainTenantMiddleware(MiddlewareMixin):
                 user_tenant_id = getattr(user, "tenant_id", None)
                 if user_tenant_id:
                     try:
-                        from tenancy.models import Organization
-
-                        org = Organization.objects.filter(tenant_id=user_tenant_id).first()
-                        if org:
-                            set_tenant(org.tenant_id, org.slug)
-                            set_db_tenant(org.tenant_id)
-                            request.tenant = org
-                            request.tenant_id = org.tenant_id
-                            request.tenant_slug = org.slug
-                            _sync_platform_context(tenant_id=org.tenant_id, slug=org.slug)
+                        ref = get_tenant_ref_by_tenant_id(user_tenant_id)
+                        if ref:
+                            _bind_tenant(request, ref.tenant_id, ref.slug, ref, "user")
                             return None
                     except Exception:
                         pass
-            set_tenant(None, None)
-            set_db_tenant(None)
-            _sync_platform_context()
+            _bind_tenant(request)
             return None
 
         subdomain = None
-        for base_domain in base_domains:
+        for base_domain in conf.base_domains:
             subdomain = _parse_subdomain(
                 request.get_host(),
                 base_domain,
@@ -171,10 +205,8 @@ class SubdomainTenantMiddleware(MiddlewareMixin):
             if subdomain:
                 break
 
-        if subdomain and subdomain.lower() in reserved_subdomains:
-            set_tenant(None, None)
-            set_db_tenant(None)
-            _sync_platform_context()
+        if subdomain and subdomain.lower() in conf.reserved_subdomains:
+            _bind_tenant(request)
             return None
 
         if not subdomain:
@@ -183,12 +215,7 @@ class SubdomainTenantMiddleware(MiddlewareMixin):
             if header_tenant:
                 try:
                     tenant_uuid = uuid.UUID(header_tenant)
-                    set_tenant(tenant_uuid, None)
-                    set_db_tenant(tenant_uuid)
-                    request.tenant_id = tenant_uuid
-                    _sync_platform_context(
-                        tenant_id=tenant_uuid,
-                    )
+                    _bind_tenant(request, tenant_uuid, source="header")
                     return None
                 except (ValueError, TypeError):
                     pass
@@ -204,14 +231,10 @@ class SubdomainTenantMiddleware(MiddlewareMixin):
                 "/api/v1/",
             ]
             if any(request.path.startswith(p) for p in public_prefixes):
-                set_tenant(None, None)
-                set_db_tenant(None)
-                _sync_platform_context()
+                _bind_tenant(request)
                 return None
             if request.path == "/":
-                set_tenant(None, None)
-                set_db_tenant(None)
-                _sync_platform_context()
+                _bind_tenant(request)
                 return None
 
             # Fallback: resolve tenant from authenticated user.tenant_id
@@ -220,32 +243,21 @@ class SubdomainTenantMiddleware(MiddlewareMixin):
                 user_tenant_id = getattr(user, "tenant_id", None)
                 if user_tenant_id:
                     try:
-                        from tenancy.models import Organization
-
-                        org = Organization.objects.filter(tenant_id=user_tenant_id).first()
-                        if org:
-                            set_tenant(org.tenant_id, org.slug)
-                            set_db_tenant(org.tenant_id)
-                            request.tenant = org
-                            request.tenant_id = org.tenant_id
-                            request.tenant_slug = org.slug
-                            _sync_platform_context(tenant_id=org.tenant_id, slug=org.slug)
+                        ref = get_tenant_ref_by_tenant_id(user_tenant_id)
+                        if ref:
+                            _bind_tenant(request, ref.tenant_id, ref.slug, ref, "user")
                             return None
                     except Exception:
                         pass
 
-            if allow_localhost:
-                set_tenant(None, None)
-                set_db_tenant(None)
-                _sync_platform_context()
+            if conf.allow_localhost:
+                _bind_tenant(request)
                 return None
 
             # Public login / accounts paths — allow without tenant
             accounts_prefixes = ["/accounts/", "/tenants/", "/admin/"]
             if any(request.path.startswith(p) for p in accounts_prefixes):
-                set_tenant(None, None)
-                set_db_tenant(None)
-                _sync_platform_context()
+                _bind_tenant(request)
                 return None
 
             from django.conf import settings as _s
@@ -256,36 +268,19 @@ class SubdomainTenantMiddleware(MiddlewareMixin):
 
         # Look up tenant
         try:
-            from tenancy.models import Organization
-
-            org = Organization.objects.filter(
-                slug=subdomain,
-            ).first()
+            ref = get_tenant_ref_by_slug(subdomain)
         except Exception:
-            set_tenant(None, subdomain)
-            set_db_tenant(None)
-            _sync_platform_context(slug=subdomain)
+            _bind_tenant(request, slug=subdomain)
             return None
 
-        if not org:
+        if not ref:
             return HttpResponse(
                 f"403 Forbidden: Unbekannter Tenant '{subdomain}'.",
                 status=403,
                 content_type="text/plain",
             )
 
-        set_tenant(org.tenant_id, subdomain)
-        set_db_tenant(org.tenant_id)
-
-        request.tenant = org
-        request.tenant_id = org.tenant_id
-        request.tenant_slug = subdomain
-
-        _sync_platform_context(
-            tenant_id=org.tenant_id,
-            slug=subdomain,
-        )
-
+        _bind_tenant(request, ref.tenant_id, subdomain, ref, "subdomain")
         return None
 
 
@@ -316,6 +311,10 @@ class ReadOnlyTenantMiddleware(MiddlewareMixin):
         if any(request.path.startswith(p) for p in _READONLY_ALLOWLIST):
             return None
 
+        resolved = getattr(request, "resolved_tenant", None)
+        if resolved is not None and resolved.organization is not None and not resolved.is_readonly:
+            return None  # cached flag says writable — skip loading the organization
+
         org = getattr(request, "tenant", None)
         if org is None or not getattr(org, "is_readonly", False):
             return None
@@ -0,0 +1,208 @@
+"""Page-level PDF text extraction with selective OCR and a page cache.
+
+The text layer is read page by page (pypdfium2). Only pages without a
+usable text layer — scanned, empty or garbled by missing font maps — are
+OCR'd, each one as a single-page PDF through iil-ingest. Every page's
+text is cached by (PDF SHA-256, page index, OCR engine version) on disk
+or in S3, so re-parsing a document (parser update, LLM re-enrichment)
+never runs OCR again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# A page needs at least this many letters to count as having a text layer
+MIN_PAGE_LETTERS = 20
+# Share of replacement/private-use characters above which a text layer is garbled
+MAX_GARBLED_RATIO = 0.01
+
+CACHE_FILE = "file"
+CACHE_S3 = "s3"
+CACHE_NONE = "none"
+
+
+class FileSystemPageCache:
+    """Page texts as UTF-8 files below ``root``."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def get(self, key: str) -> str | None:
+        try:
+            return (self.root / key).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, text: str) -> None:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(path)
+
+
+class S3PageCache:
+    """Page texts as objects below ``prefix`` in the documents bucket."""
+
+    def __init__(self, bucket: str, prefix: str = "pdf-text/"):
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def get(self, key: str) -> str | None:
+        from common.s3 import s3_client
+
+        client = s3_client()
+        try:
+            obj = client.get_object(Bucket=self.bucket, Key=self.prefix + key)
+        except client.exceptions.NoSuchKey:
+            return None
+        return obj["Body"].read().decode("utf-8")
+
+    def set(self, key: str, text: str) -> None:
+        from common.s3 import s3_client
+
+        s3_client().put_object(
+            Bucket=self.bucket,
+            Key=self.prefix + key,
+            Body=text.encode("utf-8"),
+            ContentType="text/plain; charset=utf-8",
+        )
+
+
+class _NoPageCache:
+    def get(self, key: str) -> str | None:
+        return None
+
+    def set(self, key: str, text: str) -> None:
+        pass
+
+
+def page_cache():
+    """Cache backend configured by ``PDF_TEXT_CACHE`` (file, s3 or none)."""
+    backend = getattr(settings, "PDF_TEXT_CACHE", CACHE_FILE)
+    if backend == CACHE_S3:
+        return S3PageCache(getattr(settings, "S3_BUCKET", "documents"))
+    if backend == CACHE_FILE:
+        return FileSystemPageCache(getattr(settings, "PDF_TEXT_CACHE_DIR", "var/pdf_text"))
+    return _NoPageCache()
+
+
+@lru_cache(maxsize=1)
+def _ingest_version() -> str:
+    try:
+        return metadata.version("iil-ingest")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def ocr_engine_version() -> str:
+    """Cache key part: ``PDF_OCR_ENGINE_VERSION`` or the installed iil-ingest version."""
+    return getattr(settings, "PDF_OCR_ENGINE_VERSION", "") or f"iil-ingest-{_ingest_version()}"
+
+
+def has_text_layer(text: str) -> bool:
+    """True if ``text`` is usable without OCR."""
+    if sum(ch.isalpha() for ch in text) < MIN_PAGE_LETTERS:
+        return False
+    garbled = sum(1 for ch in text if ch == "\ufffd" or "\ue000" <= ch <= "\uf8ff")
+    return garbled <= len(text) * MAX_GARBLED_RATIO
+
+
+def extract_pdf_pages(data: bytes, cache=None) -> list[str]:
+    """Text of each page of ``data``; cached pages are neither read nor OCR'd.
+
+    Raises:
+        ValueError: if ``data`` is not a readable PDF.
+    """
+    cache = page_cache() if cache is None else cache
+    prefix = f"{hashlib.sha256(data).hexdigest()}/{ocr_engine_version()}"
+
+    pages: list[str | None] = []
+    count = _cache_get(cache, f"{prefix}/pages")
+    if count is not None:
+        pages = [_cache_get(cache, f"{prefix}/{index:05d}") for index in range(int(count))]
+        if all(page is not None for page in pages):
+            return pages
+
+    import pypdfium2 as pdfium
+
+    try:
+        pdf = pdfium.PdfDocument(data)
+    except pdfium.PdfiumError as exc:
+        raise ValueError(f"Unreadable PDF: {exc}") from exc
+    try:
+        if len(pages) != len(pdf):
+            pages = [None] * len(pdf)
+        for index, cached in enumerate(pages):
+            if cached is not None:
+                continue
+            text, complete = _page_text(pdf, index)
+            pages[index] = text
+            if complete:
+                _cache_set(cache, f"{prefix}/{index:05d}", text)
+        _cache_set(cache, f"{prefix}/pages", str(len(pages)))
+    finally:
+        pdf.close()
+    return pages
+
+
+def extract_pdf_text(data: bytes, cache=None) -> str:
+    """Text of all pages, joined by newlines."""
+    return "\n".join(extract_pdf_pages(data, cache=cache))
+
+
+def _page_text(pdf, index: int) -> tuple[str, bool]:
+    """(text, complete) — incomplete if the page needed OCR and OCR failed."""
+    textpage = pdf[index].get_textpage()
+    try:
+        text = textpage.get_text_range()
+    finally:
+        textpage.close()
+    if has_text_layer(text):
+        return text, True
+    try:
+        ocr_text = _ocr_page(pdf, index)
+    except Exception as exc:
+        logger.warning("OCR of PDF page %d failed: %s", index + 1, exc)
+        return text, False
+    return (ocr_text if ocr_text.strip() else text), True
+
+
+def _ocr_page(pdf, index: int) -> str:
+    """OCR a single page, handed to iil-ingest as a one-page PDF."""
+    import pypdfium2 as pdfium
+    from ingest.extractors.ocr import ocr_pdf_bytes
+
+    single = pdfium.PdfDocument.new()
+    try:
+        single.import_pages(pdf, [index])
+        buffer = io.BytesIO()
+        single.save(buffer)
+    finally:
+        single.close()
+    return ocr_pdf_bytes(buffer.getvalue())
+
+
+def _cache_get(cache, key: str) -> str | None:
+    try:
+        return cache.get(key)
+    except Exception:
+        logger.exception("PDF text cache read failed: %s", key)
+        return None
+
+
+def _cache_set(cache, key: str, text: str) -> None:
+    try:
+        cache.set(key, text)
+    except Exception:
+        logger.exception("PDF text cache write failed: %s", key)
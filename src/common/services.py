@@ -41,9 +41,18 @@ def save_form(
             obj.updated_by_id = user_id
     obj.save()
     form.save_m2m()
+    _request_kpi_refresh(obj)
     return obj
 
 
 def delete_object(obj: models.Model) -> None:
     """Delete a model instance (ADR-041 — centralised delete)."""
     obj.delete()
+    _request_kpi_refresh(obj)
+
+
+def _request_kpi_refresh(obj: models.Model) -> None:
+    """Enqueue a recompute of the tenant's KPI rollup of the object's app."""
+    from dashboard.rollup import families_for, request_refresh
+
+    request_refresh(getattr(obj, "tenant_id", None), families_for(obj._meta.app_label))
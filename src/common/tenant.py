@@ -1,7 +1,41 @@
-"""Common tenant utilities."""
+"""Common tenant utilities.
 
+The tenant of a request is resolved once — by ``SubdomainTenantMiddleware``
+or, as a dev fallback, from the user's first Membership — and attached
+as ``request.resolved_tenant``. Active module codes are cached per
+(tenant, user) under a per-tenant version that is bumped whenever a
+ModuleSubscription or ModuleMembership changes (``tenancy.signals``).
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from django.core.cache import cache
 from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
 
+ACTIVE_MODULES_CACHE_TTL = 300  # seconds
+_MODULES_KEY = "tenant:modules:{version}:{tenant_id}:{user_id}:{staff}"
+_MODULES_VERSION_KEY = "tenant:modules:version:{}"
+
+SOURCE_NONE = "none"
+SOURCE_CONTEXT = "context"
+SOURCE_MEMBERSHIP = "membership"
+
+
+@dataclass(frozen=True)
+class ResolvedTenant:
+    """Tenant of one request as resolved by middleware or fallback."""
+
+    tenant_id: UUID | None = None
+    slug: str | None = None
+    organization: Any = field(default=None, compare=False, repr=False)
+    source: str = SOURCE_NONE
+    is_readonly: bool = False
+
 
 def require_tenant(request: HttpRequest) -> HttpResponse | None:
     """Return 403 if request has no tenant_id, else None."""
@@ -11,26 +45,92 @@ def require_tenant(request: HttpRequest) -> HttpResponse | None:
     return None
 
 
-def resolve_tenant_id(request: HttpRequest):
-    """Resolve tenant_id from request context or user membership (dev fallback)."""
-    from common.context import get_context
-
-    tenant_id = get_context().tenant_id
-    if not tenant_id and getattr(request, "user", None) and request.user.is_authenticated:
+def _resolve_from_membership(request: HttpRequest) -> ResolvedTenant:
+    user = getattr(request, "user", None)
+    if user and user.is_authenticated:
         try:
             from tenancy.models import Membership
 
             m = (
-                Membership.objects.filter(user=request.user)
+                Membership.objects.filter(user=user)
                 .select_related("organization")
                 .order_by("created_at")
                 .first()
             )
             if m and m.organization.is_active:
-                tenant_id = m.organization.tenant_id
+                org = m.organization
+                return ResolvedTenant(
+                    org.tenant_id, org.slug, org, SOURCE_MEMBERSHIP, org.is_readonly
+                )
         except Exception:
             pass
-    return tenant_id
+    return ResolvedTenant(source=SOURCE_MEMBERSHIP)
+
+
+def resolve_tenant(request: HttpRequest) -> ResolvedTenant:
+    """Return the request's resolved tenant; computed at most once per request."""
+    from common.context import get_context
+
+    ctx = get_context()
+    resolved = getattr(request, "resolved_tenant", None)
+    if resolved is not None and ctx.tenant_id in (None, resolved.tenant_id):
+        if resolved.tenant_id is not None or resolved.source == SOURCE_MEMBERSHIP:
+            return resolved
+    elif ctx.tenant_id:
+        # Tenant set on the context outside the middleware (views, tests).
+        resolved = ResolvedTenant(ctx.tenant_id, ctx.tenant_slug, source=SOURCE_CONTEXT)
+        request.resolved_tenant = resolved
+        return resolved
+
+    resolved = _resolve_from_membership(request)
+    request.resolved_tenant = resolved
+    return resolved
+
+
+def resolve_tenant_id(request: HttpRequest):
+    """Resolve tenant_id from request context or user membership (dev fallback)."""
+    return resolve_tenant(request).tenant_id
+
+
+def _modules_version(tenant_id) -> int:
+    key = _MODULES_VERSION_KEY.format(tenant_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed with a timestamp so an evicted counter never revives stale entries.
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_active_modules(tenant_id) -> None:
+    """Drop all cached module sets of a tenant (bumps its version)."""
+    if tenant_id is None:
+        return
+    key = _MODULES_VERSION_KEY.format(tenant_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def _load_active_modules(tenant_id, user) -> frozenset[str]:
+    from django_tenancy.module_models import ModuleMembership, ModuleSubscription
+
+    subscribed = set(
+        ModuleSubscription.objects.filter(
+            tenant_id=tenant_id,
+            status__in=["trial", "active"],
+        ).values_list("module", flat=True)
+    )
+    if user.is_staff:
+        return frozenset(subscribed)
+    user_modules = set(
+        ModuleMembership.objects.filter(
+            tenant_id=tenant_id,
+            user=user,
+        ).values_list("module", flat=True)
+    )
+    return frozenset(subscribed & user_modules)
 
 
 def get_active_modules(request: HttpRequest) -> set[str]:
@@ -38,6 +138,7 @@ def get_active_modules(request: HttpRequest) -> set[str]:
 
     Intersects tenant-level ModuleSubscription (active/trial) with
     user-level ModuleMembership.  Staff users see all subscribed modules.
+    Memoized on the request and cached per (tenant, user).
     """
     tenant_id = resolve_tenant_id(request)
     if not tenant_id:
@@ -45,23 +146,24 @@ def get_active_modules(request: HttpRequest) -> set[str]:
     user = getattr(request, "user", None)
     if not user or not getattr(user, "is_authenticated", False):
         return set()
-    try:
-        from django_tenancy.module_models import ModuleMembership, ModuleSubscription
 
-        subscribed = set(
-            ModuleSubscription.objects.filter(
-                tenant_id=tenant_id,
-                status__in=["trial", "active"],
-            ).values_list("module", flat=True)
-        )
-        if user.is_staff:
-            return subscribed
-        user_modules = set(
-            ModuleMembership.objects.filter(
-                tenant_id=tenant_id,
-                user=user,
-            ).values_list("module", flat=True)
+    memo = getattr(request, "_active_modules", None)
+    if memo is not None and memo[0] == tenant_id:
+        return set(memo[1])
+
+    try:
+        key = _MODULES_KEY.format(
+            version=_modules_version(tenant_id),
+            tenant_id=tenant_id,
+            user_id=user.pk,
+            staff=int(user.is_staff),
         )
-        return subscribed & user_modules
+        modules = cache.get(key)
+        if modules is None:
+            modules = _load_active_modules(tenant_id, user)
+            cache.set(key, modules, ACTIVE_MODULES_CACHE_TTL)
     except Exception:
         return set()
+
+    request._active_modules = (tenant_id, modules)
+    return set(modules)
@@ -29,5 +29,13 @@ app.conf.beat_schedule = {
         "task": "reporting.cleanup_old_export_jobs",
         "schedule": crontab(hour=3, minute=0, day_of_week=0),  # Weekly Sunday 03:00
     },
+    "maintain-audit-partitions": {
+        "task": "audit.tasks.maintain_partitions",
+        "schedule": crontab(hour=2, minute=30),  # Daily at 02:30
+    },
+    "resume-stalled-kataster-imports": {
+        "task": "substances.tasks.resume_stalled_kataster_imports",
+        "schedule": 300.0,  # Every 5 minutes
+    },
 }
 app.conf.timezone = "Europe/Berlin"
@@ -196,6 +196,18 @@ S3_BUCKET = read_secret("S3_BUCKET", default="documents")
 S3_USE_SSL = read_secret("S3_USE_SSL", default="0") == "1"
 S3_PUBLIC_BASE_URL = read_secret("S3_PUBLIC_BASE_URL", default="")
 
+# PDF text extraction — per-page text/OCR cache: "file", "s3" (S3_BUCKET) or "none"
+PDF_TEXT_CACHE = read_secret("PDF_TEXT_CACHE", default="file")
+PDF_TEXT_CACHE_DIR = read_secret("PDF_TEXT_CACHE_DIR", default=str(BASE_DIR / "var" / "pdf_text"))
+# Part of the cache key; empty = installed iil-ingest version
+PDF_OCR_ENGINE_VERSION = read_secret("PDF_OCR_ENGINE_VERSION", default="")
+
+# PubChem (global_sds) — source "http" (PUG REST) or "local" (JSON mirror, offline)
+PUBCHEM_SOURCE = read_secret("PUBCHEM_SOURCE", default="http")
+PUBCHEM_LOCAL_MIRROR = read_secret("PUBCHEM_LOCAL_MIRROR", default="")
+PUBCHEM_CACHE_DAYS = int(read_secret("PUBCHEM_CACHE_DAYS", default="90"))
+PUBCHEM_NEGATIVE_CACHE_DAYS = int(read_secret("PUBCHEM_NEGATIVE_CACHE_DAYS", default="7"))
+
 # LLM Gateway
 LLM_GATEWAY_URL = read_secret("LLM_GATEWAY_URL", default="http://localhost:8100")
 LLM_GATEWAY_TIMEOUT = float(read_secret("LLM_GATEWAY_TIMEOUT", default="120"))
@@ -363,12 +375,40 @@ if not DEBUG:
     SECURE_BROWSER_XSS_FILTER = True
     X_FRAME_OPTIONS = "DENY"
 
+# --- Dashboard KPI engine ---
+# Per-tenant KPI cache (invalidated by audit/outbox events) and worker
+# threads for the module aggregations (1 = sequential on request connection).
+DASHBOARD_KPI_CACHE_TTL = int(read_secret("DASHBOARD_KPI_CACHE_TTL", default="300"))
+DASHBOARD_KPI_WORKERS = int(read_secret("DASHBOARD_KPI_WORKERS", default="1"))
+
+# Result cache of the substance quick search (HTMX search-as-you-type), seconds
+SUBSTANCE_SEARCH_CACHE_TTL = int(read_secret("SUBSTANCE_SEARCH_CACHE_TTL", default="30"))
+
+# Outbox relay (outbox.relay): claim batch size, parallel dispatch threads
+# and the polling fallback when no NOTIFY arrives.
+OUTBOX_RELAY_BATCH_SIZE = int(read_secret("OUTBOX_RELAY_BATCH_SIZE", default="100"))
+OUTBOX_RELAY_CONCURRENCY = int(read_secret("OUTBOX_RELAY_CONCURRENCY", default="4"))
+OUTBOX_RELAY_POLL_SECONDS = float(read_secret("OUTBOX_RELAY_POLL_SECONDS", default="30"))
+
+# Audit trail (audit.partitions): monthly partitions created ahead, months
+# beyond the retention window detached as archive tables (or dropped).
+AUDIT_PARTITIONS_AHEAD = int(read_secret("AUDIT_PARTITIONS_AHEAD", default="3"))
+AUDIT_RETENTION_MONTHS = int(read_secret("AUDIT_RETENTION_MONTHS", default="120"))
+AUDIT_ARCHIVE_EXPIRED = read_secret("AUDIT_ARCHIVE_EXPIRED", default="1") == "1"
+
+# Daily inspection deadline scan: tenants per Celery subtask when fanning out.
+INSPECTION_SCAN_TENANTS_PER_TASK = int(
+    read_secret("INSPECTION_SCAN_TENANTS_PER_TASK", default="50")
+)
+
 # --- Global SDS Library (ADR-012 §7.3) ---
 SDS_REVIEW_DEADLINE_DAYS = 28
 SDS_PARSER_LLM_CONFIDENCE_THRESHOLD = 0.85
 SDS_PARSER_GLOBAL_PROMOTION_THRESHOLD = 0.90
 SDS_IDENTITY_AUTO_MATCH_THRESHOLD = 0.95
 SDS_IDENTITY_ASK_USER_THRESHOLD = 0.70
+# Worker processes for SdsParserService.parse_pdf_batch (1 = sequential)
+SDS_PARSE_WORKERS = int(read_secret("SDS_PARSE_WORKERS", default="4"))
 
 AUTHENTICATION_BACKENDS = [
     "django.contrib.auth.backends.ModelBackend",
@@ -67,6 +67,15 @@ MIDDLEWARE = [
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# Worker threads use their own connections and cannot see test transactions.
+OUTBOX_RELAY_CONCURRENCY = 1
+
+# No PDF page text cache on disk; tests pass their own cache where needed.
+PDF_TEXT_CACHE = "none"
+
+# No PubChem network calls in tests: local stand-in without mirror = all unknown.
+PUBCHEM_SOURCE = "local"
+
 # Stripe — dummy values for test/CI (no real API calls)
 STRIPE_SECRET_KEY = "sk_test_dummy_ci_key"  # hardcoded-ok: test-only dummy key
 STRIPE_PUBLISHABLE_KEY = "pk_test_dummy_ci_key"
@@ -3,6 +3,20 @@ import pytest
 collect_ignore = ["test_substances.py"]
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    """Isolate tests from the shared cache (KPI, permission, tenant caches)."""
+    from django.core.cache import cache
+
+    from tenancy.lookup import clear_local_cache
+
+    cache.clear()
+    clear_local_cache()
+    yield
+    cache.clear()
+    clear_local_cache()
+
+
 @pytest.fixture
 def fixture_user(db):
     """A user for tenancy/authz tests."""
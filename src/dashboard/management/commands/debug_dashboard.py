@@ -25,12 +25,14 @@ class Command(BaseCommand):
         self.stdout.write(f"\nTesting with tenant_id={tenant_id}")
 
         try:
-            from dashboard.services import get_compliance_kpis
+            from dashboard.services import compute_compliance_kpis
 
-            kpis = get_compliance_kpis(tenant_id)
-            self.stdout.write(self.style.SUCCESS(f"get_compliance_kpis OK: {kpis}"))
+            result = compute_compliance_kpis(tenant_id)
+            self.stdout.write(self.style.SUCCESS(f"compute_compliance_kpis OK: {result.kpis}"))
+            for module, ms in sorted(result.timings_ms.items(), key=lambda i: -i[1]):
+                self.stdout.write(f"  {module:<20} {ms:8.2f} ms")
         except Exception:
-            self.stderr.write("get_compliance_kpis FAILED:")
+            self.stderr.write("compute_compliance_kpis FAILED:")
             self.stderr.write(traceback.format_exc())
 
         try:
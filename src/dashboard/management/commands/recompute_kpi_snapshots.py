@@ -0,0 +1,29 @@
+"""Full recompute of the materialized KPI rollup (TenantKpiSnapshot) for repair."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Recompute TenantKpiSnapshot rows for all (or selected) tenants and families"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tenant", action="append", default=[], help="tenant_id (repeatable)")
+        parser.add_argument("--family", action="append", default=[], help="KPI family (repeatable)")
+
+    def handle(self, *args, **options):
+        from dashboard.models import TenantKpiSnapshot
+        from dashboard.rollup import recompute_all
+        from tenancy.models import Organization
+
+        families = options["family"] or None
+        unknown = set(families or []) - set(TenantKpiSnapshot.Family.values)
+        if unknown:
+            raise CommandError(f"Unknown KPI family: {', '.join(sorted(unknown))}")
+
+        tenant_ids = options["tenant"] or list(
+            Organization.objects.values_list("tenant_id", flat=True)
+        )
+        count = recompute_all(tenant_ids, families)
+        self.stdout.write(
+            self.style.SUCCESS(f"Recomputed {count} KPI snapshots for {len(tenant_ids)} tenants")
+        )
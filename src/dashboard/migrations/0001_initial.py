@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:41
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantKpiSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tenant_id', models.UUIDField(db_index=True)),
+                ('family', models.CharField(choices=[('ex', 'Explosionsschutz'), ('substances', 'Gefahrstoffe'), ('sds_usage', 'SDS-Verwendungen'), ('gbu', 'Gefährdungsbeurteilung'), ('dsb', 'Datenschutz'), ('fire', 'Brandschutz')], max_length=20)),
+                ('values', models.JSONField(default=dict)),
+                ('is_dirty', models.BooleanField(default=False)),
+                ('version', models.PositiveIntegerField(default=0, help_text='Bumped on every dirty mark; guards refresh against lost updates')),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('compute_ms', models.FloatField(default=0.0)),
+            ],
+            options={
+                'db_table': 'dashboard_tenant_kpi_snapshot',
+                'constraints': [models.UniqueConstraint(fields=('tenant_id', 'family'), name='uq_kpi_snapshot_tenant_family')],
+            },
+        ),
+    ]
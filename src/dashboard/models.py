@@ -0,0 +1,51 @@
+"""Dashboard models — materialized KPI rollups."""
+
+from django.db import models
+from django.utils import timezone
+from django_tenancy.managers import TenantManager
+
+
+class TenantKpiSnapshot(models.Model):
+    """Materialized KPI counters of one tenant for one KPI family.
+
+    Refreshed incrementally by outbox consumers (``dashboard.rollup``) and
+    marked dirty by audit events; readers recompute lazily when a row is
+    missing, dirty or from a previous day (date-window counters).
+    """
+
+    class Family(models.TextChoices):
+        EX = "ex", "Explosionsschutz"
+        SUBSTANCES = "substances", "Gefahrstoffe"
+        SDS_USAGE = "sds_usage", "SDS-Verwendungen"
+        GBU = "gbu", "Gefährdungsbeurteilung"
+        DSB = "dsb", "Datenschutz"
+        FIRE = "fire", "Brandschutz"
+
+    tenant_id = models.UUIDField(db_index=True)
+    family = models.CharField(max_length=20, choices=Family.choices)
+    values = models.JSONField(default=dict)
+    is_dirty = models.BooleanField(default=False)
+    version = models.PositiveIntegerField(
+        default=0,
+        help_text="Bumped on every dirty mark; guards refresh against lost updates",
+    )
+    computed_at = models.DateTimeField(default=timezone.now)
+    compute_ms = models.FloatField(default=0.0)
+
+    objects = TenantManager()
+
+    class Meta:
+        db_table = "dashboard_tenant_kpi_snapshot"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant_id", "family"],
+                name="uq_kpi_snapshot_tenant_family",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.tenant_id} {self.family} @ {self.computed_at:%Y-%m-%d %H:%M}"
+
+    @property
+    def is_fresh(self) -> bool:
+        return not self.is_dirty and timezone.localdate(self.computed_at) == timezone.localdate()
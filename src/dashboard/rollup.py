@@ -0,0 +1,200 @@
+"""Materialized per-tenant KPI rollup (TenantKpiSnapshot).
+
+One row per tenant and KPI family. Readers get the counters in O(1).
+Families are recomputed (one aggregation per model) by the outbox
+consumer: ``refresh_for_messages`` runs once per relay batch and
+refreshes each affected (tenant, family) once, however many messages
+the batch carried. Writers never touch snapshot rows; mutations without
+an outbox message of their own enqueue a ``kpi.refresh`` message
+(``request_refresh``).
+
+The read path recomputes only as a fallback, when a row is missing,
+was computed on a previous day (date-window counters) or was left dirty
+by a failed consumer refresh.
+
+``manage.py recompute_kpi_snapshots`` rebuilds all rows for repair.
+"""
+
+import logging
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict
+from datetime import date
+from uuid import UUID
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from dashboard.models import TenantKpiSnapshot
+
+logger = logging.getLogger(__name__)
+
+Family = TenantKpiSnapshot.Family
+
+KPI_REFRESH_TOPIC = "kpi.refresh"
+
+
+def _dashboard_module(name: str) -> Callable[[UUID], dict]:
+    def compute(tenant_id: UUID) -> dict:
+        from dashboard import services
+
+        return services.KPI_MODULES[name](tenant_id, date.today())
+
+    return compute
+
+
+def _gbu(tenant_id: UUID) -> dict:
+    from gbu.services.compliance import compute_compliance_summary
+
+    return asdict(compute_compliance_summary(tenant_id))
+
+
+def _dsb(tenant_id: UUID) -> dict:
+    from dsb.services import compute_dsb_kpis
+
+    return asdict(compute_dsb_kpis(tenant_id))
+
+
+FAMILY_COMPUTERS: dict[str, Callable[[UUID], dict]] = {
+    Family.EX: _dashboard_module("ex"),
+    Family.SUBSTANCES: _dashboard_module("substances"),
+    Family.SDS_USAGE: _dashboard_module("sds_usage"),
+    Family.FIRE: _dashboard_module("fire"),
+    Family.GBU: _gbu,
+    Family.DSB: _dsb,
+}
+
+# Outbox topic / audit resource-type prefixes → affected KPI families.
+_SOURCE_FAMILIES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("explosionsschutz", (Family.EX,)),
+    ("concept.", (Family.EX,)),
+    ("inspection.", (Family.EX,)),
+    ("measure.", (Family.EX,)),
+    ("sds.", (Family.SUBSTANCES, Family.SDS_USAGE)),
+    ("sdsusage", (Family.SDS_USAGE,)),
+    ("global_sds", (Family.SDS_USAGE,)),
+    ("substance", (Family.SUBSTANCES,)),
+    ("gbu", (Family.GBU,)),
+    ("dsb", (Family.DSB,)),
+    ("brandschutz", (Family.FIRE,)),
+    ("fire", (Family.FIRE,)),
+)
+
+
+def families_for(source: str) -> tuple[str, ...]:
+    """KPI families affected by an outbox topic, audit resource type or app label."""
+    source = (source or "").lower()
+    families: list[str] = []
+    for prefix, fams in _SOURCE_FAMILIES:
+        if source.startswith(prefix):
+            families.extend(f for f in fams if f not in families)
+    return tuple(families)
+
+
+def refresh_snapshot(tenant_id: UUID, family: str) -> dict:
+    """Recompute one family for one tenant and persist it. Returns the values."""
+    snapshot = TenantKpiSnapshot.objects.for_tenant(tenant_id).filter(family=family).first()
+    seen_version = snapshot.version if snapshot else 0
+
+    start = time.perf_counter()
+    values = FAMILY_COMPUTERS[family](tenant_id)
+    elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+    fields = {"values": values, "computed_at": timezone.now(), "compute_ms": elapsed_ms}
+
+    if snapshot is None:
+        try:
+            with transaction.atomic():
+                TenantKpiSnapshot.objects.create(tenant_id=tenant_id, family=family, **fields)
+            return values
+        except IntegrityError:
+            pass  # concurrent refresh created the row — fall through to update
+
+    qs = TenantKpiSnapshot.objects.for_tenant(tenant_id).filter(family=family)
+    # Only clear the dirty flag if nobody marked the row dirty while we computed.
+    if not qs.filter(version=seen_version).update(is_dirty=False, **fields):
+        qs.update(**fields)
+    return values
+
+
+def get_family_values(tenant_id: UUID, family: str) -> dict:
+    """O(1) read of a family's counters; recomputes lazily when not fresh."""
+    snapshot = TenantKpiSnapshot.objects.for_tenant(tenant_id).filter(family=family).first()
+    if snapshot is not None and snapshot.is_fresh:
+        return dict(snapshot.values)
+    return refresh_snapshot(tenant_id, family)
+
+
+def mark_snapshots_dirty(tenant_id: UUID | None, families: Iterable[str]) -> int:
+    """Flag families for recompute on the next read (consumer fallback and repair)."""
+    families = list(families)
+    if tenant_id is None or not families:
+        return 0
+    return (
+        TenantKpiSnapshot.objects.for_tenant(tenant_id)
+        .filter(family__in=families)
+        .update(is_dirty=True, version=F("version") + 1)
+    )
+
+
+def request_refresh(tenant_id: UUID | None, families: Iterable[str]) -> bool:
+    """Enqueue a ``kpi.refresh`` outbox message in the writer's transaction.
+
+    An INSERT only — no snapshot row is locked, so concurrent writers of
+    a tenant do not serialize on it.
+    """
+    from outbox.models import OutboxMessage
+
+    families = list(families)
+    if tenant_id is None or not families:
+        return False
+    OutboxMessage.objects.create(
+        tenant_id=tenant_id, topic=KPI_REFRESH_TOPIC, payload={"families": families}
+    )
+    return True
+
+
+def _message_families(msg) -> tuple[str, ...]:
+    if msg.topic == KPI_REFRESH_TOPIC:
+        return tuple(f for f in (msg.payload or {}).get("families", []) if f in FAMILY_COMPUTERS)
+    return families_for(msg.topic)
+
+
+def refresh_for_messages(messages: Iterable) -> list[tuple[UUID, str]]:
+    """Outbox batch consumer: recompute each affected (tenant, family) once.
+
+    A failed recompute leaves the row dirty, so the next read recomputes
+    it. Returns the refreshed pairs.
+    """
+    from dashboard.services import invalidate_compliance_kpis
+
+    pairs: dict[tuple[UUID, str], None] = {}
+    for msg in messages:
+        if msg.tenant_id is not None:
+            pairs.update(dict.fromkeys((msg.tenant_id, f) for f in _message_families(msg)))
+
+    refreshed = []
+    for tenant_id, family in pairs:
+        try:
+            refresh_snapshot(tenant_id, family)
+            refreshed.append((tenant_id, family))
+        except Exception:
+            logger.exception(
+                "[KPI rollup] Refresh failed for tenant=%s family=%s", tenant_id, family
+            )
+            mark_snapshots_dirty(tenant_id, [family])
+    for tenant_id in {tenant_id for tenant_id, _ in pairs}:
+        invalidate_compliance_kpis(tenant_id)
+    logger.debug("[KPI rollup] refreshed %s", refreshed)
+    return refreshed
+
+
+def recompute_all(tenant_ids: Iterable[UUID], families: Iterable[str] | None = None) -> int:
+    """Full recompute (repair). Returns the number of refreshed snapshots."""
+    families = list(families or FAMILY_COMPUTERS)
+    count = 0
+    for tenant_id in tenant_ids:
+        for family in families:
+            refresh_snapshot(tenant_id, family)
+            count += 1
+    return count
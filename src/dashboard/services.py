@@ -1,14 +1,29 @@
-"""Dashboard KPI aggregation service."""
+"""Dashboard KPI aggregation service.
+
+KPIs are computed per module group with one conditional aggregation
+(``Count(filter=Q(...))``) per model, optionally in parallel, and cached
+per tenant. Audit/outbox events invalidate the cache (see
+``common.context.emit_audit_event``). Expensive module groups are
+materialized per tenant in ``TenantKpiSnapshot`` (see ``dashboard.rollup``).
+"""
 
 import logging
-from dataclasses import dataclass
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import date, timedelta
 from uuid import UUID
 
-from django.db.models import Q
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
 
 logger = logging.getLogger(__name__)
 
+KPI_CACHE_KEY = "dashboard:kpis:{tenant_id}"
+KPI_CACHE_TTL = 300  # seconds — events invalidate earlier
+
 
 @dataclass(frozen=True)
 class ComplianceKPI:
@@ -69,19 +84,26 @@ class RecentActivity:
     url: str = ""
 
 
-def _count_site_inventory(tf) -> int:
-    """Count SiteInventoryItem entries safely."""
-    try:
-        from substances.models import SiteInventoryItem
+@dataclass(frozen=True)
+class KpiComputation:
+    """Result of a live KPI computation incl. per-module timings (ms)."""
 
-        return SiteInventoryItem.objects.filter(tf).count()
-    except Exception:
-        return 0
+    kpis: ComplianceKPI
+    timings_ms: dict[str, float] = field(default_factory=dict)
 
+    @property
+    def slowest_module(self) -> str | None:
+        if not self.timings_ms:
+            return None
+        return max(self.timings_ms, key=self.timings_ms.get)
 
-def get_compliance_kpis(tenant_id: UUID) -> ComplianceKPI:
-    """Aggregate all compliance KPIs for a tenant."""
-    from actions.models import ActionItem
+
+# ------------------------------------------------------------------
+# Module aggregations — one conditional aggregate per model
+# ------------------------------------------------------------------
+
+
+def _ex_kpis(tenant_id: UUID, today: date) -> dict[str, int]:
     from explosionsschutz.models import (
         Area,
         Equipment,
@@ -89,83 +111,111 @@ def get_compliance_kpis(tenant_id: UUID) -> ComplianceKPI:
         ProtectionMeasure,
         ZoneDefinition,
     )
-    from notifications.models import Notification
-    from substances.models import SdsRevision, Substance
 
-    today = date.today()
     tf = Q(tenant_id=tenant_id)
+    areas = Area.objects.filter(tf).aggregate(
+        areas_total=Count("id", distinct=True),
+        areas_with_hazard=Count(
+            "id",
+            filter=Q(explosion_concepts__status__in=["approved", "in_review"]),
+            distinct=True,
+        ),
+    )
+    concepts = ExplosionConcept.objects.filter(tf).aggregate(
+        concepts_total=Count("id"),
+        concepts_draft=Count("id", filter=Q(status="draft")),
+        concepts_validated=Count("id", filter=Q(status="validated")),
+        concepts_approved=Count("id", filter=Q(status="approved")),
+    )
+    upcoming = Q(next_inspection_date__gte=today)
+    equipment = Equipment.objects.filter(tf).aggregate(
+        equipment_total=Count("id"),
+        inspections_overdue=Count("id", filter=Q(next_inspection_date__lt=today)),
+        inspections_due_7d=Count(
+            "id", filter=upcoming & Q(next_inspection_date__lte=today + timedelta(days=7))
+        ),
+        inspections_due_30d=Count(
+            "id", filter=upcoming & Q(next_inspection_date__lte=today + timedelta(days=30))
+        ),
+    )
+    return {
+        **areas,
+        **concepts,
+        **equipment,
+        "zones_total": ZoneDefinition.objects.filter(tf).count(),
+        "measures_open": ProtectionMeasure.objects.filter(tf, status="open").count(),
+    }
+
+
+def _substance_kpis(tenant_id: UUID, today: date) -> dict[str, int]:
+    from substances.models import SdsRevision, Substance
 
-    # --- Explosionsschutz ---
-    areas = Area.objects.filter(tf)
-    concepts = ExplosionConcept.objects.filter(tf)
-    equipment = Equipment.objects.filter(tf)
-
-    inspections_overdue = equipment.filter(
-        next_inspection_date__lt=today,
-    ).count()
-    inspections_due_7d = equipment.filter(
-        next_inspection_date__gte=today,
-        next_inspection_date__lte=today + timedelta(days=7),
-    ).count()
-    inspections_due_30d = equipment.filter(
-        next_inspection_date__gte=today,
-        next_inspection_date__lte=today + timedelta(days=30),
-    ).count()
-
-    # --- Gefahrstoffe ---
-    substances = Substance.objects.filter(tf)
-    sds_qs = SdsRevision.objects.filter(tf)
+    tf = Q(tenant_id=tenant_id)
     two_years_ago = today - timedelta(days=730)
+    sds = SdsRevision.objects.filter(tf).aggregate(
+        sds_current=Count(
+            "substance_id", filter=Q(revision_date__gte=two_years_ago), distinct=True
+        ),
+        sds_outdated=Count(
+            "substance_id", filter=Q(revision_date__lt=two_years_ago), distinct=True
+        ),
+    )
+    return {
+        "substances_total": Substance.objects.filter(tf).count(),
+        **sds,
+        "site_inventory_items": _count_site_inventory(tf),
+    }
+
 
-    # --- Risikobewertung ---
+def _count_site_inventory(tf) -> int:
+    """Count SiteInventoryItem entries safely."""
     try:
-        from risk.models import Assessment
+        from substances.models import SiteInventoryItem
 
-        assessments = Assessment.objects.filter(tf)
-        assessments_total = assessments.count()
-        assessments_open = assessments.exclude(status="approved").count()
+        return SiteInventoryItem.objects.filter(tf).count()
     except Exception:
-        assessments_total = 0
-        assessments_open = 0
+        return 0
 
-    actions_qs = ActionItem.objects.filter(tf)
 
-    # --- SDS-Bibliothek (ADR-012) ---
-    sds_review_required = 0
-    sds_update_available = 0
-    sds_active_usages = 0
-    sds_overdue = 0
+def _sds_usage_kpis(tenant_id: UUID, today: date) -> dict[str, int]:
+    """SDS-Bibliothek (ADR-012)."""
     try:
-        from global_sds.sds_usage import (
-            SdsUsage,
-            SdsUsageStatus,
+        from global_sds.sds_usage import SdsUsage, SdsUsageStatus
+
+        pending = [SdsUsageStatus.REVIEW_REQUIRED, SdsUsageStatus.UPDATE_AVAILABLE]
+        return SdsUsage.objects.filter(tenant_id=tenant_id).aggregate(
+            sds_review_required=Count("id", filter=Q(status=SdsUsageStatus.REVIEW_REQUIRED)),
+            sds_update_available=Count("id", filter=Q(status=SdsUsageStatus.UPDATE_AVAILABLE)),
+            sds_active_usages=Count("id", filter=Q(status=SdsUsageStatus.ACTIVE)),
+            sds_overdue=Count("id", filter=Q(review_deadline__lt=today, status__in=pending)),
         )
+    except Exception:
+        return {}
+
 
-        su_qs = SdsUsage.objects.filter(tf)
-        sds_review_required = su_qs.filter(
-            status=SdsUsageStatus.REVIEW_REQUIRED,
-        ).count()
-        sds_update_available = su_qs.filter(
-            status=SdsUsageStatus.UPDATE_AVAILABLE,
-        ).count()
-        sds_active_usages = su_qs.filter(
-            status=SdsUsageStatus.ACTIVE,
-        ).count()
-        sds_overdue = su_qs.filter(
-            review_deadline__lt=today,
-            status__in=[
-                SdsUsageStatus.REVIEW_REQUIRED,
-                SdsUsageStatus.UPDATE_AVAILABLE,
-            ],
-        ).count()
+def _risk_kpis(tenant_id: UUID, today: date) -> dict[str, int]:
+    from actions.models import ActionItem
+
+    tf = Q(tenant_id=tenant_id)
+    try:
+        from risk.models import Assessment
+
+        assessments = Assessment.objects.filter(tf).aggregate(
+            assessments_total=Count("id"),
+            assessments_open=Count("id", filter=~Q(status="approved")),
+        )
     except Exception:
-        pass
+        assessments = {}
+
+    not_completed = ~Q(status="completed")
+    actions = ActionItem.objects.filter(tf).aggregate(
+        actions_open=Count("id", filter=not_completed),
+        actions_overdue=Count("id", filter=not_completed & Q(due_date__lt=today)),
+    )
+    return {**assessments, **actions}
+
 
-    # --- Brandschutz ---
-    fire_concepts_total = 0
-    fire_concepts_active = 0
-    fire_ext_overdue = 0
-    fire_escape_defect = 0
+def _fire_kpis(tenant_id: UUID, today: date) -> dict[str, int]:
     try:
         from brandschutz.models import (
             EscapeRoute,
@@ -173,65 +223,134 @@ def get_compliance_kpis(tenant_id: UUID) -> ComplianceKPI:
             FireProtectionConcept,
         )
 
-        fc_qs = FireProtectionConcept.objects.filter(tf)
-        fire_concepts_total = fc_qs.count()
-        fire_concepts_active = fc_qs.filter(
-            status="active",
-        ).count()
-        fire_ext_overdue = FireExtinguisher.objects.filter(tf, status="overdue").count()
-        fire_escape_defect = EscapeRoute.objects.filter(tf, status="defect").count()
-    except Exception:
-        pass
-
-    # --- Notifications ---
-    notifs = Notification.objects.filter(tf, is_read=False)
-
-    return ComplianceKPI(
-        areas_total=areas.count(),
-        areas_with_hazard=areas.filter(explosion_concepts__status__in=["approved", "in_review"])
-        .distinct()
-        .count(),
-        concepts_total=concepts.count(),
-        concepts_draft=concepts.filter(status="draft").count(),
-        concepts_validated=concepts.filter(status="validated").count(),
-        concepts_approved=concepts.filter(status="approved").count(),
-        zones_total=ZoneDefinition.objects.filter(tf).count(),
-        equipment_total=equipment.count(),
-        inspections_overdue=inspections_overdue,
-        inspections_due_7d=inspections_due_7d,
-        inspections_due_30d=inspections_due_30d,
-        measures_open=ProtectionMeasure.objects.filter(tf, status="open").count(),
-        substances_total=substances.count(),
-        sds_current=sds_qs.filter(revision_date__gte=two_years_ago)
-        .values("substance_id")
-        .distinct()
-        .count(),
-        sds_outdated=sds_qs.filter(revision_date__lt=two_years_ago)
-        .values("substance_id")
-        .distinct()
-        .count(),
-        site_inventory_items=_count_site_inventory(tf),
-        assessments_total=assessments_total,
-        assessments_open=assessments_open,
-        actions_open=actions_qs.exclude(status="completed").count(),
-        actions_overdue=actions_qs.filter(
-            due_date__lt=today,
+        tf = Q(tenant_id=tenant_id)
+        concepts = FireProtectionConcept.objects.filter(tf).aggregate(
+            fire_concepts_total=Count("id"),
+            fire_concepts_active=Count("id", filter=Q(status="active")),
         )
-        .exclude(status="completed")
-        .count(),
-        notifications_unread=notifs.count(),
-        notifications_critical=notifs.filter(severity="critical").count(),
-        sds_review_required=sds_review_required,
-        sds_update_available=sds_update_available,
-        sds_active_usages=sds_active_usages,
-        sds_overdue=sds_overdue,
-        fire_concepts_total=fire_concepts_total,
-        fire_concepts_active=fire_concepts_active,
-        fire_extinguishers_overdue=fire_ext_overdue,
-        fire_escape_routes_defect=fire_escape_defect,
+        return {
+            **concepts,
+            "fire_extinguishers_overdue": FireExtinguisher.objects.filter(
+                tf, status="overdue"
+            ).count(),
+            "fire_escape_routes_defect": EscapeRoute.objects.filter(tf, status="defect").count(),
+        }
+    except Exception:
+        return {}
+
+
+def _notification_kpis(tenant_id: UUID, today: date) -> dict[str, int]:
+    from notifications.models import Notification
+
+    return Notification.objects.filter(tenant_id=tenant_id, is_read=False).aggregate(
+        notifications_unread=Count("id"),
+        notifications_critical=Count("id", filter=Q(severity="critical")),
     )
 
 
+KPI_MODULES: dict[str, Callable[[UUID, date], dict[str, int]]] = {
+    "ex": _ex_kpis,
+    "substances": _substance_kpis,
+    "sds_usage": _sds_usage_kpis,
+    "risk": _risk_kpis,
+    "fire": _fire_kpis,
+    "notifications": _notification_kpis,
+}
+
+# Module groups served from the materialized rollup (dashboard.rollup);
+# the remaining groups are cheap and always computed live.
+ROLLUP_MODULES = ("ex", "substances", "sds_usage", "fire")
+
+
+def _run_module(name: str, tenant_id: UUID, today: date) -> tuple[str, dict, float]:
+    start = time.perf_counter()
+    values = KPI_MODULES[name](tenant_id, today)
+    return name, values, (time.perf_counter() - start) * 1000
+
+
+def _run_module_in_thread(name: str, tenant_id: UUID, today: date) -> tuple[str, dict, float]:
+    """Worker-thread variant: own connection, RLS tenant set, closed afterwards."""
+    from django.db import connection
+
+    from common.context import set_db_tenant
+
+    try:
+        set_db_tenant(tenant_id)
+        return _run_module(name, tenant_id, today)
+    finally:
+        connection.close()
+
+
+# ------------------------------------------------------------------
+# Public API
+# ------------------------------------------------------------------
+
+
+def compute_compliance_kpis(tenant_id: UUID) -> KpiComputation:
+    """Compute all compliance KPIs live (uncached) with per-module timings.
+
+    ``DASHBOARD_KPI_WORKERS`` > 1 runs the module groups concurrently in
+    worker threads (one DB connection each). Default is sequential on the
+    request connection.
+    """
+    today = date.today()
+    workers = getattr(settings, "DASHBOARD_KPI_WORKERS", 1)
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kpi") as pool:
+            futures = [
+                pool.submit(_run_module_in_thread, name, tenant_id, today) for name in KPI_MODULES
+            ]
+            results = [f.result() for f in futures]
+    else:
+        results = [_run_module(name, tenant_id, today) for name in KPI_MODULES]
+
+    values: dict[str, int] = {}
+    timings: dict[str, float] = {}
+    for name, module_values, elapsed_ms in results:
+        values.update(module_values)
+        timings[name] = round(elapsed_ms, 2)
+
+    logger.debug("Compliance KPI timings for tenant %s: %s", tenant_id, timings)
+    return KpiComputation(kpis=ComplianceKPI(**values), timings_ms=timings)
+
+
+def get_compliance_kpis(tenant_id: UUID) -> ComplianceKPI:
+    """Aggregate all compliance KPIs for a tenant (cached per tenant).
+
+    Module groups in ``ROLLUP_MODULES`` are read from ``TenantKpiSnapshot``;
+    the rest is aggregated live.
+    """
+    if tenant_id is None:
+        return compute_compliance_kpis(tenant_id).kpis
+
+    key = KPI_CACHE_KEY.format(tenant_id=tenant_id)
+    cached = cache.get(key)
+    if cached is not None:
+        return ComplianceKPI(**cached)
+
+    from dashboard.rollup import get_family_values
+
+    today = date.today()
+    values: dict[str, int] = {}
+    for name, compute in KPI_MODULES.items():
+        if name in ROLLUP_MODULES:
+            values.update(get_family_values(tenant_id, name))
+        else:
+            values.update(compute(tenant_id, today))
+    kpis = ComplianceKPI(
+        **{k: v for k, v in values.items() if k in ComplianceKPI.__dataclass_fields__}
+    )
+    cache.set(key, asdict(kpis), getattr(settings, "DASHBOARD_KPI_CACHE_TTL", KPI_CACHE_TTL))
+    return kpis
+
+
+def invalidate_compliance_kpis(tenant_id: UUID | None) -> None:
+    """Drop the cached KPIs of a tenant (called on audit/outbox events)."""
+    if tenant_id is not None:
+        cache.delete(KPI_CACHE_KEY.format(tenant_id=tenant_id))
+
+
 def get_recent_activities(
     tenant_id: UUID,
     limit: int = 10,
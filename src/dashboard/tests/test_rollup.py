@@ -0,0 +1,195 @@
+"""Tests für dashboard/rollup.py — materialisierter KPI-Rollup."""
+
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from dashboard.models import TenantKpiSnapshot
+from dashboard.rollup import (
+    KPI_REFRESH_TOPIC,
+    families_for,
+    get_family_values,
+    mark_snapshots_dirty,
+    refresh_for_messages,
+    refresh_snapshot,
+)
+
+Family = TenantKpiSnapshot.Family
+
+
+@pytest.fixture
+def tenant_id():
+    return uuid.uuid4()
+
+
+def _mandate(tenant_id, status="active"):
+    from datetime import date
+
+    from dsb.models import Mandate
+
+    return Mandate.objects.create(
+        tenant_id=tenant_id,
+        name="Musterfirma",
+        dsb_appointed_date=date.today(),
+        status=status,
+    )
+
+
+class TestFamiliesFor:
+    def test_should_map_topics_to_families(self):
+        assert families_for("concept.status_changed") == (Family.EX,)
+        assert families_for("inspection.overdue") == (Family.EX,)
+        assert families_for("sds.expiring") == (Family.SUBSTANCES, Family.SDS_USAGE)
+
+    def test_should_map_audit_resource_types(self):
+        assert families_for("gbu.HazardAssessmentActivity") == (Family.GBU,)
+        assert families_for("SdsUsage") == (Family.SDS_USAGE,)
+
+    def test_should_ignore_unrelated_sources(self):
+        assert families_for("risk.assessment.created") == ()
+        assert families_for("") == ()
+
+
+@pytest.mark.django_db
+class TestSnapshotLifecycle:
+    def test_should_create_snapshot_on_first_read(self, tenant_id):
+        _mandate(tenant_id)
+        values = get_family_values(tenant_id, Family.DSB)
+
+        assert values["mandates_total"] == 1
+        snap = TenantKpiSnapshot.objects.get(tenant_id=tenant_id, family=Family.DSB)
+        assert snap.is_fresh
+
+    def test_should_read_fresh_snapshot_in_one_query(self, tenant_id, django_assert_num_queries):
+        refresh_snapshot(tenant_id, Family.DSB)
+        with django_assert_num_queries(1):
+            get_family_values(tenant_id, Family.DSB)
+
+    def test_should_recompute_dirty_snapshot(self, tenant_id):
+        refresh_snapshot(tenant_id, Family.DSB)
+        _mandate(tenant_id)
+        assert get_family_values(tenant_id, Family.DSB)["mandates_total"] == 0
+
+        assert mark_snapshots_dirty(tenant_id, [Family.DSB]) == 1
+        assert get_family_values(tenant_id, Family.DSB)["mandates_total"] == 1
+
+    def test_should_recompute_snapshot_from_previous_day(self, tenant_id):
+        refresh_snapshot(tenant_id, Family.DSB)
+        TenantKpiSnapshot.objects.filter(tenant_id=tenant_id).update(
+            computed_at=timezone.now() - timedelta(days=1)
+        )
+        _mandate(tenant_id)
+        assert get_family_values(tenant_id, Family.DSB)["mandates_total"] == 1
+
+    def test_should_keep_dirty_when_marked_during_refresh(self, tenant_id, monkeypatch):
+        from dashboard import rollup
+
+        refresh_snapshot(tenant_id, Family.GBU)
+        mark_snapshots_dirty(tenant_id, [Family.GBU])
+
+        original = rollup.FAMILY_COMPUTERS[Family.GBU]
+
+        def racing_compute(tid):
+            mark_snapshots_dirty(tid, [Family.GBU])
+            return original(tid)
+
+        monkeypatch.setitem(rollup.FAMILY_COMPUTERS, Family.GBU, racing_compute)
+        refresh_snapshot(tenant_id, Family.GBU)
+
+        assert TenantKpiSnapshot.objects.get(tenant_id=tenant_id, family=Family.GBU).is_dirty
+
+
+@pytest.mark.django_db
+class TestOutboxRefresh:
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        """Record EX recomputes per tenant."""
+        from dashboard import rollup
+
+        calls = []
+        compute = rollup.FAMILY_COMPUTERS[Family.EX]
+        monkeypatch.setitem(
+            rollup.FAMILY_COMPUTERS, Family.EX, lambda tid: calls.append(tid) or compute(tid)
+        )
+        return calls
+
+    def test_should_recompute_once_per_relay_batch(self, tenant_id, calls):
+        from outbox.models import OutboxMessage
+        from outbox.relay import drain
+
+        refresh_snapshot(tenant_id, Family.EX)
+        calls.clear()
+        OutboxMessage.objects.bulk_create(
+            OutboxMessage(tenant_id=tenant_id, topic="inspection.overdue", payload={})
+            for _ in range(20)
+        )
+
+        drain(batch_size=50, concurrency=1)
+
+        assert calls == [tenant_id]
+        assert TenantKpiSnapshot.objects.get(tenant_id=tenant_id, family=Family.EX).is_fresh
+        get_family_values(tenant_id, Family.EX)
+        assert calls == [tenant_id]
+
+    def test_should_not_touch_snapshots_in_writer_transaction(self, tenant_id):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from common.context import emit_audit_event, emit_outbox_event
+
+        refresh_snapshot(tenant_id, Family.EX)
+        with CaptureQueriesContext(connection) as ctx:
+            emit_outbox_event(
+                topic="inspection.overdue", aggregate_type="Inspection", tenant_id=tenant_id
+            )
+            emit_audit_event(tenant_id=tenant_id, entity_type="explosionsschutz.Concept")
+
+        assert not any(TenantKpiSnapshot._meta.db_table in q["sql"] for q in ctx.captured_queries)
+        snapshot = TenantKpiSnapshot.objects.get(tenant_id=tenant_id, family=Family.EX)
+        assert (snapshot.is_dirty, snapshot.version) == (False, 0)
+
+    def test_should_refresh_via_delete_helper(self, tenant_id):
+        from common.services import delete_object
+        from outbox.models import OutboxMessage
+        from outbox.relay import drain
+
+        mandate = _mandate(tenant_id)
+        assert refresh_snapshot(tenant_id, Family.DSB)["mandates_total"] == 1
+        delete_object(mandate)
+
+        message = OutboxMessage.objects.get(tenant_id=tenant_id, topic=KPI_REFRESH_TOPIC)
+        assert message.payload == {"families": [Family.DSB]}
+        drain(batch_size=10)
+        snapshot = TenantKpiSnapshot.objects.get(tenant_id=tenant_id, family=Family.DSB)
+        assert snapshot.values["mandates_total"] == 0
+
+    def test_should_leave_row_dirty_when_refresh_fails(self, tenant_id, monkeypatch):
+        from dashboard import rollup
+        from outbox.models import OutboxMessage
+
+        refresh_snapshot(tenant_id, Family.GBU)
+
+        def failing(tid):
+            raise RuntimeError("db down")
+
+        monkeypatch.setitem(rollup.FAMILY_COMPUTERS, Family.GBU, failing)
+        message = OutboxMessage(tenant_id=tenant_id, topic="gbu.activity_changed", payload={})
+
+        assert refresh_for_messages([message]) == []
+        assert TenantKpiSnapshot.objects.get(tenant_id=tenant_id, family=Family.GBU).is_dirty
+
+
+@pytest.mark.django_db
+class TestRecomputeCommand:
+    def test_should_recompute_selected_tenant(self, tenant_id):
+        call_command("recompute_kpi_snapshots", tenant=[str(tenant_id)])
+        assert TenantKpiSnapshot.objects.filter(tenant_id=tenant_id).count() == len(Family)
+
+    def test_should_reject_unknown_family(self, tenant_id):
+        from django.core.management.base import CommandError
+
+        with pytest.raises(CommandError, match="Unknown KPI family"):
+            call_command("recompute_kpi_snapshots", tenant=[str(tenant_id)], family=["nope"])
@@ -0,0 +1,118 @@
+"""Tests für dashboard/services.py — KPI-Engine + Cache."""
+
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from django.core.cache import cache
+
+from dashboard.services import (
+    KPI_MODULES,
+    ComplianceKPI,
+    compute_compliance_kpis,
+    get_compliance_kpis,
+    invalidate_compliance_kpis,
+)
+from notifications.models import Notification
+
+
+@pytest.fixture
+def tenant_id():
+    tid = uuid.uuid4()
+    yield tid
+    invalidate_compliance_kpis(tid)
+
+
+def _notify(tenant_id, severity=Notification.Severity.INFO, is_read=False):
+    return Notification.objects.create(
+        tenant_id=tenant_id,
+        category=Notification.Category.SYSTEM,
+        severity=severity,
+        title="Test",
+        is_read=is_read,
+    )
+
+
+@pytest.mark.django_db
+class TestComputeComplianceKpis:
+    def test_should_return_zeroes_for_empty_tenant(self, tenant_id):
+        result = compute_compliance_kpis(tenant_id)
+        assert result.kpis == ComplianceKPI()
+
+    def test_should_report_timing_per_module(self, tenant_id):
+        result = compute_compliance_kpis(tenant_id)
+        assert set(result.timings_ms) == set(KPI_MODULES)
+        assert result.slowest_module in KPI_MODULES
+
+    def test_should_count_with_conditional_filters(self, tenant_id):
+        _notify(tenant_id)
+        _notify(tenant_id, severity=Notification.Severity.CRITICAL)
+        _notify(tenant_id, severity=Notification.Severity.CRITICAL, is_read=True)
+        _notify(uuid.uuid4())
+
+        kpis = compute_compliance_kpis(tenant_id).kpis
+        assert kpis.notifications_unread == 2
+        assert kpis.notifications_critical == 1
+
+    def test_should_bucket_actions_by_due_date(self, tenant_id):
+        from actions.models import ActionItem
+
+        yesterday = date.today() - timedelta(days=1)
+        ActionItem.objects.create(tenant_id=tenant_id, title="A", due_date=yesterday)
+        ActionItem.objects.create(tenant_id=tenant_id, title="B")
+        ActionItem.objects.create(
+            tenant_id=tenant_id, title="C", due_date=yesterday, status="completed"
+        )
+
+        kpis = compute_compliance_kpis(tenant_id).kpis
+        assert kpis.actions_open == 2
+        assert kpis.actions_overdue == 1
+
+    def test_should_use_one_query_per_model(self, tenant_id, django_assert_max_num_queries):
+        with django_assert_max_num_queries(16):
+            compute_compliance_kpis(tenant_id)
+
+
+@pytest.mark.django_db
+class TestGetComplianceKpisCache:
+    def test_should_serve_second_call_from_cache(self, tenant_id, django_assert_num_queries):
+        get_compliance_kpis(tenant_id)
+        with django_assert_num_queries(0):
+            get_compliance_kpis(tenant_id)
+
+    def test_should_recompute_after_invalidation(self, tenant_id):
+        assert get_compliance_kpis(tenant_id).notifications_unread == 0
+        _notify(tenant_id)
+        assert get_compliance_kpis(tenant_id).notifications_unread == 0
+
+        invalidate_compliance_kpis(tenant_id)
+        assert get_compliance_kpis(tenant_id).notifications_unread == 1
+
+    def test_should_invalidate_on_audit_event_commit(
+        self, tenant_id, django_capture_on_commit_callbacks
+    ):
+        from common.context import clear_context, emit_audit_event, set_request_id
+
+        get_compliance_kpis(tenant_id)
+        set_request_id()
+        try:
+            with django_capture_on_commit_callbacks(execute=True):
+                emit_audit_event(tenant_id=tenant_id, category="test", action="created")
+        finally:
+            clear_context()
+
+        assert cache.get(f"dashboard:kpis:{tenant_id}") is None
+
+    def test_should_invalidate_on_create_notification(self, tenant_id):
+        from notifications.services import create_notification
+
+        get_compliance_kpis(tenant_id)
+        create_notification(
+            tenant_id=tenant_id,
+            category=Notification.Category.SYSTEM,
+            title="Neu",
+        )
+        assert get_compliance_kpis(tenant_id).notifications_unread == 1
+
+    def test_should_not_cache_without_tenant(self):
+        assert get_compliance_kpis(None) == ComplianceKPI()
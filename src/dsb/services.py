@@ -148,7 +148,36 @@ def get_cmr_dsfa_hints(tenant_id: UUID) -> list[dict]:
 
 
 def get_dsb_kpis(tenant_id: UUID) -> DsbKPI:
-    """Aggregate all DSB KPIs for a tenant."""
+    """DSB KPIs for a tenant, read from the materialized rollup.
+
+    ``breaches_overdue`` depends on the 72h deadline (not on data changes)
+    and is therefore always counted live.
+    """
+    from dashboard.models import TenantKpiSnapshot
+    from dashboard.rollup import get_family_values
+
+    values = get_family_values(tenant_id, TenantKpiSnapshot.Family.DSB)
+    values["breaches_overdue"] = _count_overdue_breaches(tenant_id)
+    return DsbKPI(**{k: v for k, v in values.items() if k in DsbKPI.__dataclass_fields__})
+
+
+def _count_overdue_breaches(tenant_id: UUID) -> int:
+    """Breaches past the 72h deadline without authority report (Art. 33)."""
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from dsb.models import Breach
+
+    return Breach.objects.filter(
+        tenant_id=tenant_id,
+        reported_to_authority_at__isnull=True,
+        discovered_at__lt=timezone.now() - timedelta(hours=72),
+    ).count()
+
+
+def compute_dsb_kpis(tenant_id: UUID) -> DsbKPI:
+    """Aggregate all DSB KPIs for a tenant (live, uncached)."""
     from dsb.models import (
         Breach,
         DataProcessingAgreement,
@@ -202,7 +231,7 @@ def get_dsb_kpis(tenant_id: UUID) -> DsbKPI:
     breaches_open = breaches.filter(
         reported_to_authority_at__isnull=True,
     ).count()
-    breaches_overdue = sum(1 for b in breaches if b.is_overdue)
+    breaches_overdue = _count_overdue_breaches(tenant_id)
 
     return DsbKPI(
         mandates_active=mandates_active,
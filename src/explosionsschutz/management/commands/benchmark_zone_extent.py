@@ -0,0 +1,108 @@
+# explosionsschutz/management/commands/benchmark_zone_extent.py
+"""
+Management Command: Misst die TRGS-721-Zonenberechnung (Einzel- vs. Batch-Aufruf).
+
+Berechnet ein Raster zufälliger Szenarien einmal mit ``calculate_zone_extent``
+je Szenario und einmal mit ``calculate_zone_extent_batch`` (Schleife und, falls
+installiert, NumPy) und prüft, dass alle Ergebnisse identisch sind.
+
+Usage:
+    python manage.py benchmark_zone_extent
+    python manage.py benchmark_zone_extent --scenarios 100000 --iterations 5
+"""
+
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from riskfw.constants import SAFETY_FACTORS
+from riskfw.zones.calculator import (
+    NUMPY_AVAILABLE,
+    calculate_zone_extent,
+    calculate_zone_extent_batch,
+)
+
+
+class Command(BaseCommand):
+    """Benchmark für riskfw.zones.calculate_zone_extent_batch."""
+
+    help = "Misst die Zonenberechnung nach TRGS 721 (Einzelaufrufe vs. Batch)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenarios",
+            type=int,
+            default=10_000,
+            help="Anzahl Szenarien",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=3,
+            help="Wiederholungen je Variante",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=721,
+            help="Startwert für die Zufallsszenarien",
+        )
+
+    def handle(self, *args, **options):
+        size = max(options["scenarios"], 1)
+        iterations = max(options["iterations"], 1)
+        columns = self._scenarios(size, options["seed"])
+        scenarios = [
+            dict(zip(columns, values, strict=True))
+            for values in zip(*columns.values(), strict=True)
+        ]
+
+        expected = [calculate_zone_extent(**scenario) for scenario in scenarios]
+        backends = [False, True] if NUMPY_AVAILABLE else [False]
+        if not NUMPY_AVAILABLE:
+            self.stdout.write(self.style.WARNING("NumPy nicht installiert – nur Schleifenvariante"))
+        for use_numpy in backends:
+            batch = calculate_zone_extent_batch(**columns, use_numpy=use_numpy)
+            if batch.results() != expected:
+                raise CommandError(f"Batch (numpy={use_numpy}) weicht von calculate_zone_extent ab")
+
+        single = self._time(lambda: [calculate_zone_extent(**s) for s in scenarios], iterations)
+        self._report("Einzelaufrufe", size, single, single)
+        for use_numpy in backends:
+            seconds = self._time(
+                lambda use_numpy=use_numpy: calculate_zone_extent_batch(
+                    **columns, use_numpy=use_numpy
+                ),
+                iterations,
+            )
+            self._report(f"Batch ({'NumPy' if use_numpy else 'Schleife'})", size, seconds, single)
+        self.stdout.write(self.style.SUCCESS("Ergebnisse identisch mit calculate_zone_extent"))
+
+    def _report(self, label: str, size: int, seconds: float, baseline: float) -> None:
+        self.stdout.write(
+            f"  {label:<18} {size:>9} Szenarien  {seconds * 1000:10.2f} ms  "
+            f"(Faktor {baseline / seconds:6.1f})"
+        )
+
+    @staticmethod
+    def _scenarios(size: int, seed: int) -> dict[str, list]:
+        """Zufällige Spalten über alle Zonenschwellen und Freisetzungsarten."""
+        rng = random.Random(seed)
+        return {
+            "release_rate_kg_s": [rng.uniform(0.0, 2.0) for _ in range(size)],
+            "ventilation_rate_m3_s": [
+                rng.choice((0.0, 0.1, 1.0, 10.0, 100.0)) for _ in range(size)
+            ],
+            "release_type": [rng.choice(list(SAFETY_FACTORS)) for _ in range(size)],
+            "lel_percent": [rng.uniform(0.5, 15.0) for _ in range(size)],
+            "room_volume_m3": [rng.choice((None, 50.0, 500.0)) for _ in range(size)],
+        }
+
+    @staticmethod
+    def _time(run, iterations: int) -> float:
+        """Mittlere Laufzeit von ``run`` in Sekunden."""
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        return (time.perf_counter() - start) / iterations
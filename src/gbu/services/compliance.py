@@ -5,7 +5,8 @@ Funktionen:
   list_due_reviews()       — Tätigkeiten mit fälligem Review (today + warning_days)
   list_overdue_reviews()   — Tätigkeiten mit überfälligem Review
   mark_outdated_activities() — Setzt status=OUTDATED für überfällige APPROVED-Einträge
-  compliance_summary()     — Tenant-Übersicht für Dashboard
+  compliance_summary()     — Tenant-Übersicht für Dashboard (aus KPI-Rollup)
+  compute_compliance_summary() — Live-Berechnung (Rollup-Refresh)
 """
 
 import logging
@@ -90,35 +91,36 @@ def mark_outdated_activities(tenant_id: UUID) -> int:
 
     Returns: Anzahl der aktualisierten Einträge
     """
-    from common.context import emit_audit_event
+    from common.context import buffered_audit_events, emit_audit_event
     from gbu.models.activity import ActivityStatus, HazardAssessmentActivity
 
-    overdue = list(
-        HazardAssessmentActivity.objects.select_for_update(skip_locked=True).filter(
-            tenant_id=tenant_id,
-            status=ActivityStatus.APPROVED,
-            next_review_date__lt=date.today(),
+    with buffered_audit_events():
+        overdue = list(
+            HazardAssessmentActivity.objects.select_for_update(skip_locked=True).filter(
+                tenant_id=tenant_id,
+                status=ActivityStatus.APPROVED,
+                next_review_date__lt=date.today(),
+            )
         )
-    )
-
-    count = 0
-    for activity in overdue:
-        activity.status = ActivityStatus.OUTDATED
-        activity.save(update_fields=["status", "updated_at"])
-
-        emit_audit_event(
-            tenant_id=tenant_id,
-            category="compliance",
-            action="outdated",
-            entity_type="gbu.HazardAssessmentActivity",
-            entity_id=activity.id,
-            payload={
-                "next_review_date": str(activity.next_review_date),
-                "marked_outdated_at": timezone.now().isoformat(),
-            },
-            user_id=None,
+        now = timezone.now()
+        HazardAssessmentActivity.objects.filter(pk__in=[a.pk for a in overdue]).update(
+            status=ActivityStatus.OUTDATED, updated_at=now
         )
-        count += 1
+
+        for activity in overdue:
+            emit_audit_event(
+                tenant_id=tenant_id,
+                category="compliance",
+                action="outdated",
+                entity_type="gbu.HazardAssessmentActivity",
+                entity_id=activity.id,
+                payload={
+                    "next_review_date": str(activity.next_review_date),
+                    "marked_outdated_at": now.isoformat(),
+                },
+                user_id=None,
+            )
+    count = len(overdue)
 
     if count:
         logger.info(
@@ -132,30 +134,38 @@ def mark_outdated_activities(tenant_id: UUID) -> int:
 def compliance_summary(tenant_id: UUID) -> ComplianceSummary:
     """
     Kompakte Compliance-Kennzahlen f\u00fcr den Dashboard-Header.
+
+    Liest aus dem materialisierten KPI-Rollup (dashboard.TenantKpiSnapshot).
+    """
+    from dashboard.models import TenantKpiSnapshot
+    from dashboard.rollup import get_family_values
+
+    values = get_family_values(tenant_id, TenantKpiSnapshot.Family.GBU)
+    return ComplianceSummary(
+        **{f: values.get(f, 0) for f in ComplianceSummary.__dataclass_fields__}
+    )
+
+
+def compute_compliance_summary(tenant_id: UUID) -> ComplianceSummary:
     """
+    Live-Berechnung der Compliance-Kennzahlen (eine Aggregation).
+    """
+    from django.db.models import Count, Q
+
     from gbu.models.activity import ActivityStatus, HazardAssessmentActivity
 
-    qs = HazardAssessmentActivity.objects.filter(tenant_id=tenant_id)
     today = date.today()
     deadline = today + timedelta(days=_WARNING_DAYS)
-
-    total_approved = qs.filter(status=ActivityStatus.APPROVED).count()
-    overdue = qs.filter(
-        status=ActivityStatus.APPROVED,
-        next_review_date__lt=today,
-    ).count()
-    due_soon = qs.filter(
-        status=ActivityStatus.APPROVED,
-        next_review_date__gte=today,
-        next_review_date__lte=deadline,
-    ).count()
-    outdated = qs.filter(status=ActivityStatus.OUTDATED).count()
-    draft_count = qs.filter(status=ActivityStatus.DRAFT).count()
-
-    return ComplianceSummary(
-        total_approved=total_approved,
-        due_soon=due_soon,
-        overdue=overdue,
-        outdated=outdated,
-        draft_count=draft_count,
+    approved = Q(status=ActivityStatus.APPROVED)
+
+    counts = HazardAssessmentActivity.objects.filter(tenant_id=tenant_id).aggregate(
+        total_approved=Count("id", filter=approved),
+        overdue=Count("id", filter=approved & Q(next_review_date__lt=today)),
+        due_soon=Count(
+            "id",
+            filter=approved & Q(next_review_date__gte=today, next_review_date__lte=deadline),
+        ),
+        outdated=Count("id", filter=Q(status=ActivityStatus.OUTDATED)),
+        draft_count=Count("id", filter=Q(status=ActivityStatus.DRAFT)),
     )
+    return ComplianceSummary(**counts)
@@ -85,13 +85,28 @@ class RevisionEditForm(forms.ModelForm):
         }
 
 
+class MultipleFileInput(forms.FileInput):
+    allow_multiple_selected = True
+
+
+class MultipleFileField(forms.FileField):
+    """FileField für mehrere Dateien — ``cleaned_data`` ist eine Liste."""
+
+    def clean(self, data, initial=None):
+        single_file_clean = super().clean
+        files = [f for f in (data if isinstance(data, list | tuple) else [data]) if f]
+        if not files and self.required:
+            raise forms.ValidationError(self.error_messages["required"], code="required")
+        return [single_file_clean(f, initial) for f in files]
+
+
 class GlobalSdsUploadForm(forms.Form):
-    """SDS-PDF Upload in die globale Pipeline."""
+    """SDS-PDF Upload in die globale Pipeline (eine oder mehrere Dateien)."""
 
-    pdf_file = forms.FileField(
-        label="SDS-Datei (PDF)",
-        help_text="Sicherheitsdatenblatt als PDF-Datei",
-        widget=forms.FileInput(
+    pdf_file = MultipleFileField(
+        label="SDS-Dateien (PDF)",
+        help_text="Sicherheitsdatenblätter als PDF-Dateien (Mehrfachauswahl möglich)",
+        widget=MultipleFileInput(
             attrs={"class": "form-input", "accept": ".pdf"},
         ),
     )
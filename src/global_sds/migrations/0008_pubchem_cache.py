@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('global_sds', '0007_add_raw_data_jsonfield'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PubChemCompound',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cid', models.PositiveBigIntegerField(unique=True)),
+                ('properties', models.JSONField(blank=True, default=dict)),
+                ('ghs', models.JSONField(blank=True, default=dict)),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'PubChem-Verbindung',
+                'verbose_name_plural': 'PubChem-Verbindungen',
+                'db_table': 'global_sds_pubchem_compound',
+            },
+        ),
+        migrations.CreateModel(
+            name='PubChemIdentifier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('identifier', models.CharField(help_text='Normalisierter Bezeichner (getrimmt, kleingeschrieben)', max_length=512, unique=True)),
+                ('cid', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'PubChem-Bezeichner',
+                'verbose_name_plural': 'PubChem-Bezeichner',
+                'db_table': 'global_sds_pubchem_identifier',
+            },
+        ),
+    ]
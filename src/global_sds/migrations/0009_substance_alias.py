@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:50
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# Trigram index for the alias matching in SdsIdentityResolver
+# (``lower(name) % term`` / ``ORDER BY lower(name) <-> term``).
+ALIAS_TRGM_SQL = """
+CREATE INDEX global_sds_substance_alias_trgm ON global_sds_substance_alias
+USING gin (lower(name) gin_trgm_ops);
+"""
+
+
+def backfill_aliases(apps, schema_editor):
+    """Aliase aus name/synonyms der bestehenden Substanzen anlegen."""
+    GlobalSubstance = apps.get_model("global_sds", "GlobalSubstance")
+    GlobalSubstanceAlias = apps.get_model("global_sds", "GlobalSubstanceAlias")
+
+    batch = []
+    for substance in GlobalSubstance.objects.only("pk", "name", "synonyms").iterator():
+        seen = set()
+        candidates = [(substance.name, "name")] + [
+            (synonym, "synonym") for synonym in substance.synonyms or []
+        ]
+        for raw, kind in candidates:
+            name = " ".join(str(raw or "").split())[:512]
+            if name and name.lower() not in seen:
+                seen.add(name.lower())
+                batch.append(GlobalSubstanceAlias(substance_id=substance.pk, name=name, kind=kind))
+        if len(batch) >= 1000:
+            GlobalSubstanceAlias.objects.bulk_create(batch)
+            batch = []
+    GlobalSubstanceAlias.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('global_sds', '0008_pubchem_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GlobalSubstanceAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=512)),
+                ('kind', models.CharField(choices=[('name', 'Name'), ('synonym', 'Synonym')], default='synonym', max_length=10)),
+                ('substance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='global_sds.globalsubstance')),
+            ],
+            options={
+                'verbose_name': 'Substanz-Alias',
+                'verbose_name_plural': 'Substanz-Aliase',
+                'db_table': 'global_sds_substance_alias',
+                'indexes': [models.Index(django.db.models.functions.text.Lower('name'), name='ix_substance_alias_lower')],
+                'constraints': [models.UniqueConstraint(fields=('substance', 'name'), name='uq_substance_alias_name')],
+            },
+        ),
+        migrations.RunSQL(ALIAS_TRGM_SQL, "DROP INDEX IF EXISTS global_sds_substance_alias_trgm;"),
+        migrations.RunPython(backfill_aliases, migrations.RunPython.noop),
+    ]
@@ -11,6 +11,7 @@ import uuid
 
 from django.db import models
 from django.db.models import Q
+from django.db.models.functions import Lower
 
 from global_sds.querysets import SdsRevisionQuerySet
 
@@ -112,11 +113,80 @@ class GlobalSubstance(models.Model):
     def save(self, *args, **kwargs):
         self.cas_number_normalized = _normalize_cas(self.cas_number)
         super().save(*args, **kwargs)
+        self.sync_aliases()
 
     def __str__(self):
         cas = f" (CAS {self.cas_number})" if self.cas_number else ""
         return f"{self.name}{cas}"
 
+    def alias_names(self) -> dict[str, str]:
+        """``{Name: Art}`` aus name und synonyms (ohne Groß/Klein-Dubletten)."""
+        names: dict[str, str] = {}
+        seen: set[str] = set()
+        candidates = [(self.name, GlobalSubstanceAlias.Kind.NAME)] + [
+            (synonym, GlobalSubstanceAlias.Kind.SYNONYM) for synonym in self.synonyms or []
+        ]
+        for raw, kind in candidates:
+            name = " ".join(str(raw or "").split())[:512]
+            if name and name.lower() not in seen:
+                seen.add(name.lower())
+                names[name] = kind
+        return names
+
+    def sync_aliases(self) -> None:
+        """GlobalSubstanceAlias-Zeilen an name/synonyms angleichen."""
+        wanted = self.alias_names()
+        current = dict(self.aliases.values_list("name", "kind"))
+        if current == wanted:
+            return
+        self.aliases.all().delete()
+        GlobalSubstanceAlias.objects.bulk_create(
+            GlobalSubstanceAlias(substance=self, name=name, kind=kind)
+            for name, kind in wanted.items()
+        )
+
+
+class GlobalSubstanceAlias(models.Model):
+    """
+    Name oder Synonym einer GlobalSubstance — Suchindex der Identitätsauflösung.
+
+    Wird von ``GlobalSubstance.save()`` gepflegt. Auf ``lower(name)`` liegen
+    ein B-Tree- und ein GIN-Trigramm-Index (gin_trgm_ops, Migration 0009).
+    """
+
+    class Kind(models.TextChoices):
+        NAME = "name", "Name"
+        SYNONYM = "synonym", "Synonym"
+
+    substance = models.ForeignKey(
+        GlobalSubstance,
+        on_delete=models.CASCADE,
+        related_name="aliases",
+    )
+    name = models.CharField(max_length=512)
+    kind = models.CharField(
+        max_length=10,
+        choices=Kind.choices,
+        default=Kind.SYNONYM,
+    )
+
+    class Meta:
+        db_table = "global_sds_substance_alias"
+        verbose_name = "Substanz-Alias"
+        verbose_name_plural = "Substanz-Aliase"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["substance", "name"],
+                name="uq_substance_alias_name",
+            ),
+        ]
+        indexes = [
+            models.Index(Lower("name"), name="ix_substance_alias_lower"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} → {self.substance_id}"
+
 
 # ─────────────────────────────────────────────────────────────────────
 # SDS REVISION — Versioniertes Sicherheitsdatenblatt
@@ -346,7 +416,7 @@ class GlobalSdsRevision(models.Model):
         """
         import contextlib
         from datetime import date
-        from decimal import Decimal, InvalidOperation
+        from decimal import Decimal
 
         source = data if data is not None else (self.raw_data or {})
         updated: list[str] = []
@@ -771,3 +841,50 @@ class SdsRevisionProperty(models.Model):
 
     def __str__(self):
         return f"{self.definition.key}: {self.value_numeric_lo or self.value_text}"
+
+
+# ─────────────────────────────────────────────────────────────────────
+# PUBCHEM CACHE — Persistenter Cache für PubChemClient (ADR-169)
+# ─────────────────────────────────────────────────────────────────────
+
+
+class PubChemIdentifier(models.Model):
+    """
+    Aufgelöster PubChem-Bezeichner: CAS-Nummer/Name → CID.
+
+    ``cid=None`` ist ein negativer Eintrag (PubChem kennt den Bezeichner
+    nicht) und gilt kürzer als positive Einträge (PUBCHEM_NEGATIVE_CACHE_DAYS).
+    """
+
+    identifier = models.CharField(
+        max_length=512,
+        unique=True,
+        help_text="Normalisierter Bezeichner (getrimmt, kleingeschrieben)",
+    )
+    cid = models.PositiveBigIntegerField(null=True, blank=True)
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "global_sds_pubchem_identifier"
+        verbose_name = "PubChem-Bezeichner"
+        verbose_name_plural = "PubChem-Bezeichner"
+
+    def __str__(self):
+        return f"{self.identifier} → {self.cid or '—'}"
+
+
+class PubChemCompound(models.Model):
+    """PubChem-Daten je CID: Eigenschaften (Property-Tabelle) und GHS-Klassifizierung."""
+
+    cid = models.PositiveBigIntegerField(unique=True)
+    properties = models.JSONField(default=dict, blank=True)
+    ghs = models.JSONField(default=dict, blank=True)
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "global_sds_pubchem_compound"
+        verbose_name = "PubChem-Verbindung"
+        verbose_name_plural = "PubChem-Verbindungen"
+
+    def __str__(self):
+        return f"CID {self.cid} {self.properties.get('MolecularFormula', '')}".strip()
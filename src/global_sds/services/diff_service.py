@@ -3,7 +3,9 @@
 SdsRevisionDiffService — Feldvergleich + Impact-Klassifizierung (ADR-012 §6).
 
 Vergleicht zwei Revisionen, klassifiziert Änderungen und
-persistiert den Diff als SdsRevisionDiffRecord.
+persistiert den Diff als SdsRevisionDiffRecord. ``compute_diffs`` /
+``persist_diffs`` verarbeiten viele Revisionspaare auf einmal (z.B. eine
+komplette Produktlinie eines Herstellers).
 """
 
 import logging
@@ -99,6 +101,78 @@ class SdsRevisionDiffService:
         new_revision: GlobalSdsRevision,
     ) -> DiffResult:
         """Diff berechnen."""
+        result = self._diff(old_revision, new_revision)
+        logger.info(
+            "Diff %s → %s: %d changes, impact=%s",
+            old_revision.pk,
+            new_revision.pk,
+            len(result.field_diffs),
+            result.overall_impact,
+        )
+        return result
+
+    def compute_diffs(
+        self,
+        pairs: list[tuple[int, int]],
+    ) -> dict[tuple[int, int], DiffResult]:
+        """
+        Diffs für viele (alt, neu)-Revisions-IDs berechnen.
+
+        Revisionen und H-Sätze werden mit je einer Abfrage geladen,
+        die Vergleiche laufen im Speicher.
+        """
+        pairs = list(dict.fromkeys(pairs))
+        ids = {pk for pair in pairs for pk in pair}
+        revisions = GlobalSdsRevision.objects.prefetch_related("hazard_statements").in_bulk(ids)
+
+        results = {}
+        for old_id, new_id in pairs:
+            if old_id not in revisions or new_id not in revisions:
+                logger.warning("Diff %s → %s skipped: revision not found", old_id, new_id)
+                continue
+            results[(old_id, new_id)] = self._diff(revisions[old_id], revisions[new_id])
+
+        logger.info("Computed %d diffs (%d revisions)", len(results), len(revisions))
+        return results
+
+    def persist_diffs(
+        self,
+        diffs: dict[tuple[int, int], DiffResult],
+    ) -> list[SdsRevisionDiffRecord]:
+        """
+        Diffs per ``bulk_create`` persistieren.
+
+        Bereits vorhandene Records bleiben unverändert (immutable) und
+        werden mit zurückgegeben — wie ``persist_diff``.
+        """
+        if not diffs:
+            return []
+        SdsRevisionDiffRecord.objects.bulk_create(
+            [
+                SdsRevisionDiffRecord(
+                    old_revision_id=old_id,
+                    new_revision_id=new_id,
+                    **self._record_fields(diff_result),
+                )
+                for (old_id, new_id), diff_result in diffs.items()
+            ],
+            ignore_conflicts=True,
+        )
+        old_ids = {old_id for old_id, _ in diffs}
+        records = [
+            record
+            for record in SdsRevisionDiffRecord.objects.filter(old_revision_id__in=old_ids)
+            if (record.old_revision_id, record.new_revision_id) in diffs
+        ]
+        logger.info("Persisted %d DiffRecords", len(records))
+        return records
+
+    def _diff(
+        self,
+        old_revision: GlobalSdsRevision,
+        new_revision: GlobalSdsRevision,
+    ) -> DiffResult:
+        """Diff im Speicher (H-Sätze aus dem Prefetch-Cache, falls vorhanden)."""
         result = DiffResult()
 
         # Skalare Felder vergleichen
@@ -117,8 +191,8 @@ class SdsRevisionDiffService:
                 )
 
         # H-Sätze vergleichen
-        old_h = set(old_revision.hazard_statements.values_list("code", flat=True))
-        new_h = set(new_revision.hazard_statements.values_list("code", flat=True))
+        old_h = {h.code for h in old_revision.hazard_statements.all()}
+        new_h = {h.code for h in new_revision.hazard_statements.all()}
         result.added_h_codes = sorted(new_h - old_h)
         result.removed_h_codes = sorted(old_h - new_h)
 
@@ -137,14 +211,6 @@ class SdsRevisionDiffService:
         result.overall_impact = self._compute_overall(
             result.field_diffs,
         )
-
-        logger.info(
-            "Diff %s → %s: %d changes, impact=%s",
-            old_revision.pk,
-            new_revision.pk,
-            len(result.field_diffs),
-            result.overall_impact,
-        )
         return result
 
     def persist_diff(
@@ -157,21 +223,7 @@ class SdsRevisionDiffService:
         record, created = SdsRevisionDiffRecord.objects.get_or_create(
             old_revision=old_revision,
             new_revision=new_revision,
-            defaults={
-                "overall_impact": diff_result.overall_impact,
-                "field_diffs": [
-                    {
-                        "field": d.field_name,
-                        "old": d.old_value,
-                        "new": d.new_value,
-                        "impact": d.impact,
-                    }
-                    for d in diff_result.field_diffs
-                ],
-                "added_h_codes": diff_result.added_h_codes,
-                "removed_h_codes": diff_result.removed_h_codes,
-                "changed_components": (diff_result.changed_components),
-            },
+            defaults=self._record_fields(diff_result),
         )
         if created:
             logger.info(
@@ -180,6 +232,25 @@ class SdsRevisionDiffService:
             )
         return record
 
+    @staticmethod
+    def _record_fields(diff_result: DiffResult) -> dict:
+        """Felder eines SdsRevisionDiffRecord aus einem DiffResult."""
+        return {
+            "overall_impact": diff_result.overall_impact,
+            "field_diffs": [
+                {
+                    "field": d.field_name,
+                    "old": d.old_value,
+                    "new": d.new_value,
+                    "impact": d.impact,
+                }
+                for d in diff_result.field_diffs
+            ],
+            "added_h_codes": diff_result.added_h_codes,
+            "removed_h_codes": diff_result.removed_h_codes,
+            "changed_components": diff_result.changed_components,
+        }
+
     def _classify_field(self, field_name: str) -> str:
         """Impact-Stufe für ein Feld bestimmen."""
         if field_name in SAFETY_CRITICAL_FIELDS:
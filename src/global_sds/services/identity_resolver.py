@@ -6,11 +6,15 @@ CAS-Lookup (exakt) + Fuzzy Name+Hersteller Matching.
 """
 
 import logging
+import re
+from collections import defaultdict
 from dataclasses import dataclass
 
 from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Count, Max
 
-from global_sds.models import GlobalSubstance
+from global_sds.models import GlobalSubstance, GlobalSubstanceAlias
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +31,17 @@ CONFIDENCE_ASK_USER = getattr(
 )
 
 
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+ALIAS_MATCH_SQL = """
+SELECT substance_id, similarity(lower(name), %s)
+FROM {table}
+WHERE lower(name) %% %s
+ORDER BY lower(name) <-> %s
+LIMIT 1
+"""
+
+
 @dataclass
 class IdentityMatch:
     """Ergebnis der Identitätsauflösung."""
@@ -117,13 +132,13 @@ class SdsIdentityResolver:
         manufacturer_name: str,
     ) -> IdentityMatch:
         """
-        Fuzzy-Matching über Name via pg_trgm similarity (ADR-161 §P0.4).
+        Fuzzy-Matching über Namen und Synonyme (GlobalSubstanceAlias).
 
-        Uses PostgreSQL pg_trgm extension for trigram-based similarity
-        scoring directly in the database — no Python loop required.
-        Falls back to difflib SequenceMatcher if pg_trgm is unavailable.
+        Uses the pg_trgm ``%`` operator and ``<->`` ordering on the
+        trigram-indexed alias table — one query for names and synonyms.
+        Falls back to an in-memory trigram index if pg_trgm is unavailable.
         """
-        search_term = product_name.lower().strip()
+        search_term = " ".join(product_name.lower().split())
         if not search_term:
             return IdentityMatch(
                 substance=None,
@@ -133,12 +148,12 @@ class SdsIdentityResolver:
 
         try:
             result = self._pg_trgm_match(search_term)
-        except Exception:
+        except DatabaseError:
             logger.warning(
-                "pg_trgm unavailable, falling back to difflib",
+                "pg_trgm unavailable, falling back to in-memory trigram index",
                 exc_info=True,
             )
-            result = self._difflib_fallback(search_term)
+            result = self._ngram_fallback(search_term)
 
         if result and result.confidence >= CONFIDENCE_ASK_USER:
             logger.info(
@@ -160,79 +175,99 @@ class SdsIdentityResolver:
 
     def _pg_trgm_match(self, search_term: str) -> IdentityMatch | None:
         """
-        pg_trgm similarity search — single DB query, O(1) scalability.
+        Bester Alias per Trigramm-Index — eine Abfrage über Namen und Synonyme.
 
-        Uses similarity() on name field. Synonyms are checked via
-        a raw annotation since JSONField arrays need unnesting.
+        ``%`` filtert über den GIN-Index (pg_trgm.similarity_threshold),
+        ``<->`` sortiert nach Trigramm-Distanz.
         """
+        # Savepoint: a failing query must not abort the caller's transaction
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                ALIAS_MATCH_SQL.format(table=GlobalSubstanceAlias._meta.db_table),
+                [search_term, search_term, search_term],
+            )
+            row = cursor.fetchone()
 
-        # Annotate with trigram similarity score on name
-        candidates = (
-            GlobalSubstance.objects.extra(
-                select={"name_similarity": "similarity(LOWER(name), %s)"},
-                select_params=[search_term],
-            ).order_by("-name_similarity")
-        )[:5]  # Top 5 candidates
+        if row is None:
+            return None
+        substance_id, score = row
+        return IdentityMatch(
+            substance=GlobalSubstance.objects.get(pk=substance_id),
+            confidence=float(score),
+            match_type="fuzzy",
+        )
 
-        best_match = None
-        best_score = 0.0
+    def _ngram_fallback(self, search_term: str) -> IdentityMatch | None:
+        """Pure-Python fallback when pg_trgm is not available."""
+        best = AliasTrigramIndex.current().best_match(search_term)
+        if best is None:
+            return None
+        substance_id, score = best
+        return IdentityMatch(
+            substance=GlobalSubstance.objects.get(pk=substance_id),
+            confidence=score,
+            match_type="fuzzy",
+        )
 
-        for substance in candidates:
-            score = float(substance.name_similarity)
 
-            # Also check synonyms (JSON array) with Python fallback
-            for synonym in substance.synonyms or []:
-                from difflib import SequenceMatcher
+def trigrams(text: str) -> set[str]:
+    """Trigramme wie pg_trgm: je Wort kleingeschrieben, mit "  " davor und " " danach."""
+    grams: set[str] = set()
+    for word in WORD_PATTERN.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
 
-                syn_score = SequenceMatcher(
-                    None,
-                    search_term,
-                    str(synonym).lower(),
-                ).ratio()
-                score = max(score, syn_score)
 
-            if score > best_score:
-                best_score = score
-                best_match = substance
+def trigram_similarity(a: set[str], b: set[str]) -> float:
+    """Anteil gemeinsamer Trigramme (entspricht pg_trgm ``similarity``)."""
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
 
-        if best_match:
-            return IdentityMatch(
-                substance=best_match,
-                confidence=best_score,
-                match_type="fuzzy",
-            )
-        return None
 
-    def _difflib_fallback(self, search_term: str) -> IdentityMatch | None:
-        """Pure-Python fallback when pg_trgm is not available."""
-        from difflib import SequenceMatcher
-
-        best_match = None
-        best_score = 0.0
-
-        for substance in GlobalSubstance.objects.all()[:500]:
-            name_score = SequenceMatcher(
-                None,
-                search_term,
-                substance.name.lower(),
-            ).ratio()
-
-            for synonym in substance.synonyms or []:
-                syn_score = SequenceMatcher(
-                    None,
-                    search_term,
-                    str(synonym).lower(),
-                ).ratio()
-                name_score = max(name_score, syn_score)
-
-            if name_score > best_score:
-                best_score = name_score
-                best_match = substance
-
-        if best_match:
-            return IdentityMatch(
-                substance=best_match,
-                confidence=best_score,
-                match_type="fuzzy",
-            )
-        return None
+class AliasTrigramIndex:
+    """
+    In-Memory-Trigrammindex über alle GlobalSubstanceAlias-Zeilen.
+
+    Kandidaten sind nur Aliase mit mindestens einem gemeinsamen Trigramm;
+    der Index wird pro Prozess gehalten und neu aufgebaut, sobald sich
+    Anzahl oder höchste ID der Aliase ändern.
+    """
+
+    _current: "AliasTrigramIndex | None" = None
+
+    def __init__(self, aliases, version: tuple = ()):
+        self.version = version
+        self.substance_ids: list[int] = []
+        self.grams: list[set[str]] = []
+        self.postings: dict[str, list[int]] = defaultdict(list)
+        for substance_id, name in aliases:
+            position = len(self.substance_ids)
+            grams = trigrams(name)
+            self.substance_ids.append(substance_id)
+            self.grams.append(grams)
+            for gram in grams:
+                self.postings[gram].append(position)
+
+    @classmethod
+    def current(cls) -> "AliasTrigramIndex":
+        version = tuple(
+            GlobalSubstanceAlias.objects.aggregate(n=Count("pk"), top=Max("pk")).values()
+        )
+        if cls._current is None or cls._current.version != version:
+            aliases = GlobalSubstanceAlias.objects.values_list("substance_id", "name")
+            cls._current = cls(aliases.iterator(), version)
+        return cls._current
+
+    def best_match(self, term: str) -> tuple[int, float] | None:
+        """(substance_id, Ähnlichkeit) des ähnlichsten Alias oder None."""
+        query = trigrams(term)
+        candidates = {pos for gram in query for pos in self.postings.get(gram, ())}
+        best: tuple[int, float] | None = None
+        for position in candidates:
+            score = trigram_similarity(query, self.grams[position])
+            if best is None or score > best[1]:
+                best = (self.substance_ids[position], score)
+        return best
@@ -0,0 +1,318 @@
+# src/global_sds/services/pubchem_client.py
+"""
+PubChemClient — gecachter, gebündelter Zugriff auf PubChem (ADR-169).
+
+Bezeichner (CAS/Name) → CID und CID → Eigenschaften/GHS werden in
+``PubChemIdentifier`` / ``PubChemCompound`` gespeichert; unbekannte
+Bezeichner werden negativ gecacht. Eigenschaften mehrerer CIDs kommen
+über einen Batch-Request, HTTP-Verbindungen werden wiederverwendet.
+
+Die Datenquelle ist austauschbar (``PUBCHEM_SOURCE``):
+- ``http``  — PubChem PUG REST (Standard)
+- ``local`` — JSON-Spiegel (``PUBCHEM_LOCAL_MIRROR``) für Tests und
+  Installationen ohne Internetzugang
+
+Der Client öffnet selbst keine lang laufende Transaktion — Aufrufer
+sollten ihn außerhalb von ``transaction.atomic`` verwenden.
+"""
+
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from global_sds.models import PubChemCompound, PubChemIdentifier
+
+logger = logging.getLogger(__name__)
+
+PUBCHEM_BASE = "https://pubchem.ncbi.nlm.nih.gov/rest/pug"
+PUBCHEM_VIEW = "https://pubchem.ncbi.nlm.nih.gov/rest/pug_view"
+PROPERTY_NAMES = "IUPACName,MolecularFormula,MolecularWeight,InChIKey"
+
+# PubChem akzeptiert bis zu einige hundert CIDs pro Property-Request;
+# 100 hält die URL kurz.
+PROPERTY_BATCH_SIZE = 100
+
+SOURCE_HTTP = "http"
+SOURCE_LOCAL = "local"
+
+H_PATTERN = re.compile(r"\b(H[0-9]{3}[A-Za-z]?)\b")
+P_PATTERN = re.compile(r"\b(P[0-9]{3}(?:\+P[0-9]{3})*)\b")
+GHS_PATTERN = re.compile(r"\b(GHS0[1-9])\b", re.IGNORECASE)
+SIGNAL_PATTERN = re.compile(r"\b(Danger|Warning|Gefahr|Achtung)\b", re.IGNORECASE)
+
+
+def normalize_identifier(identifier: str | None) -> str:
+    """Cache-Schlüssel eines Bezeichners: getrimmt, kleingeschrieben."""
+    return " ".join((identifier or "").split()).lower()[:512]
+
+
+def parse_ghs_text(text: str) -> dict:
+    """H/P-Sätze, Piktogramme und Signalwort aus PubChem-GHS-JSON (als Text)."""
+    sw_lower = {s.lower() for s in SIGNAL_PATTERN.findall(text)}
+    signal_word = ""
+    if "danger" in sw_lower or "gefahr" in sw_lower:
+        signal_word = "danger"
+    elif "warning" in sw_lower or "achtung" in sw_lower:
+        signal_word = "warning"
+    return {
+        "h_statements": sorted(set(H_PATTERN.findall(text))),
+        "p_statements": sorted(set(P_PATTERN.findall(text))),
+        "pictograms": sorted({g.upper() for g in GHS_PATTERN.findall(text)}),
+        "signal_word": signal_word,
+    }
+
+
+@dataclass
+class PubChemRecord:
+    """PubChem-Daten einer Verbindung."""
+
+    cid: int
+    properties: dict = field(default_factory=dict)
+    ghs: dict = field(default_factory=dict)
+
+
+# ─────────────────────────────────────────────────────────────────────
+# Datenquellen
+# ─────────────────────────────────────────────────────────────────────
+
+
+class HttpPubChemSource:
+    """
+    PubChem PUG REST über einen wiederverwendeten httpx.Client.
+
+    Netzwerkfehler werden als Exception weitergereicht (nicht gecacht);
+    404 bedeutet "unbekannt".
+    """
+
+    TIMEOUT = (5.0, 15.0)  # connect, read
+
+    _client = None
+    _client_pid = None
+
+    @classmethod
+    def client(cls):
+        """Prozessweiter Client mit Connection-Pool (nach fork neu angelegt)."""
+        import httpx
+
+        if cls._client is None or cls._client_pid != os.getpid():
+            connect, read = cls.TIMEOUT
+            cls._client = httpx.Client(
+                timeout=httpx.Timeout(read, connect=connect),
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+                follow_redirects=True,
+            )
+            cls._client_pid = os.getpid()
+        return cls._client
+
+    def resolve_cid(self, identifier: str) -> int | None:
+        url = f"{PUBCHEM_BASE}/compound/name/{quote(identifier, safe='')}/cids/JSON"
+        resp = self.client().get(url)
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        cids = resp.json().get("IdentifierList", {}).get("CID", [])
+        return cids[0] if cids else None
+
+    def fetch_properties(self, cids: list[int]) -> dict[int, dict]:
+        result: dict[int, dict] = {}
+        for start in range(0, len(cids), PROPERTY_BATCH_SIZE):
+            chunk = ",".join(str(cid) for cid in cids[start : start + PROPERTY_BATCH_SIZE])
+            resp = self.client().get(
+                f"{PUBCHEM_BASE}/compound/cid/{chunk}/property/{PROPERTY_NAMES}/JSON"
+            )
+            if resp.status_code == 404:
+                continue
+            resp.raise_for_status()
+            for row in resp.json().get("PropertyTable", {}).get("Properties", []):
+                result[row["CID"]] = row
+        return result
+
+    def fetch_ghs(self, cid: int) -> dict:
+        resp = self.client().get(
+            f"{PUBCHEM_VIEW}/data/compound/{cid}/JSON", params={"heading": "GHS Classification"}
+        )
+        if resp.status_code == 404:
+            return {}
+        resp.raise_for_status()
+        return parse_ghs_text(resp.text)
+
+
+class LocalPubChemSource:
+    """
+    Lokaler Stand-in ohne Netzwerk.
+
+    Datensätze: ``[{"cid": 180, "identifiers": ["67-64-1", "Aceton"],
+    "properties": {...}, "ghs": {...}}]`` — direkt übergeben oder aus der
+    JSON-Datei ``PUBCHEM_LOCAL_MIRROR`` (fehlt sie, ist alles unbekannt).
+    """
+
+    def __init__(self, records: list[dict] | None = None):
+        if records is None:
+            records = self._load(getattr(settings, "PUBCHEM_LOCAL_MIRROR", ""))
+        self._cids = {}
+        self._compounds = {}
+        for record in records:
+            cid = int(record["cid"])
+            self._compounds[cid] = record
+            for identifier in record.get("identifiers", []):
+                self._cids[normalize_identifier(identifier)] = cid
+
+    @staticmethod
+    def _load(path: str) -> list[dict]:
+        if not path:
+            return []
+        try:
+            return json.loads(Path(path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            logger.warning("PubChem mirror not found: %s", path)
+            return []
+
+    def resolve_cid(self, identifier: str) -> int | None:
+        return self._cids.get(normalize_identifier(identifier))
+
+    def fetch_properties(self, cids: list[int]) -> dict[int, dict]:
+        return {
+            cid: dict(self._compounds[cid].get("properties", {}))
+            for cid in cids
+            if cid in self._compounds
+        }
+
+    def fetch_ghs(self, cid: int) -> dict:
+        return dict(self._compounds.get(cid, {}).get("ghs", {}))
+
+
+def get_pubchem_source():
+    """Datenquelle gemäß ``PUBCHEM_SOURCE``."""
+    if getattr(settings, "PUBCHEM_SOURCE", SOURCE_HTTP) == SOURCE_LOCAL:
+        return LocalPubChemSource()
+    return HttpPubChemSource()
+
+
+# ─────────────────────────────────────────────────────────────────────
+# Client
+# ─────────────────────────────────────────────────────────────────────
+
+
+class PubChemClient:
+    """
+    Gecachte PubChem-Abfragen für viele Bezeichner auf einmal.
+
+    Nicht erreichbare Quellen liefern ``None`` für die betroffenen
+    Bezeichner; die Fehler stehen in ``errors`` und werden nicht gecacht.
+    """
+
+    def __init__(self, source=None):
+        self.source = source if source is not None else get_pubchem_source()
+        self.errors: list[str] = []
+
+    def lookup(self, identifier: str) -> PubChemRecord | None:
+        """Daten zu einer CAS-Nummer oder einem Namen (None = unbekannt)."""
+        key = normalize_identifier(identifier)
+        return self.lookup_many([identifier]).get(key)
+
+    def lookup_many(self, identifiers) -> dict[str, PubChemRecord | None]:
+        """``{normalisierter Bezeichner: PubChemRecord | None}``."""
+        keys = list(dict.fromkeys(k for k in map(normalize_identifier, identifiers) if k))
+        if not keys:
+            return {}
+        cids = self._resolve(keys)
+        compounds = self._compounds({cid for cid in cids.values() if cid})
+        return {key: compounds.get(cids.get(key)) for key in keys}
+
+    # ── Bezeichner → CID ──
+
+    def _resolve(self, keys: list[str]) -> dict[str, int | None]:
+        now = timezone.now()
+        positive_cutoff = now - timedelta(days=getattr(settings, "PUBCHEM_CACHE_DAYS", 90))
+        negative_cutoff = now - timedelta(days=getattr(settings, "PUBCHEM_NEGATIVE_CACHE_DAYS", 7))
+
+        cids: dict[str, int | None] = {}
+        for identifier, cid, fetched_at in PubChemIdentifier.objects.filter(
+            identifier__in=keys
+        ).values_list("identifier", "cid", "fetched_at"):
+            if fetched_at >= (positive_cutoff if cid else negative_cutoff):
+                cids[identifier] = cid
+
+        fresh: dict[str, int | None] = {}
+        for key in keys:
+            if key in cids:
+                continue
+            try:
+                fresh[key] = self.source.resolve_cid(key)
+            except Exception as exc:
+                logger.warning("PubChem CID lookup failed for %s: %s", key, exc)
+                self.errors.append(f"{key}: {exc}")
+
+        self._store(
+            PubChemIdentifier,
+            [PubChemIdentifier(identifier=key, cid=cid) for key, cid in fresh.items()],
+            unique_fields=["identifier"],
+            update_fields=["cid", "fetched_at"],
+        )
+        return cids | fresh
+
+    # ── CID → Eigenschaften + GHS ──
+
+    def _compounds(self, cids: set[int]) -> dict[int, PubChemRecord]:
+        if not cids:
+            return {}
+        cutoff = timezone.now() - timedelta(days=getattr(settings, "PUBCHEM_CACHE_DAYS", 90))
+        records = {
+            cid: PubChemRecord(cid, properties, ghs)
+            for cid, properties, ghs in PubChemCompound.objects.filter(
+                cid__in=cids, fetched_at__gte=cutoff
+            ).values_list("cid", "properties", "ghs")
+        }
+
+        missing = sorted(cids - records.keys())
+        if not missing:
+            return records
+        try:
+            properties = self.source.fetch_properties(missing)
+        except Exception as exc:
+            logger.warning("PubChem properties failed for CIDs %s: %s", missing, exc)
+            self.errors.append(f"properties: {exc}")
+            return records
+
+        complete = []
+        for cid in missing:
+            record = PubChemRecord(cid, properties.get(cid, {}))
+            try:
+                record.ghs = self.source.fetch_ghs(cid)
+                complete.append(record)
+            except Exception as exc:
+                logger.warning("PubChem GHS failed for CID %s: %s", cid, exc)
+                self.errors.append(f"ghs {cid}: {exc}")
+            records[cid] = record
+
+        self._store(
+            PubChemCompound,
+            [PubChemCompound(cid=r.cid, properties=r.properties, ghs=r.ghs) for r in complete],
+            unique_fields=["cid"],
+            update_fields=["properties", "ghs", "fetched_at"],
+        )
+        return records
+
+    @staticmethod
+    def _store(model, objs: list, unique_fields: list[str], update_fields: list[str]) -> None:
+        if not objs:
+            return
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    objs,
+                    update_conflicts=True,
+                    unique_fields=unique_fields,
+                    update_fields=update_fields,
+                )
+        except DatabaseError:
+            logger.exception("Could not cache %d %s rows", len(objs), model.__name__)
@@ -1,30 +1,24 @@
 # src/global_sds/services/pubchem_service.py
 """
-PubChemEnrichmentService — Anreicherung via PubChem REST API (ADR-169 Phase 1).
+PubChemEnrichmentService — Anreicherung via PubChem (ADR-169 Phase 1).
 
 Ruft für eine CAS-Nummer oder einen Produktnamen folgende Daten ab:
 - Molekulare Eigenschaften (Formel, Gewicht, IUPAC-Name, CID)
 - GHS-Klassifizierung (H/P-Sätze, Signalwort, Piktogramme)
-- Physikalische Eigenschaften (Flammpunkt wenn verfügbar)
+
+Die Abfragen laufen über PubChemClient (persistenter Cache inkl.
+negativer Treffer, Batch-Requests, austauschbare Datenquelle).
 
 API-Doku: https://pubchem.ncbi.nlm.nih.gov/docs/pug-rest
 """
 
 import logging
-import re
 from dataclasses import dataclass, field
 from typing import Any
 
-logger = logging.getLogger(__name__)
-
-PUBCHEM_BASE = "https://pubchem.ncbi.nlm.nih.gov/rest/pug"
-PUBCHEM_VIEW = "https://pubchem.ncbi.nlm.nih.gov/rest/pug_view"
+from global_sds.services.pubchem_client import PubChemClient, PubChemRecord, normalize_identifier
 
-H_PATTERN = re.compile(r"\b(H[0-9]{3}[A-Za-z]?)\b")
-P_PATTERN = re.compile(r"\b(P[0-9]{3}(?:\+P[0-9]{3})*)\b")
-GHS_PATTERN = re.compile(r"\b(GHS0[1-9])\b", re.IGNORECASE)
-SIGNAL_PATTERN = re.compile(r"\b(Danger|Warning|Gefahr|Achtung)\b", re.IGNORECASE)
-FLASH_PATTERN = re.compile(r"(\d+(?:[.,]\d+)?)\s*°?\s*C", re.IGNORECASE)
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -49,89 +43,97 @@ class PubChemResult:
 
 class PubChemEnrichmentService:
     """
-    Reichert SDS-Daten mit PubChem REST API an.
+    Reichert SDS-Daten mit PubChem-Daten an.
 
-    Nutzt httpx mit kurzem Timeout (5s connect, 15s read) und
-    fängt alle Netzwerkfehler als leere Results.
+    Netzwerkfehler liefern leere Results (Fehler in ``errors``). Keine
+    DB-Transaktion um den Aufruf legen — entfernte Aufrufe würden sie
+    offen halten.
     """
 
-    TIMEOUT = (5.0, 15.0)  # connect, read
+    def __init__(self, client: PubChemClient | None = None):
+        self.client = client or PubChemClient()
 
     def enrich_by_cas(self, cas: str) -> PubChemResult:
         """Anreicherung via CAS-Nummer."""
-        return self._enrich("name", cas)
+        return self._enrich(cas)
 
     def enrich_by_name(self, name: str) -> PubChemResult:
         """Anreicherung via Produktname (Fallback wenn keine CAS)."""
-        return self._enrich("name", name)
+        return self._enrich(name)
 
     def enrich(self, parse_result: dict) -> PubChemResult:
         """Automatisch CAS oder Produktname nutzen."""
-        cas = (parse_result.get("cas_number") or "").strip()
-        name = (parse_result.get("product_name") or "").strip()
+        return self.enrich_many([parse_result])[0]
 
-        if cas:
-            result = self._enrich("name", cas)
-            if result.enriched:
-                return result
-
-        if name:
-            return self._enrich("name", name)
-
-        return PubChemResult()
+    def enrich_many(self, parse_results: list[dict]) -> list[PubChemResult]:
+        """
+        Wie ``enrich`` für viele Parse-Ergebnisse.
 
-    def _enrich(self, id_type: str, identifier: str) -> PubChemResult:
-        result = PubChemResult()
+        Erst alle CAS-Nummern, dann die Produktnamen der nicht gefundenen
+        in je einem gebündelten Lookup.
+        """
+        cas_keys = [(r.get("cas_number") or "").strip() for r in parse_results]
+        name_keys = [(r.get("product_name") or "").strip() for r in parse_results]
+
+        errors_before = len(self.client.errors)
+        by_cas = self.client.lookup_many(cas_keys)
+        results = [self._lookup_result(by_cas, cas) for cas in cas_keys]
+
+        missing_names = [
+            name
+            for name, result in zip(name_keys, results, strict=True)
+            if name and not result.enriched
+        ]
+        if missing_names:
+            by_name = self.client.lookup_many(missing_names)
+            results = [
+                result if result.enriched or not name else self._lookup_result(by_name, name)
+                for name, result in zip(name_keys, results, strict=True)
+            ]
+
+        errors = self.client.errors[errors_before:]
+        for result in results:
+            result.errors = list(errors)
+        return results
+
+    def _lookup_result(
+        self, records: dict[str, PubChemRecord | None], identifier: str
+    ) -> PubChemResult:
+        record = records.get(normalize_identifier(identifier))
+        return self._to_result(record) if record else PubChemResult()
+
+    def _enrich(self, identifier: str) -> PubChemResult:
         if not identifier:
-            return result
-
-        try:
-            import httpx
-        except ImportError:
-            result.errors.append("httpx not installed")
-            return result
-
-        try:
-            cid = self._resolve_cid(httpx, id_type, identifier)
-        except Exception as exc:
-            logger.warning("PubChem CID lookup failed for %s: %s", identifier, exc)
-            result.errors.append(str(exc))
-            return result
-
-        if not cid:
-            return result
-
-        result.cid = cid
-
-        try:
-            props = self._fetch_properties(httpx, cid)
-            result.iupac_name = props.get("IUPACName", "")
-            result.molecular_formula = props.get("MolecularFormula", "")
-            mw = props.get("MolecularWeight")
-            if mw:
-                try:
-                    result.molecular_weight = float(mw)
-                except (ValueError, TypeError):
-                    pass
-            result.inchi_key = props.get("InChIKey", "")
-        except Exception as exc:
-            logger.warning("PubChem properties failed for CID %s: %s", cid, exc)
-            result.errors.append(f"properties: {exc}")
-
-        try:
-            ghs = self._fetch_ghs(httpx, cid)
-            result.h_statements = ghs.get("h_statements", [])
-            result.p_statements = ghs.get("p_statements", [])
-            result.ghs_pictograms = ghs.get("pictograms", [])
-            result.signal_word = ghs.get("signal_word", "")
-        except Exception as exc:
-            logger.warning("PubChem GHS failed for CID %s: %s", cid, exc)
-            result.errors.append(f"ghs: {exc}")
+            return PubChemResult()
+        errors_before = len(self.client.errors)
+        record = self.client.lookup(identifier)
+        result = self._to_result(record) if record else PubChemResult()
+        result.errors = self.client.errors[errors_before:]
+        return result
+
+    @staticmethod
+    def _to_result(record: PubChemRecord) -> PubChemResult:
+        props = record.properties
+        ghs = record.ghs
+        result = PubChemResult(cid=record.cid)
+        result.iupac_name = props.get("IUPACName", "")
+        result.molecular_formula = props.get("MolecularFormula", "")
+        mw = props.get("MolecularWeight")
+        if mw:
+            try:
+                result.molecular_weight = float(mw)
+            except (ValueError, TypeError):
+                pass
+        result.inchi_key = props.get("InChIKey", "")
+        result.h_statements = ghs.get("h_statements", [])
+        result.p_statements = ghs.get("p_statements", [])
+        result.ghs_pictograms = ghs.get("pictograms", [])
+        result.signal_word = ghs.get("signal_word", "")
 
         result.enriched = bool(result.iupac_name or result.h_statements or result.molecular_formula)
         result.raw = {
-            "cid": cid,
-            "source": f"PubChem CID {cid}",
+            "cid": record.cid,
+            "source": f"PubChem CID {record.cid}",
             "iupac_name": result.iupac_name,
             "molecular_formula": result.molecular_formula,
             "molecular_weight": result.molecular_weight,
@@ -141,62 +143,8 @@ class PubChemEnrichmentService:
             "ghs_pictograms": result.ghs_pictograms,
             "signal_word": result.signal_word,
         }
-
-        logger.info(
-            "PubChem enriched CID=%s: H=%d P=%d formula=%s",
-            cid,
-            len(result.h_statements),
-            len(result.p_statements),
-            result.molecular_formula,
-        )
         return result
 
-    def _resolve_cid(self, httpx, id_type: str, identifier: str) -> int | None:
-        url = f"{PUBCHEM_BASE}/compound/{id_type}/{identifier}/cids/JSON"
-        resp = httpx.get(url, timeout=self.TIMEOUT, follow_redirects=True)
-        if resp.status_code == 404:
-            return None
-        resp.raise_for_status()
-        data = resp.json()
-        cids = data.get("IdentifierList", {}).get("CID", [])
-        return cids[0] if cids else None
-
-    def _fetch_properties(self, httpx, cid: int) -> dict:
-        props = "IUPACName,MolecularFormula,MolecularWeight,InChIKey"
-        url = f"{PUBCHEM_BASE}/compound/cid/{cid}/property/{props}/JSON"
-        resp = httpx.get(url, timeout=self.TIMEOUT, follow_redirects=True)
-        resp.raise_for_status()
-        data = resp.json()
-        table = data.get("PropertyTable", {}).get("Properties", [])
-        return table[0] if table else {}
-
-    def _fetch_ghs(self, httpx, cid: int) -> dict:
-        url = f"{PUBCHEM_VIEW}/data/compound/{cid}/JSON?heading=GHS+Classification"
-        resp = httpx.get(url, timeout=self.TIMEOUT, follow_redirects=True)
-        if resp.status_code == 404:
-            return {}
-        resp.raise_for_status()
-        text = resp.text
-
-        h_codes = sorted(set(H_PATTERN.findall(text)))
-        p_codes = sorted(set(P_PATTERN.findall(text)))
-        ghs_codes = sorted(set(GHS_PATTERN.findall(text)))
-        sw_matches = SIGNAL_PATTERN.findall(text)
-
-        signal_word = ""
-        sw_lower = {s.lower() for s in sw_matches}
-        if "danger" in sw_lower or "gefahr" in sw_lower:
-            signal_word = "danger"
-        elif "warning" in sw_lower or "achtung" in sw_lower:
-            signal_word = "warning"
-
-        return {
-            "h_statements": h_codes,
-            "p_statements": p_codes,
-            "pictograms": [g.upper() for g in ghs_codes],
-            "signal_word": signal_word,
-        }
-
     def merge_into_parse_result(self, parse_result: dict, pubchem: PubChemResult) -> dict:
         """
         Ergänzt parse_result mit PubChem-Daten (nur leere Felder).
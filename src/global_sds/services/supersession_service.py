@@ -4,15 +4,23 @@ SdsSupersessionService — Supersession-Kette + Notifications (ADR-012 §6.2).
 
 Setzt alte Revision auf SUPERSEDED, erstellt Outbox-Events,
 und flaggt GBU/Ex-Schutz-Dokumente bei SAFETY_CRITICAL.
+
+``supersede_many`` verarbeitet viele Revisionspaare mengenbasiert und
+liefert den Wirkungsbereich (betroffene Tenants, Nutzungen, Dokumente).
 """
 
 import logging
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import date, timedelta
 
 from django.conf import settings
+from django.utils import timezone
 
+from common.context import emit_outbox_events
 from global_sds.models import (
     GlobalSdsRevision,
+    GlobalSubstance,
     ImpactLevel,
     SdsRevisionDiffRecord,
 )
@@ -26,6 +34,38 @@ REVIEW_DEADLINE_DAYS = getattr(
     28,
 )
 
+SUPERSESSION_TOPIC = "sds.revision_superseded"
+
+USAGE_UPDATE_FIELDS = [
+    "pending_update_revision",
+    "pending_update_impact",
+    "status",
+    "review_deadline",
+    "updated_at",
+]
+
+
+@dataclass
+class SupersessionBatchResult:
+    """Wirkungsbereich einer Batch-Supersession."""
+
+    superseded: int = 0
+    affected_usages: int = 0
+    affected_tenants: set[str] = field(default_factory=set)
+    impacts: Counter = field(default_factory=Counter)
+    flagged_gbu_activities: int = 0
+    flagged_ex_concepts: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "superseded": self.superseded,
+            "affected_usages": self.affected_usages,
+            "affected_tenants": sorted(self.affected_tenants),
+            "impacts": dict(self.impacts),
+            "flagged_gbu_activities": self.flagged_gbu_activities,
+            "flagged_ex_concepts": self.flagged_ex_concepts,
+        }
+
 
 class SdsSupersessionService:
     """
@@ -66,36 +106,18 @@ class SdsSupersessionService:
         )
         affected = 0
 
+        events = []
         for usage in usages:
-            usage.pending_update_revision = new_revision
-            usage.pending_update_impact = impact
-
-            if impact == ImpactLevel.SAFETY_CRITICAL:
-                usage.status = SdsUsageStatus.REVIEW_REQUIRED
-                usage.review_deadline = date.today() + timedelta(days=REVIEW_DEADLINE_DAYS)
-            elif impact == ImpactLevel.REGULATORY:
-                usage.status = SdsUsageStatus.UPDATE_AVAILABLE
-
-            usage.save(
-                update_fields=[
-                    "pending_update_revision",
-                    "pending_update_impact",
-                    "status",
-                    "review_deadline",
-                    "updated_at",
-                ]
-            )
+            self._apply_update(usage, new_revision, impact)
+            usage.save(update_fields=USAGE_UPDATE_FIELDS)
             affected += 1
-
-            # 4. Outbox-Event
-            self._emit_supersession_event(
-                usage,
-                old_revision,
-                new_revision,
-                diff_record,
-                impact,
+            events.append(
+                self._supersession_event(usage, old_revision, new_revision, diff_record, impact)
             )
 
+        # 4. Outbox-Events
+        emit_outbox_events(events)
+
         # 5. GBU/Ex-Schutz flaggen via DiffRecord properties
         if diff_record.requires_gbu_review or diff_record.requires_ex_review:
             self._flag_downstream(old_revision, diff_record)
@@ -109,41 +131,126 @@ class SdsSupersessionService:
         )
         return affected
 
-    def _emit_supersession_event(
+    def supersede_many(
         self,
+        pairs: list[tuple[int, int]],
+    ) -> SupersessionBatchResult:
+        """
+        Viele (alt, neu)-Revisionspaare auf einmal supersedieren.
+
+        Diffs werden gebündelt berechnet und per ``bulk_create``
+        gespeichert; Revisionen und SdsUsages per ``bulk_update``;
+        GBU/Ex-Schutz mit je einem UPDATE pro Modul geflaggt.
+        Aufrufer sollten den Batch in ``transaction.atomic`` ausführen.
+        """
+        from global_sds.services.diff_service import SdsRevisionDiffService
+
+        diff_service = SdsRevisionDiffService()
+        records = diff_service.persist_diffs(diff_service.compute_diffs(pairs))
+        result = SupersessionBatchResult(superseded=len(records))
+        if not records:
+            return result
+
+        revisions = GlobalSdsRevision.objects.in_bulk(
+            {r.old_revision_id for r in records} | {r.new_revision_id for r in records}
+        )
+        now = timezone.now()
+
+        # 1. Alte Revisionen → SUPERSEDED
+        old_revisions = []
+        for record in records:
+            old = revisions[record.old_revision_id]
+            old.superseded_by_id = record.new_revision_id
+            old.status = GlobalSdsRevision.Status.SUPERSEDED
+            old.updated_at = now
+            old_revisions.append(old)
+        GlobalSdsRevision.objects.bulk_update(
+            old_revisions, ["superseded_by", "status", "updated_at"]
+        )
+
+        # 2. Neue Revisionen → VERIFIED
+        GlobalSdsRevision.objects.filter(
+            pk__in=[r.new_revision_id for r in records],
+        ).update(status=GlobalSdsRevision.Status.VERIFIED, updated_at=now)
+
+        # 3. Betroffene Tenants updaten
+        by_old = {r.old_revision_id: r for r in records}
+        usages = list(
+            SdsUsage.objects.filter(
+                sds_revision_id__in=by_old,
+                status=SdsUsageStatus.ACTIVE,
+            )
+        )
+        for usage in usages:
+            record = by_old[usage.sds_revision_id]
+            self._apply_update(usage, revisions[record.new_revision_id], record.overall_impact)
+            usage.updated_at = now
+            result.affected_tenants.add(str(usage.tenant_id))
+            result.impacts[record.overall_impact] += 1
+        SdsUsage.objects.bulk_update(usages, USAGE_UPDATE_FIELDS, batch_size=500)
+        result.affected_usages = len(usages)
+
+        # 4. Outbox-Events — ein INSERT pro 500 Events
+        emit_outbox_events(
+            [
+                self._supersession_event(
+                    usage,
+                    revisions[by_old[usage.sds_revision_id].old_revision_id],
+                    revisions[by_old[usage.sds_revision_id].new_revision_id],
+                    by_old[usage.sds_revision_id],
+                    by_old[usage.sds_revision_id].overall_impact,
+                )
+                for usage in usages
+            ]
+        )
+
+        # 5. GBU/Ex-Schutz flaggen — ein UPDATE pro Modul
+        result.flagged_gbu_activities, result.flagged_ex_concepts = self._flag_modules(
+            gbu_revision_ids=[r.old_revision_id for r in records if r.requires_gbu_review],
+            ex_revision_ids=[r.old_revision_id for r in records if r.requires_ex_review],
+        )
+
+        logger.info("Batch supersession: %s", result.as_dict())
+        return result
+
+    @staticmethod
+    def _apply_update(usage: SdsUsage, new_revision: GlobalSdsRevision, impact: str) -> None:
+        """Pending-Update und Status einer SdsUsage setzen (ohne Speichern)."""
+        usage.pending_update_revision = new_revision
+        usage.pending_update_impact = impact
+
+        if impact == ImpactLevel.SAFETY_CRITICAL:
+            usage.status = SdsUsageStatus.REVIEW_REQUIRED
+            usage.review_deadline = date.today() + timedelta(days=REVIEW_DEADLINE_DAYS)
+        elif impact == ImpactLevel.REGULATORY:
+            usage.status = SdsUsageStatus.UPDATE_AVAILABLE
+
+    @staticmethod
+    def _supersession_event(
         usage: SdsUsage,
         old_revision: GlobalSdsRevision,
         new_revision: GlobalSdsRevision,
         diff_record: SdsRevisionDiffRecord,
         impact: str,
-    ) -> None:
-        """Outbox-Event emittieren (ADR-012 §6.5)."""
-        try:
-            from outbox.services import emit_audit_event
-
-            emit_audit_event(
-                tenant_id=str(usage.tenant_id),
-                event_type="sds.revision_superseded",
-                entity_type="SdsUsage",
-                entity_id=str(usage.pk),
-                payload={
-                    "old_revision_id": str(old_revision.pk),
-                    "new_revision_id": str(new_revision.pk),
-                    "diff_record_id": str(diff_record.pk),
-                    "impact_level": impact,
-                    "added_h_codes": diff_record.added_h_codes,
-                    "removed_h_codes": diff_record.removed_h_codes,
-                    "requires_gbu_review": (impact == ImpactLevel.SAFETY_CRITICAL),
-                    "requires_ex_review": (impact == ImpactLevel.SAFETY_CRITICAL),
-                    "review_deadline": (
-                        str(usage.review_deadline) if usage.review_deadline else None
-                    ),
-                },
-            )
-        except ImportError:
-            logger.warning(
-                "outbox.services not available, skipping audit event",
-            )
+    ) -> dict:
+        """Outbox-Event (ADR-012 §6.5) als Argumente für ``emit_outbox_events``."""
+        return {
+            "tenant_id": usage.tenant_id,
+            "topic": SUPERSESSION_TOPIC,
+            "aggregate_type": "SdsUsage",
+            "payload": {
+                "sds_usage_id": usage.pk,
+                "old_revision_id": str(old_revision.pk),
+                "new_revision_id": str(new_revision.pk),
+                "diff_record_id": str(diff_record.pk),
+                "impact_level": impact,
+                "added_h_codes": diff_record.added_h_codes,
+                "removed_h_codes": diff_record.removed_h_codes,
+                "requires_gbu_review": (impact == ImpactLevel.SAFETY_CRITICAL),
+                "requires_ex_review": (impact == ImpactLevel.SAFETY_CRITICAL),
+                "review_deadline": (str(usage.review_deadline) if usage.review_deadline else None),
+            },
+        }
 
     def _flag_downstream(
         self,
@@ -151,50 +258,98 @@ class SdsSupersessionService:
         diff_record: SdsRevisionDiffRecord,
     ) -> None:
         """GBU + Ex-Schutz bei SAFETY_CRITICAL flaggen."""
-        reason = (
-            f"SDS-Update: {diff_record.overall_impact}. Neue H-Sätze: {diff_record.added_h_codes}"
+        logger.info(
+            "SDS-Update %s: %s, neue H-Sätze %s",
+            old_revision.pk,
+            diff_record.overall_impact,
+            diff_record.added_h_codes,
+        )
+        self._flag_modules(
+            gbu_revision_ids=[old_revision.pk] if diff_record.requires_gbu_review else [],
+            ex_revision_ids=[old_revision.pk] if diff_record.requires_ex_review else [],
         )
 
+    def _flag_modules(
+        self,
+        gbu_revision_ids: list[int],
+        ex_revision_ids: list[int],
+    ) -> tuple[int, int]:
+        """
+        Downstream-Dokumente zu abgelösten Revisionen flaggen — je Modul ein UPDATE.
+
+        - GBU: freigegebene Tätigkeiten der nutzenden Tenants, deren Stoff
+          die CAS-Nummer der abgelösten Revision trägt → OUTDATED
+        - Ex-Schutz: freigegebene Konzepte mit Stoffreferenz auf die
+          abgelöste Revision → REVIEW_REQUIRED
+
+        Returns: (geflaggte GBU-Tätigkeiten, geflaggte Ex-Konzepte).
+        """
+        now = timezone.now()
+        gbu_flagged = ex_flagged = 0
+
         # GBU flaggen (falls Modul vorhanden)
-        try:
-            from gbu.models import HazardAssessment
-
-            flagged = HazardAssessment.objects.filter(
-                sds_usage__sds_revision=old_revision,
-                status__in=["APPROVED", "ACTIVE"],
-            ).update(
-                review_required=True,
-                review_reason=reason,
-            )
-            if flagged:
-                logger.info(
-                    "Flagged %d GBU assessments",
-                    flagged,
+        if gbu_revision_ids:
+            try:
+                from gbu.models import ActivityStatus, HazardAssessmentActivity
+                from substances.models import Identifier, normalize_identifier_value
+
+                # Vergleich über den normalisierten Schlüssel (67-64-1 = "67 64 1")
+                cas_keys = {
+                    normalize_identifier_value(cas)
+                    for cas in GlobalSubstance.objects.filter(
+                        revisions__in=gbu_revision_ids,
+                        cas_number__isnull=False,
+                    ).values_list("cas_number", flat=True)
+                } - {""}
+                if cas_keys:
+                    gbu_flagged = (
+                        HazardAssessmentActivity.objects.unscoped()
+                        .filter(
+                            status=ActivityStatus.APPROVED,
+                            tenant_id__in=SdsUsage.objects.filter(
+                                sds_revision_id__in=gbu_revision_ids,
+                            ).values("tenant_id"),
+                            sds_revision__substance__identifiers__id_type=Identifier.IdType.CAS,
+                            sds_revision__substance__identifiers__id_value_normalized__in=cas_keys,
+                        )
+                        .update(status=ActivityStatus.OUTDATED, updated_at=now)
+                    )
+                if gbu_flagged:
+                    logger.info(
+                        "Flagged %d GBU activities",
+                        gbu_flagged,
+                    )
+            except ImportError as exc:
+                logger.debug(
+                    "GBU flagging skipped: %s",
+                    exc,
                 )
-        except (ImportError, Exception) as exc:
-            logger.debug(
-                "GBU flagging skipped: %s",
-                exc,
-            )
 
         # Ex-Schutz flaggen (falls Modul vorhanden)
-        try:
-            from explosionsschutz.models import ExplosionConcept
-
-            flagged = ExplosionConcept.objects.filter(
-                substances__revisions=old_revision,
-                status="APPROVED",
-            ).update(
-                review_required=True,
-                review_reason=reason,
-            )
-            if flagged:
-                logger.info(
-                    "Flagged %d Ex-Schutz concepts",
-                    flagged,
+        if ex_revision_ids:
+            try:
+                from explosionsschutz.models import ExplosionConcept
+
+                ex_flagged = (
+                    ExplosionConcept.objects.unscoped()
+                    .filter(
+                        substance_references__sds_revision__in=ex_revision_ids,
+                        status__in=[
+                            ExplosionConcept.Status.APPROVED,
+                            ExplosionConcept.Status.APPROVED_WITH_ACTIONS,
+                        ],
+                    )
+                    .update(status=ExplosionConcept.Status.REVIEW_REQUIRED, updated_at=now)
                 )
-        except (ImportError, Exception) as exc:
-            logger.debug(
-                "Ex-Schutz flagging skipped: %s",
-                exc,
-            )
+                if ex_flagged:
+                    logger.info(
+                        "Flagged %d Ex-Schutz concepts",
+                        ex_flagged,
+                    )
+            except ImportError as exc:
+                logger.debug(
+                    "Ex-Schutz flagging skipped: %s",
+                    exc,
+                )
+
+        return gbu_flagged, ex_flagged
@@ -4,19 +4,29 @@ SdsUploadPipeline — Orchestriert Stufen 1-3 (ADR-012 §5).
 
 PDF Upload → SHA-256 Deduplizierung → Identitätsauflösung →
 Versionserkennung → optional Supersession.
+
+Die Verarbeitung ist zweistufig:
+- ``prepare()`` — Hash, PubChem-Anreicherung, Identitätsauflösung und
+  Ablage der PDF, ohne Transaktion
+- ``commit()``  — kurze Transaktion: Substanz/Revision anlegen,
+  Versionserkennung, Diff und Supersession
+
+Der SHA-256 der PDF ist Idempotenzschlüssel: ``source_hash`` ist eindeutig,
+wiederholte oder parallele Uploads derselben PDF enden als DUPLICATE.
+Beide Stufen laufen auch als Celery-Chain (``global_sds.tasks``).
 """
 
 import contextlib
 import hashlib
 import logging
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from enum import StrEnum
 
 from django.conf import settings
 from django.core.files.base import ContentFile
-from django.db import transaction
+from django.db import IntegrityError, transaction
 
-from global_sds.models import GlobalSdsRevision, GlobalSubstance
+from global_sds.models import GlobalSdsRevision, GlobalSubstance, _normalize_cas
 from global_sds.services.diff_service import SdsRevisionDiffService
 from global_sds.services.enrichment_service import (
     SdsEnrichmentService,
@@ -61,6 +71,39 @@ class UploadResult:
     message: str = ""
     superseded_count: int = 0
 
+    def to_dict(self) -> dict:
+        """JSON-serialisierbare Form (Celery-Ergebnis)."""
+        return {
+            "outcome": str(self.outcome),
+            "revision_id": self.revision.pk if self.revision else None,
+            "substance_id": self.substance.pk if self.substance else None,
+            "message": self.message,
+            "superseded_count": self.superseded_count,
+        }
+
+
+@dataclass
+class PreparedUpload:
+    """
+    Ergebnis von ``prepare()`` — Eingabe von ``commit()``.
+
+    JSON-serialisierbar, damit beide Stufen als Celery-Chain laufen können.
+    ``substance_id`` None bedeutet: neue Substanz anlegen.
+    """
+
+    source_hash: str
+    parse_result: dict
+    tenant_id: str
+    pdf_name: str = ""
+    substance_id: int | None = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PreparedUpload":
+        return cls(**data)
+
 
 class SdsUploadPipeline:
     """
@@ -78,7 +121,6 @@ class SdsUploadPipeline:
         self.diff_service = SdsRevisionDiffService()
         self.supersession_service = SdsSupersessionService()
 
-    @transaction.atomic
     def process(
         self,
         pdf_bytes: bytes,
@@ -86,7 +128,7 @@ class SdsUploadPipeline:
         tenant_id: str,
     ) -> UploadResult:
         """
-        PDF durch die Pipeline verarbeiten.
+        PDF durch die Pipeline verarbeiten (``prepare`` + ``commit``).
 
         Args:
             pdf_bytes: Raw PDF content.
@@ -96,25 +138,116 @@ class SdsUploadPipeline:
         Returns:
             UploadResult mit Outcome und ggf. erstellter Revision.
         """
+        prepared = self.prepare(pdf_bytes, parse_result, tenant_id)
+        if isinstance(prepared, UploadResult):
+            return prepared
+        return self.commit(prepared)
+
+    def prepare(
+        self,
+        pdf_bytes: bytes,
+        parse_result: dict,
+        tenant_id: str,
+    ) -> PreparedUpload | UploadResult:
+        """
+        Vorbereitungsstufe — läuft ohne Transaktion.
+
+        Entfernte Aufrufe (PubChem, Speicher-Backend) und die
+        Fuzzy-Suche halten so keine DB-Transaktion offen.
+
+        Returns:
+            PreparedUpload für ``commit()`` oder ein abschließendes
+            UploadResult (DUPLICATE, IDENTITY_REVIEW).
+        """
         # ── Stufe 1: SHA-256 Deduplizierung ──
         source_hash = hashlib.sha256(pdf_bytes).hexdigest()
+        duplicate = self._find_duplicate(source_hash)
+        if duplicate:
+            return duplicate
+
+        # ── Stufe 1b: PubChem-Anreicherung ──
+        parse_result = self._enrich_pubchem(parse_result)
+
+        # ── Stufe 2: Identitätsauflösung ──
+        identity = self.identity_resolver.resolve(
+            cas_number=parse_result.get("cas_number", "") or None,
+            product_name=parse_result.get("product_name", ""),
+            manufacturer_name=parse_result.get("manufacturer_name", ""),
+        )
+
+        if identity.needs_user_confirmation:
+            return UploadResult(
+                outcome=UploadOutcome.IDENTITY_REVIEW,
+                substance=identity.substance,
+                message=(
+                    f"Match unsicher (conf={identity.confidence:.2f}). "
+                    f"Nutzerbestätigung erforderlich."
+                ),
+            )
+
+        return PreparedUpload(
+            source_hash=source_hash,
+            parse_result=parse_result,
+            tenant_id=str(tenant_id),
+            pdf_name=self.store_pdf(pdf_bytes, source_hash),
+            substance_id=None if identity.is_new_substance else identity.substance.pk,
+        )
+
+    def commit(self, prepared: PreparedUpload) -> UploadResult:
+        """
+        Commit-Stufe — eine kurze Transaktion.
+
+        Idempotent: ist ``source_hash`` bereits gespeichert (Wiederholung
+        oder paralleler Upload derselben PDF), ist das Ergebnis DUPLICATE.
+        """
+        try:
+            with transaction.atomic():
+                duplicate = self._find_duplicate(prepared.source_hash)
+                if duplicate:
+                    return duplicate
+                return self._commit_revision(prepared)
+        except IntegrityError:
+            # Paralleler Upload derselben PDF hat zuerst committet
+            duplicate = self._find_duplicate(prepared.source_hash)
+            if duplicate:
+                return duplicate
+            raise
+
+    @staticmethod
+    def store_pdf(pdf_bytes: bytes, source_hash: str = "") -> str:
+        """
+        PDF unter ihrem Hash ablegen und den Speichernamen liefern.
+
+        Der Name ist deterministisch — wiederholte Aufrufe legen die
+        Datei nicht erneut ab.
+        """
+        source_hash = source_hash or hashlib.sha256(pdf_bytes).hexdigest()
+        field = GlobalSdsRevision._meta.get_field("pdf_file")
+        name = field.generate_filename(None, f"{source_hash[:16]}.pdf")
+        if field.storage.exists(name):
+            return name
+        return field.storage.save(name, ContentFile(pdf_bytes))
 
+    @staticmethod
+    def _find_duplicate(source_hash: str) -> UploadResult | None:
         existing = GlobalSdsRevision.objects.filter(
             source_hash=source_hash,
         ).first()
-        if existing:
-            logger.info(
-                "Duplicate: hash %s already exists (rev %s)",
-                source_hash[:12],
-                existing.pk,
-            )
-            return UploadResult(
-                outcome=UploadOutcome.DUPLICATE,
-                revision=existing,
-                message="PDF bereits importiert (SHA-256 Match)",
-            )
+        if not existing:
+            return None
+        logger.info(
+            "Duplicate: hash %s already exists (rev %s)",
+            source_hash[:12],
+            existing.pk,
+        )
+        return UploadResult(
+            outcome=UploadOutcome.DUPLICATE,
+            revision=existing,
+            message="PDF bereits importiert (SHA-256 Match)",
+        )
 
-        # ── Stufe 1b: PubChem-Anreicherung ──
+    @staticmethod
+    def _enrich_pubchem(parse_result: dict) -> dict:
         try:
             from global_sds.services.pubchem_service import PubChemEnrichmentService
 
@@ -129,50 +262,38 @@ class SdsUploadPipeline:
                 )
         except Exception as exc:
             logger.warning("PubChem enrichment skipped: %s", exc)
+        return parse_result
 
-        # ── Stufe 2: Identitätsauflösung ──
-        cas_number = parse_result.get("cas_number", "")
-        product_name = parse_result.get("product_name", "")
-        manufacturer = parse_result.get("manufacturer_name", "")
-
-        identity = self.identity_resolver.resolve(
-            cas_number=cas_number or None,
-            product_name=product_name,
-            manufacturer_name=manufacturer,
-        )
-
-        if identity.needs_user_confirmation:
-            return UploadResult(
-                outcome=UploadOutcome.IDENTITY_REVIEW,
-                substance=identity.substance,
-                message=(
-                    f"Match unsicher (conf={identity.confidence:.2f}). "
-                    f"Nutzerbestätigung erforderlich."
-                ),
-            )
+    def _commit_revision(self, prepared: PreparedUpload) -> UploadResult:
+        """Substanz/Revision anlegen, Stufe 3 und Supersession — innerhalb der Transaktion."""
+        parse_result = prepared.parse_result
 
-        # Substanz bestimmen oder neu anlegen
-        if identity.is_new_substance:
-            substance = GlobalSubstance.objects.create(
-                cas_number=cas_number or None,
-                name=product_name,
-            )
-            revision = self._create_revision(
-                substance=substance,
-                source_hash=source_hash,
-                parse_result=parse_result,
-                tenant_id=tenant_id,
-                pdf_bytes=pdf_bytes,
-                initial=True,
-            )
-            return UploadResult(
-                outcome=UploadOutcome.NEW_SUBSTANCE,
-                revision=revision,
-                substance=substance,
-                message=f"Neue Substanz: {substance.name}",
+        if prepared.substance_id is None:
+            substance, created = self._create_substance(
+                cas_number=parse_result.get("cas_number", "") or None,
+                name=parse_result.get("product_name", ""),
             )
+            if created:
+                revision = self._create_revision(
+                    substance=substance,
+                    source_hash=prepared.source_hash,
+                    parse_result=parse_result,
+                    tenant_id=prepared.tenant_id,
+                    pdf_name=prepared.pdf_name,
+                    initial=True,
+                )
+                return UploadResult(
+                    outcome=UploadOutcome.NEW_SUBSTANCE,
+                    revision=revision,
+                    substance=substance,
+                    message=f"Neue Substanz: {substance.name}",
+                )
+            substance_id = substance.pk
+        else:
+            substance_id = prepared.substance_id
 
-        substance = identity.substance
+        # Parallele Revisionen derselben Substanz nacheinander prüfen
+        substance = GlobalSubstance.objects.select_for_update().get(pk=substance_id)
 
         # ── Stufe 3: Versionserkennung ──
         from datetime import date
@@ -205,10 +326,10 @@ class SdsUploadPipeline:
         is_first = version.outcome == VersionOutcome.FIRST_REVISION
         revision = self._create_revision(
             substance=substance,
-            source_hash=source_hash,
+            source_hash=prepared.source_hash,
             parse_result=parse_result,
-            tenant_id=tenant_id,
-            pdf_bytes=pdf_bytes,
+            tenant_id=prepared.tenant_id,
+            pdf_name=prepared.pdf_name,
             initial=is_first,
         )
 
@@ -238,13 +359,35 @@ class SdsUploadPipeline:
             superseded_count=superseded_count,
         )
 
+    @staticmethod
+    def _create_substance(cas_number: str | None, name: str) -> tuple[GlobalSubstance, bool]:
+        """
+        Substanz anlegen — (substance, created).
+
+        Hat ein paralleler Upload dieselbe CAS-Nummer zuerst angelegt,
+        wird dessen Substanz geliefert.
+        """
+        try:
+            with transaction.atomic():
+                return GlobalSubstance.objects.create(cas_number=cas_number, name=name), True
+        except IntegrityError:
+            normalized = _normalize_cas(cas_number)
+            existing = (
+                GlobalSubstance.objects.filter(cas_number_normalized=normalized).first()
+                if normalized
+                else None
+            )
+            if existing is None:
+                raise
+            return existing, False
+
     def _create_revision(
         self,
         substance: GlobalSubstance,
         source_hash: str,
         parse_result: dict,
         tenant_id: str,
-        pdf_bytes: bytes | None = None,
+        pdf_name: str = "",
         initial: bool = False,
     ) -> GlobalSdsRevision:
         """Revision erstellen — Felder via sync_fields_from_raw_data() befüllen."""
@@ -262,7 +405,7 @@ class SdsUploadPipeline:
             source_hash=source_hash,
             status=status,
             uploaded_by_tenant_id=tenant_id,
-            pdf_file=ContentFile(pdf_bytes, name=f"{source_hash[:16]}.pdf") if pdf_bytes else None,
+            pdf_file=pdf_name or None,
             raw_data=parse_result,
             llm_corrections=parse_result.get("llm_corrections", []),
             product_name=parse_result.get("product_name", "") or "",
@@ -0,0 +1,145 @@
+"""
+Global SDS Celery-Tasks.
+
+prepare_sds_upload — Upload-Vorbereitung (Anreicherung, Identität) ohne Transaktion
+commit_sds_upload  — kurze Commit-Transaktion (Revision, Version, Supersession)
+
+Beide Tasks bilden eine Chain (``sds_upload_chain``). Massen-Uploads
+(``sds_bulk_upload``) laufen als Celery-Group, je PDF eine Chain; ohne
+``parse_result`` parst ``prepare_sds_upload`` die PDF selbst über den
+SHA-256-Cache von ``SdsParserService`` — identische PDFs werden nie erneut
+per OCR extrahiert oder geparst.
+
+Wiederholungen sind sicher: der SHA-256 der PDF ist Idempotenzschlüssel.
+"""
+
+import logging
+from collections.abc import Iterable
+
+from celery import chain, group, shared_task
+from django.db import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    bind=True,
+    name="global_sds.tasks.prepare_sds_upload",
+    max_retries=3,
+    default_retry_delay=30,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def prepare_sds_upload(
+    self, pdf_name: str, parse_result: dict | None, tenant_id: str, filename: str = ""
+) -> dict:
+    """
+    Vorbereitungsstufe für eine abgelegte PDF (``SdsUploadPipeline.store_pdf``).
+
+    ``parse_result`` None: PDF hier parsen (SHA-256-Cache, ``parse_sds_bytes``);
+    ``filename`` ist der ursprüngliche Dateiname (Fallback für den Produktnamen).
+
+    Returns:
+        ``PreparedUpload.to_dict()`` oder — bei DUPLICATE/IDENTITY_REVIEW —
+        ``UploadResult.to_dict()``.
+    """
+    from global_sds.models import GlobalSdsRevision
+    from global_sds.services.upload_pipeline import SdsUploadPipeline
+
+    storage = GlobalSdsRevision._meta.get_field("pdf_file").storage
+    try:
+        with storage.open(pdf_name, "rb") as fh:
+            pdf_bytes = fh.read()
+        if parse_result is None:
+            parse_result = parse_sds_bytes(pdf_bytes, filename or pdf_name)
+        prepared = SdsUploadPipeline().prepare(pdf_bytes, parse_result, tenant_id)
+    except FileNotFoundError:
+        logger.error("[SDS Upload] Staged PDF not found: %s", pdf_name)
+        return {"error": "not_found", "pdf_name": pdf_name}
+    except (DatabaseError, OSError) as exc:
+        logger.warning("[SDS Upload] Prepare failed for %s: %s", pdf_name, exc)
+        raise self.retry(exc=exc) from exc
+
+    return prepared.to_dict()
+
+
+@shared_task(
+    bind=True,
+    name="global_sds.tasks.commit_sds_upload",
+    max_retries=3,
+    default_retry_delay=10,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def commit_sds_upload(self, prepared: dict) -> dict:
+    """
+    Commit-Stufe; reicht abschließende Ergebnisse der Vorbereitung durch.
+
+    Returns:
+        ``UploadResult.to_dict()``.
+    """
+    from global_sds.services.upload_pipeline import PreparedUpload, SdsUploadPipeline
+
+    if "source_hash" not in prepared:
+        return prepared
+
+    upload = PreparedUpload.from_dict(prepared)
+    try:
+        result = SdsUploadPipeline().commit(upload)
+    except DatabaseError as exc:
+        logger.warning("[SDS Upload] Commit failed for %s: %s", upload.source_hash[:12], exc)
+        raise self.retry(exc=exc) from exc
+
+    logger.info(
+        "[SDS Upload] %s: %s (rev %s)",
+        upload.source_hash[:12],
+        result.outcome,
+        result.revision.pk if result.revision else None,
+    )
+    return result.to_dict()
+
+
+def parse_sds_bytes(pdf_bytes: bytes, filename: str = "") -> dict:
+    """
+    SDS-PDF parsen (Cache nach SHA-256).
+
+    Parserfehler ergeben wie beim Einzel-Upload Konfidenz 0 und den
+    Dateinamen als Produktnamen (plus ``_error``); die Revision bleibt PENDING.
+    """
+    from substances.services.sds_parser import SdsParserService
+
+    try:
+        return SdsParserService().parse_pdf_bytes(pdf_bytes)
+    except Exception as exc:
+        logger.warning("[SDS Upload] Parser error for %s: %s", filename, exc)
+        return {
+            "product_name": filename.replace(".pdf", ""),
+            "parse_confidence": 0.0,
+            "_error": f"{type(exc).__name__}: {exc}",
+        }
+
+
+def sds_upload_chain(
+    pdf_bytes: bytes, parse_result: dict | None, tenant_id: str, filename: str = ""
+):
+    """PDF ablegen und die Chain prepare → commit als Signatur liefern."""
+    from global_sds.services.upload_pipeline import SdsUploadPipeline
+
+    pdf_name = SdsUploadPipeline.store_pdf(pdf_bytes)
+    return chain(
+        prepare_sds_upload.s(pdf_name, parse_result, str(tenant_id), filename),
+        commit_sds_upload.s(),
+    )
+
+
+def sds_bulk_upload(pdfs: Iterable[tuple[str, bytes]], tenant_id: str):
+    """
+    Massen-Upload (Ordner, viele Dateien) als Celery-Group.
+
+    ``pdfs`` sind (Dateiname, PDF-Bytes); je PDF eine Chain parse/prepare →
+    commit, die Worker parsen parallel.
+    Aufruf: ``sds_bulk_upload(pdfs, tenant_id).apply_async()``.
+    """
+    return group(
+        sds_upload_chain(pdf_bytes, None, tenant_id, filename) for filename, pdf_bytes in pdfs
+    )
@@ -171,3 +171,38 @@ class TestPersistDiff:
         record2 = svc.persist_diff(old, new, diff)
         assert record1.pk == record2.pk
         assert SdsRevisionDiffRecord.objects.count() == 1
+
+
+class TestBatchDiff:
+    """compute_diffs / persist_diffs for many revision pairs."""
+
+    def _pairs(self, count):
+        pairs = []
+        for i in range(count):
+            substance = GlobalSubstanceFactory()
+            old = GlobalSdsRevisionFactory(substance=substance, wgk=1, source_hash=f"o{i}" * 32)
+            new = GlobalSdsRevisionFactory(substance=substance, wgk=3, source_hash=f"n{i}" * 32)
+            pairs.append((old.pk, new.pk))
+        return pairs
+
+    def test_should_load_revisions_and_h_codes_once(self, django_assert_num_queries):
+        pairs = self._pairs(5)
+        svc = SdsRevisionDiffService()
+
+        with django_assert_num_queries(2):
+            diffs = svc.compute_diffs(pairs)
+
+        assert list(diffs) == pairs
+        assert all(d.overall_impact == ImpactLevel.REGULATORY for d in diffs.values())
+
+    def test_should_persist_batch_idempotently(self):
+        pairs = self._pairs(3)
+        svc = SdsRevisionDiffService()
+        diffs = svc.compute_diffs(pairs)
+
+        first = svc.persist_diffs(diffs)
+        second = svc.persist_diffs(diffs)
+
+        assert len(first) == 3
+        assert {r.pk for r in first} == {r.pk for r in second}
+        assert SdsRevisionDiffRecord.objects.count() == 3
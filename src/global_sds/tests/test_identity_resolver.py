@@ -2,8 +2,15 @@
 """Tests for SdsIdentityResolver (ADR-012 §5 Stufe 2)."""
 
 import pytest
-
-from global_sds.services.identity_resolver import SdsIdentityResolver
+from django.db import connection
+
+from global_sds.models import GlobalSubstanceAlias
+from global_sds.services import identity_resolver
+from global_sds.services.identity_resolver import (
+    SdsIdentityResolver,
+    trigram_similarity,
+    trigrams,
+)
 from global_sds.tests.factories import GlobalSubstanceFactory
 
 pytestmark = pytest.mark.django_db
@@ -127,3 +134,56 @@ class TestEdgeCases:
         )
         assert result is not None
         assert result.match_type in ("fuzzy", "none")
+
+
+class TestSubstanceAliases:
+    """GlobalSubstanceAlias — Namen und Synonyme als Trigramm-Suchindex."""
+
+    def test_should_sync_aliases_on_save(self, substance_acetone):
+        assert dict(substance_acetone.aliases.values_list("name", "kind")) == {
+            "Aceton": "name",
+            "Acetone": "synonym",
+            "2-Propanon": "synonym",
+            "Dimethylketon": "synonym",
+        }
+
+        substance_acetone.synonyms = ["ACETON", "Propan-2-on"]
+        substance_acetone.save()
+
+        assert sorted(substance_acetone.aliases.values_list("name", flat=True)) == [
+            "Aceton",
+            "Propan-2-on",
+        ]
+
+    def test_should_match_synonym_in_one_query(self, substance_acetone, substance_toluene):
+        resolver = SdsIdentityResolver()
+
+        result = resolver._pg_trgm_match("methylbenzol")
+
+        assert result.substance == substance_toluene
+        assert result.confidence == 1.0
+
+    def test_should_fall_back_to_ngram_index(self, monkeypatch, substance_acetone):
+        monkeypatch.setattr(identity_resolver, "ALIAS_MATCH_SQL", "SELECT no_such_function()")
+
+        result = SdsIdentityResolver().resolve(cas_number=None, product_name="Dimethylketon")
+
+        assert result.substance == substance_acetone
+        assert result.confidence == 1.0
+        # Savepoint: the surrounding transaction is still usable
+        assert GlobalSubstanceAlias.objects.filter(substance=substance_acetone).count() == 4
+
+    @pytest.mark.parametrize(
+        ("a", "b"),
+        [
+            ("Aceton", "aceton technisch"),
+            ("Ethanol absolut", "ethanol technisch 96%"),
+            ("2-Propanon", "propanon"),
+        ],
+    )
+    def test_ngram_similarity_should_match_pg_trgm(self, db, a, b):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT similarity(lower(%s), lower(%s))", [a, b])
+            expected = cursor.fetchone()[0]
+
+        assert trigram_similarity(trigrams(a), trigrams(b)) == pytest.approx(expected, abs=1e-6)
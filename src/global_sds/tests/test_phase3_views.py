@@ -225,3 +225,43 @@ class TestProgressRegistry:
             service_cls = _import_class(service_path)
             assert model_cls is not None
             assert service_cls is not None
+
+
+# ── SDS Upload View ──────────────────────────────────────────────────
+
+
+class TestSdsUploadView:
+    def _post(self, rf, tenant_id, files):
+        from django.contrib.messages.storage.fallback import FallbackStorage
+
+        from global_sds.views import sds_upload
+        from tests.factories import UserFactory
+
+        request = rf.post("/global-sds/upload/", {"pdf_file": files})
+        request.user = UserFactory()
+        request.tenant_id = tenant_id
+        request.session = {}
+        request._messages = FallbackStorage(request)
+        return sds_upload(request)
+
+    def test_should_reject_upload_without_file(self, rf, tenant_id):
+        response = self._post(rf, tenant_id, [])
+
+        assert response.status_code == 200
+        assert "Dieses Feld ist zwingend erforderlich." in response.content.decode()
+
+    def test_should_dispatch_bulk_upload_with_filenames(self, rf, tenant_id):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        files = [
+            SimpleUploadedFile(f"{name}.pdf", name.encode(), "application/pdf")
+            for name in ("Aceton", "Toluol")
+        ]
+
+        with patch("global_sds.tasks.sds_bulk_upload") as bulk:
+            response = self._post(rf, tenant_id, files)
+
+        assert response.status_code == 302
+        pdfs, tid = bulk.call_args.args
+        assert list(pdfs) == [("Aceton.pdf", b"Aceton"), ("Toluol.pdf", b"Toluol")]
+        assert tid == str(tenant_id)
@@ -0,0 +1,132 @@
+# src/global_sds/tests/test_pubchem_client.py
+"""Tests for PubChemClient — persistent cache, negative caching, batching, offline source."""
+
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from global_sds.models import PubChemCompound, PubChemIdentifier
+from global_sds.services.pubchem_client import LocalPubChemSource, PubChemClient
+from global_sds.services.pubchem_service import PubChemEnrichmentService
+from global_sds.services.upload_pipeline import SdsUploadPipeline
+
+pytestmark = pytest.mark.django_db
+
+ACETONE = {
+    "cid": 180,
+    "identifiers": ["67-64-1", "Aceton", "Acetone"],
+    "properties": {"CID": 180, "IUPACName": "propan-2-one", "MolecularFormula": "C3H6O"},
+    "ghs": {"h_statements": ["H225", "H319"], "pictograms": ["GHS02"], "signal_word": "danger"},
+}
+TOLUENE = {
+    "cid": 1140,
+    "identifiers": ["108-88-3", "Toluol"],
+    "properties": {"CID": 1140, "IUPACName": "toluene", "MolecularFormula": "C7H8"},
+    "ghs": {"h_statements": ["H225", "H304"]},
+}
+
+
+class RecordingSource(LocalPubChemSource):
+    """Local stand-in that records every call."""
+
+    def __init__(self, records=(ACETONE, TOLUENE), fail=False):
+        super().__init__(list(records))
+        self.calls = []
+        self.fail = fail
+
+    def resolve_cid(self, identifier):
+        self.calls.append(("cid", identifier))
+        if self.fail:
+            raise ConnectionError("offline")
+        return super().resolve_cid(identifier)
+
+    def fetch_properties(self, cids):
+        self.calls.append(("properties", tuple(cids)))
+        return super().fetch_properties(cids)
+
+    def fetch_ghs(self, cid):
+        self.calls.append(("ghs", cid))
+        return super().fetch_ghs(cid)
+
+
+class TestPubChemClient:
+    def test_should_batch_properties_for_many_cids(self):
+        source = RecordingSource()
+
+        records = PubChemClient(source).lookup_many(["67-64-1", " Toluol ", "unbekannt"])
+
+        assert records["67-64-1"].properties["IUPACName"] == "propan-2-one"
+        assert records["toluol"].ghs["h_statements"] == ["H225", "H304"]
+        assert records["unbekannt"] is None
+        assert [c for c in source.calls if c[0] == "properties"] == [("properties", (180, 1140))]
+
+    def test_should_serve_repeat_lookups_from_cache(self):
+        PubChemClient(RecordingSource()).lookup_many(["67-64-1", "unbekannt"])
+        offline = RecordingSource(fail=True)
+
+        client = PubChemClient(offline)
+        records = client.lookup_many(["67-64-1", "unbekannt"])
+
+        assert records["67-64-1"].cid == 180
+        assert records["unbekannt"] is None
+        assert offline.calls == []
+        assert client.errors == []
+        assert PubChemIdentifier.objects.get(identifier="unbekannt").cid is None
+
+    def test_should_expire_negative_entries_sooner(self, settings):
+        settings.PUBCHEM_NEGATIVE_CACHE_DAYS = 7
+        PubChemClient(RecordingSource()).lookup_many(["67-64-1", "unbekannt"])
+        PubChemIdentifier.objects.update(fetched_at=timezone.now() - timedelta(days=8))
+        source = RecordingSource()
+
+        PubChemClient(source).lookup_many(["67-64-1", "unbekannt"])
+
+        assert source.calls == [("cid", "unbekannt")]
+
+    def test_should_not_cache_failures(self):
+        client = PubChemClient(RecordingSource(fail=True))
+
+        assert client.lookup("67-64-1") is None
+        assert client.errors == ["67-64-1: offline"]
+        assert not PubChemIdentifier.objects.exists()
+        assert not PubChemCompound.objects.exists()
+
+
+class TestPubChemEnrichment:
+    def test_should_fall_back_to_product_name(self):
+        service = PubChemEnrichmentService(PubChemClient(RecordingSource()))
+
+        results = service.enrich_many(
+            [
+                {"cas_number": "67-64-1", "product_name": "Irgendwas"},
+                {"cas_number": "", "product_name": "Toluol"},
+                {"cas_number": "", "product_name": ""},
+            ]
+        )
+
+        assert [r.cid for r in results] == [180, 1140, None]
+        assert results[0].h_statements == ["H225", "H319"]
+        assert results[1].enriched is True
+
+    def test_should_enrich_outside_pipeline_transaction(self, monkeypatch, tenant_id):
+        outer_blocks = len(connection.atomic_blocks)
+        seen = []
+
+        def fake_enrich(self, parse_result):
+            seen.append(len(connection.atomic_blocks))
+            return PubChemEnrichmentService._to_result(
+                PubChemClient(RecordingSource()).lookup("67-64-1")
+            )
+
+        monkeypatch.setattr(PubChemEnrichmentService, "enrich", fake_enrich)
+
+        result = SdsUploadPipeline().process(
+            b"pubchem-outside-tx",
+            {"cas_number": "67-64-1", "product_name": "Aceton", "parse_confidence": 0.95},
+            str(tenant_id),
+        )
+
+        assert seen == [outer_blocks]
+        assert result.revision.raw_data["_pubchem"]["cid"] == 180
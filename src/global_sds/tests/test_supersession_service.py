@@ -1,6 +1,7 @@
 # src/global_sds/tests/test_supersession_service.py
 """Tests for SdsSupersessionService (ADR-012 §6.2)."""
 
+import uuid
 from datetime import date, timedelta
 from unittest.mock import patch
 
@@ -8,7 +9,7 @@ import pytest
 
 from global_sds.models import GlobalSdsRevision, ImpactLevel
 from global_sds.sds_usage import SdsUsageStatus
-from global_sds.services.supersession_service import SdsSupersessionService
+from global_sds.services.supersession_service import SUPERSESSION_TOPIC, SdsSupersessionService
 from global_sds.tests.factories import (
     GlobalSdsRevisionFactory,
     GlobalSubstanceFactory,
@@ -248,3 +249,151 @@ class TestDownstreamFlagging:
         svc.supersede(old, new, diff)
 
         mock_flag.assert_not_called()
+
+
+class TestSupersedeMany:
+    """Batch supersession with blast radius."""
+
+    def _pair(self, i, old_flash, new_flash):
+        substance = GlobalSubstanceFactory()
+        old = GlobalSdsRevisionFactory(
+            substance=substance,
+            status="VERIFIED",
+            flash_point_c=old_flash,
+            source_hash=f"o{i}" * 32,
+        )
+        new = GlobalSdsRevisionFactory(
+            substance=substance,
+            status="PENDING",
+            flash_point_c=new_flash,
+            source_hash=f"n{i}" * 32,
+        )
+        return old, new
+
+    def test_should_supersede_batch_and_report_blast_radius(self, db, user, tenant_id, tenant_id_b):
+        from explosionsschutz.models import Area, ConceptSubstanceReference, ExplosionConcept
+
+        critical_old, critical_new = self._pair(1, -20, -10)
+        info_old, info_new = self._pair(2, 5, 5)
+        for tid in (tenant_id, tenant_id_b):
+            SdsUsageFactory(
+                tenant_id=tid,
+                sds_revision=critical_old,
+                status=SdsUsageStatus.ACTIVE,
+                approved_by=user,
+            )
+        SdsUsageFactory(
+            tenant_id=tenant_id,
+            sds_revision=info_old,
+            status=SdsUsageStatus.ACTIVE,
+            approved_by=user,
+        )
+        area = Area.objects.create(
+            tenant_id=tenant_id, site_id=uuid.uuid4(), code="EX-1", name="Abfüllung"
+        )
+        concepts = [
+            ExplosionConcept.objects.create(
+                tenant_id=tenant_id,
+                area=area,
+                substance_id=uuid.uuid4(),
+                title=f"Konzept {revision.pk}",
+                status=ExplosionConcept.Status.APPROVED,
+            )
+            for revision in (critical_old, info_old)
+        ]
+        for concept, revision in zip(concepts, (critical_old, info_old), strict=True):
+            ConceptSubstanceReference.objects.create(
+                tenant_id=tenant_id, concept=concept, sds_revision=revision, role="PRIMARY"
+            )
+
+        result = SdsSupersessionService().supersede_many(
+            [(critical_old.pk, critical_new.pk), (info_old.pk, info_new.pk)]
+        )
+
+        assert result.as_dict() == {
+            "superseded": 2,
+            "affected_usages": 3,
+            "affected_tenants": sorted({str(tenant_id), str(tenant_id_b)}),
+            "impacts": {ImpactLevel.SAFETY_CRITICAL: 2, ImpactLevel.INFORMATIONAL: 1},
+            "flagged_gbu_activities": 0,
+            "flagged_ex_concepts": 1,
+        }
+        critical_old.refresh_from_db()
+        assert critical_old.status == GlobalSdsRevision.Status.SUPERSEDED
+        assert critical_old.superseded_by == critical_new
+        assert critical_old.usages.filter(status=SdsUsageStatus.REVIEW_REQUIRED).count() == 2
+        concepts[0].refresh_from_db()
+        concepts[1].refresh_from_db()
+        assert concepts[0].status == ExplosionConcept.Status.REVIEW_REQUIRED
+        assert concepts[1].status == ExplosionConcept.Status.APPROVED
+
+    def test_should_write_outbox_events(self, db, user, tenant_id, tenant_id_b):
+        from outbox.models import OutboxMessage
+
+        old, new = self._pair(3, -20, -10)
+        usages = [
+            SdsUsageFactory(
+                tenant_id=tid, sds_revision=old, status=SdsUsageStatus.ACTIVE, approved_by=user
+            )
+            for tid in (tenant_id, tenant_id_b)
+        ]
+
+        SdsSupersessionService().supersede_many([(old.pk, new.pk)])
+
+        messages = OutboxMessage.objects.filter(topic=SUPERSESSION_TOPIC)
+        assert sorted(m.payload["sds_usage_id"] for m in messages) == sorted(u.pk for u in usages)
+        assert {m.tenant_id for m in messages} == {tenant_id, tenant_id_b}
+        message = messages.first()
+        assert message.aggregate_type == "SdsUsage"
+        assert message.payload["new_revision_id"] == str(new.pk)
+        assert message.payload["impact_level"] == ImpactLevel.SAFETY_CRITICAL
+
+    def test_should_flag_gbu_by_normalized_cas(self, db, user, tenant_id):
+        from django.utils import timezone
+
+        from gbu.models.activity import ActivityStatus, HazardAssessmentActivity
+        from substances.models import Identifier, SdsRevision, Substance
+        from tenancy.models import Organization, Site
+
+        old, new = self._pair(4, -20, -10)
+        old.substance.cas_number = "67-64-1"
+        old.substance.save(update_fields=["cas_number"])
+        SdsUsageFactory(
+            tenant_id=tenant_id, sds_revision=old, status=SdsUsageStatus.ACTIVE, approved_by=user
+        )
+        org = Organization.objects.create(tenant_id=tenant_id, name="Test GmbH", slug="test-gmbh")
+        site = Site.objects.create(tenant_id=tenant_id, organization=org, name="Werk")
+        substance = Substance.objects.create(tenant_id=tenant_id, name="Aceton")
+        Identifier.objects.create(
+            tenant_id=tenant_id,
+            substance=substance,
+            id_type=Identifier.IdType.CAS,
+            id_value="67 64 1",
+        )
+        activity = HazardAssessmentActivity.objects.create(
+            tenant_id=tenant_id,
+            site=site,
+            sds_revision=SdsRevision.objects.create(
+                tenant_id=tenant_id, substance=substance, revision_date=date.today()
+            ),
+            activity_description="Umfüllen",
+            activity_frequency="weekly",
+            duration_minutes=30,
+            quantity_class="s",
+            status=ActivityStatus.APPROVED,
+            approved_by_id=uuid.uuid4(),
+            approved_by_name="Max Mustermann",
+            approved_at=timezone.now(),
+        )
+
+        result = SdsSupersessionService().supersede_many([(old.pk, new.pk)])
+
+        activity.refresh_from_db()
+        assert result.flagged_gbu_activities == 1
+        assert activity.status == ActivityStatus.OUTDATED
+
+    def test_should_ignore_empty_batch(self, db):
+        result = SdsSupersessionService().supersede_many([])
+
+        assert result.superseded == 0
+        assert result.affected_tenants == set()
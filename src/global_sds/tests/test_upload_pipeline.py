@@ -6,7 +6,11 @@ import hashlib
 import pytest
 
 from global_sds.models import GlobalSdsRevision, GlobalSubstance
-from global_sds.services.upload_pipeline import SdsUploadPipeline, UploadOutcome
+from global_sds.services.upload_pipeline import (
+    PreparedUpload,
+    SdsUploadPipeline,
+    UploadOutcome,
+)
 from global_sds.tests.factories import GlobalSdsRevisionFactory
 
 pytestmark = pytest.mark.django_db
@@ -148,3 +152,102 @@ class TestEndToEnd:
         assert result.revision.product_name == "Cyclohexan"
         assert result.revision.flash_point_c == -20
         assert result.revision.uploaded_by_tenant_id == str(tenant_id)
+
+
+class TestStagedUpload:
+    """prepare() ohne Transaktion, commit() idempotent über source_hash."""
+
+    @pytest.fixture(autouse=True)
+    def _media(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_should_prepare_without_writing_rows(self, db, tenant_id):
+        prepared = SdsUploadPipeline().prepare(
+            _make_pdf("staged-pdf"), _make_parse_result(product_name="Staged"), str(tenant_id)
+        )
+
+        assert isinstance(prepared, PreparedUpload)
+        assert PreparedUpload.from_dict(prepared.to_dict()) == prepared
+        assert prepared.pdf_name.endswith(f"{prepared.source_hash[:16]}.pdf")
+        assert not GlobalSubstance.objects.exists()
+        assert not GlobalSdsRevision.objects.exists()
+
+    def test_should_commit_retry_as_duplicate(self, db, tenant_id):
+        pipeline = SdsUploadPipeline()
+        prepared = pipeline.prepare(
+            _make_pdf("retry-pdf"), _make_parse_result(product_name="Retry"), str(tenant_id)
+        )
+
+        first = pipeline.commit(prepared)
+        retry = pipeline.commit(prepared)
+
+        assert first.outcome == UploadOutcome.NEW_SUBSTANCE
+        assert retry.outcome == UploadOutcome.DUPLICATE
+        assert retry.revision == first.revision
+        assert GlobalSdsRevision.objects.count() == 1
+
+    def test_should_not_duplicate_substance_for_concurrent_cas(self, db, tenant_id):
+        pipeline = SdsUploadPipeline()
+        parse = _make_parse_result(cas_number="110-82-7", product_name="Cyclohexan")
+        first = pipeline.prepare(_make_pdf("cyclohexan-a"), parse, str(tenant_id))
+        second = pipeline.prepare(
+            _make_pdf("cyclohexan-b"),
+            {**parse, "revision_date": "2025-09-01", "version_number": "2.0"},
+            str(tenant_id),
+        )
+        assert first.substance_id is None and second.substance_id is None
+
+        pipeline.commit(first)
+        result = pipeline.commit(second)
+
+        assert result.outcome == UploadOutcome.NEW_REVISION
+        assert GlobalSubstance.objects.count() == 1
+        assert result.revision.substance_id == GlobalSubstance.objects.get().pk
+
+    def test_should_run_as_celery_chain(self, db, tenant_id):
+        from global_sds.tasks import sds_upload_chain
+
+        pdf = _make_pdf("chain-pdf")
+        parse = _make_parse_result(product_name="Chain Reiniger")
+
+        result = sds_upload_chain(pdf, parse, str(tenant_id)).apply().get()
+        again = sds_upload_chain(pdf, parse, str(tenant_id)).apply().get()
+
+        revision = GlobalSdsRevision.objects.get()
+        assert result["outcome"] == UploadOutcome.NEW_SUBSTANCE
+        assert result["revision_id"] == revision.pk
+        assert again["outcome"] == UploadOutcome.DUPLICATE
+        assert revision.pdf_file.read() == pdf
+
+    def test_should_bulk_upload_as_group_with_parse_cache(self, db, tenant_id, monkeypatch):
+        from global_sds.tasks import sds_bulk_upload
+        from substances.services.sds_parser import SdsParserService
+
+        parsed = []
+
+        def fake_parse(self, data):
+            parsed.append(data)
+            if data == b"broken":
+                raise ValueError("kein PDF")
+            return _make_parse_result(product_name=data.decode().title())
+
+        monkeypatch.setattr(SdsParserService, "_parse_bytes", fake_parse)
+        pdfs = [
+            ("aceton.pdf", _make_pdf("aceton-sds")),
+            ("toluol.pdf", _make_pdf("toluol-sds")),
+            ("aceton-kopie.pdf", _make_pdf("aceton-sds")),
+            ("Reiniger X.pdf", b"broken"),
+        ]
+
+        results = sds_bulk_upload(pdfs, str(tenant_id)).apply().get()
+
+        assert [r["outcome"] for r in results] == [
+            UploadOutcome.NEW_SUBSTANCE,
+            UploadOutcome.NEW_SUBSTANCE,
+            UploadOutcome.DUPLICATE,
+            UploadOutcome.NEW_SUBSTANCE,
+        ]
+        assert parsed == [b"aceton-sds", b"toluol-sds", b"broken"]
+        broken = GlobalSdsRevision.objects.get(pk=results[3]["revision_id"])
+        assert broken.status == GlobalSdsRevision.Status.PENDING
+        assert broken.product_name == broken.substance.name == "Reiniger X"
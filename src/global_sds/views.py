@@ -177,10 +177,23 @@ def sds_upload(request: HttpRequest) -> HttpResponse:
             {"form": form},
         )
 
-    pdf_file = request.FILES["pdf_file"]
-    pdf_bytes = pdf_file.read()
+    pdf_files = form.cleaned_data["pdf_file"]
     tenant_id = _tenant_id(request)
 
+    if len(pdf_files) > 1:
+        # Massen-Upload: je PDF ein Celery-Task, geparst über den SHA-256-Cache
+        from global_sds.tasks import sds_bulk_upload
+
+        sds_bulk_upload(((f.name, f.read()) for f in pdf_files), str(tenant_id)).apply_async()
+        messages.info(
+            request,
+            f"{len(pdf_files)} SDS-Dateien werden im Hintergrund verarbeitet.",
+        )
+        return redirect("global_sds:dashboard")
+
+    pdf_file = pdf_files[0]
+    pdf_bytes = pdf_file.read()
+
     # Parser aufrufen
     try:
         import io
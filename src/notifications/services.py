@@ -1,12 +1,29 @@
 """Notification service — creation, delivery, deadline scanning."""
 
 import logging
+import time
+from collections import Counter
 from datetime import date, timedelta
 from uuid import UUID
 
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    Exists,
+    F,
+    Func,
+    OuterRef,
+    Q,
+    UUIDField,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, LPad
 from django.utils import timezone
 
+from dashboard.services import invalidate_compliance_kpis
 from notifications.models import Notification
 
 logger = logging.getLogger(__name__)
@@ -29,7 +46,7 @@ def create_notification(
     action_url: str = "",
 ) -> Notification:
     """Create and persist a notification."""
-    return Notification.objects.create(
+    notification = Notification.objects.create(
         tenant_id=tenant_id,
         recipient_id=recipient_id,
         category=category,
@@ -40,6 +57,8 @@ def create_notification(
         entity_id=entity_id,
         action_url=action_url,
     )
+    invalidate_compliance_kpis(tenant_id)
+    return notification
 
 
 def get_unread(
@@ -82,7 +101,10 @@ def mark_all_read(
     )
     if user_id:
         qs = qs.filter(Q(recipient_id=user_id) | Q(recipient_id__isnull=True))
-    return qs.update(is_read=True, read_at=timezone.now())
+    updated = qs.update(is_read=True, read_at=timezone.now())
+    if updated:
+        invalidate_compliance_kpis(tenant_id)
+    return updated
 
 
 # ------------------------------------------------------------------
@@ -90,101 +112,197 @@ def mark_all_read(
 # ------------------------------------------------------------------
 
 DEFAULT_THRESHOLDS = [30, 7, 3, 1, 0]  # days before due
+SCAN_BATCH_SIZE = 500
+SCAN_SUMMARY_TOPIC = "inspection.deadlines_scanned"
+_EQUIPMENT_ENTITY = "explosionsschutz.Equipment"
+
+
+def _scheduled_equipment(tenant_ids=None):
+    """Equipment with a next_inspection_date (optionally for some tenants)."""
+    from explosionsschutz.models import Equipment
+
+    qs = Equipment.objects.filter(next_inspection_date__isnull=False)
+    if tenant_ids is not None:
+        qs = qs.filter(tenant_id__in=list(tenant_ids))
+    return qs
+
+
+def tenants_with_due_inspections(threshold_days: list[int] | None = None) -> list[UUID]:
+    """Tenant IDs with at least one inspection inside the threshold window."""
+    thresholds = threshold_days or DEFAULT_THRESHOLDS
+    today = date.today()
+    return list(
+        _scheduled_equipment()
+        .filter(next_inspection_date__lte=today + timedelta(days=max(thresholds)))
+        .values_list("tenant_id", flat=True)
+        .distinct()
+    )
+
+
+def _int_id_as_uuid(field: str):
+    """SQL twin of ``UUID(int=pk)`` — how integer entity ids are stored in entity_id."""
+    hex_id = Func(F(field), function="TO_HEX", output_field=CharField())
+    return Cast(LPad(hex_id, 32, Value("0")), UUIDField())
+
+
+def _equipment_type_label(row: dict) -> str:
+    label = f"{row['equipment_type__manufacturer']} {row['equipment_type__model']}".strip()
+    return label or "–"
+
+
+def _inspection_title(serial_number: str, days_until: int) -> str:
+    if days_until < 0:
+        return f"Prüfung überfällig: {serial_number} (seit {abs(days_until)} Tagen)"
+    if days_until == 0:
+        return f"Prüfung heute fällig: {serial_number}"
+    return f"Prüfung in {days_until} Tagen: {serial_number}"
 
 
 def scan_inspection_deadlines(
     threshold_days: list[int] | None = None,
+    tenant_ids: list[UUID] | None = None,
+    batch_size: int = SCAN_BATCH_SIZE,
 ) -> dict:
     """
-    Scan all tenants for upcoming/overdue equipment inspections.
+    Scan tenants for upcoming/overdue equipment inspections.
 
     Creates notifications for equipment whose next_inspection_date
-    falls within one of the threshold windows. Skips if a matching
-    notification already exists for the same entity + category +
-    date window.
-
-    Returns summary dict with counts per severity.
+    falls within the threshold window. Skips if a matching
+    notification already exists for the same entity + category
+    since yesterday.
+
+    Set-based: severity and category are bucketed in SQL, existing
+    notifications are excluded by an anti-join, and the new rows are
+    written with ``bulk_create`` in chunks of ``batch_size``. One
+    ``inspection.deadlines_scanned`` outbox event per affected tenant
+    is written the same way. ``tenant_ids`` restricts the scan to a
+    partition (Celery fan-out).
+
+    Returns summary dict with counts and throughput.
     """
-    from explosionsschutz.models import Equipment
+    from common.context import emit_outbox_events
 
+    started = time.perf_counter()
     thresholds = threshold_days or DEFAULT_THRESHOLDS
     today = date.today()
-    stats = {"created": 0, "skipped": 0, "overdue": 0}
-
-    equipment_qs = Equipment.objects.filter(
-        next_inspection_date__isnull=False,
-    ).select_related("equipment_type")
-
-    for eq in equipment_qs.iterator(chunk_size=200):
-        days_until = (eq.next_inspection_date - today).days
-
-        # Determine which threshold bucket this falls into
-        matched_threshold = None
-        for t in sorted(thresholds):
-            if days_until <= t:
-                matched_threshold = t
-                break
-
-        if matched_threshold is None:
-            stats["skipped"] += 1
-            continue
-
-        # Determine severity + category
-        if days_until < 0:
-            severity = Notification.Severity.CRITICAL
-            category = Notification.Category.INSPECTION_OVERDUE
-            stats["overdue"] += 1
-        elif days_until <= 3:
-            severity = Notification.Severity.CRITICAL
-            category = Notification.Category.INSPECTION_DUE
-        elif days_until <= 7:
-            severity = Notification.Severity.WARNING
-            category = Notification.Category.INSPECTION_DUE
-        else:
-            severity = Notification.Severity.INFO
-            category = Notification.Category.INSPECTION_DUE
-
-        # Dedup: skip if notification already exists for this
-        # equipment + category in the same threshold window
-        window_start = today - timedelta(days=1)
-        already_exists = Notification.objects.filter(
-            tenant_id=eq.tenant_id,
-            entity_type="explosionsschutz.Equipment",
-            entity_id=eq.id,
-            category=category,
-            created_at__date__gte=window_start,
-        ).exists()
-
-        if already_exists:
-            stats["skipped"] += 1
-            continue
-
-        # Build notification
-        if days_until < 0:
-            title = f"Prüfung überfällig: {eq.serial_number} (seit {abs(days_until)} Tagen)"
-        elif days_until == 0:
-            title = f"Prüfung heute fällig: {eq.serial_number}"
-        else:
-            title = f"Prüfung in {days_until} Tagen: {eq.serial_number}"
-
-        msg = (
-            f"Betriebsmittel: {eq.serial_number}\n"
-            f"Typ: {eq.equipment_type.name if eq.equipment_type else '–'}\n"
-            f"Fällig am: {eq.next_inspection_date.isoformat()}"
+    horizon = today + timedelta(days=max(thresholds))
+    window_start = today - timedelta(days=1)
+
+    equipment = _scheduled_equipment(tenant_ids)
+    totals = equipment.aggregate(
+        scanned=Count("id"),
+        overdue=Count("id", filter=Q(next_inspection_date__lt=today)),
+    )
+
+    existing = Notification.objects.filter(
+        tenant_id=OuterRef("tenant_id"),
+        entity_type=_EQUIPMENT_ENTITY,
+        entity_id=OuterRef("entity_uuid"),
+        category=OuterRef("category"),
+        created_at__date__gte=window_start,
+    )
+    rows = (
+        equipment.filter(next_inspection_date__lte=horizon)
+        .annotate(
+            entity_uuid=_int_id_as_uuid("id"),
+            category=Case(
+                When(
+                    next_inspection_date__lt=today,
+                    then=Value(Notification.Category.INSPECTION_OVERDUE),
+                ),
+                default=Value(Notification.Category.INSPECTION_DUE),
+            ),
+            severity=Case(
+                When(
+                    next_inspection_date__lte=today + timedelta(days=3),
+                    then=Value(Notification.Severity.CRITICAL),
+                ),
+                When(
+                    next_inspection_date__lte=today + timedelta(days=7),
+                    then=Value(Notification.Severity.WARNING),
+                ),
+                default=Value(Notification.Severity.INFO),
+            ),
         )
+        .filter(~Exists(existing))
+        .values(
+            "id",
+            "tenant_id",
+            "serial_number",
+            "next_inspection_date",
+            "equipment_type__manufacturer",
+            "equipment_type__model",
+            "category",
+            "severity",
+        )
+    )
 
-        create_notification(
-            tenant_id=eq.tenant_id,
-            category=category,
-            title=title,
-            message=msg,
-            severity=severity,
-            entity_type="explosionsschutz.Equipment",
-            entity_id=eq.id,
-            action_url=f"/ex/equipment/{eq.id}/",
+    created_by_tenant: Counter = Counter()
+    overdue_by_tenant: Counter = Counter()
+    batch: list[Notification] = []
+
+    def flush() -> None:
+        Notification.objects.bulk_create(batch, batch_size=batch_size)
+        batch.clear()
+
+    with transaction.atomic():
+        for row in rows.iterator(chunk_size=batch_size):
+            days_until = (row["next_inspection_date"] - today).days
+            serial = row["serial_number"]
+            batch.append(
+                Notification(
+                    tenant_id=row["tenant_id"],
+                    category=row["category"],
+                    severity=row["severity"],
+                    title=_inspection_title(serial, days_until),
+                    message=(
+                        f"Betriebsmittel: {serial}\n"
+                        f"Typ: {_equipment_type_label(row)}\n"
+                        f"Fällig am: {row['next_inspection_date'].isoformat()}"
+                    ),
+                    entity_type=_EQUIPMENT_ENTITY,
+                    entity_id=row["id"],
+                    action_url=f"/ex/equipment/{row['id']}/",
+                )
+            )
+            created_by_tenant[row["tenant_id"]] += 1
+            if days_until < 0:
+                overdue_by_tenant[row["tenant_id"]] += 1
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+
+        emit_outbox_events(
+            [
+                {
+                    "tenant_id": tenant_id,
+                    "topic": SCAN_SUMMARY_TOPIC,
+                    "payload": {
+                        "created": count,
+                        "overdue": overdue_by_tenant[tenant_id],
+                        "scan_date": today.isoformat(),
+                    },
+                }
+                for tenant_id, count in created_by_tenant.items()
+            ],
+            batch_size=batch_size,
         )
-        stats["created"] += 1
 
+    for tenant_id in created_by_tenant:
+        invalidate_compliance_kpis(tenant_id)
+
+    created = sum(created_by_tenant.values())
+    elapsed = time.perf_counter() - started
+    stats = {
+        "created": created,
+        "skipped": totals["scanned"] - created,
+        "overdue": totals["overdue"],
+        "scanned": totals["scanned"],
+        "tenants": len(created_by_tenant),
+        "duration_ms": round(elapsed * 1000, 1),
+        "per_second": round(totals["scanned"] / elapsed, 1) if elapsed else 0.0,
+    }
     logger.info("Inspection deadline scan complete: %s", stats)
     return stats
 
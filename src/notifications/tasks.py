@@ -1,6 +1,7 @@
 """Celery tasks for notification processing."""
 
 import logging
+from uuid import UUID
 
 from celery import shared_task
 
@@ -12,9 +13,35 @@ def check_inspection_deadlines() -> dict:
     """
     Daily task: scan all equipment for upcoming/overdue inspections
     and create notifications.
+
+    Scans inline while few tenants are due; otherwise fans out one
+    ``scan_tenant_inspection_deadlines`` subtask per chunk of
+    ``INSPECTION_SCAN_TENANTS_PER_TASK`` tenants.
     """
+    from django.conf import settings
+
+    from notifications.services import scan_inspection_deadlines, tenants_with_due_inspections
+
+    per_task = max(1, getattr(settings, "INSPECTION_SCAN_TENANTS_PER_TASK", 50))
+    tenant_ids = tenants_with_due_inspections()
+    if len(tenant_ids) <= per_task:
+        stats = scan_inspection_deadlines()
+        logger.info("Inspection deadline check: %s", stats)
+        return stats
+
+    chunks = [tenant_ids[i : i + per_task] for i in range(0, len(tenant_ids), per_task)]
+    for chunk in chunks:
+        scan_tenant_inspection_deadlines.delay([str(t) for t in chunk])
+    stats = {"tenants": len(tenant_ids), "dispatched": len(chunks)}
+    logger.info("Inspection deadline check fanned out: %s", stats)
+    return stats
+
+
+@shared_task(name="notifications.tasks.scan_tenant_inspection_deadlines", acks_late=True)
+def scan_tenant_inspection_deadlines(tenant_ids: list[str]) -> dict:
+    """Scan one partition of tenants (fan-out subtask)."""
     from notifications.services import scan_inspection_deadlines
 
-    stats = scan_inspection_deadlines()
-    logger.info("Inspection deadline check: %s", stats)
+    stats = scan_inspection_deadlines(tenant_ids=[UUID(t) for t in tenant_ids])
+    logger.info("Inspection deadline partition (%d tenants): %s", len(tenant_ids), stats)
     return stats
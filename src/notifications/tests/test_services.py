@@ -0,0 +1,138 @@
+"""Tests für notifications/services.py — Prüffristen-Scanner."""
+
+import uuid
+from datetime import date, timedelta
+
+import pytest
+
+from notifications.models import Notification
+from notifications.services import (
+    SCAN_SUMMARY_TOPIC,
+    scan_inspection_deadlines,
+    tenants_with_due_inspections,
+)
+from outbox.models import OutboxMessage
+
+
+def _equipment(tenant_id, days_until, serial="EQ-1"):
+    from explosionsschutz.models import Area, Equipment, EquipmentType
+
+    equipment_type, _ = EquipmentType.objects.get_or_create(
+        tenant_id=tenant_id,
+        manufacturer="R. STAHL",
+        model="IS1+",
+        defaults={"atex_category": "2G", "is_system": False},
+    )
+    area, _ = Area.objects.get_or_create(
+        tenant_id=tenant_id,
+        code="PROD-01",
+        defaults={"name": "Produktion", "site_id": uuid.uuid4()},
+    )
+    return Equipment.objects.create(
+        tenant_id=tenant_id,
+        area=area,
+        equipment_type=equipment_type,
+        serial_number=serial,
+        next_inspection_date=date.today() + timedelta(days=days_until),
+    )
+
+
+@pytest.fixture
+def tenant_id():
+    return uuid.uuid4()
+
+
+@pytest.mark.django_db
+class TestScanInspectionDeadlines:
+    def test_should_bucket_severity_and_category(self, tenant_id):
+        overdue = _equipment(tenant_id, -2, "A")
+        soon = _equipment(tenant_id, 3, "B")
+        week = _equipment(tenant_id, 6, "C")
+        month = _equipment(tenant_id, 20, "D")
+        _equipment(tenant_id, 90, "E")
+
+        stats = scan_inspection_deadlines()
+
+        assert stats["created"] == 4
+        assert stats["skipped"] == 1
+        assert stats["overdue"] == 1
+        by_entity = {n.entity_id.int: n for n in Notification.objects.filter(tenant_id=tenant_id)}
+        assert by_entity[overdue.id].category == Notification.Category.INSPECTION_OVERDUE
+        assert by_entity[overdue.id].severity == Notification.Severity.CRITICAL
+        assert by_entity[overdue.id].title == "Prüfung überfällig: A (seit 2 Tagen)"
+        assert by_entity[soon.id].severity == Notification.Severity.CRITICAL
+        assert by_entity[week.id].severity == Notification.Severity.WARNING
+        assert by_entity[month.id].severity == Notification.Severity.INFO
+        assert "Typ: R. STAHL IS1+" in by_entity[month.id].message
+
+    def test_should_skip_notification_from_per_item_scanner(self, tenant_id):
+        from notifications.services import create_notification
+
+        eq = _equipment(tenant_id, 2)
+        create_notification(
+            tenant_id=tenant_id,
+            category=Notification.Category.INSPECTION_DUE,
+            title="alt",
+            entity_type="explosionsschutz.Equipment",
+            entity_id=eq.id,
+        )
+        assert scan_inspection_deadlines()["created"] == 0
+
+    def test_should_not_duplicate_on_rerun(self, tenant_id):
+        _equipment(tenant_id, 0)
+        assert scan_inspection_deadlines()["created"] == 1
+
+        stats = scan_inspection_deadlines()
+        assert stats["created"] == 0
+        assert stats["skipped"] == 1
+        assert Notification.objects.filter(tenant_id=tenant_id).count() == 1
+
+    def test_should_write_in_batches(self, tenant_id, django_assert_max_num_queries):
+        for i in range(25):
+            _equipment(tenant_id, i % 10, f"EQ-{i}")
+        # aggregate + cursor + 3 INSERT batches + outbox + rollup mark + savepoints
+        with django_assert_max_num_queries(9):
+            stats = scan_inspection_deadlines(batch_size=10)
+        assert stats["created"] == 25
+
+    def test_should_emit_one_outbox_event_per_tenant(self, tenant_id):
+        _equipment(tenant_id, -1, "A")
+        _equipment(tenant_id, 1, "B")
+
+        scan_inspection_deadlines()
+
+        msg = OutboxMessage.objects.get(tenant_id=tenant_id, topic=SCAN_SUMMARY_TOPIC)
+        assert msg.payload["created"] == 2
+        assert msg.payload["overdue"] == 1
+
+    def test_should_scan_only_given_partition(self, tenant_id):
+        other = uuid.uuid4()
+        _equipment(tenant_id, 1)
+        _equipment(other, 1)
+
+        stats = scan_inspection_deadlines(tenant_ids=[tenant_id])
+
+        assert stats["created"] == 1
+        assert stats["tenants"] == 1
+        assert not Notification.objects.filter(tenant_id=other).exists()
+
+    def test_should_list_tenants_with_due_inspections(self, tenant_id):
+        _equipment(tenant_id, 5)
+        _equipment(uuid.uuid4(), 120)
+        assert tenants_with_due_inspections() == [tenant_id]
+
+
+@pytest.mark.django_db
+class TestCheckInspectionDeadlinesTask:
+    def test_should_fan_out_per_tenant_chunk(self, settings):
+        from notifications.tasks import check_inspection_deadlines
+
+        settings.INSPECTION_SCAN_TENANTS_PER_TASK = 1
+        tenants = [uuid.uuid4(), uuid.uuid4()]
+        for tid in tenants:
+            _equipment(tid, 1)
+
+        stats = check_inspection_deadlines()
+
+        assert stats == {"tenants": 2, "dispatched": 2}
+        assert Notification.objects.filter(tenant_id__in=tenants).count() == 2
@@ -5,6 +5,7 @@ from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.views import View
 
+from dashboard.services import invalidate_compliance_kpis
 from notifications.models import Notification
 from notifications.services import (
     get_notifications,
@@ -88,6 +89,7 @@ class NotificationMarkReadView(LoginRequiredMixin, View):
             tenant_id=tenant_id,
         )
         notif.mark_read()
+        invalidate_compliance_kpis(tenant_id)
 
         if request.headers.get("HX-Request"):
             return HttpResponse(status=204)
@@ -0,0 +1,56 @@
+"""Outbox topic handlers (registered with ``outbox.relay``).
+
+Handlers raise on failure; the relay retries with backoff and
+dead-letters the message once the topic's retry policy is exhausted.
+"""
+
+import logging
+
+from outbox.relay import register_batch_handler, register_handler
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_TOPICS = (
+    "inspection.overdue",
+    "inspection.due_soon",
+    "sds.expiring",
+    "measure.due",
+    "concept.status_changed",
+    "approval.required",
+)
+
+
+@register_batch_handler
+def refresh_kpi_rollup(messages) -> None:
+    """Recompute the TenantKpiSnapshot families affected by a relay batch."""
+    from dashboard.rollup import refresh_for_messages
+
+    refresh_for_messages(messages)
+
+
+@register_handler(*NOTIFICATION_TOPICS)
+def create_notification_from_outbox(msg) -> None:
+    """Create in-app Notification from outbox message payload."""
+    from notifications.models import Notification
+    from notifications.services import create_notification
+
+    payload = msg.payload or {}
+    category_map = {
+        "inspection.overdue": Notification.Category.INSPECTION_OVERDUE,
+        "inspection.due_soon": Notification.Category.INSPECTION_DUE,
+        "sds.expiring": Notification.Category.SDS_EXPIRING,
+        "measure.due": Notification.Category.MEASURE_DUE,
+        "concept.status_changed": Notification.Category.CONCEPT_STATUS,
+        "approval.required": Notification.Category.APPROVAL_REQUIRED,
+    }
+    create_notification(
+        tenant_id=msg.tenant_id,
+        title=payload.get("title", msg.topic),
+        message=payload.get("message", ""),
+        category=category_map.get(msg.topic, Notification.Category.SYSTEM),
+        severity=payload.get("severity", Notification.Severity.INFO),
+        entity_type=msg.aggregate_type or "",
+        entity_id=msg.aggregate_id,
+        action_url=payload.get("action_url", ""),
+    )
+    logger.debug("[Outbox] Notification created for topic=%s", msg.topic)
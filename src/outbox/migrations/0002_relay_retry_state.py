@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:59
+
+from django.db import migrations, models
+
+# Wake the outbox relay (LISTEN outbox_message) once per inserting statement;
+# NOTIFY is delivered on commit and collapsed per transaction.
+NOTIFY_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION outbox_message_notify() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('outbox_message', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER outbox_message_notify
+    AFTER INSERT ON outbox_message
+    FOR EACH STATEMENT EXECUTE FUNCTION outbox_message_notify();
+"""
+
+DROP_NOTIFY_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS outbox_message_notify ON outbox_message;
+DROP FUNCTION IF EXISTS outbox_message_notify();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outbox', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='dead_lettered_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='Set when retries are exhausted; the relay skips the message', null=True),
+        ),
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='last_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, help_text='Earliest retry after a failed dispatch (null = now)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='outboxmessage',
+            index=models.Index(condition=models.Q(('dead_lettered_at__isnull', True), ('published_at__isnull', True)), fields=['created_at'], name='outbox_claimable_idx'),
+        ),
+        migrations.RunSQL(NOTIFY_TRIGGER_SQL, DROP_NOTIFY_TRIGGER_SQL),
+    ]
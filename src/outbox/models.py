@@ -50,6 +50,21 @@ class OutboxMessage(models.Model):
         help_text="When the message was published (null = pending)",
     )
 
+    # Relay retry state (outbox.relay)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Earliest retry after a failed dispatch (null = now)",
+    )
+    last_error = models.TextField(blank=True, default="")
+    dead_lettered_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="Set when retries are exhausted; the relay skips the message",
+    )
+
     class Meta:
         db_table = "outbox_message"
         ordering = ["created_at"]
@@ -58,12 +73,26 @@ class OutboxMessage(models.Model):
                 fields=["published_at", "created_at"],
                 name="outbox_pending_idx",
             ),
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(published_at__isnull=True, dead_lettered_at__isnull=True),
+                name="outbox_claimable_idx",
+            ),
         ]
 
     def __str__(self) -> str:
-        status = "published" if self.published_at else "pending"
+        if self.published_at:
+            status = "published"
+        elif self.dead_lettered_at:
+            status = "dead"
+        else:
+            status = "pending"
         return f"{self.topic} ({status})"
 
     @property
     def is_published(self) -> bool:
         return self.published_at is not None
+
+    @property
+    def is_dead_lettered(self) -> bool:
+        return self.dead_lettered_at is not None
@@ -1,7 +1,6 @@
-"""Outbox publisher worker."""
+"""Outbox publisher worker (``python -m outbox.publisher``)."""
 
 import os
-import time
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
@@ -9,40 +8,7 @@ import django
 
 django.setup()
 
-import logging
-
-from django.db import transaction  # noqa: E402
-from django.utils import timezone  # noqa: E402
-
-from outbox.models import OutboxMessage  # noqa: E402
-
-logger = logging.getLogger(__name__)
-
-POLL_SECONDS = 2
-
-
-def publish(msg: OutboxMessage) -> None:
-    """Publish message (MVP: just print)."""
-    logger.info(f"[OUTBOX] topic={msg.topic} tenant={msg.tenant_id} payload={msg.payload}")
-
-
-def run_forever():
-    """Poll outbox and publish messages."""
-    logger.info("[OUTBOX] Publisher started")
-    while True:
-        with transaction.atomic():
-            qs = (
-                OutboxMessage.objects.select_for_update(skip_locked=True)
-                .filter(published_at__isnull=True)
-                .order_by("created_at")[:50]
-            )
-            msgs = list(qs)
-            for m in msgs:
-                publish(m)
-                m.published_at = timezone.now()
-                m.save(update_fields=["published_at"])
-        time.sleep(POLL_SECONDS)
-
+from outbox.relay import run_forever  # noqa: E402
 
 if __name__ == "__main__":
     run_forever()
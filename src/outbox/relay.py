@@ -0,0 +1,308 @@
+"""Outbox relay — claims pending messages in batches and dispatches them.
+
+- claim:    ``SELECT … FOR UPDATE SKIP LOCKED`` so parallel relays
+            (publisher worker, Celery fallback) never dispatch twice
+- dispatch: topic → handlers (``register_handler``) on a bounded thread
+            pool; messages of one aggregate stay in order
+- batch:    ``register_batch_handler`` hooks see all messages published
+            by a batch once it committed (coalesced side effects)
+- publish:  one UPDATE per batch; failed messages back off per topic
+            policy and are dead-lettered after ``max_attempts``
+- wake-up:  ``LISTEN outbox_message`` (trigger from migration 0002)
+            with a polling fallback
+
+Delivery is at-least-once: handlers must be idempotent.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from outbox.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "outbox_message"
+WILDCARD = "*"
+_MAX_ERROR_LENGTH = 2000
+
+Handler = Callable[[OutboxMessage], None]
+BatchHandler = Callable[[list[OutboxMessage]], None]
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff per topic: base_delay · 2^(attempt-1), capped."""
+
+    max_attempts: int = 5
+    base_delay: float = 10.0  # seconds
+    max_delay: float = 3600.0
+
+    def delay(self, attempts: int) -> float:
+        return min(self.max_delay, self.base_delay * 2 ** max(attempts - 1, 0))
+
+
+DEFAULT_POLICY = RetryPolicy()
+
+_handlers: dict[str, list[Handler]] = {}
+_policies: dict[str, RetryPolicy] = {}
+_batch_handlers: list[BatchHandler] = []
+
+
+def register_handler(*topics: str, policy: RetryPolicy | None = None):
+    """Decorator: dispatch messages of ``topics`` (``"*"`` = all) to the handler."""
+
+    def decorator(handler: Handler) -> Handler:
+        for topic in topics:
+            registered = _handlers.setdefault(topic, [])
+            if handler not in registered:
+                registered.append(handler)
+            if policy is not None:
+                _policies[topic] = policy
+        return handler
+
+    return decorator
+
+
+def register_batch_handler(handler: BatchHandler) -> BatchHandler:
+    """Decorator: call the handler once per committed batch with its published messages.
+
+    Runs after the claim transaction, so row locks are released and the
+    messages stay published even if the handler raises (logged only).
+    """
+    if handler not in _batch_handlers:
+        _batch_handlers.append(handler)
+    return handler
+
+
+def handlers_for(topic: str) -> list[Handler]:
+    return _handlers.get(WILDCARD, []) + _handlers.get(topic, [])
+
+
+def policy_for(topic: str) -> RetryPolicy:
+    return _policies.get(topic, DEFAULT_POLICY)
+
+
+@dataclass
+class RelayStats:
+    """Counters of one drain run (throughput and lag)."""
+
+    claimed: int = 0
+    published: int = 0
+    retried: int = 0
+    dead_lettered: int = 0
+    batches: int = 0
+    duration_ms: float = 0.0
+    max_lag_ms: float = 0.0
+
+    @property
+    def throughput_per_s(self) -> float:
+        return round(self.published / (self.duration_ms / 1000), 1) if self.duration_ms else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "throughput_per_s": self.throughput_per_s}
+
+
+def dispatch(msg: OutboxMessage) -> None:
+    """Run all handlers of the message's topic; any exception fails the message."""
+    handlers = handlers_for(msg.topic)
+    if not handlers:
+        logger.debug("[Outbox] No handler for topic=%s, skipping dispatch", msg.topic)
+    for handler in handlers:
+        handler(msg)
+
+
+def _dispatch_group(messages: list[OutboxMessage]) -> list[tuple[OutboxMessage, str | None]]:
+    results = []
+    for msg in messages:
+        try:
+            with transaction.atomic():
+                dispatch(msg)
+            results.append((msg, None))
+        except Exception as exc:
+            logger.exception(
+                "[Outbox] Dispatch failed for message %s (topic=%s)", msg.pk, msg.topic
+            )
+            results.append((msg, f"{type(exc).__name__}: {exc}"[:_MAX_ERROR_LENGTH]))
+    return results
+
+
+def _dispatch_group_in_thread(messages: list[OutboxMessage]):
+    """Worker-thread variant: own connection, closed afterwards."""
+    try:
+        return _dispatch_group(messages)
+    finally:
+        connection.close()
+
+
+def _claimable(now):
+    return (
+        OutboxMessage.objects.filter(published_at__isnull=True, dead_lettered_at__isnull=True)
+        .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+        .order_by("created_at")
+    )
+
+
+def relay_batch(batch_size: int, concurrency: int, stats: RelayStats) -> int:
+    """Claim, dispatch and settle one batch. Returns the number of claimed messages."""
+    with transaction.atomic():
+        messages = list(_claimable(timezone.now()).select_for_update(skip_locked=True)[:batch_size])
+        if not messages:
+            return 0
+
+        groups: dict[object, list[OutboxMessage]] = {}
+        for msg in messages:
+            groups.setdefault(msg.aggregate_id or msg.pk, []).append(msg)
+
+        if concurrency > 1 and len(groups) > 1:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(groups))) as pool:
+                results = [
+                    r for rs in pool.map(_dispatch_group_in_thread, groups.values()) for r in rs
+                ]
+        else:
+            results = [r for group in groups.values() for r in _dispatch_group(group)]
+
+        now = timezone.now()
+        published = [msg for msg, error in results if error is None]
+        published_ids = [msg.pk for msg in published]
+        if published_ids:
+            OutboxMessage.objects.filter(pk__in=published_ids).update(
+                published_at=now, next_attempt_at=None, last_error=""
+            )
+
+        failed = []
+        for msg, error in results:
+            if error is None:
+                continue
+            policy = policy_for(msg.topic)
+            msg.attempts += 1
+            msg.last_error = error
+            if msg.attempts >= policy.max_attempts:
+                msg.dead_lettered_at = now
+                stats.dead_lettered += 1
+                logger.error("[Outbox] Dead-lettered message %s (topic=%s)", msg.pk, msg.topic)
+            else:
+                msg.next_attempt_at = now + timedelta(seconds=policy.delay(msg.attempts))
+                stats.retried += 1
+            failed.append(msg)
+        if failed:
+            OutboxMessage.objects.bulk_update(
+                failed, ["attempts", "last_error", "next_attempt_at", "dead_lettered_at"]
+            )
+
+    if published:
+        _run_batch_handlers(published)
+
+    stats.claimed += len(messages)
+    stats.published += len(published_ids)
+    stats.batches += 1
+    lag_ms = max((now - msg.created_at).total_seconds() * 1000 for msg in messages)
+    stats.max_lag_ms = round(max(stats.max_lag_ms, lag_ms), 1)
+    return len(messages)
+
+
+def _run_batch_handlers(messages: list[OutboxMessage]) -> None:
+    for handler in _batch_handlers:
+        try:
+            handler(messages)
+        except Exception:
+            logger.exception(
+                "[Outbox] Batch handler %s failed", getattr(handler, "__name__", handler)
+            )
+
+
+def drain(
+    batch_size: int | None = None,
+    concurrency: int | None = None,
+    max_batches: int | None = None,
+) -> RelayStats:
+    """Relay batches until nothing is claimable (or ``max_batches`` is reached)."""
+    batch_size = batch_size or getattr(settings, "OUTBOX_RELAY_BATCH_SIZE", 100)
+    concurrency = concurrency or getattr(settings, "OUTBOX_RELAY_CONCURRENCY", 1)
+    stats = RelayStats()
+    start = time.perf_counter()
+    while max_batches is None or stats.batches < max_batches:
+        if relay_batch(batch_size, concurrency, stats) < batch_size:
+            break
+    stats.duration_ms = round((time.perf_counter() - start) * 1000, 2)
+    return stats
+
+
+def outbox_metrics() -> dict:
+    """Backlog gauges in one query: pending, retrying, dead, oldest pending age."""
+    now = timezone.now()
+    pending = Q(published_at__isnull=True, dead_lettered_at__isnull=True)
+    row = OutboxMessage.objects.aggregate(
+        pending=Count("id", filter=pending),
+        retrying=Count("id", filter=pending & Q(attempts__gt=0)),
+        dead=Count("id", filter=Q(dead_lettered_at__isnull=False)),
+        oldest=Min("created_at", filter=pending),
+    )
+    oldest = row.pop("oldest")
+    row["lag_seconds"] = round((now - oldest).total_seconds(), 1) if oldest else 0.0
+    return row
+
+
+def _seconds_until_next_retry(poll_seconds: float) -> float:
+    next_at = (
+        OutboxMessage.objects.filter(
+            published_at__isnull=True,
+            dead_lettered_at__isnull=True,
+            next_attempt_at__isnull=False,
+        )
+        .aggregate(next_at=Min("next_attempt_at"))
+        .get("next_at")
+    )
+    if next_at is None:
+        return poll_seconds
+    return max(0.0, min(poll_seconds, (next_at - timezone.now()).total_seconds()))
+
+
+def _listen():
+    """Dedicated autocommit connection subscribed to CHANNEL (None if unsupported)."""
+    listener = connections.create_connection("default")
+    if listener.vendor != "postgresql":
+        return None
+    listener.ensure_connection()
+    listener.connection.execute(f"LISTEN {CHANNEL}")
+    return listener
+
+
+def _wait(listener, timeout: float) -> None:
+    if listener is None:
+        time.sleep(timeout)
+        return
+    for _ in listener.connection.notifies(timeout=timeout, stop_after=1):
+        pass
+
+
+def run_forever(poll_seconds: float | None = None) -> None:
+    """Relay loop: drain, then sleep until NOTIFY, a due retry or the poll timeout."""
+    poll_seconds = poll_seconds or getattr(settings, "OUTBOX_RELAY_POLL_SECONDS", 30)
+    listener = None
+    logger.info("[OUTBOX] Relay started (channel=%s)", CHANNEL)
+    while True:
+        try:
+            if listener is None:
+                listener = _listen()
+            stats = drain()
+            if stats.claimed:
+                logger.info("[OUTBOX] %s", stats.as_dict())
+            _wait(listener, _seconds_until_next_retry(poll_seconds))
+        except Exception:
+            logger.exception("[OUTBOX] Relay loop error — reconnecting")
+            if listener is not None:
+                listener.close()
+            listener = None
+            connection.close()
+            time.sleep(min(poll_seconds, 5))
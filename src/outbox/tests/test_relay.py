@@ -0,0 +1,185 @@
+"""Tests for outbox/relay.py — batched claim, dispatch, retry, dead-letter."""
+
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from outbox import relay
+from outbox.models import OutboxMessage
+from outbox.relay import (
+    RetryPolicy,
+    drain,
+    outbox_metrics,
+    register_batch_handler,
+    register_handler,
+)
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    """Isolated handler registry for the test."""
+    monkeypatch.setattr(relay, "_handlers", {})
+    monkeypatch.setattr(relay, "_policies", {})
+    monkeypatch.setattr(relay, "_batch_handlers", [])
+    return relay
+
+
+def _msg(topic="test.event", **kwargs):
+    return OutboxMessage.objects.create(topic=topic, payload={}, **kwargs)
+
+
+@pytest.mark.django_db
+class TestDrain:
+    def test_should_dispatch_by_topic_and_mark_batch_published(self, handlers):
+        seen = []
+        register_handler("test.event")(lambda msg: seen.append(msg.pk))
+        msgs = [_msg() for _ in range(3)]
+        other = _msg("other.event")
+
+        stats = drain(batch_size=10)
+
+        assert seen == [m.pk for m in msgs]
+        assert stats.published == 4
+        assert not OutboxMessage.objects.filter(published_at__isnull=True).exists()
+        assert OutboxMessage.objects.get(pk=other.pk).is_published
+
+    def test_should_publish_batch_with_single_update(self, handlers, django_assert_num_queries):
+        for _ in range(20):
+            _msg()
+        # SAVEPOINT/claim/RELEASE + 20 × (SAVEPOINT, RELEASE) + one UPDATE
+        with django_assert_num_queries(44):
+            stats = drain(batch_size=50)
+        assert stats.published == 20
+
+    def test_should_keep_aggregate_order(self, handlers):
+        seen = []
+        register_handler("test.event")(lambda msg: seen.append(msg.payload.get("n")))
+        aggregate = uuid.uuid4()
+        for n in range(5):
+            OutboxMessage.objects.create(
+                topic="test.event", payload={"n": n}, aggregate_id=aggregate
+            )
+
+        drain(batch_size=10, concurrency=4)
+
+        assert seen == [0, 1, 2, 3, 4]
+
+    def test_should_retry_with_backoff(self, handlers):
+        def failing(msg):
+            raise RuntimeError("broker down")
+
+        register_handler("test.event", policy=RetryPolicy(max_attempts=3, base_delay=60))(failing)
+        msg = _msg()
+
+        stats = drain(batch_size=10)
+
+        msg.refresh_from_db()
+        assert stats.retried == 1
+        assert msg.attempts == 1
+        assert msg.published_at is None
+        assert "broker down" in msg.last_error
+        assert msg.next_attempt_at > timezone.now() + timedelta(seconds=50)
+        assert drain(batch_size=10).claimed == 0  # not due yet
+
+    def test_should_dead_letter_after_max_attempts(self, handlers):
+        def failing(msg):
+            raise RuntimeError("boom")
+
+        register_handler("test.event", policy=RetryPolicy(max_attempts=2))(failing)
+        msg = _msg(attempts=1)
+
+        stats = drain(batch_size=10)
+
+        msg.refresh_from_db()
+        assert stats.dead_lettered == 1
+        assert msg.is_dead_lettered
+        assert "dead" in str(msg)
+        assert drain(batch_size=10).claimed == 0
+
+    def test_should_call_batch_handlers_with_published_messages(self, handlers):
+        batches = []
+        register_handler("fail.event", policy=RetryPolicy(max_attempts=3))(lambda msg: 1 / 0)
+        register_batch_handler(lambda msgs: batches.append(sorted(m.topic for m in msgs)))
+        register_batch_handler(lambda msgs: 1 / 0)  # logged, does not unpublish
+        _msg()
+        _msg("fail.event")
+        _msg()
+
+        stats = drain(batch_size=10)
+
+        assert batches == [["test.event", "test.event"]]
+        assert stats.published == 2
+        assert OutboxMessage.objects.filter(published_at__isnull=False).count() == 2
+
+    def test_should_roll_back_partial_handler_work(self, handlers):
+        from notifications.models import Notification
+
+        tenant_id = uuid.uuid4()
+
+        def create_then_fail(msg):
+            Notification.objects.create(tenant_id=tenant_id, category="system", title="x")
+            raise RuntimeError("late failure")
+
+        register_handler("test.event")(create_then_fail)
+        _msg()
+
+        drain(batch_size=10)
+
+        assert not Notification.objects.filter(tenant_id=tenant_id).exists()
+
+
+@pytest.mark.django_db
+class TestRegisteredHandlers:
+    def test_should_create_notification_for_known_topic(self):
+        from notifications.models import Notification
+        from outbox.tasks import process_outbox
+
+        tenant_id = uuid.uuid4()
+        OutboxMessage.objects.create(
+            tenant_id=tenant_id,
+            topic="inspection.overdue",
+            payload={"title": "Prüfung überfällig", "severity": "critical"},
+        )
+
+        result = process_outbox()
+
+        assert result["published"] == 1
+        notification = Notification.objects.get(tenant_id=tenant_id)
+        assert notification.category == Notification.Category.INSPECTION_OVERDUE
+        assert notification.severity == "critical"
+
+
+@pytest.mark.django_db
+class TestOutboxMetrics:
+    def test_should_report_backlog_and_lag(self):
+        _msg(created_at=timezone.now() - timedelta(minutes=5))
+        _msg(attempts=2)
+        _msg(dead_lettered_at=timezone.now())
+        _msg(published_at=timezone.now())
+
+        metrics = outbox_metrics()
+
+        assert metrics["pending"] == 2
+        assert metrics["retrying"] == 1
+        assert metrics["dead"] == 1
+        assert metrics["lag_seconds"] >= 299
+
+
+@pytest.mark.django_db(transaction=True)
+class TestListenNotify:
+    def test_should_wake_on_notify(self):
+        import time
+
+        from django.db import connection
+
+        listener = relay._listen()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"NOTIFY {relay.CHANNEL}")
+            start = time.monotonic()
+            relay._wait(listener, timeout=5)
+            assert time.monotonic() - start < 1
+        finally:
+            listener.close()
@@ -1,9 +1,23 @@
-"""Authorization service — ADR-003 §5.2 with override support."""
+"""Authorization service — ADR-003 §5.2 with override support.
+
+Permission checks resolve against a compiled ``EffectivePermissions`` set
+per (tenant, user), built once from Membership, PermissionOverride and
+role Assignments (incl. validity windows). The set is memoized for the
+current request and held in the shared cache under a versioned key;
+``permissions.signals`` bumps the version when assignments, overrides,
+role permissions or memberships change.
+"""
 
 from __future__ import annotations
 
+import contextvars
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
 from uuid import UUID
 
+from django.core.cache import cache
 from django.db.models import Q
 from django.utils import timezone
 
@@ -14,6 +28,17 @@ from permissions.models import (
     Scope,
 )
 
+PERMS_CACHE_TTL = 300  # seconds
+_PERMS_KEY = "authz:perms:{global_v}:{tenant_v}:{tenant_id}:{user_id}"
+_VERSION_KEY = "authz:version:{}"
+_GLOBAL = "global"
+_BOOTSTRAPPED_KEY = "authz:bootstrapped"
+
+# Per-request memo: (request_id, {(tenant_id, user_id): EffectivePermissions})
+_request_memo: contextvars.ContextVar[tuple[str, dict] | None] = contextvars.ContextVar(
+    "authz_request_memo", default=None
+)
+
 
 class PermissionDenied(Exception):
     def __init__(self, permission_code: str) -> None:
@@ -24,6 +49,147 @@ class PermissionDenied(Exception):
         return f"Missing permission: {self.permission_code}"
 
 
+@dataclass(frozen=True)
+class EffectivePermissions:
+    """Compiled permission set of one user in one tenant."""
+
+    is_member: bool = False
+    denied: frozenset[str] = frozenset()
+    granted: frozenset[str] = frozenset()
+    by_scope: dict[str, frozenset[str]] = field(default_factory=dict)
+    valid_until: datetime | None = None
+
+    def allows(self, permission_code: str, scope_type: str = Scope.SCOPE_TENANT) -> bool:
+        """Order of evaluation: deny override → grant override → role."""
+        if not self.is_member or permission_code in self.denied:
+            return False
+        return permission_code in self.granted or permission_code in self.by_scope.get(
+            scope_type, frozenset()
+        )
+
+    def codes(self, scope_type: str = Scope.SCOPE_TENANT) -> frozenset[str]:
+        """All permission codes allowed in the given scope type."""
+        if not self.is_member:
+            return frozenset()
+        return (self.granted | self.by_scope.get(scope_type, frozenset())) - self.denied
+
+    def is_expired(self, now: datetime) -> bool:
+        return self.valid_until is not None and now >= self.valid_until
+
+
+def compile_permissions(tenant_id: UUID, user_id: UUID) -> EffectivePermissions:
+    """Build the effective permission set from the database (3 queries)."""
+    from tenancy.models import Membership
+
+    membership_id = (
+        Membership.objects.filter(tenant_id=tenant_id, user_id=user_id)
+        .values_list("id", flat=True)
+        .first()
+    )
+    if membership_id is None:
+        return EffectivePermissions()
+
+    now = timezone.now()
+    boundaries: list[datetime] = []
+
+    denied: set[str] = set()
+    granted: set[str] = set()
+    overrides = PermissionOverride.objects.filter(membership_id=membership_id).filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gte=now)
+    )
+    for code, allowed, expires_at in overrides.values_list(
+        "permission__code", "allowed", "expires_at"
+    ):
+        (granted if allowed else denied).add(code)
+        if expires_at is not None:
+            boundaries.append(expires_at)
+
+    by_scope: dict[str, set[str]] = {}
+    assignments = (
+        Assignment.objects.filter(tenant_id=tenant_id, user_id=user_id)
+        .filter(Q(valid_to__isnull=True) | Q(valid_to__gte=now))
+        .values_list("role__permissions__code", "scope__scope_type", "valid_from", "valid_to")
+    )
+    for code, scope_type, valid_from, valid_to in assignments:
+        if valid_from is not None and valid_from > now:
+            boundaries.append(valid_from)
+            continue
+        if valid_to is not None:
+            boundaries.append(valid_to)
+        if code is not None:
+            by_scope.setdefault(scope_type, set()).add(code)
+
+    return EffectivePermissions(
+        is_member=True,
+        denied=frozenset(denied),
+        granted=frozenset(granted),
+        by_scope={k: frozenset(v) for k, v in by_scope.items()},
+        valid_until=min(boundaries) if boundaries else None,
+    )
+
+
+def _versions(tenant_id: UUID) -> tuple[int, int]:
+    """Current (global, tenant) permission versions; seeded on first use."""
+    keys = [_VERSION_KEY.format(_GLOBAL), _VERSION_KEY.format(tenant_id)]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        if key not in found:
+            # Seed with a timestamp so an evicted counter never revives stale entries.
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+        versions.append(found[key])
+    return versions[0], versions[1]
+
+
+def _memo() -> dict | None:
+    request_id = get_context().request_id
+    if request_id is None:
+        return None
+    current = _request_memo.get()
+    if current is None or current[0] != request_id:
+        current = (request_id, {})
+        _request_memo.set(current)
+    return current[1]
+
+
+def get_effective_permissions(tenant_id: UUID, user_id: UUID) -> EffectivePermissions:
+    """Return the compiled permission set (request memo → shared cache → DB)."""
+    now = timezone.now()
+    memo = _memo()
+    memo_key = (tenant_id, user_id)
+    if memo is not None:
+        perms = memo.get(memo_key)
+        if perms is not None and not perms.is_expired(now):
+            return perms
+
+    global_v, tenant_v = _versions(tenant_id)
+    key = _PERMS_KEY.format(
+        global_v=global_v, tenant_v=tenant_v, tenant_id=tenant_id, user_id=user_id
+    )
+    perms = cache.get(key)
+    if perms is None or perms.is_expired(now):
+        perms = compile_permissions(tenant_id, user_id)
+        timeout = PERMS_CACHE_TTL
+        if perms.valid_until is not None:
+            timeout = max(1, min(timeout, int((perms.valid_until - now).total_seconds())))
+        cache.set(key, perms, timeout)
+
+    if memo is not None:
+        memo[memo_key] = perms
+    return perms
+
+
+def invalidate_permissions(tenant_id: UUID | None = None) -> None:
+    """Bump the permission version of a tenant (or all tenants if None)."""
+    key = _VERSION_KEY.format(tenant_id if tenant_id is not None else _GLOBAL)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    _request_memo.set(None)
+
+
 def has_permission(
     user_id: UUID,
     tenant_id: UUID,
@@ -37,59 +203,41 @@ def has_permission(
     2. Explicit grant override → allow
     3. Role-based permission → allow/deny
     """
-    from tenancy.models import Membership
+    return get_effective_permissions(tenant_id, user_id).allows(permission_code, scope_type)
 
-    membership = Membership.objects.filter(
-        tenant_id=tenant_id,
-        user_id=user_id,
-    ).first()
 
-    if not membership:
-        return False
+def has_permissions(
+    permission_codes: Iterable[str],
+    user_id: UUID | None = None,
+    tenant_id: UUID | None = None,
+    scope_type: str = Scope.SCOPE_TENANT,
+) -> dict[str, bool]:
+    """Batch check — one compiled set, one lookup per code.
 
-    # 1. Check explicit deny
-    deny = (
-        PermissionOverride.objects.filter(
-            membership=membership,
-            permission__code=permission_code,
-            allowed=False,
-        )
-        .filter(
-            Q(expires_at__isnull=True) | Q(expires_at__gte=timezone.now()),
-        )
-        .exists()
-    )
-    if deny:
-        return False
-
-    # 2. Check explicit grant
-    grant = (
-        PermissionOverride.objects.filter(
-            membership=membership,
-            permission__code=permission_code,
-            allowed=True,
-        )
-        .filter(
-            Q(expires_at__isnull=True) | Q(expires_at__gte=timezone.now()),
-        )
-        .exists()
-    )
-    if grant:
+    Falls back to the request context for ``user_id``/``tenant_id``.
+    """
+    ctx = get_context()
+    user_id = user_id or ctx.user_id
+    tenant_id = tenant_id or ctx.tenant_id
+    codes = list(permission_codes)
+    if user_id is None or tenant_id is None:
+        return dict.fromkeys(codes, False)
+
+    perms = get_effective_permissions(tenant_id, user_id)
+    return {code: perms.allows(code, scope_type) for code in codes}
+
+
+def _permissions_bootstrapped() -> bool:
+    """True once any Permission row exists (cached; reset on Permission delete)."""
+    if cache.get(_BOOTSTRAPPED_KEY):
         return True
 
-    # 3. Check role-based
-    now = timezone.now()
-    return (
-        Assignment.objects.filter(
-            tenant_id=tenant_id,
-            user_id=user_id,
-            role__permissions__code=permission_code,
-            scope__scope_type=scope_type,
-        )
-        .filter(Q(valid_from__isnull=True) | Q(valid_from__lte=now))
-        .filter(Q(valid_to__isnull=True) | Q(valid_to__gte=now))
-        .exists()
-    )
+    from permissions.models import Permission
+
+    exists = Permission.objects.exists()
+    if exists:
+        cache.set(_BOOTSTRAPPED_KEY, True, None)
+    return exists
 
 
 def require_permission(permission_code: str) -> None:
@@ -99,9 +247,7 @@ def require_permission(permission_code: str) -> None:
     Permission rows), all checks pass to avoid blocking the
     application during initial setup.
     """
-    from permissions.models import Permission
-
-    if Permission.objects.count() == 0:
+    if not _permissions_bootstrapped():
         return
 
     ctx = get_context()
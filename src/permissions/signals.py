@@ -0,0 +1,51 @@
+"""Cache invalidation for the compiled permission sets (permissions.authz).
+
+Signals (not service hooks) because assignments, overrides and role
+permissions are also edited via the admin and ``Role.permissions.add()``.
+"""
+
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from permissions.authz import _BOOTSTRAPPED_KEY, invalidate_permissions
+from permissions.models import Assignment, Permission, PermissionOverride, Role, RolePermission
+from tenancy.models import Membership
+
+
+@receiver([post_save, post_delete], sender=Assignment)
+def _assignment_changed(sender, instance, **kwargs):
+    invalidate_permissions(instance.tenant_id)
+
+
+@receiver([post_save, post_delete], sender=PermissionOverride)
+def _override_changed(sender, instance, **kwargs):
+    tenant_id = (
+        Membership.objects.filter(pk=instance.membership_id)
+        .values_list("tenant_id", flat=True)
+        .first()
+    )
+    invalidate_permissions(tenant_id)  # None (membership gone) → global bump
+
+
+@receiver([post_save, post_delete], sender=RolePermission)
+def _role_permission_changed(sender, instance, **kwargs):
+    # System roles (tenant_id NULL) are shared by all tenants.
+    invalidate_permissions(None)
+
+
+@receiver(m2m_changed, sender=Role.permissions.through)
+def _role_permissions_m2m_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_permissions(None)
+
+
+@receiver(post_delete, sender=Permission)
+def _permission_deleted(sender, instance, **kwargs):
+    cache.delete(_BOOTSTRAPPED_KEY)
+    invalidate_permissions(None)
+
+
+@receiver([post_save, post_delete], sender=Membership)
+def _membership_changed(sender, instance, **kwargs):
+    invalidate_permissions(instance.tenant_id)
@@ -0,0 +1,45 @@
+"""Permission template tags backed by the compiled permission set (ADR-003).
+
+Usage::
+
+    {% load authz_tags %}
+    {% effective_permissions as perms %}
+    {% if "risk.assessment.edit" in perms %}…{% endif %}
+
+    {% has_permissions "risk.assessment.edit" "risk.assessment.delete" as can %}
+"""
+
+from django import template
+
+from permissions.authz import get_effective_permissions
+from permissions.authz import has_permissions as _has_permissions
+from permissions.models import Scope
+
+register = template.Library()
+
+
+def _ids(context):
+    request = context.get("request")
+    user = getattr(request, "user", None)
+    tenant_id = getattr(request, "tenant_id", None)
+    if tenant_id is None or user is None or not user.is_authenticated:
+        return None, None
+    return tenant_id, user.pk
+
+
+@register.simple_tag(takes_context=True)
+def effective_permissions(context, scope_type=Scope.SCOPE_TENANT):
+    """Set of permission codes the current user holds in the current tenant."""
+    tenant_id, user_id = _ids(context)
+    if tenant_id is None:
+        return frozenset()
+    return get_effective_permissions(tenant_id, user_id).codes(scope_type)
+
+
+@register.simple_tag(takes_context=True)
+def has_permissions(context, *permission_codes):
+    """Batch check → ``{code: bool}``."""
+    tenant_id, user_id = _ids(context)
+    if tenant_id is None:
+        return dict.fromkeys(permission_codes, False)
+    return _has_permissions(permission_codes, user_id=user_id, tenant_id=tenant_id)
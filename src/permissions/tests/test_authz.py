@@ -6,7 +6,14 @@ from unittest.mock import patch
 import pytest
 from django.utils import timezone
 
-from permissions.authz import PermissionDenied, has_permission, require_permission
+from permissions.authz import (
+    PermissionDenied,
+    compile_permissions,
+    get_effective_permissions,
+    has_permission,
+    has_permissions,
+    require_permission,
+)
 from permissions.models import (
     Permission,
     PermissionOverride,
@@ -190,6 +197,101 @@ class TestRequirePermission:
                 require_permission("risk.assessment.read")
 
 
+@pytest.mark.django_db
+class TestEffectivePermissionCache:
+    """Compiled permission set — memoized, cached, versioned invalidation."""
+
+    def test_should_answer_repeated_checks_from_cache(
+        self, fixture_user, fixture_tenant, fixture_assignment, django_assert_num_queries
+    ):
+        tid = fixture_tenant.tenant_id
+        assert has_permission(fixture_user.pk, tid, "risk.assessment.read") is True
+        with django_assert_num_queries(0):
+            assert has_permission(fixture_user.pk, tid, "risk.assessment.read") is True
+            assert has_permission(fixture_user.pk, tid, "risk.assessment.delete") is False
+
+    def test_should_invalidate_on_new_override(
+        self, fixture_user, fixture_tenant, fixture_assignment, fixture_permission_read
+    ):
+        from tenancy.models import Membership
+
+        tid = fixture_tenant.tenant_id
+        assert has_permission(fixture_user.pk, tid, "risk.assessment.read") is True
+
+        ms = Membership.objects.get(tenant_id=tid, user=fixture_user)
+        PermissionOverride.objects.create(
+            membership=ms, permission=fixture_permission_read, allowed=False
+        )
+        assert has_permission(fixture_user.pk, tid, "risk.assessment.read") is False
+
+    def test_should_invalidate_on_assignment_delete(
+        self, fixture_user, fixture_tenant, fixture_assignment
+    ):
+        tid = fixture_tenant.tenant_id
+        assert has_permission(fixture_user.pk, tid, "risk.assessment.read") is True
+        fixture_assignment.delete()
+        assert has_permission(fixture_user.pk, tid, "risk.assessment.read") is False
+
+    def test_should_invalidate_on_role_permission_add(
+        self, fixture_user, fixture_tenant, fixture_assignment, fixture_permission_write
+    ):
+        tid = fixture_tenant.tenant_id
+        assert has_permission(fixture_user.pk, tid, fixture_permission_write.code) is False
+        fixture_assignment.role.permissions.add(fixture_permission_write)
+        assert has_permission(fixture_user.pk, tid, fixture_permission_write.code) is True
+
+    def test_should_respect_future_validity_window(
+        self, fixture_user, fixture_tenant, fixture_assignment
+    ):
+        fixture_assignment.valid_from = timezone.now() + timezone.timedelta(hours=1)
+        fixture_assignment.save()
+
+        perms = compile_permissions(fixture_tenant.tenant_id, fixture_user.pk)
+        assert perms.allows("risk.assessment.read") is False
+        assert perms.valid_until == fixture_assignment.valid_from
+
+    def test_should_ignore_expired_assignment(
+        self, fixture_user, fixture_tenant, fixture_assignment
+    ):
+        fixture_assignment.valid_to = timezone.now() - timezone.timedelta(minutes=1)
+        fixture_assignment.save()
+        assert (
+            has_permission(fixture_user.pk, fixture_tenant.tenant_id, "risk.assessment.read")
+            is False
+        )
+
+    def test_should_batch_check_permissions(self, fixture_user, fixture_tenant, fixture_assignment):
+        result = has_permissions(
+            ["risk.assessment.read", "risk.assessment.delete"],
+            user_id=fixture_user.pk,
+            tenant_id=fixture_tenant.tenant_id,
+        )
+        assert result == {"risk.assessment.read": True, "risk.assessment.delete": False}
+
+    def test_should_deny_batch_without_context(self):
+        assert has_permissions(["risk.assessment.read"]) == {"risk.assessment.read": False}
+
+    def test_should_expose_codes_for_templates(
+        self, fixture_user, fixture_tenant, fixture_assignment
+    ):
+        from django.template import Context, Template
+        from django.test import RequestFactory
+
+        request = RequestFactory().get("/")
+        request.user = fixture_user
+        request.tenant_id = fixture_tenant.tenant_id
+        tpl = Template(
+            "{% load authz_tags %}{% effective_permissions as perms %}"
+            '{% if "risk.assessment.read" in perms %}yes{% else %}no{% endif %}'
+        )
+        assert tpl.render(Context({"request": request})) == "yes"
+
+    def test_should_return_empty_set_for_non_member(self, fixture_tenant):
+        perms = get_effective_permissions(fixture_tenant.tenant_id, uuid.uuid4())
+        assert perms.is_member is False
+        assert perms.codes() == frozenset()
+
+
 @pytest.mark.unit
 class TestPermissionDenied:
     """PermissionDenied exception tests."""
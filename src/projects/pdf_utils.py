@@ -16,16 +16,17 @@ logger = logging.getLogger(__name__)
 
 
 def extract_pdf_text(pdf_file) -> str:
-    """Extract text from PDF file via iil-ingest."""
-    from ingest.extractors.pdf import PDFExtractor
+    """Extract text from PDF file, OCR'ing only pages without a text layer."""
+    from common.pdf_text import extract_pdf_text as extract_pages_text
 
     if hasattr(pdf_file, "seek"):
         pdf_file.seek(0)
     data = pdf_file.read()
-    content = PDFExtractor().extract(data)
-    for err in content.extraction_errors:
-        logger.warning("PDF extraction: %s", err)
-    return content.text
+    try:
+        return extract_pages_text(data)
+    except ValueError as exc:
+        logger.warning("PDF extraction: %s", exc)
+        return ""
 
 
 def _clean_toc(title: str) -> str:
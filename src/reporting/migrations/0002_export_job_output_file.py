@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reporting', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportjob',
+            name='output_s3_key',
+            field=models.CharField(blank=True, default='', help_text='S3 key of a raw export file (e.g. audit log exports)', max_length=512),
+        ),
+        migrations.AddField(
+            model_name='exportjob',
+            name='output_size_bytes',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
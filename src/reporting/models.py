@@ -54,6 +54,13 @@ class ExportJob(models.Model):
     finished_at = models.DateTimeField(null=True, blank=True)
     error = models.TextField(null=True, blank=True)
     output_document_id = models.UUIDField(null=True, blank=True)
+    output_s3_key = models.CharField(
+        max_length=512,
+        blank=True,
+        default="",
+        help_text="S3 key of a raw export file (e.g. audit log exports)",
+    )
+    output_size_bytes = models.BigIntegerField(null=True, blank=True)
     retention_policy = models.ForeignKey(
         RetentionPolicy, null=True, blank=True, on_delete=models.SET_NULL
     )
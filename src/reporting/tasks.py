@@ -25,7 +25,7 @@ def process_export_job(self, job_id: str) -> dict:
     from reporting.models import ExportJob
 
     try:
-        job = ExportJob.objects.get(id=UUID(job_id))
+        job = ExportJob.objects.get(pk=job_id)
     except ExportJob.DoesNotExist:
         logger.error("[ExportJob] Not found: %s", job_id)
         return {"error": "not_found", "job_id": job_id}
@@ -72,6 +72,10 @@ def _dispatch_export(job) -> dict:
         return _export_risk_assessment(job, params)
     if export_type.startswith("brandschutz.concept."):
         return _export_brandschutz_concept(job, params)
+    if export_type.startswith("audit.log."):
+        return _export_audit_log(job, params)
+    if export_type.startswith("substances.hazard_register."):
+        return _export_hazard_register(job, params)
 
     raise ValueError(f"Unknown export_type: {export_type!r}")
 
@@ -161,3 +165,73 @@ def cleanup_old_export_jobs(days: int = 90) -> dict:
     count, _ = qs.delete()
     logger.info("[ExportJob] Cleaned up %d old jobs (>%d days)", count, days)
     return {"deleted": count, "cutoff_days": days}
+
+
+def _upload_export(job, key: str, write, content_type: str) -> int:
+    """Write an export via ``write(fileobj)`` and upload it to S3 as ``key``."""
+    import tempfile
+
+    from django.conf import settings
+
+    from common.s3 import s3_client
+
+    # Spools to disk beyond 16 MB; upload_fileobj sends multipart chunks.
+    with tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024) as buf:
+        write(buf)
+        size = buf.tell()
+        buf.seek(0)
+        s3_client().upload_fileobj(
+            buf,
+            settings.S3_BUCKET,
+            key,
+            ExtraArgs={"ContentType": content_type},
+        )
+
+    job.output_s3_key = key
+    job.output_size_bytes = size
+    job.save(update_fields=["output_s3_key", "output_size_bytes"])
+    return size
+
+
+def _export_audit_log(job, params: dict) -> dict:
+    """Stream the filtered audit log of the job's tenant to S3."""
+    from audit.export import CONTENT_TYPES, export_filename, stream_audit_export
+    from audit.services import filter_audit_events, get_audit_events
+
+    fmt = params.get("format", "csv")
+    compress = bool(params.get("gzip"))
+    qs = filter_audit_events(get_audit_events(job.tenant_id), params, search=True)
+    key = f"exports/{job.tenant_id}/audit/{job.pk}/{export_filename(fmt, compress)}"
+
+    def write(buf):
+        for chunk in stream_audit_export(qs, fmt, compress):
+            buf.write(chunk)
+
+    size = _upload_export(job, key, write, "application/gzip" if compress else CONTENT_TYPES[fmt])
+    logger.info("[ExportJob] Audit log %s (%d bytes)", key, size)
+    return {"document_id": None, "s3_key": key, "size_bytes": size}
+
+
+def _export_hazard_register(job, params: dict) -> dict:
+    """Write the Gefahrstoffverzeichnis (xlsx/csv/ods) of the job's tenant to S3."""
+    from substances.exports.hazard_register import (
+        CONTENT_TYPES,
+        FORMAT_XLSX,
+        export_filename,
+        write_hazard_register,
+    )
+
+    fmt = params.get("format", FORMAT_XLSX)
+    site_id = params.get("site_id") or None
+    if fmt not in CONTENT_TYPES:
+        raise ValueError(f"Unknown hazard register format: {fmt!r}")
+    key = f"exports/{job.tenant_id}/hazard_register/{job.pk}/{export_filename(fmt)}"
+
+    size = _upload_export(
+        job,
+        key,
+        lambda buf: write_hazard_register(buf, job.tenant_id, site_id, fmt),
+        CONTENT_TYPES[fmt],
+    )
+    logger.info("[ExportJob] Hazard register %s (%d bytes)", key, size)
+    return {"document_id": None, "s3_key": key, "size_bytes": size}
@@ -1,9 +1,16 @@
 """Tests for riskfw.zones — zone calculation and ventilation (TRGS 721/722)."""
 
+import itertools
+
 import pytest
 
-from riskfw.exceptions import ZoneCalculationError
-from riskfw.zones.calculator import calculate_zone_extent
+from riskfw.exceptions import SubstanceNotFoundError, ZoneCalculationError
+from riskfw.zones.calculator import (
+    NUMPY_AVAILABLE,
+    calculate_zone_extent,
+    calculate_zone_extent_batch,
+    calculate_zone_extent_scenarios,
+)
 from riskfw.zones.models import ReleaseType, VentilationEffectiveness, ZoneType
 from riskfw.zones.ventilation import analyze_ventilation_effectiveness
 
@@ -131,6 +138,103 @@ class TestCalculateZoneExtent:
         assert result.volume_m3 > 0
 
 
+BACKENDS = [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy missing")),
+]
+
+# Grid across all zone thresholds, release types, LEL sources and room volumes
+SCENARIOS = [
+    {
+        "release_rate_kg_s": rate,
+        "ventilation_rate_m3_s": ventilation,
+        "release_type": release_type,
+        "substance_name": substance_name,
+        "lel_percent": 1.7,
+        "room_volume_m3": room,
+    }
+    for rate, ventilation, release_type, substance_name, room in itertools.product(
+        (0.0, 1e-4, 0.001, 0.01, 0.37, 1.0, 2.5),
+        (0.0, 0.05, 1.0, 10.0, 123.4),
+        ("jet", "pool", "diffuse"),
+        (None, "aceton", "Wasserstoff"),
+        (None, 0.0, 10.0, 250.0),
+    )
+]
+
+
+@pytest.mark.unit
+class TestCalculateZoneExtentBatch:
+    """calculate_zone_extent_batch matches calculate_zone_extent exactly."""
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_should_match_scalar_results(self, use_numpy):
+        batch = calculate_zone_extent_scenarios(SCENARIOS, use_numpy=use_numpy)
+
+        assert len(batch) == len(SCENARIOS)
+        assert batch.results() == [calculate_zone_extent(**s) for s in SCENARIOS]
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_should_broadcast_scalar_arguments(self, use_numpy):
+        rates = [0.001, 0.01, 1.0]
+
+        batch = calculate_zone_extent_batch(
+            rates, 10.0, release_type="pool", lel_percent=2.5, use_numpy=use_numpy
+        )
+
+        assert [str(r.zone_type) for r in batch.results()] == ["2", "1", "0"]
+        assert batch.result(1) == calculate_zone_extent(0.01, 10.0, "pool", lel_percent=2.5)
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_should_reject_invalid_rows_by_index(self, use_numpy):
+        with pytest.raises(ZoneCalculationError, match=r"ventilation_rate_m3_s\[2\]"):
+            calculate_zone_extent_batch(0.01, [1.0, 0.0, -1.0], use_numpy=use_numpy)
+        with pytest.raises(ZoneCalculationError, match=r"lel_percent\[1\]"):
+            calculate_zone_extent_batch(0.01, 1.0, lel_percent=[1.0, 0.0], use_numpy=use_numpy)
+        with pytest.raises(ZoneCalculationError, match="Unknown release_type"):
+            calculate_zone_extent_batch(
+                0.01, 1.0, release_type=["jet", "explosion"], use_numpy=use_numpy
+            )
+
+    def test_should_reject_columns_of_different_length(self):
+        with pytest.raises(ZoneCalculationError, match="differ in length"):
+            calculate_zone_extent_batch([0.01, 0.02], [1.0, 2.0, 3.0])
+
+    def test_should_look_up_each_substance_once(self, monkeypatch):
+        from riskfw.zones import calculator
+
+        calls = []
+        lookup = calculator.get_substance_properties
+        monkeypatch.setattr(
+            calculator, "get_substance_properties", lambda name: calls.append(name) or lookup(name)
+        )
+
+        calculate_zone_extent_batch(0.01, 1.0, substance_name=["aceton", None, "aceton"] * 10)
+
+        assert calls == ["aceton"]
+        with pytest.raises(SubstanceNotFoundError):
+            calculate_zone_extent_batch(0.01, 1.0, substance_name=["aceton", "Unobtainium-42"])
+
+    def test_should_validate_scenarios(self):
+        with pytest.raises(ZoneCalculationError, match="ventilation_rate_m3_s is required"):
+            calculate_zone_extent_scenarios([{"release_rate_kg_s": 0.01}])
+        with pytest.raises(ZoneCalculationError, match="unknown keys"):
+            calculate_zone_extent_scenarios(
+                [{"release_rate_kg_s": 0.01, "ventilation_rate_m3_s": 1.0, "lel": 2.0}]
+            )
+        assert len(calculate_zone_extent_scenarios([])) == 0
+
+    def test_should_compute_numpy_arrays(self):
+        np = pytest.importorskip("numpy")
+
+        batch = calculate_zone_extent_batch(
+            np.linspace(0.0, 1.0, 101), np.full(101, 5.0), use_numpy=True
+        )
+
+        assert isinstance(batch.radius_m, np.ndarray)
+        assert batch.results()[50] == calculate_zone_extent(0.5, 5.0)
+
+
 @pytest.mark.unit
 class TestAnalyzeVentilationEffectiveness:
     """analyze_ventilation_effectiveness per TRGS 722."""
@@ -1,10 +1,15 @@
 """Zone extent calculations per TRGS 721/722."""
 
-from riskfw.zones.calculator import calculate_zone_extent
+from riskfw.zones.calculator import (
+    calculate_zone_extent,
+    calculate_zone_extent_batch,
+    calculate_zone_extent_scenarios,
+)
 from riskfw.zones.models import (
     ReleaseType,
     VentilationEffectiveness,
     VentilationResult,
+    ZoneExtentBatch,
     ZoneExtentResult,
     ZoneType,
 )
@@ -15,7 +20,10 @@ __all__ = [
     "ReleaseType",
     "VentilationEffectiveness",
     "ZoneExtentResult",
+    "ZoneExtentBatch",
     "VentilationResult",
     "calculate_zone_extent",
+    "calculate_zone_extent_batch",
+    "calculate_zone_extent_scenarios",
     "analyze_ventilation_effectiveness",
 ]
@@ -4,18 +4,40 @@ Zone extent calculation per TRGS 721:2017-09, Annex 1.
 Dilution factor from ventilation vs. release rate.
 Zone type from dilution thresholds (TRGS 721 Table 1).
 Zone radius from spherical approximation.
+
+calculate_zone_extent_batch evaluates many scenarios at once with the same
+formulas, vectorized with NumPy (requirements.txt); a plain loop is the
+fallback where NumPy is missing.
 """
 
 import logging
 import math
+from collections.abc import Iterable, Mapping
 
 from riskfw.constants import NORM_TRGS_721, SAFETY_FACTORS
 from riskfw.exceptions import ZoneCalculationError
 from riskfw.substances.lookup import get_substance_properties
-from riskfw.zones.models import ReleaseType, ZoneExtentResult, ZoneType
+from riskfw.zones.models import ReleaseType, ZoneExtentBatch, ZoneExtentResult, ZoneType
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Keyword arguments of calculate_zone_extent (scenario dicts)
+SCENARIO_REQUIRED = ("release_rate_kg_s", "ventilation_rate_m3_s")
+SCENARIO_DEFAULTS: dict[str, object] = {
+    "release_type": "jet",
+    "substance_name": None,
+    "lel_percent": 1.5,
+    "room_volume_m3": None,
+}
+
 
 def calculate_zone_extent(
     release_rate_kg_s: float,
@@ -96,7 +118,7 @@ def calculate_zone_extent(
             f" ({room_volume_m3:.1f} m3)"
         )
 
-    logger.info(
+    logger.debug(
         "[ZoneCalc] substance=%s type=%s zone=%s radius=%.2fm",
         substance_name,
         release_type,
@@ -115,3 +137,240 @@ def calculate_zone_extent(
         basis_norm=NORM_TRGS_721,
         warnings=warnings,
     )
+
+
+def calculate_zone_extent_batch(
+    release_rate_kg_s,
+    ventilation_rate_m3_s,
+    release_type="jet",
+    substance_name=None,
+    lel_percent=1.5,
+    room_volume_m3=None,
+    use_numpy: bool | None = None,
+) -> ZoneExtentBatch:
+    """
+    Calculates zone extents for many scenarios per TRGS 721:2017-09 Annex 1.
+
+    Each argument is either a scalar (applied to every scenario) or a sequence /
+    1-d array with one value per scenario; all sequences must have the same
+    length. ``batch.result(i)`` equals ``calculate_zone_extent`` called with the
+    i-th values. Substance names are looked up once per distinct name.
+
+    Args:
+        use_numpy: Force (True) or disable (False) the NumPy path; default: if installed
+
+    Returns:
+        ZoneExtentBatch
+
+    Raises:
+        ZoneCalculationError: Invalid input (message names the first bad index)
+        SubstanceNotFoundError: Substance not in database
+    """
+    if use_numpy is None:
+        use_numpy = NUMPY_AVAILABLE
+    elif use_numpy and not NUMPY_AVAILABLE:
+        raise ZoneCalculationError("use_numpy=True requires numpy")
+
+    columns = {
+        "release_rate_kg_s": release_rate_kg_s,
+        "ventilation_rate_m3_s": ventilation_rate_m3_s,
+        "release_type": release_type,
+        "substance_name": substance_name,
+        "lel_percent": lel_percent,
+        "room_volume_m3": room_volume_m3,
+    }
+    lengths = {name: len(value) for name, value in columns.items() if not _is_scalar(value)}
+    if len(set(lengths.values())) > 1:
+        raise ZoneCalculationError(f"Batch columns differ in length: {lengths}")
+    size = next(iter(lengths.values()), 1)
+
+    compute = _batch_numpy if use_numpy else _batch_python
+    batch = compute(size, **columns)
+    logger.debug("[ZoneCalc] batch of %d scenarios (numpy=%s)", size, use_numpy)
+    return batch
+
+
+def calculate_zone_extent_scenarios(
+    scenarios: Iterable[Mapping[str, object]], use_numpy: bool | None = None
+) -> ZoneExtentBatch:
+    """
+    calculate_zone_extent_batch for a list of scenarios.
+
+    Each scenario is a mapping of calculate_zone_extent keyword arguments;
+    missing optional keys take the function defaults.
+    """
+    columns: dict[str, list] = {name: [] for name in (*SCENARIO_REQUIRED, *SCENARIO_DEFAULTS)}
+    for index, scenario in enumerate(scenarios):
+        unknown = set(scenario) - set(columns)
+        if unknown:
+            raise ZoneCalculationError(f"Scenario {index}: unknown keys {sorted(unknown)}")
+        for name in SCENARIO_REQUIRED:
+            if name not in scenario:
+                raise ZoneCalculationError(f"Scenario {index}: {name} is required")
+            columns[name].append(scenario[name])
+        for name, default in SCENARIO_DEFAULTS.items():
+            columns[name].append(scenario.get(name, default))
+    return calculate_zone_extent_batch(**columns, use_numpy=use_numpy)
+
+
+def _is_scalar(value) -> bool:
+    return value is None or isinstance(value, str | int | float) or getattr(value, "ndim", 1) == 0
+
+
+def _invalid(name: str, index: int, value, requirement: str) -> ZoneCalculationError:
+    return ZoneCalculationError(f"{name}[{index}] must be {requirement}, got {value}")
+
+
+def _safety_factors(release_types) -> dict[str, float]:
+    """Safety factor per distinct release type; rejects unknown types."""
+    factors = {}
+    for value in release_types:
+        try:
+            factors[value] = SAFETY_FACTORS[ReleaseType(value)]
+        except ValueError:
+            raise ZoneCalculationError(
+                f"Unknown release_type: {value!r}. Allowed: {[r.value for r in ReleaseType]}"
+            ) from None
+    return factors
+
+
+def _lel_by_name(names) -> dict[str, float]:
+    """LEL per distinct substance name (one lookup each)."""
+    return {name: get_substance_properties(name).lower_explosion_limit for name in names if name}
+
+
+def _batch_python(
+    size,
+    release_rate_kg_s,
+    ventilation_rate_m3_s,
+    release_type,
+    substance_name,
+    lel_percent,
+    room_volume_m3,
+) -> ZoneExtentBatch:
+    """Plain-loop variant: the statements of calculate_zone_extent without per-call overhead."""
+
+    def column(value) -> list:
+        if _is_scalar(value):
+            return [value] * size
+        return value.tolist() if hasattr(value, "tolist") else list(value)
+
+    rate = column(release_rate_kg_s)
+    ventilation = column(ventilation_rate_m3_s)
+    for name, values in (("release_rate_kg_s", rate), ("ventilation_rate_m3_s", ventilation)):
+        for index, value in enumerate(values):
+            if value < 0:
+                raise _invalid(name, index, value, ">= 0")
+
+    release_types = column(release_type)
+    factors = _safety_factors(dict.fromkeys(release_types))
+    safety_factor = [factors[value] for value in release_types]
+
+    lel = column(lel_percent)
+    names = column(substance_name)
+    if any(names):
+        lel_by_name = _lel_by_name(dict.fromkeys(names))
+        lel = [lel_by_name[name] if name else value for name, value in zip(names, lel, strict=True)]
+    for index, value in enumerate(lel):
+        if value <= 0:
+            raise _invalid("lel_percent", index, value, "> 0")
+
+    room = [value if value else 0.0 for value in column(room_volume_m3)]
+
+    zone, radius, volume, dilution, ventilated = [], [], [], [], []
+    for i in range(size):
+        if ventilation[i] > 0:
+            dilution_factor = ventilation[i] / (rate[i] + 1e-9)
+            zone_volume_m3 = (rate[i] / (lel[i] / 100.0)) * safety_factor[i]
+        else:
+            dilution_factor = 0.0
+            zone_volume_m3 = room[i]
+        zone.append(2 if dilution_factor >= 1000 else 1 if dilution_factor >= 100 else 0)
+        radius.append(
+            (zone_volume_m3 * 3.0 / (4.0 * math.pi)) ** (1.0 / 3.0) if zone_volume_m3 > 0 else 0.0
+        )
+        volume.append(zone_volume_m3)
+        dilution.append(dilution_factor)
+        ventilated.append(ventilation[i] > 0)
+
+    return ZoneExtentBatch(
+        zone=zone,
+        release_type=release_types,
+        radius_m=radius,
+        volume_m3=volume,
+        dilution_factor=dilution,
+        safety_factor=safety_factor,
+        lel_percent=lel,
+        room_volume_m3=room,
+        ventilated=ventilated,
+    )
+
+
+def _batch_numpy(
+    size,
+    release_rate_kg_s,
+    ventilation_rate_m3_s,
+    release_type,
+    substance_name,
+    lel_percent,
+    room_volume_m3,
+) -> ZoneExtentBatch:
+    """Vectorized variant: float64 element-wise operations in the order of the scalar code."""
+
+    def column(value, dtype=np.float64):
+        return np.broadcast_to(np.asarray(value, dtype=dtype), (size,))
+
+    rate = column(release_rate_kg_s)
+    ventilation = column(ventilation_rate_m3_s)
+    for name, values in (("release_rate_kg_s", rate), ("ventilation_rate_m3_s", ventilation)):
+        bad = np.flatnonzero(values < 0)
+        if bad.size:
+            raise _invalid(name, bad[0], values[bad[0]], ">= 0")
+
+    release_types, type_index = np.unique(column(release_type, str), return_inverse=True)
+    factors = _safety_factors(release_types.tolist())
+    safety_factor = np.array([factors[value] for value in release_types.tolist()])[type_index]
+
+    lel = column(lel_percent)
+    if _is_scalar(substance_name):
+        if substance_name:
+            lel = column(_lel_by_name([substance_name])[substance_name])
+    else:
+        names = list(substance_name)
+        if any(names):
+            lel_by_name = _lel_by_name(dict.fromkeys(names))
+            lel = np.array(
+                [
+                    lel_by_name[name] if name else value
+                    for name, value in zip(names, lel, strict=True)
+                ],
+                dtype=np.float64,
+            )
+    bad = np.flatnonzero(lel <= 0)
+    if bad.size:
+        raise _invalid("lel_percent", bad[0], lel[bad[0]], "> 0")
+
+    if _is_scalar(room_volume_m3):
+        room = column(room_volume_m3 or 0.0)
+    elif isinstance(room_volume_m3, np.ndarray):
+        room = column(room_volume_m3)
+    else:
+        room = column([value if value else 0.0 for value in room_volume_m3])
+
+    ventilated = ventilation > 0
+    dilution = np.where(ventilated, ventilation / (rate + 1e-9), 0.0)
+    volume = np.where(ventilated, (rate / (lel / 100.0)) * safety_factor, room)
+    radius = np.where(volume > 0, (volume * 3.0 / (4.0 * math.pi)) ** (1.0 / 3.0), 0.0)
+    zone = (dilution >= 100).astype(np.int8) + (dilution >= 1000)
+
+    return ZoneExtentBatch(
+        zone=zone,
+        release_type=release_types[type_index],
+        radius_m=radius,
+        volume_m3=volume,
+        dilution_factor=dilution,
+        safety_factor=safety_factor,
+        lel_percent=lel,
+        room_volume_m3=room,
+        ventilated=ventilated,
+    )
@@ -1,8 +1,11 @@
 """Dataclasses and enums for zone calculation results."""
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from enum import StrEnum
 
+from riskfw.constants import NORM_TRGS_721
+
 
 class ZoneType(StrEnum):
     """ATEX zone classification per TRGS 721."""
@@ -48,6 +51,59 @@ class ZoneExtentResult:
     warnings: list[str] = field(default_factory=list)
 
 
+@dataclass
+class ZoneExtentBatch:
+    """
+    Column-wise result of a batch TRGS 721 zone extent calculation.
+
+    One entry per scenario; columns are NumPy arrays when NumPy is installed,
+    lists otherwise. Values are unrounded -- ``result(i)`` rounds exactly like
+    ``calculate_zone_extent`` and adds its warnings.
+    """
+
+    zone: Sequence[int]  # 0, 1, 2
+    release_type: Sequence[str]
+    radius_m: Sequence[float]
+    volume_m3: Sequence[float]
+    dilution_factor: Sequence[float]
+    safety_factor: Sequence[float]
+    lel_percent: Sequence[float]
+    room_volume_m3: Sequence[float]  # 0.0 = unknown
+    ventilated: Sequence[bool]
+    basis_norm: str = NORM_TRGS_721
+
+    def __len__(self) -> int:
+        return len(self.zone)
+
+    def result(self, index: int) -> ZoneExtentResult:
+        """The scenario at ``index`` as ``ZoneExtentResult``."""
+        volume_m3 = float(self.volume_m3[index])
+        room_volume_m3 = float(self.room_volume_m3[index])
+        warnings: list[str] = []
+        if not self.ventilated[index]:
+            warnings.append("No ventilation -- entire room classified as Zone 0 per TRGS 721")
+        if room_volume_m3 and volume_m3 > room_volume_m3:
+            warnings.append(
+                f"Calculated zone volume ({volume_m3:.1f} m3) exceeds room volume"
+                f" ({room_volume_m3:.1f} m3)"
+            )
+        return ZoneExtentResult(
+            zone_type=ZoneType(str(int(self.zone[index]))),
+            release_type=ReleaseType(str(self.release_type[index])),
+            radius_m=round(float(self.radius_m[index]), 3),
+            volume_m3=round(volume_m3, 3),
+            dilution_factor=round(float(self.dilution_factor[index]), 2),
+            safety_factor=float(self.safety_factor[index]),
+            lel_percent=float(self.lel_percent[index]),
+            basis_norm=self.basis_norm,
+            warnings=warnings,
+        )
+
+    def results(self) -> list[ZoneExtentResult]:
+        """All scenarios as ``ZoneExtentResult`` (same order as the input)."""
+        return [self.result(index) for index in range(len(self))]
+
+
 @dataclass
 class VentilationResult:
     """Result of a TRGS 722 ventilation effectiveness analysis."""
@@ -1,6 +1,18 @@
 # src/substances/exports/__init__.py
 """Export-Module für Substances."""
 
+from .hazard_register import (
+    FORMATS,
+    iter_hazard_register_rows,
+    stream_hazard_register_csv,
+    write_hazard_register,
+)
 from .hazard_register_excel import generate_hazard_register_excel
 
-__all__ = ["generate_hazard_register_excel"]
+__all__ = [
+    "FORMATS",
+    "generate_hazard_register_excel",
+    "iter_hazard_register_rows",
+    "stream_hazard_register_csv",
+    "write_hazard_register",
+]
@@ -0,0 +1,299 @@
+# src/substances/exports/hazard_register.py
+"""
+Gefahrstoffverzeichnis — gemeinsame Zeilenquelle und Streaming-Formate.
+
+Die Zeilen kommen aus einer flachen ``values()``-Query (Projektionsspalten,
+H/P-Sätze und Inventar als Subqueries) und werden über einen
+serverseitigen Cursor gelesen. XLSX (write-only), CSV und ODS teilen
+diesen Generator; der Speicherbedarf bleibt unabhängig von der Stoffzahl
+konstant. Große Exporte laufen als ``reporting.ExportJob`` nach S3.
+"""
+
+from __future__ import annotations
+
+import csv
+import zipfile
+from collections.abc import Iterable, Iterator
+from uuid import UUID
+from xml.sax.saxutils import escape, quoteattr
+
+FORMAT_XLSX = "xlsx"
+FORMAT_CSV = "csv"
+FORMAT_ODS = "ods"
+FORMATS = (FORMAT_XLSX, FORMAT_CSV, FORMAT_ODS)
+CONTENT_TYPES = {
+    FORMAT_XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    FORMAT_CSV: "text/csv; charset=utf-8",
+    FORMAT_ODS: "application/vnd.oasis.opendocument.spreadsheet",
+}
+
+CHUNK_SIZE = 2000
+_FLUSH_BYTES = 64 * 1024
+
+# (Überschrift, Spaltenbreite in Zeichen)
+COLUMNS = (
+    ("Nr.", 5),
+    ("Stoffname", 30),
+    ("CAS-Nr.", 15),
+    ("Handelsname", 25),
+    ("Hersteller", 20),
+    ("Lagerklasse", 10),
+    ("CMR", 6),
+    ("Menge", 10),
+    ("Einheit", 8),
+    ("Lagerort", 20),
+    ("H-Sätze", 30),
+    ("P-Sätze", 40),
+    ("Piktogramme", 20),
+    ("SDS-Datum", 12),
+    ("SDS-Status", 12),
+)
+HEADERS = tuple(header for header, _ in COLUMNS)
+CMR_COLUMN = HEADERS.index("CMR")
+
+
+def export_filename(fmt: str) -> str:
+    return f"Gefahrstoffverzeichnis.{fmt}"
+
+
+def hazard_register_queryset(tenant_id: UUID, site_id: UUID | None = None):
+    """
+    Flache Zeilen-Query des Gefahrstoffverzeichnisses (eine Query, keine Joins je Stoff).
+
+    Mit ``site_id`` nur Stoffe mit Inventar am Standort; Menge und Lagerort
+    stammen dann aus dem ersten Inventareintrag dieses Standorts.
+    """
+    from django.contrib.postgres.expressions import ArraySubquery
+    from django.db.models import Exists, JSONField, OuterRef, Subquery
+    from django.db.models.functions import JSONObject
+
+    from substances.models import (
+        HazardStatementRef,
+        PictogramRef,
+        PrecautionaryStatementRef,
+        SiteInventoryItem,
+        Substance,
+    )
+
+    inventory = SiteInventoryItem.objects.unscoped().filter(substance=OuterRef("pk"))
+    if site_id:
+        inventory = inventory.filter(site_id=site_id)
+
+    def codes(ref_model):
+        return ArraySubquery(
+            ref_model.objects.filter(sds_revisions=OuterRef("current_sds"))
+            .order_by("code")
+            .values("code")
+        )
+
+    qs = Substance.objects.for_tenant(tenant_id).filter(status="active")
+    if site_id:
+        qs = qs.filter(Exists(inventory))
+    return (
+        qs.annotate(
+            inventory=Subquery(
+                inventory.order_by("pk").values(
+                    data=JSONObject(
+                        quantity="quantity", unit="unit", storage_location="storage_location"
+                    )
+                )[:1],
+                output_field=JSONField(),
+            ),
+            h_codes=codes(HazardStatementRef),
+            p_codes=codes(PrecautionaryStatementRef),
+            pictogram_codes=codes(PictogramRef),
+        )
+        .order_by("name", "pk")
+        .values(
+            "name",
+            "primary_cas",
+            "trade_name",
+            "manufacturer__name",
+            "storage_class",
+            "is_cmr",
+            "inventory",
+            "h_codes",
+            "p_codes",
+            "pictogram_codes",
+            "current_sds__revision_date",
+            "current_sds__status",
+        )
+    )
+
+
+def iter_hazard_register_rows(
+    tenant_id: UUID, site_id: UUID | None = None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[list]:
+    """Datenzeilen (Werte in ``COLUMNS``-Reihenfolge) über einen serverseitigen Cursor."""
+    from substances.models import SdsRevision
+
+    status_labels = dict(SdsRevision.Status.choices)
+    rows = hazard_register_queryset(tenant_id, site_id).iterator(chunk_size=chunk_size)
+    for number, row in enumerate(rows, 1):
+        inventory = row["inventory"] or {}
+        sds_date = row["current_sds__revision_date"]
+        yield [
+            number,
+            row["name"],
+            row["primary_cas"],
+            row["trade_name"],
+            row["manufacturer__name"] or "",
+            row["storage_class"],
+            "Ja" if row["is_cmr"] else "Nein",
+            float(inventory["quantity"]) if inventory else "",
+            inventory.get("unit", ""),
+            inventory.get("storage_location", ""),
+            ", ".join(row["h_codes"]),
+            ", ".join(row["p_codes"]),
+            ", ".join(row["pictogram_codes"]),
+            sds_date.strftime("%d.%m.%Y") if sds_date else "",
+            status_labels.get(row["current_sds__status"], "Kein SDS"),
+        ]
+
+
+# ─────────────────────────────────────────────────────────────────────
+# CSV
+# ─────────────────────────────────────────────────────────────────────
+
+
+class _Echo:
+    """Dateiartiges Objekt, dessen write() die Zeile zurückgibt (csv.writer-Senke)."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _buffered(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Kleine Zeilen-Chunks zu Blöcken von etwa ``_FLUSH_BYTES`` zusammenfassen."""
+    pending: list[bytes] = []
+    size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= _FLUSH_BYTES:
+            yield b"".join(pending)
+            pending, size = [], 0
+    if pending:
+        yield b"".join(pending)
+
+
+def stream_hazard_register_csv(rows: Iterable[list]) -> Iterator[bytes]:
+    """CSV (Semikolon, UTF-8) als Byte-Stream."""
+
+    def lines():
+        writer = csv.writer(_Echo(), delimiter=";")
+        yield writer.writerow(HEADERS)
+        for row in rows:
+            yield writer.writerow(row)
+
+    return _buffered(line.encode() for line in lines())
+
+
+# ─────────────────────────────────────────────────────────────────────
+# ODS (OpenDocument, ohne Zusatzabhängigkeit)
+# ─────────────────────────────────────────────────────────────────────
+
+_ODS_NS = (
+    'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+    'xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0" '
+    'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+    'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+    'xmlns:fo="urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0" '
+    'office:version="1.2"'
+)
+_ODS_MANIFEST = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" '
+    'manifest:version="1.2">'
+    '<manifest:file-entry manifest:full-path="/" '
+    f'manifest:media-type="{CONTENT_TYPES[FORMAT_ODS]}"/>'
+    '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+    "</manifest:manifest>"
+)
+
+
+def _ods_cell(value, style: str = "") -> str:
+    style_attr = f' table:style-name="{style}"' if style else ""
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return (
+            f'<table:table-cell{style_attr} office:value-type="float" office:value="{value}">'
+            f"<text:p>{value}</text:p></table:table-cell>"
+        )
+    if value in ("", None):
+        return f"<table:table-cell{style_attr}/>"
+    return (
+        f'<table:table-cell{style_attr} office:value-type="string">'
+        f"<text:p>{escape(str(value))}</text:p></table:table-cell>"
+    )
+
+
+def _ods_content(rows: Iterable[list]) -> Iterator[str]:
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<office:document-content {_ODS_NS}>'
+    yield "<office:automatic-styles>"
+    for index, (_, width) in enumerate(COLUMNS):
+        yield (
+            f'<style:style style:name="co{index}" style:family="table-column">'
+            f'<style:table-column-properties style:column-width="{width * 0.2:.2f}cm"/>'
+            "</style:style>"
+        )
+    yield (
+        '<style:style style:name="header" style:family="table-cell">'
+        '<style:table-cell-properties fo:background-color="#4472c4"/>'
+        '<style:text-properties fo:color="#ffffff" fo:font-weight="bold"/></style:style>'
+        '<style:style style:name="cmr" style:family="table-cell">'
+        '<style:table-cell-properties fo:background-color="#ffcccc"/></style:style>'
+    )
+    yield "</office:automatic-styles><office:body><office:spreadsheet>"
+    yield f"<table:table table:name={quoteattr('Gefahrstoffverzeichnis')}>"
+    for index in range(len(COLUMNS)):
+        yield f'<table:table-column table:style-name="co{index}"/>'
+    yield "<table:table-header-rows><table:table-row>"
+    yield "".join(_ods_cell(header, "header") for header in HEADERS)
+    yield "</table:table-row></table:table-header-rows>"
+    for row in rows:
+        cells = (
+            _ods_cell(value, "cmr" if col == CMR_COLUMN and value == "Ja" else "")
+            for col, value in enumerate(row)
+        )
+        yield "<table:table-row>" + "".join(cells) + "</table:table-row>"
+    yield "</table:table></office:spreadsheet></office:body></office:document-content>"
+
+
+def write_hazard_register_ods(fileobj, rows: Iterable[list]) -> None:
+    """ODS nach ``fileobj``; content.xml wird zeilenweise in das ZIP geschrieben."""
+    with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as zf:
+        # mimetype muss unkomprimiert der erste Eintrag sein
+        zf.writestr("mimetype", CONTENT_TYPES[FORMAT_ODS], compress_type=zipfile.ZIP_STORED)
+        zf.writestr("META-INF/manifest.xml", _ODS_MANIFEST)
+        with zf.open("content.xml", "w") as content:
+            for chunk in _buffered(part.encode() for part in _ods_content(rows)):
+                content.write(chunk)
+
+
+# ─────────────────────────────────────────────────────────────────────
+# Einstieg für View und ExportJob
+# ─────────────────────────────────────────────────────────────────────
+
+
+def write_hazard_register(
+    fileobj, tenant_id: UUID, site_id: UUID | None = None, fmt: str = FORMAT_XLSX
+) -> None:
+    """
+    Gefahrstoffverzeichnis im Format ``fmt`` nach ``fileobj`` schreiben.
+
+    Raises:
+        ValueError: Unbekanntes Format
+        ImportError: openpyxl fehlt (nur XLSX)
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unbekanntes Exportformat: {fmt!r}")
+    rows = iter_hazard_register_rows(tenant_id, site_id)
+    if fmt == FORMAT_XLSX:
+        from .hazard_register_excel import write_hazard_register_xlsx
+
+        write_hazard_register_xlsx(fileobj, rows)
+    elif fmt == FORMAT_ODS:
+        write_hazard_register_ods(fileobj, rows)
+    else:
+        for chunk in stream_hazard_register_csv(rows):
+            fileobj.write(chunk)
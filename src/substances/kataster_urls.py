@@ -23,4 +23,10 @@ urlpatterns = [
     # Import
     path("import/", views.KatasterImportView.as_view(), name="import"),
     path("import/batches/", views.ImportBatchListView.as_view(), name="import-list"),
+    path("import/batches/<int:pk>/", views.ImportBatchDetailView.as_view(), name="import-detail"),
+    path(
+        "import/batches/<int:pk>/fortschritt/",
+        views.ImportBatchProgressView.as_view(),
+        name="import-progress",
+    ),
 ]
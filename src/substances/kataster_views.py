@@ -8,10 +8,12 @@ import logging
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views import View
 
 from .kataster_forms import KatasterImportForm, ProductForm, SubstanceUsageForm
+from .services.excel_reader import sample_rows
 from .services.kataster_service import (
     KatasterDashboardService,
     KatasterImportService,
@@ -360,7 +362,10 @@ class KatasterImportView(LoginRequiredMixin, View):
             )
 
         try:
-            rows = service.parse_excel(file_content)
+            preview_rows, rows = sample_rows(service.iter_excel_rows(file_content), 5)
+            # Rows are streamed once into pending ImportRows (not the session)
+            with transaction.atomic():
+                total_rows = service.stage_rows(batch, rows)
         except Exception:
             logger.exception("Excel parsing failed")
             messages.error(request, "Fehler beim Lesen der Excel-Datei.")
@@ -368,14 +373,13 @@ class KatasterImportView(LoginRequiredMixin, View):
                 request, self.template_name, {"form": KatasterImportForm(tenant_id=tenant_id)}
             )
 
-        if not rows:
+        if not total_rows:
             messages.warning(request, "Keine Daten in der Datei gefunden.")
             return render(
                 request, self.template_name, {"form": KatasterImportForm(tenant_id=tenant_id)}
             )
 
-        excel_columns = list(rows[0].keys())
-        excel_columns = [c for c in excel_columns if not c.startswith("_")]
+        excel_columns = [c for c in preview_rows[0] if not c.startswith("_")]
 
         target_fields = [
             ("trade_name", "Produktname / Handelsname *"),
@@ -388,34 +392,31 @@ class KatasterImportView(LoginRequiredMixin, View):
             ("cas_number", "CAS-Nummer"),
         ]
 
-        # Store batch info in session
-        request.session["kataster_import_batch_id"] = batch.pk
-        request.session["kataster_import_rows"] = rows
-
         return render(
             request,
             "substances/kataster/import_mapping.html",
             {
                 "batch": batch,
-                "preview_rows": rows[:5],
+                "preview_rows": preview_rows,
                 "excel_columns": excel_columns,
                 "target_fields": target_fields,
-                "total_rows": len(rows),
+                "total_rows": total_rows,
             },
         )
 
     def _execute_import(self, request, tenant_id, user_id):
-        """Step 3: Führe den Import mit bestätigtem Mapping aus."""
-        batch_id = request.session.get("kataster_import_batch_id")
-        rows = request.session.get("kataster_import_rows")
-
-        if not batch_id or not rows:
-            messages.error(request, "Import-Session abgelaufen. Bitte erneut hochladen.")
-            return redirect("kataster:import")
-
+        """Step 3: Mapping bestätigen und Import als Celery-Job starten."""
         from .models import ImportBatch
-
-        batch = get_object_or_404(ImportBatch, pk=batch_id, tenant_id=tenant_id)
+        from .tasks import run_kataster_import
+
+        batch = ImportBatch.objects.filter(
+            pk=request.POST.get("batch_id") or 0,
+            tenant_id=tenant_id,
+            status=ImportBatch.Status.PENDING,
+        ).first()
+        if batch is None or not batch.total_rows:
+            messages.error(request, "Import nicht mehr verfügbar. Bitte erneut hochladen.")
+            return redirect("kataster:import")
 
         column_mapping = {}
         for key in request.POST:
@@ -426,35 +427,51 @@ class KatasterImportView(LoginRequiredMixin, View):
                     column_mapping[field_name] = excel_col
 
         service = KatasterImportService(tenant_id=tenant_id, user_id=user_id)
-        stats = service.process_batch(batch, rows, column_mapping)
+        service.queue_import(batch, column_mapping)
+        transaction.on_commit(lambda: run_kataster_import.delay(batch.pk))
 
-        # Clean session
-        del request.session["kataster_import_batch_id"]
-        del request.session["kataster_import_rows"]
+        return redirect("kataster:import-detail", pk=batch.pk)
 
-        if stats.errors:
-            messages.warning(
-                request,
-                f"Import teilweise: {stats.created} neu, {stats.updated} aktualisiert, "
-                f"{len(stats.errors)} Fehler.",
-            )
-        else:
-            messages.success(
-                request,
-                f"Import erfolgreich: {stats.created} neu, {stats.updated} aktualisiert, "
-                f"{stats.skipped} übersprungen.",
-            )
 
+class ImportBatchDetailView(LoginRequiredMixin, View):
+    """Import-Batch: Fortschritt während des Jobs, danach das Ergebnis."""
+
+    def get(self, request, pk):
+        from .models import ImportBatch
+
+        batch = get_object_or_404(
+            ImportBatch.objects.select_related("target_site"),
+            pk=pk,
+            tenant_id=_tenant_id(request),
+        )
+        if batch.is_running:
+            return render(request, "substances/kataster/import_progress.html", {"batch": batch})
         return render(
             request,
             "substances/kataster/import_result.html",
             {
                 "batch": batch,
-                "stats": stats,
+                "stats": KatasterImportService.batch_stats(batch),
             },
         )
 
 
+class ImportBatchProgressView(LoginRequiredMixin, View):
+    """HTMX-Polling: Fortschrittsbalken eines laufenden Imports."""
+
+    def get(self, request, pk):
+        from .models import ImportBatch
+
+        batch = get_object_or_404(ImportBatch, pk=pk, tenant_id=_tenant_id(request))
+        response = render(
+            request, "substances/kataster/partials/_import_progress.html", {"batch": batch}
+        )
+        if not batch.is_running:
+            # Finished: reload the page, which then renders the result
+            response["HX-Refresh"] = "true"
+        return response
+
+
 class ImportBatchListView(LoginRequiredMixin, View):
     """Liste aller Import-Batches."""
 
@@ -0,0 +1,128 @@
+# substances/management/commands/benchmark_sds_parser.py
+"""
+Management Command: Misst die SDS-Textanalyse am Referenzkorpus.
+
+Vergleicht den abschnittsbezogenen Scan mit einem Volltext-Scan (alle
+Muster über den gesamten Text, wie vor der Abschnittszuordnung) und
+prüft die Ergebnisse gegen die erwarteten JSON-Dateien des Korpus.
+
+Usage:
+    python manage.py benchmark_sds_parser
+    python manage.py benchmark_sds_parser --pages 40 --iterations 20
+    python manage.py benchmark_sds_parser --corpus /pfad/zu/txt-dateien
+"""
+
+import json
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from substances.services.sds_parser import SdsParserService
+
+DEFAULT_CORPUS = Path(__file__).resolve().parents[2] / "tests" / "sds_corpus"
+
+# Fülltext einer OCR-Seite ohne Treffer für die Feldmuster
+FILLER_PAGE = (
+    "Die Angaben stützen sich auf den heutigen Stand unserer Kenntnisse und\n"
+    "dienen der Beschreibung des Produkts im Hinblick auf Sicherheitserfordernisse.\n"
+) * 30
+
+
+class _FullTextParser(SdsParserService):
+    """Referenz: jedes Feld im gesamten Text suchen."""
+
+    def _section_scopes(self, text, head, chunks):
+        return dict.fromkeys(self.FIELD_SECTIONS, text)
+
+
+class Command(BaseCommand):
+    """Benchmark für SdsParserService._parse_text."""
+
+    help = "Misst die SDS-Textanalyse am Referenzkorpus (abschnittsbezogen vs. Volltext)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--corpus",
+            type=str,
+            default=str(DEFAULT_CORPUS),
+            help="Verzeichnis mit *.txt (und optional erwarteten *.json)",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=0,
+            help="Fülltext-Seiten je Dokument ergänzen (simuliert lange OCR-Dokumente)",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=10,
+            help="Wiederholungen je Dokument",
+        )
+
+    def handle(self, *args, **options):
+        corpus = Path(options["corpus"])
+        files = sorted(corpus.glob("*.txt"))
+        if not files:
+            raise CommandError(f"Keine *.txt-Dateien in {corpus}")
+
+        parser = SdsParserService()
+        baseline = _FullTextParser()
+        iterations = max(options["iterations"], 1)
+        total_scoped = total_full = 0.0
+        mismatches = 0
+
+        for path in files:
+            text = path.read_text(encoding="utf-8")
+            expected_path = path.with_suffix(".json")
+            if expected_path.exists():
+                result = asdict(parser._parse_text(text))
+                result.pop("raw_text")
+                if result != json.loads(expected_path.read_text(encoding="utf-8")):
+                    mismatches += 1
+                    self.stdout.write(
+                        self.style.ERROR(f"  ✗ {path.name}: Abweichung vom Erwartungswert")
+                    )
+
+            text = self._inflate(text, options["pages"])
+            scoped = self._time(parser, text, iterations)
+            full = self._time(baseline, text, iterations)
+            total_scoped += scoped
+            total_full += full
+            self.stdout.write(
+                f"  {path.name:<28} {len(text):>9} Zeichen  "
+                f"{scoped * 1000:8.2f} ms  (Volltext {full * 1000:8.2f} ms)"
+            )
+
+        speedup = total_full / total_scoped if total_scoped else 0.0
+        self.stdout.write(
+            f"\n{len(files)} Dokumente: {total_scoped * 1000:.2f} ms abschnittsbezogen, "
+            f"{total_full * 1000:.2f} ms Volltext (Faktor {speedup:.1f})"
+        )
+        if mismatches:
+            raise CommandError(f"{mismatches} Dokument(e) weichen vom Erwartungswert ab")
+        self.stdout.write(self.style.SUCCESS("Ergebnisse identisch mit dem Korpus"))
+
+    @staticmethod
+    def _inflate(text: str, pages: int) -> str:
+        """Fülltext-Seiten in Abschnitt 8 (bzw. am Ende) einfügen."""
+        if pages <= 0:
+            return text
+        filler = FILLER_PAGE * pages
+        sec9 = [
+            m for m in SdsParserService.SECTION_PATTERN.finditer(text) if m.group(1) in ("9", "09")
+        ]
+        if not sec9:
+            return text + "\n" + filler
+        marker = sec9[0].start()
+        return text[:marker] + "\n" + filler + text[marker:]
+
+    @staticmethod
+    def _time(parser: SdsParserService, text: str, iterations: int) -> float:
+        """Mittlere Laufzeit von ``_parse_text`` in Sekunden."""
+        start = time.perf_counter()
+        for _ in range(iterations):
+            parser._parse_text(text)
+        return (time.perf_counter() - start) / iterations
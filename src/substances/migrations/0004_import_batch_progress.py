@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('substances', '0003_compliancereview_katasterrevision_sdschangelog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importbatch',
+            name='processed_rows',
+            field=models.PositiveIntegerField(default=0, help_text='Bereits verarbeitete Zeilen (Fortschritt des Import-Jobs)'),
+        ),
+        migrations.AddField(
+            model_name='importbatch',
+            name='total_rows',
+            field=models.PositiveIntegerField(default=0, help_text='Anzahl der als ImportRow bereitgestellten Zeilen'),
+        ),
+        migrations.AlterField(
+            model_name='importbatch',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Warte auf Bestätigung'), ('queued', 'In Warteschlange'), ('processing', 'Wird verarbeitet'), ('done', 'Abgeschlossen'), ('failed', 'Fehlgeschlagen')], default='pending', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='importrow',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Ausstehend'), ('ok', 'OK'), ('warning', 'Warnung'), ('error', 'Fehler'), ('skipped', 'Übersprungen')], default='ok', max_length=20),
+        ),
+    ]
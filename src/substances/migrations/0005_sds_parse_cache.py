@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('substances', '0004_import_batch_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SdsParseCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('parser_version', models.CharField(max_length=20)),
+                ('result', models.JSONField(help_text='Ausgabe von SdsParserService.parse_pdf')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'SDS-Parser-Cache',
+                'verbose_name_plural': 'SDS-Parser-Cache',
+                'db_table': 'substances_sds_parse_cache',
+            },
+        ),
+    ]
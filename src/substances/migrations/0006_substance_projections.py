@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_projections(apps, schema_editor):
+    """current_sds / primary_cas für bestehende Stoffe setzen (ein UPDATE)."""
+    Substance = apps.get_model("substances", "Substance")
+    SdsRevision = apps.get_model("substances", "SdsRevision")
+    Identifier = apps.get_model("substances", "Identifier")
+
+    Substance.objects.update(
+        current_sds=Subquery(
+            SdsRevision.objects.filter(substance=OuterRef("pk"), status="approved")
+            .order_by("-revision_number")
+            .values("pk")[:1]
+        ),
+        primary_cas=Coalesce(
+            Subquery(
+                Identifier.objects.filter(substance=OuterRef("pk"), id_type="cas")
+                .order_by("pk")
+                .values("id_value")[:1]
+            ),
+            Value(""),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('substances', '0005_sds_parse_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='substance',
+            name='current_sds',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Aktuell gültige SDS-Revision (approved, neueste)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='substances.sdsrevision'),
+        ),
+        migrations.AddField(
+            model_name='substance',
+            name='primary_cas',
+            field=models.CharField(blank=True, default='', editable=False, help_text='CAS-Nummer aus den Stoffkennungen', max_length=100),
+        ),
+        migrations.RunPython(backfill_projections, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,98 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:13
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+# Trigram indexes for the typo-tolerant search (``lower(field) % term``);
+# pg_trgm is installed by global_sds 0004.
+TRGM_INDEXES = [
+    ("substances_substance_name_trgm", "substances_substance", "name"),
+    ("substances_substance_trade_name_trgm", "substances_substance", "trade_name"),
+    ("substances_product_trade_name_trgm", "substances_product", "trade_name"),
+]
+TRGM_SQL = "".join(
+    f"CREATE INDEX {name} ON {table} USING gin (lower({column}) gin_trgm_ops);\n"
+    for name, table, column in TRGM_INDEXES
+)
+TRGM_REVERSE_SQL = "".join(f"DROP INDEX IF EXISTS {name};\n" for name, _, _ in TRGM_INDEXES)
+
+
+def _vector(*weighted_fields):
+    parts = [
+        SearchVector(field, weight=weight, config="german") for field, weight in weighted_fields
+    ]
+    vector = parts[0]
+    for part in parts[1:]:
+        vector = vector + part
+    return vector
+
+
+def backfill_search_index(apps, schema_editor):
+    """search_vector und normalisierte Kennungen für Bestandsdaten setzen."""
+    Substance = apps.get_model("substances", "Substance")
+    Product = apps.get_model("substances", "Product")
+    Identifier = apps.get_model("substances", "Identifier")
+
+    Substance.objects.update(
+        search_vector=_vector(("name", "A"), ("trade_name", "A"), ("description", "C"))
+    )
+    Product.objects.update(
+        search_vector=_vector(("trade_name", "A"), ("material_number", "A"), ("description", "C"))
+    )
+
+    batch = []
+    for identifier in Identifier.objects.only("pk", "id_value").iterator(chunk_size=2000):
+        identifier.id_value_normalized = "".join(
+            ch for ch in identifier.id_value if ch.isalnum()
+        ).upper()[:100]
+        batch.append(identifier)
+        if len(batch) >= 2000:
+            Identifier.objects.bulk_update(batch, ["id_value_normalized"])
+            batch = []
+    Identifier.objects.bulk_update(batch, ["id_value_normalized"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('global_sds', '0009_substance_alias'),
+        ('substances', '0006_substance_projections'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='identifier',
+            name='id_value_normalized',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Suchschlüssel (normalize_identifier_value)', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Volltextindex (Handelsname, Materialnr.)', null=True),
+        ),
+        migrations.AddField(
+            model_name='substance',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Volltextindex (Name, Handelsname, Beschreibung)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='identifier',
+            index=models.Index(fields=['tenant_id', 'id_value_normalized'], name='ix_identifier_normalized'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['tenant_id', 'material_number'], name='ix_product_material_number'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='ix_product_search'),
+        ),
+        migrations.AddIndex(
+            model_name='substance',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='ix_substance_search'),
+        ),
+        migrations.RunSQL(TRGM_SQL, TRGM_REVERSE_SQL),
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:20
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+# Postgres cannot turn a plain column into a generated one: drop the
+# Python-maintained search_vector and add it back as GENERATED ... STORED
+# (computed for existing rows on ADD COLUMN).
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('substances', '0007_search_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='ix_product_search',
+        ),
+        migrations.RemoveIndex(
+            model_name='substance',
+            name='ix_substance_search',
+        ),
+        migrations.RemoveField(
+            model_name='product',
+            name='search_vector',
+        ),
+        migrations.RemoveField(
+            model_name='substance',
+            name='search_vector',
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('trade_name', config='german', weight='A'), '||', django.contrib.postgres.search.SearchVector('material_number', config='german', weight='A'), django.contrib.postgres.search.SearchConfig('german')), '||', django.contrib.postgres.search.SearchVector('description', config='german', weight='C'), django.contrib.postgres.search.SearchConfig('german')), help_text='Volltextindex (Handelsname, Materialnr., Beschreibung)', output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='substance',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('name', config='german', weight='A'), '||', django.contrib.postgres.search.SearchVector('trade_name', config='german', weight='A'), django.contrib.postgres.search.SearchConfig('german')), '||', django.contrib.postgres.search.SearchVector('description', config='german', weight='C'), django.contrib.postgres.search.SearchConfig('german')), help_text='Volltextindex (Name, Handelsname, Beschreibung)', output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='ix_product_search'),
+        ),
+        migrations.AddIndex(
+            model_name='substance',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='ix_substance_search'),
+        ),
+    ]
@@ -21,8 +21,12 @@ Enthält:
 
 import hashlib
 
-from django.db import models
-from django_tenancy.managers import TenantManager
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models, transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django_tenancy.managers import TenantManager, TenantQuerySet
 
 # =============================================================================
 # BASE CLASS (Tenant-Scoped)
@@ -43,6 +47,34 @@ class TenantScopedModel(models.Model):
         abstract = True
 
 
+# =============================================================================
+# SUCHINDEX (tsvector, Kennungen)
+# =============================================================================
+
+SEARCH_CONFIG = "german"
+
+
+def search_vector_expression(*weighted_fields):
+    """Gewichteter tsvector über ``(Feld, Gewicht)``-Paare.
+
+    Ausdruck der generierten ``search_vector``-Spalten: Postgres hält sie bei
+    jedem INSERT/UPDATE aktuell, auch bei ``update()`` und ``bulk_create()``.
+    """
+    parts = [
+        SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        for field, weight in weighted_fields
+    ]
+    vector = parts[0]
+    for part in parts[1:]:
+        vector = vector + part
+    return vector
+
+
+def normalize_identifier_value(value: str) -> str:
+    """Vergleichsschlüssel einer Kennung: nur Buchstaben/Ziffern, groß (67-64-1 → 67641)."""
+    return "".join(ch for ch in value or "" if ch.isalnum()).upper()[:100]
+
+
 # =============================================================================
 # PARTY (Hersteller / Lieferant)
 # =============================================================================
@@ -87,6 +119,65 @@ class Party(TenantScopedModel):
 # =============================================================================
 
 
+class SubstanceQuerySet(TenantQuerySet):
+    """Projektionen current_sds / primary_cas berechnen und aktualisieren."""
+
+    @staticmethod
+    def current_sds_subquery():
+        """ID der aktuell gültigen SDS-Revision (approved, höchste Revisionsnummer)."""
+        return Subquery(
+            SdsRevision.objects.unscoped()
+            .filter(substance=OuterRef("pk"), status=SdsRevision.Status.APPROVED)
+            .order_by("-revision_number")
+            .values("pk")[:1]
+        )
+
+    @staticmethod
+    def primary_cas_subquery():
+        """CAS-Nummer aus den Stoffkennungen ("" wenn keine)."""
+        return Coalesce(
+            Subquery(
+                Identifier.objects.unscoped()
+                .filter(substance=OuterRef("pk"), id_type=Identifier.IdType.CAS)
+                .order_by("pk")
+                .values("id_value")[:1]
+            ),
+            Value(""),
+        )
+
+    def with_live_projections(self):
+        """Projektionen live per Subquery annotieren (live_current_sds_id, live_primary_cas).
+
+        Für Pfade, die den gespeicherten Spalten nicht trauen können
+        (z.B. Abgleich nach Rohdaten-Importen).
+        """
+        return self.annotate(
+            live_current_sds_id=self.current_sds_subquery(),
+            live_primary_cas=self.primary_cas_subquery(),
+        )
+
+    def refresh_projections(self) -> int:
+        """current_sds / primary_cas aller Stoffe mit einem UPDATE neu setzen.
+
+        Bulk-Pfade, die Kennungen oder SDS-Revisionen an ``save()`` vorbei
+        schreiben, rufen dies danach auf.
+        """
+        return self.update(
+            current_sds=self.current_sds_subquery(),
+            primary_cas=self.primary_cas_subquery(),
+        )
+
+
+class SubstanceManager(TenantManager.from_queryset(SubstanceQuerySet)):
+    """TenantManager (ADR-137) mit SubstanceQuerySet."""
+
+    def get_queryset(self) -> SubstanceQuerySet:
+        return SubstanceQuerySet(self.model, query=super().get_queryset().query, using=self._db)
+
+    def _unscoped_queryset(self) -> SubstanceQuerySet:
+        return SubstanceQuerySet(self.model, using=self._db)
+
+
 class Substance(TenantScopedModel):
     """Gefahrstoff / Chemisches Produkt."""
 
@@ -267,6 +358,34 @@ class Substance(TenantScopedModel):
         help_text="GESTIS Volltext-Link",
     )
 
+    # Projektionen — gepflegt von SdsRevision.save() / Identifier.save()
+    current_sds = models.ForeignKey(
+        "SdsRevision",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+",
+        help_text="Aktuell gültige SDS-Revision (approved, neueste)",
+    )
+    primary_cas = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="CAS-Nummer aus den Stoffkennungen",
+    )
+    search_vector = models.GeneratedField(
+        expression=search_vector_expression(
+            ("name", "A"), ("trade_name", "A"), ("description", "C")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        help_text="Volltextindex (Name, Handelsname, Beschreibung)",
+    )
+
+    objects = SubstanceManager()
+
     class Meta:
         db_table = "substances_substance"
         verbose_name = "Gefahrstoff"
@@ -279,25 +398,35 @@ class Substance(TenantScopedModel):
             models.Index(fields=["tenant_id", "status"], name="ix_substance_tenant_status"),
             models.Index(fields=["tenant_id", "is_cmr"], name="ix_substance_tenant_cmr"),
             models.Index(fields=["name"], name="ix_substance_name"),
+            GinIndex(fields=["search_vector"], name="ix_substance_search"),
         ]
 
+    PROJECTION_FIELDS = ("current_sds", "primary_cas")
+
     def __str__(self):
         return self.name
 
-    @property
-    def current_sds(self):
-        """Aktuell gültige SDS-Revision (approved, neueste)."""
-        return (
-            self.sds_revisions.filter(status=SdsRevision.Status.APPROVED)
-            .order_by("-revision_number")
-            .first()
-        )
+    def save(self, *args, **kwargs):
+        # Projektionen nie mit veralteten In-Memory-Werten überschreiben
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not (f.primary_key or f.generated or f.name in self.PROJECTION_FIELDS)
+            ]
+        super().save(*args, **kwargs)
 
     @property
     def cas_number(self):
         """CAS-Nummer (falls vorhanden)."""
-        identifier = self.identifiers.filter(id_type=Identifier.IdType.CAS).first()
-        return identifier.id_value if identifier else None
+        return self.primary_cas or None
+
+
+def _refresh_substance_projections(obj) -> None:
+    """Projektionen des Stoffs von ``obj`` (SdsRevision/Identifier) neu berechnen."""
+    Substance.objects.unscoped().filter(pk=obj.substance_id).refresh_projections()
+    if type(obj).substance.is_cached(obj):
+        obj.substance.refresh_from_db(fields=Substance.PROJECTION_FIELDS)
 
 
 # =============================================================================
@@ -320,6 +449,13 @@ class Identifier(TenantScopedModel):
     substance = models.ForeignKey(Substance, on_delete=models.CASCADE, related_name="identifiers")
     id_type = models.CharField(max_length=20, choices=IdType.choices)
     id_value = models.CharField(max_length=100)
+    id_value_normalized = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Suchschlüssel (normalize_identifier_value)",
+    )
 
     class Meta:
         db_table = "substances_identifier"
@@ -330,10 +466,30 @@ class Identifier(TenantScopedModel):
                 fields=["tenant_id", "substance", "id_type"], name="uq_identifier_substance_type"
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=["tenant_id", "id_value_normalized"], name="ix_identifier_normalized"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.get_id_type_display()}: {self.id_value}"
 
+    def save(self, *args, **kwargs):
+        self.id_value_normalized = normalize_identifier_value(self.id_value)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "id_value" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "id_value_normalized"}
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            _refresh_substance_projections(self)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            _refresh_substance_projections(self)
+        return result
+
 
 # =============================================================================
 # SDS REVISION (Sicherheitsdatenblatt)
@@ -403,6 +559,17 @@ class SdsRevision(TenantScopedModel):
     def __str__(self):
         return f"{self.substance.name} - Rev. {self.revision_number}"
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            _refresh_substance_projections(self)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            _refresh_substance_projections(self)
+        return result
+
 
 # =============================================================================
 # SITE INVENTORY (Standort-Inventar)
@@ -712,6 +879,14 @@ class Product(TenantScopedModel):
         default="",
         help_text="Beschreibung / allgemeiner Verwendungszweck",
     )
+    search_vector = models.GeneratedField(
+        expression=search_vector_expression(
+            ("trade_name", "A"), ("material_number", "A"), ("description", "C")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        help_text="Volltextindex (Handelsname, Materialnr., Beschreibung)",
+    )
 
     class Meta:
         db_table = "substances_product"
@@ -726,6 +901,10 @@ class Product(TenantScopedModel):
         ]
         indexes = [
             models.Index(fields=["tenant_id", "status"], name="ix_product_tenant_status"),
+            models.Index(
+                fields=["tenant_id", "material_number"], name="ix_product_material_number"
+            ),
+            GinIndex(fields=["search_vector"], name="ix_product_search"),
         ]
 
     def __str__(self):
@@ -734,13 +913,19 @@ class Product(TenantScopedModel):
 
     @property
     def is_pure_substance(self) -> bool:
-        """True wenn Reinstoff (genau 1 Komponente)."""
-        return self.components.count() == 1
+        """True wenn Reinstoff (genau 1 Komponente).
+
+        Nutzt ``prefetch_related("components")``, falls vorhanden.
+        """
+        return len(self.components.all()) == 1
 
     @property
     def cas_number(self) -> str | None:
-        """CAS der Hauptkomponente (bei Reinstoff)."""
-        comp = self.components.select_related("substance").first()
+        """CAS der Hauptkomponente (bei Reinstoff).
+
+        Ohne Query bei ``prefetch_related("components__substance")``.
+        """
+        comp = min(self.components.all(), key=lambda c: c.pk, default=None)
         return comp.substance.cas_number if comp and comp.substance else None
 
 
@@ -990,6 +1175,7 @@ class ImportBatch(TenantScopedModel):
 
     class Status(models.TextChoices):
         PENDING = "pending", "Warte auf Bestätigung"
+        QUEUED = "queued", "In Warteschlange"
         PROCESSING = "processing", "Wird verarbeitet"
         DONE = "done", "Abgeschlossen"
         FAILED = "failed", "Fehlgeschlagen"
@@ -1022,6 +1208,14 @@ class ImportBatch(TenantScopedModel):
     )
     error_message = models.TextField(blank=True, default="")
     imported_at = models.DateTimeField(null=True, blank=True)
+    total_rows = models.PositiveIntegerField(
+        default=0,
+        help_text="Anzahl der als ImportRow bereitgestellten Zeilen",
+    )
+    processed_rows = models.PositiveIntegerField(
+        default=0,
+        help_text="Bereits verarbeitete Zeilen (Fortschritt des Import-Jobs)",
+    )
 
     class Meta:
         db_table = "substances_import_batch"
@@ -1032,6 +1226,16 @@ class ImportBatch(TenantScopedModel):
     def __str__(self):
         return f"{self.file_name} → {self.target_site} ({self.get_status_display()})"
 
+    @property
+    def is_running(self) -> bool:
+        return self.status in (self.Status.QUEUED, self.Status.PROCESSING)
+
+    @property
+    def progress_percent(self) -> int:
+        if not self.total_rows:
+            return 100 if self.status == self.Status.DONE else 0
+        return min(100, self.processed_rows * 100 // self.total_rows)
+
     @staticmethod
     def compute_file_hash(file_content: bytes) -> str:
         """SHA-256 des Dateiinhalts berechnen."""
@@ -1042,6 +1246,7 @@ class ImportRow(TenantScopedModel):
     """Einzelzeile eines Excel-Imports mit Matching-Ergebnis (UC-004)."""
 
     class Status(models.TextChoices):
+        PENDING = "pending", "Ausstehend"
         OK = "ok", "OK"
         WARNING = "warning", "Warnung"
         ERROR = "error", "Fehler"
@@ -1159,6 +1364,34 @@ class SPhrase(models.Model):
         return f"{self.s_code}: {self.s_text_de[:60]}"
 
 
+# =============================================================================
+# SDS PARSE CACHE (Parser-Ergebnisse nach PDF-Inhalt)
+# =============================================================================
+
+
+class SdsParseCache(models.Model):
+    """Parser-Ergebnis eines SDS-PDFs, adressiert über SHA-256 des Inhalts.
+
+    Nicht tenant-gebunden: das Ergebnis hängt nur von den PDF-Bytes ab.
+    Einträge mit abweichender ``parser_version`` gelten als veraltet und
+    werden beim nächsten Parsen desselben PDFs überschrieben.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    parser_version = models.CharField(max_length=20)
+    result = models.JSONField(help_text="Ausgabe von SdsParserService.parse_pdf")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "substances_sds_parse_cache"
+        verbose_name = "SDS-Parser-Cache"
+        verbose_name_plural = "SDS-Parser-Cache"
+
+    def __str__(self):
+        return f"{self.sha256[:12]} (v{self.parser_version})"
+
+
 # =============================================================================
 # SDS CHANGE LOG (UC-005: SDS-Aktualisierungszyklus)
 # =============================================================================
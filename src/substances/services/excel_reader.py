@@ -0,0 +1,63 @@
+# substances/services/excel_reader.py
+"""
+Streamender Excel-Reader für Kataster- und Stoff-Importe.
+
+.xlsx wird über openpyxl im ``read_only``-Modus Zeile für Zeile gelesen,
+.xls (Altformat) über xlrd mit ``on_demand``. Zeilen werden als Tupel
+geliefert — der Speicherbedarf hängt nicht von der Blattgröße ab.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+from collections.abc import Iterator
+from itertools import chain, islice
+from typing import BinaryIO
+
+logger = logging.getLogger(__name__)
+
+
+def iter_sheet_rows(source: bytes | BinaryIO) -> Iterator[tuple]:
+    """Zeilen des ersten/aktiven Blatts als Tupel, lazy.
+
+    Öffnet die Arbeitsmappe sofort (Formatfehler fallen hier auf, nicht
+    erst beim Iterieren); .xlsx wird bevorzugt, sonst .xls versucht.
+    """
+    if isinstance(source, bytes | bytearray):
+        source = io.BytesIO(source)
+    try:
+        return _iter_xlsx(source)
+    except Exception:
+        source.seek(0)
+        return _iter_xls(source.read())
+
+
+def sample_rows(rows: Iterator[tuple], size: int) -> tuple[list[tuple], Iterator[tuple]]:
+    """Die ersten ``size`` Zeilen als Liste plus Iterator über *alle* Zeilen."""
+    rows = iter(rows)
+    sample = list(islice(rows, size))
+    return sample, chain(sample, rows)
+
+
+def _iter_xlsx(source: BinaryIO) -> Iterator[tuple]:
+    import openpyxl
+
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    return _closing(wb.active.iter_rows(values_only=True), wb.close)
+
+
+def _iter_xls(content: bytes) -> Iterator[tuple]:
+    import xlrd
+
+    wb = xlrd.open_workbook(file_contents=content, on_demand=True)
+    ws = wb.sheet_by_index(0)
+    rows = (tuple(ws.row_values(row_idx)) for row_idx in range(ws.nrows))
+    return _closing(rows, wb.release_resources)
+
+
+def _closing(rows: Iterator[tuple], close) -> Iterator[tuple]:
+    try:
+        yield from rows
+    finally:
+        close()
@@ -10,11 +10,14 @@ Enthält:
 
 import hashlib
 import logging
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from uuid import UUID
 
 from django.db.models import Count, Q
 
+from substances.services.excel_reader import iter_sheet_rows, sample_rows
+
 logger = logging.getLogger(__name__)
 
 
@@ -228,23 +231,30 @@ class KatasterImportService:
         "wgk",
     )
 
+    # Rows handed to the structure analysis (LLM preview uses the first 20)
+    STRUCTURE_SAMPLE_ROWS = 30
+
     def parse_excel(self, file_content: bytes) -> list[dict]:
-        """Parse Excel (.xlsx or .xls) via LLM-analysierte Struktur.
+        """Parse Excel (.xlsx or .xls) vollständig — siehe ``iter_excel_rows``."""
+        return list(self.iter_excel_rows(file_content))
+
+    def iter_excel_rows(self, file_content: bytes) -> Iterator[dict]:
+        """Parse Excel (.xlsx or .xls) via LLM-analysierte Struktur, streamend.
 
         Trennung: LLM analysiert Struktur → Parser extrahiert Daten.
         LLM sieht nur Struktur/Header, niemals die eigentlichen Werte.
         Fallback auf regelbasierte Erkennung wenn LLM nicht verfügbar.
-        """
-        try:
-            raw_rows = self._parse_xlsx(file_content)
-        except Exception:
-            raw_rows = self._parse_xls(file_content)
 
-        if not raw_rows:
-            return []
+        Die Strukturanalyse sieht nur die ersten ``STRUCTURE_SAMPLE_ROWS``
+        Zeilen; danach werden die Datenzeilen lazy gelesen und als Dicts
+        geliefert, ohne das Blatt vollständig in den Speicher zu laden.
+        """
+        sample, raw_rows = sample_rows(iter_sheet_rows(file_content), self.STRUCTURE_SAMPLE_ROWS)
+        if not sample:
+            return iter(())
 
         # Step 1: LLM analysiert Struktur (oder Fallback)
-        analysis = self._analyze_structure(raw_rows)
+        analysis = self._analyze_structure(sample)
         logger.info("Structure analysis: %s", analysis)
 
         # Step 2: Deterministischer Parser extrahiert Daten
@@ -419,7 +429,7 @@ class KatasterImportService:
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _extract_rows(raw_rows: list[tuple], analysis: dict) -> list[dict]:
+    def _extract_rows(raw_rows: Iterable[tuple], analysis: dict) -> Iterator[dict]:
         """Extrahiere Datenzeilen basierend auf der Strukturanalyse.
 
         Rein deterministisch — liest nur Zellwerte an den vom
@@ -429,12 +439,13 @@ class KatasterImportService:
         product_col = analysis.get("product_name_col", 1)
         col_map = analysis.get("column_mapping", {})
 
-        result = []
-        for row_idx in range(data_start, len(raw_rows)):
-            row = raw_rows[row_idx]
+        for row_idx, row in enumerate(raw_rows):
+            if row_idx < data_start:
+                continue
 
             # Produktname prüfen — nur Zeilen mit Name sind relevant
-            trade_name = str(row[product_col] if product_col < len(row) else "").strip()
+            cell = row[product_col] if product_col < len(row) else None
+            trade_name = str(cell if cell is not None else "").strip()
             if not trade_name:
                 continue
 
@@ -448,96 +459,350 @@ class KatasterImportService:
                     val = row[col_idx]
                     record[field_name] = str(val).strip() if val is not None else ""
 
-            result.append(record)
+            yield record
 
-        return result
+    # Rows per INSERT/UPDATE statement in the bulk import pipeline
+    BULK_CHUNK_SIZE = 500
 
-    @staticmethod
-    def _parse_xlsx(file_content: bytes) -> list[tuple]:
-        """Parse .xlsx via openpyxl."""
-        import io
+    # Mapped fields with their DB length limit (validated per row up front)
+    _FIELD_LIMITS = {
+        "trade_name": 300,
+        "material_number": 100,
+        "storage_location": 300,
+        "storage_class": 10,
+    }
+
+    def process_batch(self, batch, rows: list[dict], column_mapping: dict) -> ImportStats:
+        """Verarbeitet geparste Zeilen synchron (Bereitstellen + Import).
+
+        Entspricht ``stage_rows`` + ``queue_import`` + ``run_import`` in
+        einem Aufruf — für Aufrufer ohne Celery (Management-Commands, Tests).
+        """
+        self.stage_rows(batch, rows)
+        self.queue_import(batch, column_mapping)
+        return self.run_import(batch)
+
+    def stage_rows(self, batch, rows: Iterable[dict]) -> int:
+        """Speichert geparste Zeilen einmalig als ausstehende ImportRows.
+
+        Ersetzt das Zwischenspeichern in der Session: der Import-Job liest
+        die Zeilen chunkweise aus der Datenbank. ``rows`` darf ein Iterator
+        sein (``iter_excel_rows``) und wird in Chunks geschrieben.
+        """
+        from itertools import islice
+
+        from substances.models import ImportRow
+
+        if batch.total_rows:
+            batch.rows.all().delete()
+        rows = iter(rows)
+        total = 0
+        while chunk := list(islice(rows, self.BULK_CHUNK_SIZE)):
+            ImportRow.objects.bulk_create(
+                ImportRow(
+                    tenant_id=self.tenant_id,
+                    created_by=self.user_id,
+                    batch=batch,
+                    row_number=row_data.pop("_row_number", 0),
+                    raw_data=row_data,
+                    status=ImportRow.Status.PENDING,
+                )
+                for row_data in chunk
+            )
+            total += len(chunk)
+        batch.total_rows = total
+        batch.processed_rows = 0
+        batch.save(update_fields=["total_rows", "processed_rows", "updated_at"])
+        return total
+
+    def queue_import(self, batch, column_mapping: dict) -> None:
+        """Bestätigtes Mapping speichern und Batch für den Import-Job freigeben."""
+        batch.column_mapping = column_mapping
+        batch.status = batch.Status.QUEUED
+        batch.stats = {}
+        batch.error_message = ""
+        batch.save(
+            update_fields=["column_mapping", "status", "stats", "error_message", "updated_at"]
+        )
 
-        import openpyxl
+    def run_import(self, batch) -> ImportStats:
+        """Importiert alle ausstehenden Zeilen eines Batches, chunkweise.
 
-        wb = openpyxl.load_workbook(io.BytesIO(file_content), read_only=True, data_only=True)
-        ws = wb.active
-        rows = list(ws.iter_rows(values_only=True))
-        wb.close()
-        return rows
+        Jeder Chunk läuft in einer eigenen Transaktion, die auch den
+        Fortschritt (``processed_rows``, Zwischenstatistik) am Batch
+        festschreibt. Bricht ein Worker ab, setzt ein erneuter Aufruf beim
+        ersten noch ausstehenden Chunk fort.
+
+        Pro Chunk: Zeilen werden vorab validiert, vorhandene Produkte und
+        Verwendungen des Tenants in Dicts vorgeladen, neue per
+        ``bulk_create`` und bestehende per ``bulk_update`` geschrieben;
+        ImportRows landen gesammelt per Upsert. Schlägt ein
+        Bulk-Schreibvorgang fehl, läuft der Chunk zeilenweise (mit Savepoint
+        je Zeile) — Fehlerisolation und ``ImportStats`` bleiben identisch.
+        """
+        from django.db import transaction
+
+        from substances.models import ImportBatch, ImportRow
+
+        batch.status = ImportBatch.Status.PROCESSING
+        batch.save(update_fields=["status", "updated_at"])
+        column_mapping = batch.column_mapping or {}
+
+        while True:
+            with transaction.atomic():
+                # Row lock serialises concurrent (re-delivered) jobs per batch
+                locked = ImportBatch.objects.select_for_update().get(pk=batch.pk)
+                parsed = list(
+                    batch.rows.filter(status=ImportRow.Status.PENDING)
+                    .order_by("row_number")
+                    .values_list("row_number", "raw_data")[: self.BULK_CHUNK_SIZE]
+                )
+                if not parsed:
+                    break
+                try:
+                    with transaction.atomic():
+                        chunk_stats = self._process_rows_bulk(batch, parsed, column_mapping)
+                except Exception:
+                    logger.exception(
+                        "Bulk import of batch %s failed, retrying row by row", batch.pk
+                    )
+                    chunk_stats = self._process_rows_individually(batch, parsed, column_mapping)
+                self._record_progress(locked, chunk_stats, len(parsed))
+            batch.processed_rows, batch.stats = locked.processed_rows, locked.stats
+            if len(parsed) < self.BULK_CHUNK_SIZE:
+                break
+
+        stats = self.batch_stats(batch)
+        self._finish_batch(batch, stats)
+        return stats
 
     @staticmethod
-    def _parse_xls(file_content: bytes) -> list[tuple]:
-        """Parse .xls (legacy Excel) via xlrd."""
-        import xlrd
+    def _record_progress(batch, chunk_stats: ImportStats, row_count: int) -> None:
+        totals = batch.stats or {}
+        batch.stats = {
+            "created": totals.get("created", 0) + chunk_stats.created,
+            "updated": totals.get("updated", 0) + chunk_stats.updated,
+            "skipped": totals.get("skipped", 0) + chunk_stats.skipped,
+            "errors": totals.get("errors", 0) + len(chunk_stats.errors),
+        }
+        batch.processed_rows += row_count
+        batch.save(update_fields=["stats", "processed_rows", "updated_at"])
 
-        wb = xlrd.open_workbook(file_contents=file_content)
-        ws = wb.sheet_by_index(0)
-        rows = []
-        for row_idx in range(ws.nrows):
-            rows.append(tuple(ws.cell_value(row_idx, col) for col in range(ws.ncols)))
-        return rows
+    @staticmethod
+    def batch_stats(batch) -> ImportStats:
+        """``ImportStats`` eines (teilweise) verarbeiteten Batches aus der DB."""
+        from substances.models import ImportRow
+
+        totals = batch.stats or {}
+        errors = []
+        if totals.get("errors"):
+            errors = [
+                f"Zeile {row_number}: {messages[0] if messages else ''}"
+                for row_number, messages in batch.rows.filter(status=ImportRow.Status.ERROR)
+                .order_by("row_number")
+                .values_list("row_number", "messages")
+            ]
+        return ImportStats(
+            created=totals.get("created", 0),
+            updated=totals.get("updated", 0),
+            skipped=totals.get("skipped", 0),
+            errors=errors,
+        )
+
+    def _row_values(self, row_data: dict, column_mapping: dict) -> dict:
+        """Gemappte Zielwerte einer Zeile; ValueError bei Überlänge."""
+        values = {
+            name: self._map_field(row_data, column_mapping, name)
+            for name in (
+                "trade_name",
+                "material_number",
+                "usage_description",
+                "storage_location",
+                "storage_class",
+            )
+        }
+        for name, limit in self._FIELD_LIMITS.items():
+            if len(values[name]) > limit:
+                raise ValueError(f"{name} länger als {limit} Zeichen")
+        return values
+
+    def _process_rows_bulk(self, batch, parsed: list, column_mapping: dict) -> ImportStats:
+        from django.utils import timezone
 
-    def process_batch(self, batch, rows: list[dict], column_mapping: dict) -> ImportStats:
-        """Verarbeitet geparste Zeilen und erstellt/aktualisiert Produkte + Usages."""
         from substances.models import ImportRow, Product, SubstanceUsage
 
         stats = ImportStats()
-        batch.column_mapping = column_mapping
-        batch.status = batch.Status.PROCESSING
-        batch.save(update_fields=["column_mapping", "status"])
+        now = timezone.now()
+        chunk = self.BULK_CHUNK_SIZE
 
-        for row_data in rows:
-            row_num = row_data.pop("_row_number", 0)
-            import_row = ImportRow.objects.create(
+        import_rows = []
+        valid = []  # (import_row, values)
+        for row_num, row_data in parsed:
+            import_row = ImportRow(
                 tenant_id=self.tenant_id,
                 created_by=self.user_id,
                 batch=batch,
                 row_number=row_num,
                 raw_data=row_data,
             )
-
+            import_rows.append(import_row)
             try:
-                trade_name = self._map_field(row_data, column_mapping, "trade_name")
-                if not trade_name:
-                    import_row.status = ImportRow.Status.SKIPPED
-                    import_row.messages = ["Kein Produktname gefunden"]
-                    import_row.save(update_fields=["status", "messages"])
-                    stats.skipped += 1
-                    continue
-
-                product, created = Product.objects.get_or_create(
+                values = self._row_values(row_data, column_mapping)
+            except Exception as e:
+                import_row.status = ImportRow.Status.ERROR
+                import_row.messages = [str(e)]
+                stats.errors.append(f"Zeile {row_num}: {e}")
+                continue
+            if not values["trade_name"]:
+                import_row.status = ImportRow.Status.SKIPPED
+                import_row.messages = ["Kein Produktname gefunden"]
+                stats.skipped += 1
+                continue
+            valid.append((import_row, values))
+
+        # Products: pre-load existing (manufacturer=None), create the rest.
+        names = {values["trade_name"] for _, values in valid}
+        products = {
+            p.trade_name: p
+            for p in Product.objects.filter(
+                tenant_id=self.tenant_id, manufacturer__isnull=True, trade_name__in=names
+            )
+        }
+        new_products = {}
+        for _, values in valid:
+            name = values["trade_name"]
+            if name not in products and name not in new_products:
+                new_products[name] = Product(
                     tenant_id=self.tenant_id,
-                    trade_name=trade_name,
-                    manufacturer=None,
-                    defaults={
-                        "created_by": self.user_id,
-                        "material_number": self._map_field(
-                            row_data, column_mapping, "material_number"
-                        ),
-                        "status": Product.Status.ACTIVE,
-                    },
+                    created_by=self.user_id,
+                    trade_name=name,
+                    material_number=values["material_number"],
+                    status=Product.Status.ACTIVE,
                 )
+        Product.objects.bulk_create(new_products.values(), batch_size=chunk)
+        products.update(new_products)
 
-                usage_desc = self._map_field(row_data, column_mapping, "usage_description")
-                storage_loc = self._map_field(row_data, column_mapping, "storage_location")
-                storage_cls = self._map_field(row_data, column_mapping, "storage_class")
-
-                SubstanceUsage.objects.update_or_create(
+        # Usages at the target site (department=None): update or create.
+        usages = {
+            u.product_id: u
+            for u in SubstanceUsage.objects.filter(
+                tenant_id=self.tenant_id,
+                site_id=batch.target_site_id,
+                department__isnull=True,
+                product_id__in=[p.pk for p in products.values()],
+            )
+        }
+        new_usages = {}
+        changed_usages = {}
+        counted_new = set()
+        for import_row, values in valid:
+            product = products[values["trade_name"]]
+            usage = usages.get(product.pk)
+            if usage is None:
+                usage = SubstanceUsage(
                     tenant_id=self.tenant_id,
                     product=product,
-                    site=batch.target_site,
+                    site_id=batch.target_site_id,
                     department=None,
-                    defaults={
-                        "created_by": self.user_id,
-                        "usage_description": usage_desc,
-                        "storage_location": storage_loc,
-                        "storage_class": storage_cls,
-                    },
                 )
+                usages[product.pk] = new_usages[product.pk] = usage
+            elif usage.pk is not None:
+                changed_usages[product.pk] = usage
+            usage.created_by = self.user_id
+            usage.usage_description = values["usage_description"]
+            usage.storage_location = values["storage_location"]
+            usage.storage_class = values["storage_class"]
+            usage.updated_at = now
+
+            import_row.resolved_product = product
+            import_row.status = ImportRow.Status.OK
+            # get_or_create semantics: only the first row of a new product counts as created
+            if product.trade_name in new_products and product.pk not in counted_new:
+                counted_new.add(product.pk)
+                stats.created += 1
+            else:
+                stats.updated += 1
+
+        SubstanceUsage.objects.bulk_create(new_usages.values(), batch_size=chunk)
+        SubstanceUsage.objects.bulk_update(
+            changed_usages.values(),
+            [
+                "created_by",
+                "usage_description",
+                "storage_location",
+                "storage_class",
+                "updated_at",
+            ],
+            batch_size=chunk,
+        )
+
+        ImportRow.objects.bulk_create(
+            import_rows,
+            batch_size=chunk,
+            update_conflicts=True,
+            unique_fields=["batch", "row_number"],
+            update_fields=["raw_data", "resolved_product", "status", "messages", "updated_at"],
+        )
+        return stats
+
+    def _process_rows_individually(self, batch, parsed: list, column_mapping: dict) -> ImportStats:
+        """Fallback: eine Zeile nach der anderen, jede in eigenem Savepoint."""
+        from django.db import transaction
+
+        from substances.models import ImportRow, Product, SubstanceUsage
+
+        stats = ImportStats()
+        for row_num, row_data in parsed:
+            import_row, _ = ImportRow.objects.update_or_create(
+                batch=batch,
+                row_number=row_num,
+                defaults={
+                    "tenant_id": self.tenant_id,
+                    "created_by": self.user_id,
+                    "raw_data": row_data,
+                    "resolved_product": None,
+                    "status": ImportRow.Status.OK,
+                    "messages": [],
+                },
+            )
 
-                import_row.resolved_product = product
-                import_row.status = ImportRow.Status.OK
-                import_row.save(update_fields=["resolved_product", "status"])
+            try:
+                with transaction.atomic():
+                    values = self._row_values(row_data, column_mapping)
+                    if not values["trade_name"]:
+                        import_row.status = ImportRow.Status.SKIPPED
+                        import_row.messages = ["Kein Produktname gefunden"]
+                        import_row.save(update_fields=["status", "messages"])
+                        stats.skipped += 1
+                        continue
+
+                    product, created = Product.objects.get_or_create(
+                        tenant_id=self.tenant_id,
+                        trade_name=values["trade_name"],
+                        manufacturer=None,
+                        defaults={
+                            "created_by": self.user_id,
+                            "material_number": values["material_number"],
+                            "status": Product.Status.ACTIVE,
+                        },
+                    )
+
+                    SubstanceUsage.objects.update_or_create(
+                        tenant_id=self.tenant_id,
+                        product=product,
+                        site=batch.target_site,
+                        department=None,
+                        defaults={
+                            "created_by": self.user_id,
+                            "usage_description": values["usage_description"],
+                            "storage_location": values["storage_location"],
+                            "storage_class": values["storage_class"],
+                        },
+                    )
+
+                    import_row.resolved_product = product
+                    import_row.status = ImportRow.Status.OK
+                    import_row.save(update_fields=["resolved_product", "status"])
 
                 if created:
                     stats.created += 1
@@ -551,6 +816,10 @@ class KatasterImportService:
                 import_row.save(update_fields=["status", "messages"])
                 stats.errors.append(f"Zeile {row_num}: {e}")
 
+        return stats
+
+    @staticmethod
+    def _finish_batch(batch, stats: ImportStats) -> None:
         from django.utils import timezone
 
         batch.status = batch.Status.DONE if not stats.errors else batch.Status.FAILED
@@ -561,9 +830,7 @@ class KatasterImportService:
             "errors": len(stats.errors),
         }
         batch.imported_at = timezone.now()
-        batch.save(update_fields=["status", "stats", "imported_at"])
-
-        return stats
+        batch.save(update_fields=["status", "stats", "imported_at", "updated_at"])
 
     @staticmethod
     def _map_field(row_data: dict, mapping: dict, field_name: str) -> str:
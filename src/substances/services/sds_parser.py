@@ -7,19 +7,34 @@ Extrahiert relevante Informationen aus Sicherheitsdatenblättern:
 - P-Sätze (Precautionary Statements)
 - GHS-Piktogramme
 - Physikalische Eigenschaften (Flammpunkt, Zündtemperatur, etc.)
+
+Der Text wird einmal in seine 16 Abschnitte zerlegt; jedes Feld wird nur
+in den Abschnitten gesucht, in denen es laut Verordnung (EG) Nr. 1907/2006
+Anhang II steht (Abschnitt 9 für Physik, 14 für Transport, 2/3 für
+H-/P-Sätze). Ohne erkannte Abschnitte wird der gesamte Text durchsucht.
+
+Ergebnisse werden nach SHA-256 der PDF-Bytes in ``SdsParseCache``
+abgelegt (mit ``PARSER_VERSION``); ``parse_pdf_batch`` parst mehrere PDFs
+parallel in einem Prozess-Pool. Massen-Uploads laufen stattdessen als
+Celery-Group (``global_sds.tasks.sds_bulk_upload``), je PDF ein Task.
 """
 
 import contextlib
+import hashlib
 import json
 import logging
+import multiprocessing
 import re
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 
-from ingest.extractors.pdf import PDFExtractor
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
 
-logger = logging.getLogger(__name__)
+from common.pdf_text import extract_pdf_text
 
-_pdf_extractor = PDFExtractor(ocr_fallback=True)
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -144,6 +159,17 @@ class SdsParserService:
         r"(?:^|\n)(?:ABSCHNITT|Abschnitt|SECTION|Section)\s*(\d{1,2})[:\s]",
         re.IGNORECASE,
     )
+    # Felder → Abschnitte, in denen sie gesucht werden (0 = Kopf vor Abschnitt 1)
+    FIELD_SECTIONS = {
+        "metadata": (0, 1),
+        "cas": (1, 3),
+        "hazards": (2, 3),
+        "signal_word": (2,),
+        "physical": (9,),
+        "storage_class": (7, 15),
+        "wgk": (12, 15),
+        "transport": (14,),
+    }
     SECTION_TITLES = {
         1: "Bezeichnung", 2: "Gefahren", 3: "Zusammensetzung",
         4: "Erste-Hilfe", 5: "Brandschutzmassnahmen", 6: "Freisetzung",
@@ -160,6 +186,10 @@ class SdsParserService:
         "warning": "warning",
     }
 
+    APPEARANCE_PATTERN = re.compile(
+        r"\bAggregatzustand[^\n:]*(?::[.\s]*|\s*\n\s*)([A-Za-zäöüßÄÖÜ]+)",
+    )
+
     # Metadata patterns (Section 1 + header/footer)
     PRODUCT_NAME_PATTERN = re.compile(
         r"(?:Handelsname|Produktname|Produktbezeichnung|Trade\s*name|Product\s*name)"
@@ -198,17 +228,115 @@ class SdsParserService:
 
     LLM_CONFIDENCE_THRESHOLD = 0.6
 
+    # Bump whenever extraction or parsing changes: cached results of
+    # older versions are then re-parsed on their next lookup.
+    PARSER_VERSION = "2"
+
     def parse_pdf(self, pdf_file) -> dict:
         """
         Parst ein SDS-PDF und extrahiert relevante Informationen.
 
+        Identische PDFs (gleicher SHA-256) werden nicht erneut extrahiert
+        oder geparst, solange ``PARSER_VERSION`` unverändert ist.
+
         Args:
             pdf_file: Django UploadedFile oder file-like object
 
         Returns:
             dict mit extrahierten Daten
         """
-        text = self._extract_text(pdf_file)
+        if hasattr(pdf_file, "seek"):
+            pdf_file.seek(0)
+        return self.parse_pdf_bytes(pdf_file.read())
+
+    def parse_pdf_bytes(self, data: bytes, sha256: str | None = None) -> dict:
+        """Wie ``parse_pdf`` für PDF-Bytes; ``sha256`` falls bereits berechnet."""
+        sha256 = sha256 or hashlib.sha256(data).hexdigest()
+        cached = self._cached_results([sha256])
+        if sha256 in cached:
+            return cached[sha256]
+        out = self._parse_bytes(data)
+        self._store_results({sha256: out})
+        return out
+
+    def parse_pdf_batch(self, pdfs: Iterable[bytes], workers: int | None = None) -> list[dict]:
+        """
+        Parst viele SDS-PDFs — Cache-Treffer sofort, der Rest parallel.
+
+        Gleiche PDFs im Batch werden nur einmal geparst. Ohne Cache-Treffer
+        verteilt ein Prozess-Pool (``SDS_PARSE_WORKERS``) Textextraktion,
+        OCR und Regex-Parsing auf mehrere CPU-Kerne; in Daemon-Prozessen
+        (Celery-Worker) und innerhalb von ``transaction.atomic`` wird
+        sequenziell geparst. Schlägt ein einzelnes PDF fehl, enthält sein
+        Ergebnis ``_error`` (und wird nicht gecacht).
+
+        Returns:
+            Ergebnisse in der Reihenfolge von ``pdfs``.
+        """
+        pdfs = list(pdfs)
+        hashes = [hashlib.sha256(data).hexdigest() for data in pdfs]
+        results = self._cached_results(hashes)
+        missing = {h: data for h, data in zip(hashes, pdfs, strict=True) if h not in results}
+
+        if missing:
+            if workers is None:
+                workers = getattr(settings, "SDS_PARSE_WORKERS", 4)
+            workers = min(workers, len(missing))
+            blocker = _pool_blocker() if workers > 1 else ""
+            if blocker:
+                logger.debug("SDS batch parse runs sequentially: %s", blocker)
+            if workers <= 1 or blocker:
+                parsed = [_parse_in_worker(data) for data in missing.values()]
+            else:
+                # Forked workers must not share the parent's DB sockets
+                connections.close_all()
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    parsed = list(pool.map(_parse_in_worker, missing.values()))
+
+            fresh = {}
+            for sha256, (out, error) in zip(missing, parsed, strict=True):
+                if error is None:
+                    fresh[sha256] = out
+                    results[sha256] = out
+                else:
+                    logger.warning("SDS parse failed for %s: %s", sha256[:12], error)
+                    results[sha256] = {"parse_confidence": 0.0, "_error": error}
+            self._store_results(fresh)
+
+        return [results[h] for h in hashes]
+
+    def _cached_results(self, hashes: list[str]) -> dict[str, dict]:
+        from substances.models import SdsParseCache
+
+        return dict(
+            SdsParseCache.objects.filter(
+                sha256__in=set(hashes), parser_version=self.PARSER_VERSION
+            ).values_list("sha256", "result")
+        )
+
+    def _store_results(self, results: dict[str, dict]) -> None:
+        """Ergebnisse cachen; veraltete Versionen desselben PDFs ersetzen."""
+        from substances.models import SdsParseCache
+
+        if not results:
+            return
+        try:
+            with transaction.atomic():
+                SdsParseCache.objects.bulk_create(
+                    [
+                        SdsParseCache(sha256=sha256, parser_version=self.PARSER_VERSION, result=out)
+                        for sha256, out in results.items()
+                    ],
+                    update_conflicts=True,
+                    unique_fields=["sha256"],
+                    update_fields=["parser_version", "result", "updated_at"],
+                )
+        except DatabaseError:
+            logger.exception("Could not store %d SDS parse results", len(results))
+
+    def _parse_bytes(self, data: bytes) -> dict:
+        """Extraktion + Parsing + ggf. LLM-Anreicherung, ohne Cache."""
+        text = self._extract_text_from_bytes(data)
         result = self._parse_text(text)
 
         out = {
@@ -249,25 +377,19 @@ class SdsParserService:
         return out
 
     def _extract_text(self, pdf_file) -> str:
-        """Extrahiert Text aus PDF via iil-ingest PDFExtractor."""
+        """Extrahiert Text aus PDF (Textlayer, OCR-Fallback je Seite)."""
         if hasattr(pdf_file, "seek"):
             pdf_file.seek(0)
-        data = pdf_file.read()
-        content = _pdf_extractor.extract(data)
-        for err in content.extraction_errors:
-            logger.warning("PDF extraction: %s", err)
-        text = content.text
-        # CID-kodierter Text (font nicht eingebettet): OCR erzwingen
-        if text and text.count("(cid:") / max(len(text), 1) > 0.01:
-            logger.info("CID-encoded PDF detected — forcing OCR fallback")
-            try:
-                from ingest.extractors.ocr import ocr_pdf_bytes
-                ocr_text = ocr_pdf_bytes(data)
-                if ocr_text.strip():
-                    return ocr_text
-            except Exception as ocr_exc:
-                logger.warning("OCR fallback failed: %s", ocr_exc)
-        return text
+        return self._extract_text_from_bytes(pdf_file.read())
+
+    def _extract_text_from_bytes(self, data: bytes) -> str:
+        """Seitenweise Textextraktion; OCR nur für Seiten ohne brauchbaren
+        Textlayer (z.B. Scans, CID-kodierte Fonts), Seitentexte gecacht."""
+        try:
+            return extract_pdf_text(data)
+        except ValueError as exc:
+            logger.warning("PDF extraction: %s", exc)
+            return ""
 
     def _parse_text(self, text: str) -> SdsParseResult:
         """Parst extrahierten Text."""
@@ -276,57 +398,51 @@ class SdsParserService:
         if not text:
             return result
 
-        # Abschnitte extrahieren (100% Rohtext pro Sektion)
-        result.sections = self._extract_sections(text)
-
-        # H-Sätze finden
-        h_matches = self.H_PATTERN.findall(text)
-        result.h_statements = sorted(set(h_matches))
+        # Abschnitte einmal zerlegen (100% Rohtext pro Sektion)
+        head, chunks = self._split_sections(text)
+        result.sections = self._sections_dict(chunks)
+        scope = self._section_scopes(text, head, chunks)
 
-        # P-Sätze finden
-        p_matches = self.P_PATTERN.findall(text)
-        result.p_statements = sorted(set(p_matches))
-
-        # GHS-Piktogramme finden
-        ghs_matches = self.GHS_PATTERN.findall(text)
-        result.pictograms = sorted(set(g.upper() for g in ghs_matches))
+        # H-/P-Sätze und GHS-Piktogramme (Abschnitt 2/3)
+        hazards = scope["hazards"]
+        result.h_statements = sorted(set(self.H_PATTERN.findall(hazards)))
+        result.p_statements = sorted(set(self.P_PATTERN.findall(hazards)))
+        result.pictograms = sorted(set(g.upper() for g in self.GHS_PATTERN.findall(hazards)))
 
         # Signalwort finden
-        text_lower = text.lower()
+        signal_text = scope["signal_word"].lower()
         for word, signal in self.SIGNAL_WORDS.items():
-            if word in text_lower:
+            if word in signal_text:
                 result.signal_word = signal
                 break
 
-        # Physikalische Eigenschaften extrahieren
-        result.flash_point_c = self._extract_number(self.FLASH_POINT_PATTERN, text)
-        result.boiling_point_c = self._extract_number(self.BOILING_POINT_PATTERN, text)
-        result.density_g_cm3 = self._extract_number(self.DENSITY_PATTERN, text)
-        result.vapor_pressure_hpa = self._extract_number(self.VAPOR_PRESSURE_PATTERN, text)
-        result.ph_value = self._extract_number(self.PH_PATTERN, text)
-        result.ignition_temperature_c = self._extract_number(self.IGNITION_TEMP_PATTERN, text)
-        result.lower_explosion_limit = self._extract_number(self.LEL_PATTERN, text)
-        result.upper_explosion_limit = self._extract_number(self.UEL_PATTERN, text)
+        # Physikalische Eigenschaften extrahieren (Abschnitt 9)
+        phys = scope["physical"]
+        result.flash_point_c = self._extract_number(self.FLASH_POINT_PATTERN, phys)
+        result.boiling_point_c = self._extract_number(self.BOILING_POINT_PATTERN, phys)
+        result.density_g_cm3 = self._extract_number(self.DENSITY_PATTERN, phys)
+        result.vapor_pressure_hpa = self._extract_number(self.VAPOR_PRESSURE_PATTERN, phys)
+        result.ph_value = self._extract_number(self.PH_PATTERN, phys)
+        result.ignition_temperature_c = self._extract_number(self.IGNITION_TEMP_PATTERN, phys)
+        result.lower_explosion_limit = self._extract_number(self.LEL_PATTERN, phys)
+        result.upper_explosion_limit = self._extract_number(self.UEL_PATTERN, phys)
 
         # Viskosität + weitere physikalische
-        result.viscosity_mm2_s = self._extract_number(self.VISCOSITY_PATTERN, text)
+        result.viscosity_mm2_s = self._extract_number(self.VISCOSITY_PATTERN, phys)
 
         # Transport + Lagerung
-        un_match = self.UN_NUMBER_PATTERN.search(text)
+        un_match = self.UN_NUMBER_PATTERN.search(scope["transport"])
         if un_match:
             result.un_number = f"UN {un_match.group(1)}"
-        result.adr_class = self._extract_string(self.ADR_CLASS_PATTERN, text)
-        result.storage_class = self._extract_string(self.STORAGE_CLASS_PATTERN, text)
-        result.wgk = self._extract_string(self.WGK_PATTERN, text)
-        ws_match = self.WATER_SOLUBILITY_PATTERN.search(text)
+        result.adr_class = self._extract_string(self.ADR_CLASS_PATTERN, scope["transport"])
+        result.storage_class = self._extract_string(self.STORAGE_CLASS_PATTERN, scope["storage_class"])
+        result.wgk = self._extract_string(self.WGK_PATTERN, scope["wgk"])
+        ws_match = self.WATER_SOLUBILITY_PATTERN.search(phys)
         if ws_match:
             result.water_solubility = ws_match.group(1).strip()[:120]
 
         # Aussehen / Appearance (handles both ': flüssig' and '\nflüssig')
-        appearance_pat = re.compile(
-            r"\bAggregatzustand[^\n:]*(?::[.\s]*|\s*\n\s*)([A-Za-zäöüßÄÖÜ]+)",
-        )
-        ap_m = appearance_pat.search(text)
+        ap_m = self.APPEARANCE_PATTERN.search(phys)
         if ap_m:
             result.appearance = ap_m.group(1).strip()
 
@@ -378,15 +494,17 @@ class SdsParserService:
             if col_data.get("density_g_cm3") is not None and result.density_g_cm3 is None:
                 result.density_g_cm3 = col_data["density_g_cm3"]
 
-        # Metadaten extrahieren (Abschnitt 1 + Header)
+        # Metadaten extrahieren (Abschnitt 1 + Header); Kopf-/Fußzeilen
+        # können überall stehen, daher bei Fehlschlag den ganzen Text
+        meta = scope["metadata"]
         result.product_name = self._extract_string(
             self.PRODUCT_NAME_PATTERN,
-            text,
-        )
+            meta,
+        ) or self._extract_string(self.PRODUCT_NAME_PATTERN, text)
         result.manufacturer_name = self._extract_string(
             self.MANUFACTURER_PATTERN,
-            text,
-        )
+            meta,
+        ) or self._extract_string(self.MANUFACTURER_PATTERN, text)
         # Fallback: Firmenname aus 'Adresse\n<Name>' in Abschnitt 1
         if not result.manufacturer_name:
             sec1 = result.sections.get("01_Bezeichnung", "")
@@ -395,34 +513,39 @@ class SdsParserService:
                 result.manufacturer_name = cm.group(1).strip()[:120]
         result.version_number = self._extract_string(
             self.VERSION_PATTERN,
-            text,
-        )
+            meta,
+        ) or self._extract_string(self.VERSION_PATTERN, text)
 
-        # CAS-Nummer
-        cas_match = self.CAS_PATTERN.search(text)
+        # CAS-Nummer (Abschnitt 1/3)
+        cas_match = self.CAS_PATTERN.search(scope["cas"]) or self.CAS_PATTERN.search(text)
         if cas_match:
             result.cas_number = cas_match.group(1)
 
         # Revisionsdatum — zuerst ISO, dann DD.MM.YYYY
-        iso_match = self.REVISION_DATE_ISO_PATTERN.search(text)
-        if iso_match:
-            year, month, day = iso_match.groups()
-            with contextlib.suppress(ValueError):
-                result.revision_date = f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
-        else:
-            date_match = self.REVISION_DATE_PATTERN.search(text)
-            if date_match:
-                day, month, year = date_match.groups()
-                if len(year) == 2:
-                    year = f"20{year}" if int(year) < 50 else f"19{year}"
-                with contextlib.suppress(ValueError):
-                    result.revision_date = f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+        result.revision_date = self._extract_revision_date(meta) or self._extract_revision_date(text)
 
         # Konfidenz berechnen
         result.parse_confidence = self._compute_confidence(result)
 
         return result
 
+    def _extract_revision_date(self, text: str) -> str:
+        """Revisionsdatum als ISO-String — zuerst ISO-, dann DD.MM.YYYY-Format."""
+        iso_match = self.REVISION_DATE_ISO_PATTERN.search(text)
+        if iso_match:
+            year, month, day = iso_match.groups()
+            with contextlib.suppress(ValueError):
+                return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+            return ""
+        date_match = self.REVISION_DATE_PATTERN.search(text)
+        if date_match:
+            day, month, year = date_match.groups()
+            if len(year) == 2:
+                year = f"20{year}" if int(year) < 50 else f"19{year}"
+            with contextlib.suppress(ValueError):
+                return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+        return ""
+
     def _extract_string(
         self,
         pattern: re.Pattern,
@@ -723,15 +846,63 @@ class SdsParserService:
 
     def _extract_sections(self, text: str) -> dict[str, str]:
         """Extrahiert alle 16 SDS-Abschnitte als Rohtext-Dict."""
-        sections: dict[str, str] = {}
+        return self._sections_dict(self._split_sections(text)[1])
+
+    def _split_sections(self, text: str) -> tuple[str, dict[int, list[str]]]:
+        """
+        Zerlegt den Text in einem Durchlauf in Kopf und Abschnitte.
+
+        Returns:
+            (Text vor dem ersten Abschnitt, {Nummer: [Rohtext je Vorkommen]})
+        """
+        chunks: dict[int, list[str]] = {}
         splits = list(self.SECTION_PATTERN.finditer(text))
         for i, match in enumerate(splits):
-            num = int(match.group(1))
-            start = match.start()
             end = splits[i + 1].start() if i + 1 < len(splits) else len(text)
-            key = f"{num:02d}_{self.SECTION_TITLES.get(num, 'Abschnitt')}"
-            sections[key] = text[start:end].strip()
-        return sections
+            chunks.setdefault(int(match.group(1)), []).append(text[match.start():end].strip())
+        head = text[: splits[0].start()] if splits else text
+        return head, chunks
+
+    def _sections_dict(self, chunks: dict[int, list[str]]) -> dict[str, str]:
+        """``{"09_Physik+Chemie": text}`` — bei Wiederholungen zählt das letzte Vorkommen."""
+        return {
+            f"{num:02d}_{self.SECTION_TITLES.get(num, 'Abschnitt')}": parts[-1]
+            for num, parts in chunks.items()
+        }
+
+    def _section_scopes(self, text: str, head: str, chunks: dict[int, list[str]]) -> dict[str, str]:
+        """
+        Suchtext je Feldgruppe aus ``FIELD_SECTIONS``.
+
+        Fehlen alle zugeordneten Abschnitte (z.B. Auszug ohne Gliederung),
+        wird der gesamte Text durchsucht.
+        """
+        scopes = {}
+        for name, nums in self.FIELD_SECTIONS.items():
+            parts = [part for num in nums if num in chunks for part in chunks[num]]
+            if parts and 0 in nums:
+                parts.insert(0, head)
+            scopes[name] = "\n".join(parts) if parts else text
+        return scopes
+
+
+def _pool_blocker() -> str:
+    """Grund, warum kein Prozess-Pool gestartet werden darf ("" = keiner)."""
+    if multiprocessing.current_process().daemon:
+        # z.B. Celery-Prefork-Worker: daemonic processes are not allowed to have children
+        return "daemon process"
+    if any(conn.in_atomic_block for conn in connections.all(initialized_only=True)):
+        # connections.close_all() vor dem Fork würde die offene Transaktion abbrechen
+        return "inside transaction.atomic"
+    return ""
+
+
+def _parse_in_worker(data: bytes) -> tuple[dict | None, str | None]:
+    """Pool-Worker: (Ergebnis, None) oder (None, Fehlermeldung)."""
+    try:
+        return SdsParserService()._parse_bytes(data), None
+    except Exception as exc:
+        return None, f"{type(exc).__name__}: {exc}"
 
 
 def parse_sds_text(text: str) -> dict:
@@ -0,0 +1,291 @@
+# substances/services/search.py
+"""
+Ranglisten-Suche über Gefahrstoffe, Handelsprodukte und Stoffkennungen.
+
+1. Kennungen (CAS, EC, UFI …) exakt über ``Identifier.id_value_normalized``,
+   Materialnummern exakt über ``Product.material_number`` (btree)
+2. Volltext über ``search_vector`` (generierte tsvector-Spalte, german, GIN)
+   als Präfixsuche — passend für Search-as-you-type
+3. Tippfehler über Trigramme (``lower(name) % term``, GIN gin_trgm_ops);
+   ohne pg_trgm nur Volltext
+
+Treffer enthalten ein Highlight (ts_headline, HTML-escaped, ``<mark>``).
+``cached_search`` hält Ergebnisse kurz im Cache (HTMX-Schnellsuche).
+"""
+
+import hashlib
+import logging
+import re
+from dataclasses import asdict, dataclass
+from uuid import UUID
+
+from django.conf import settings
+from django.contrib.postgres.lookups import TrigramSimilar
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    TrigramSimilarity,
+)
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Greatest, Lower
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from substances.models import (
+    SEARCH_CONFIG,
+    Identifier,
+    Product,
+    Substance,
+    normalize_identifier_value,
+)
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+KIND_SUBSTANCE = "substance"
+KIND_PRODUCT = "product"
+KINDS = (KIND_SUBSTANCE, KIND_PRODUCT)
+
+MATCH_IDENTIFIER = "identifier"
+MATCH_TEXT = "text"
+
+# Exakte Kennungstreffer stehen vor allen Text-/Trigrammtreffern
+IDENTIFIER_RANK = 10.0
+
+# ts_headline-Marker; werden nach dem Escapen zu <mark>…</mark>
+_START, _STOP = "\x02", "\x03"
+
+SEARCH_CACHE_KEY = "substances:search:{tenant_id}:{digest}"
+SEARCH_CACHE_TTL = 30  # seconds
+
+
+@dataclass
+class SearchHit:
+    """Ein Suchtreffer (Gefahrstoff oder Produkt)."""
+
+    kind: str
+    pk: int
+    title: str
+    highlight: str  # HTML, escaped
+    subtitle: str = ""
+    cas_number: str = ""
+    is_cmr: bool = False
+    rank: float = 0.0
+    match: str = MATCH_TEXT
+
+    @property
+    def highlight_html(self):
+        return mark_safe(self.highlight)  # escaped in _highlight()
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def prefix_tsquery(query: str) -> SearchQuery | None:
+    """Präfix-tsquery (``wort:* & …``) aus den Wörtern von ``query``."""
+    words = WORD_PATTERN.findall(query)
+    if not words:
+        return None
+    # Wörter bestehen nur aus Buchstaben/Ziffern — keine tsquery-Syntax möglich
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words), search_type="raw", config=SEARCH_CONFIG
+    )
+
+
+def search_condition(tenant_id: UUID, query: str) -> Q:
+    """Filter für Gefahrstofflisten: Volltext oder exakte Kennung (ohne Ranking)."""
+    tsquery = prefix_tsquery(query)
+    if tsquery is None:
+        return Q(pk__in=[])
+    return Q(search_vector=tsquery) | Q(pk__in=_identifier_matches(tenant_id, query))
+
+
+def search(
+    tenant_id: UUID, query: str, limit: int = 10, kinds: tuple[str, ...] = KINDS
+) -> list[SearchHit]:
+    """Top-``limit`` Treffer nach Rang (Kennung > Volltext/Trigramm)."""
+    query = " ".join(query.split())
+    tsquery = prefix_tsquery(query)
+    if tsquery is None:
+        return []
+
+    hits: list[SearchHit] = []
+    if KIND_SUBSTANCE in kinds:
+        hits += _substance_hits(tenant_id, query, tsquery, limit)
+    if KIND_PRODUCT in kinds:
+        hits += _product_hits(tenant_id, query, tsquery, limit)
+    hits.sort(key=lambda hit: (-hit.rank, hit.title.lower()))
+    return hits[:limit]
+
+
+def cached_search(
+    tenant_id: UUID, query: str, limit: int = 10, kinds: tuple[str, ...] = KINDS
+) -> list[SearchHit]:
+    """``search`` mit kurzem Ergebnis-Cache je Mandant und Suchbegriff."""
+    normalized = " ".join(query.split()).lower()
+    digest = hashlib.sha1(f"{limit}:{','.join(kinds)}:{normalized}".encode()).hexdigest()
+    key = SEARCH_CACHE_KEY.format(tenant_id=tenant_id, digest=digest)
+    cached = cache.get(key)
+    if cached is not None:
+        return [SearchHit(**hit) for hit in cached]
+
+    hits = search(tenant_id, query, limit, kinds)
+    cache.set(
+        key,
+        [hit.to_dict() for hit in hits],
+        getattr(settings, "SUBSTANCE_SEARCH_CACHE_TTL", SEARCH_CACHE_TTL),
+    )
+    return hits
+
+
+# ─────────────────────────────────────────────────────────────────────
+# Gefahrstoffe
+# ─────────────────────────────────────────────────────────────────────
+
+
+def _identifier_matches(tenant_id: UUID, query: str):
+    """Substance-IDs mit exakt passender Kennung (nur bei Ziffern im Suchbegriff)."""
+    key = normalize_identifier_value(query)
+    if not any(ch.isdigit() for ch in key):
+        return Identifier.objects.none().values("substance_id")
+    return (
+        Identifier.objects.unscoped()
+        .filter(tenant_id=tenant_id, id_value_normalized=key)
+        .values("substance_id")
+    )
+
+
+def _substance_hits(tenant_id, query, tsquery, limit) -> list[SearchHit]:
+    fields = ("pk", "name", "trade_name", "primary_cas", "is_cmr")
+    base = Substance.objects.for_tenant(tenant_id)
+
+    exact = list(
+        base.filter(pk__in=_identifier_matches(tenant_id, query))
+        .order_by("name")
+        .values(*fields)[:limit]
+    )
+    exact_ids = [row["pk"] for row in exact]
+
+    def ranked(trigram: bool):
+        qs = _ranked(base, query, tsquery, ("name", "trade_name"), trigram)
+        return list(qs.exclude(pk__in=exact_ids).values(*fields, "rank", "hl")[:limit])
+
+    hits = [
+        SearchHit(
+            KIND_SUBSTANCE,
+            row["pk"],
+            row["name"],
+            escape(row["name"]),
+            subtitle=row["trade_name"],
+            cas_number=row["primary_cas"],
+            is_cmr=row["is_cmr"],
+            rank=IDENTIFIER_RANK,
+            match=MATCH_IDENTIFIER,
+        )
+        for row in exact
+    ]
+    hits += [
+        SearchHit(
+            KIND_SUBSTANCE,
+            row["pk"],
+            row["name"],
+            _highlight(row["hl"]),
+            subtitle=row["trade_name"],
+            cas_number=row["primary_cas"],
+            is_cmr=row["is_cmr"],
+            rank=float(row["rank"]),
+        )
+        for row in _with_trigram_fallback(ranked)
+    ]
+    return hits
+
+
+# ─────────────────────────────────────────────────────────────────────
+# Produkte
+# ─────────────────────────────────────────────────────────────────────
+
+
+def _product_hits(tenant_id, query, tsquery, limit) -> list[SearchHit]:
+    fields = ("pk", "trade_name", "material_number", "manufacturer__name")
+    base = Product.objects.for_tenant(tenant_id)
+
+    # Materialnummern wie "M-4711" zerlegt der Parser in Wort und Zahl ("-4711")
+    exact = list(base.filter(material_number=query).order_by("trade_name").values(*fields)[:limit])
+    exact_ids = [row["pk"] for row in exact]
+
+    def ranked(trigram: bool):
+        qs = _ranked(base, query, tsquery, ("trade_name", "material_number"), trigram)
+        return list(qs.exclude(pk__in=exact_ids).values(*fields, "rank", "hl")[:limit])
+
+    def hit(row, highlight, rank, match=MATCH_TEXT):
+        subtitle = " · ".join(p for p in (row["manufacturer__name"], row["material_number"]) if p)
+        return SearchHit(
+            KIND_PRODUCT,
+            row["pk"],
+            row["trade_name"],
+            highlight,
+            subtitle=subtitle,
+            rank=rank,
+            match=match,
+        )
+
+    hits = [hit(row, escape(row["trade_name"]), IDENTIFIER_RANK, MATCH_IDENTIFIER) for row in exact]
+    hits += [
+        hit(row, _highlight(row["hl"]), float(row["rank"]))
+        for row in _with_trigram_fallback(ranked)
+    ]
+    return hits
+
+
+# ─────────────────────────────────────────────────────────────────────
+# Gemeinsam
+# ─────────────────────────────────────────────────────────────────────
+
+
+def _ranked(qs, query: str, tsquery, trigram_fields: tuple[str, ...], trigram: bool):
+    """Treffer-QuerySet mit ``rank`` und ``hl`` (Headline des ersten Feldes)."""
+    condition = Q(search_vector=tsquery)
+    rank = SearchRank(F("search_vector"), tsquery)
+    if trigram:
+        term = query.lower()
+        for field in trigram_fields:
+            condition |= Q(TrigramSimilar(Lower(field), term))
+        rank = rank + Greatest(
+            *(TrigramSimilarity(Lower(field), term) for field in trigram_fields),
+            Value(0.0),
+            output_field=FloatField(),
+        )
+    return (
+        qs.filter(condition)
+        .annotate(
+            rank=rank,
+            hl=SearchHeadline(
+                trigram_fields[0],
+                tsquery,
+                config=SEARCH_CONFIG,
+                start_sel=_START,
+                stop_sel=_STOP,
+                highlight_all=True,
+            ),
+        )
+        .order_by("-rank", trigram_fields[0])
+    )
+
+
+def _with_trigram_fallback(run) -> list:
+    """``run(trigram=True)``; ohne pg_trgm erneut nur mit Volltext."""
+    try:
+        # Savepoint: eine fehlschlagende Query darf die Transaktion des Aufrufers nicht abbrechen
+        with transaction.atomic():
+            return run(trigram=True)
+    except DatabaseError as exc:
+        logger.debug("Trigram search unavailable, using full-text only: %s", exc)
+        return run(trigram=False)
+
+
+def _highlight(headline: str) -> str:
+    return escape(headline).replace(_START, "<mark>").replace(_STOP, "</mark>")
@@ -8,7 +8,8 @@ Unterstützt:
 - GHS-Klassifikation (H-/P-Sätze, Piktogramme, Signalwort)
 - TRGS 510 Lagerklassen
 - Ex-Schutz-relevante Daten (Flammpunkt, Zündtemperatur, UEG/OEG)
-- Upsert-Logik (update_or_create) für idempotenten Import
+- Upsert-Logik für idempotenten Import — mengenbasiert je Chunk
+  (bulk_create mit update_conflicts), zeilenweise als Fallback
 """
 
 from __future__ import annotations
@@ -16,7 +17,10 @@ from __future__ import annotations
 import contextlib
 import json
 import logging
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
 from typing import Any
 from uuid import UUID
@@ -30,6 +34,7 @@ from substances.models import (
     PrecautionaryStatementRef,
     SdsRevision,
     Substance,
+    normalize_identifier_value,
 )
 
 logger = logging.getLogger(__name__)
@@ -115,42 +120,127 @@ class SubstanceImportService:
         """Import substances from a list of dicts."""
         return self._import_records(records, dry_run=dry_run)
 
+    # Records per set-based write (substances, identifiers, SDS, M2M rows)
+    BATCH_SIZE = 500
+
+    _ID_TYPES = {
+        "cas": Identifier.IdType.CAS,
+        "ec": Identifier.IdType.EC,
+    }
+
     def _import_records(
         self,
-        records: list[dict[str, Any]],
+        records: Iterable[dict[str, Any]],
         *,
         dry_run: bool = False,
     ) -> ImportStats:
         stats = ImportStats()
 
+        if dry_run:
+            for idx, record in enumerate(records, 1):
+                name = record.get("name", f"<unbenannt #{idx}>")
+                try:
+                    self._validate_record(record)
+                    stats.skipped += 1
+                except Exception as exc:
+                    msg = f"{name}: {exc}"
+                    logger.warning("Import-Fehler: %s", msg)
+                    stats.errors.append(msg)
+            logger.info(stats.summary())
+            return stats
+
+        ref_maps = self._load_ref_maps()
+        records = iter(records)
+        while chunk := list(islice(records, self.BATCH_SIZE)):
+            try:
+                with transaction.atomic():
+                    chunk_stats = self._import_batch(chunk, ref_maps)
+            except Exception:
+                logger.exception("Batch-Import fehlgeschlagen, importiere einzeln")
+                chunk_stats = self._import_individually(chunk)
+            stats.created += chunk_stats.created
+            stats.updated += chunk_stats.updated
+            stats.errors.extend(chunk_stats.errors)
+
+        logger.info(stats.summary())
+        return stats
+
+    @staticmethod
+    def _load_ref_maps() -> dict[str, dict[str, int]]:
+        """GHS-Referenztabellen einmalig als code → id laden."""
+        return {
+            "h_statements": dict(HazardStatementRef.objects.values_list("code", "id")),
+            "p_statements": dict(PrecautionaryStatementRef.objects.values_list("code", "id")),
+            "pictograms": dict(PictogramRef.objects.values_list("code", "id")),
+        }
+
+    def _import_individually(self, records: list[dict[str, Any]]) -> ImportStats:
+        """Fallback: jeder Datensatz in eigener Transaktion (Fehlerisolation)."""
+        stats = ImportStats()
         for idx, record in enumerate(records, 1):
             name = record.get("name", f"<unbenannt #{idx}>")
             try:
-                if dry_run:
-                    self._validate_record(record)
-                    stats.skipped += 1
+                created = self._upsert_substance(record)
+                if created:
+                    stats.created += 1
                 else:
-                    created = self._upsert_substance(record)
-                    if created:
-                        stats.created += 1
-                    else:
-                        stats.updated += 1
+                    stats.updated += 1
             except Exception as exc:
                 msg = f"{name}: {exc}"
                 logger.warning("Import-Fehler: %s", msg)
                 stats.errors.append(msg)
-
-        logger.info(stats.summary())
         return stats
 
-    @transaction.atomic
-    def _upsert_substance(
+    def _import_batch(
         self,
-        record: dict[str, Any],
-    ) -> bool:
-        """Create or update a single substance. Returns True if created."""
-        name = record["name"]
+        records: list[dict[str, Any]],
+        ref_maps: dict[str, dict[str, int]],
+    ) -> ImportStats:
+        """Set-based upsert of one chunk: a fixed number of statements.
+
+        Substances, identifiers and SDS revisions are written with
+        ``bulk_create(update_conflicts=True)`` on their unique keys; the
+        M2M through rows are replaced in bulk. A name appearing twice in
+        the chunk behaves like consecutive ``update_or_create`` calls:
+        the last record wins, the first counts as created. The
+        current_sds / primary_cas projections are refreshed with one
+        UPDATE at the end.
+        """
+        stats = ImportStats()
+        by_name: dict[str, dict[str, Any]] = {}
+        for idx, record in enumerate(records, 1):
+            name = record.get("name")
+            if not name:
+                stats.errors.append(f"<unbenannt #{idx}>: Feld 'name' fehlt")
+                continue
+            by_name.pop(name, None)  # keep the position of the last occurrence
+            by_name[name] = record
 
+        existing = set(
+            Substance.objects.filter(tenant_id=self.tenant_id, name__in=by_name).values_list(
+                "name", flat=True
+            )
+        )
+        for record in records:
+            name = record.get("name")
+            if not name:
+                continue
+            if name in existing:
+                stats.updated += 1
+            else:
+                existing.add(name)
+                stats.created += 1
+
+        substances = self._bulk_upsert_substances(by_name)
+        self._bulk_upsert_identifiers(substances, by_name)
+        self._bulk_upsert_sds(substances, by_name, ref_maps)
+        Substance.objects.unscoped().filter(
+            pk__in=[s.pk for s in substances.values()]
+        ).refresh_projections()
+        return stats
+
+    def _substance_defaults(self, record: dict[str, Any]) -> dict[str, Any]:
+        """Feldwerte eines Datensatzes; ``None`` = bestehenden Wert behalten."""
         defaults = {
             "trade_name": record.get("trade_name") or "",
             "description": record.get("description") or "",
@@ -184,11 +274,140 @@ class SubstanceImportService:
             "gestis_url": (record.get("gestis_url") or ""),
         }
         # Remove None values for optional fields
-        defaults = {k: v for k, v in defaults.items() if v is not None}
+        return {k: v for k, v in defaults.items() if v is not None}
+
+    def _bulk_upsert_substances(self, by_name: dict[str, dict[str, Any]]) -> dict[str, Substance]:
+        # One upsert per distinct field set: missing optional values must
+        # not overwrite existing ones (same as update_or_create defaults).
+        groups: dict[tuple[str, ...], list[Substance]] = defaultdict(list)
+        substances = {}
+        for name, record in by_name.items():
+            defaults = self._substance_defaults(record)
+            substance = Substance(tenant_id=self.tenant_id, name=name, **defaults)
+            groups[tuple(sorted(defaults))].append(substance)
+            substances[name] = substance
+        for fields, objs in groups.items():
+            Substance.objects.bulk_create(
+                objs,
+                batch_size=self.BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["tenant_id", "name"],
+                update_fields=[*fields, "updated_at"],
+            )
+        return substances
+
+    def _bulk_upsert_identifiers(
+        self,
+        substances: dict[str, Substance],
+        by_name: dict[str, dict[str, Any]],
+    ) -> None:
+        identifiers = [
+            Identifier(
+                tenant_id=self.tenant_id,
+                substance=substances[name],
+                id_type=id_type,
+                id_value=record[key],
+                id_value_normalized=normalize_identifier_value(record[key]),
+                created_by=self.user_id,
+            )
+            for name, record in by_name.items()
+            for key, id_type in self._ID_TYPES.items()
+            if record.get(key)
+        ]
+        Identifier.objects.bulk_create(
+            identifiers,
+            batch_size=self.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["tenant_id", "substance", "id_type"],
+            update_fields=["id_value", "id_value_normalized", "created_by", "updated_at"],
+        )
+
+    def _bulk_upsert_sds(
+        self,
+        substances: dict[str, Substance],
+        by_name: dict[str, dict[str, Any]],
+        ref_maps: dict[str, dict[str, int]],
+    ) -> None:
+        from django.utils import timezone
+
+        now = timezone.now()
+        revisions = {}
+        for name, record in by_name.items():
+            if not record.get("h_statements") and not record.get("p_statements"):
+                continue
+            revisions[name] = SdsRevision(
+                tenant_id=self.tenant_id,
+                created_by=self.user_id,
+                substance=substances[name],
+                revision_number=1,
+                revision_date=now.date(),
+                status=SdsRevision.Status.APPROVED,
+                signal_word=record.get("signal_word", "none"),
+                approved_by=self.user_id,
+                approved_at=now,
+                notes="Auto-Import aus Referenzdaten",
+            )
+        if not revisions:
+            return
+        SdsRevision.objects.bulk_create(
+            revisions.values(),
+            batch_size=self.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["substance", "revision_number"],
+            update_fields=[
+                "tenant_id",
+                "created_by",
+                "revision_date",
+                "status",
+                "signal_word",
+                "approved_by",
+                "approved_at",
+                "notes",
+                "updated_at",
+            ],
+        )
+
+        # Like .set(): replace the links of every revision whose record
+        # lists codes for that relation; unknown codes are ignored.
+        for key, relation in (
+            ("h_statements", SdsRevision.hazard_statements),
+            ("p_statements", SdsRevision.precautionary_statements),
+            ("pictograms", SdsRevision.pictograms),
+        ):
+            through = relation.through
+            sds_column = relation.field.m2m_field_name() + "_id"
+            ref_column = relation.field.m2m_reverse_field_name() + "_id"
+            code_ids = ref_maps[key]
+            replaced = [
+                (revisions[name].pk, by_name[name][key])
+                for name in revisions
+                if by_name[name].get(key)
+            ]
+            if not replaced:
+                continue
+            through.objects.filter(**{f"{sds_column}__in": [pk for pk, _ in replaced]}).delete()
+            through.objects.bulk_create(
+                [
+                    through(**{sds_column: sds_id, ref_column: code_ids[code]})
+                    for sds_id, codes in replaced
+                    for code in dict.fromkeys(codes)
+                    if code in code_ids
+                ],
+                batch_size=self.BATCH_SIZE,
+            )
+
+    @transaction.atomic
+    def _upsert_substance(
+        self,
+        record: dict[str, Any],
+    ) -> bool:
+        """Create or update a single substance. Returns True if created."""
+        name = record["name"]
+
         substance, created = Substance.objects.update_or_create(
             tenant_id=self.tenant_id,
             name=name,
-            defaults=defaults,
+            defaults=self._substance_defaults(record),
         )
 
         self._upsert_identifiers(substance, record)
@@ -204,11 +423,7 @@ class SubstanceImportService:
         record: dict[str, Any],
     ) -> None:
         """Create/update CAS, EC, and other identifiers."""
-        id_map = {
-            "cas": Identifier.IdType.CAS,
-            "ec": Identifier.IdType.EC,
-        }
-        for key, id_type in id_map.items():
+        for key, id_type in self._ID_TYPES.items():
             value = record.get(key)
             if not value:
                 continue
@@ -344,23 +559,26 @@ class SubstanceImportService:
         *,
         dry_run: bool = False,
     ) -> ImportStats:
-        """Import substances from an Excel (.xlsx) file.
+        """Import substances from an Excel (.xlsx / .xls) file.
 
         Reads the first sheet. First row = headers (same as CSV columns).
+        Rows are streamed and converted lazily, so memory stays flat
+        regardless of sheet size.
         """
-        import openpyxl
+        from substances.services.excel_reader import iter_sheet_rows
 
-        wb = openpyxl.load_workbook(file_obj, read_only=True, data_only=True)
-        ws = wb.active
-        rows = list(ws.iter_rows(values_only=True))
-        wb.close()
-
-        if not rows:
+        rows = iter_sheet_rows(file_obj)
+        header = next(rows, None)
+        if header is None:
             raise ValueError("Excel-Datei ist leer")
 
-        headers = [str(h or "").strip().lower() for h in rows[0]]
-        records = []
-        for row in rows[1:]:
+        headers = [str(h or "").strip().lower() for h in header]
+        return self._import_records(self._xlsx_records(headers, rows), dry_run=dry_run)
+
+    @staticmethod
+    def _xlsx_records(headers: list[str], rows: Iterable[tuple]) -> Iterator[dict[str, Any]]:
+        """Excel-Zeilen → Import-Records (nur Zeilen mit Namen)."""
+        for row in rows:
             raw = dict(zip(headers, row, strict=False))
             record = {
                 "name": str(raw.get("name") or "").strip(),
@@ -399,10 +617,7 @@ class SubstanceImportService:
                     record[list_field] = [c.strip() for c in val.split(";") if c.strip()]
 
             if record["name"]:
-                records.append(record)
-
-        logger.info("Excel-Import: %d Zeilen gelesen", len(records))
-        return self._import_records(records, dry_run=dry_run)
+                yield record
 
     def import_from_docx(
         self,
@@ -43,20 +43,13 @@ class SubstanceService:
 
     @staticmethod
     def search(query: str, tenant_id: UUID, limit: int = 20) -> list[Substance]:
-        """Sucht Gefahrstoffe nach Name, Handelsname oder CAS."""
+        """Sucht Gefahrstoffe nach Name, Handelsname oder Kennung (nach Rang sortiert)."""
         require_permission("substance.view")
-        from django.db.models import Q
+        from substances.services.search import KIND_SUBSTANCE, search
 
-        return list(
-            Substance.objects.filter(
-                Q(tenant_id=tenant_id)
-                & (
-                    Q(name__icontains=query)
-                    | Q(trade_name__icontains=query)
-                    | Q(identifiers__id_value__icontains=query)
-                )
-            ).distinct()[:limit]
-        )
+        ids = [hit.pk for hit in search(tenant_id, query, limit, kinds=(KIND_SUBSTANCE,))]
+        substances = Substance.objects.for_tenant(tenant_id).in_bulk(ids)
+        return [substances[pk] for pk in ids if pk in substances]
 
     @staticmethod
     @transaction.atomic
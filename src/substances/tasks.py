@@ -0,0 +1,93 @@
+"""
+Substances Celery-Tasks.
+
+run_kataster_import            — führt einen bestätigten Kataster-Import aus
+resume_stalled_kataster_imports — Beat: nimmt liegengebliebene Imports wieder auf
+"""
+
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Import jobs without progress for this long are considered lost
+STALLED_IMPORT_MINUTES = 10
+
+
+@shared_task(
+    bind=True,
+    name="substances.tasks.run_kataster_import",
+    max_retries=3,
+    default_retry_delay=30,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def run_kataster_import(self, batch_id: int) -> dict:
+    """
+    Kataster-Import eines ImportBatch ausführen (Status queued/processing).
+
+    Verarbeitet die bereitgestellten ImportRows chunkweise; nach einem
+    Abbruch setzt eine erneute Ausführung beim ersten ausstehenden Chunk fort.
+    """
+    from substances.models import ImportBatch
+    from substances.services.kataster_service import KatasterImportService
+
+    try:
+        batch = ImportBatch.objects.select_related("target_site").get(pk=batch_id)
+    except ImportBatch.DoesNotExist:
+        logger.error("[Kataster Import] Batch not found: %s", batch_id)
+        return {"error": "not_found", "batch_id": batch_id}
+
+    if not batch.is_running:
+        logger.warning("[Kataster Import] Batch %s already %s, skipping", batch_id, batch.status)
+        return {"skipped": True, "status": batch.status}
+
+    service = KatasterImportService(tenant_id=batch.tenant_id, user_id=batch.created_by)
+    try:
+        stats = service.run_import(batch)
+    except Exception as exc:
+        logger.exception("[Kataster Import] Batch %s failed: %s", batch_id, exc)
+        if self.request.retries >= self.max_retries:
+            batch.status = ImportBatch.Status.FAILED
+            batch.error_message = str(exc)
+            batch.save(update_fields=["status", "error_message", "updated_at"])
+            raise
+        raise self.retry(exc=exc) from exc
+
+    logger.info(
+        "[Kataster Import] Batch %s: %d neu, %d aktualisiert, %d Fehler",
+        batch_id,
+        stats.created,
+        stats.updated,
+        len(stats.errors),
+    )
+    return {
+        "batch_id": batch_id,
+        "created": stats.created,
+        "updated": stats.updated,
+        "skipped": stats.skipped,
+        "errors": len(stats.errors),
+    }
+
+
+@shared_task(name="substances.tasks.resume_stalled_kataster_imports")
+def resume_stalled_kataster_imports() -> dict:
+    """Beat-Task: Imports ohne Fortschritt seit ``STALLED_IMPORT_MINUTES`` neu einreihen."""
+    from substances.models import ImportBatch
+
+    cutoff = timezone.now() - timedelta(minutes=STALLED_IMPORT_MINUTES)
+    batch_ids = list(
+        ImportBatch.objects.filter(
+            status__in=[ImportBatch.Status.QUEUED, ImportBatch.Status.PROCESSING],
+            updated_at__lt=cutoff,
+        ).values_list("pk", flat=True)
+    )
+    for batch_id in batch_ids:
+        ImportBatch.objects.filter(pk=batch_id).update(updated_at=timezone.now())
+        run_kataster_import.delay(batch_id)
+    if batch_ids:
+        logger.info("[Kataster Import] Resumed stalled batches: %s", batch_ids)
+    return {"resumed": batch_ids}
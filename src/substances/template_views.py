@@ -13,6 +13,8 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.views import View
 
+from permissions.authz import require_permission
+
 from .forms import SdsUploadForm, SubstanceForm
 from .models import (
     HazardStatementRef,
@@ -24,7 +26,8 @@ from .models import (
     SiteInventoryItem,
     Substance,
 )
-from .services import ExIntegrationService, SubstanceService
+from .services import ExIntegrationService
+from .services.search import cached_search, search_condition
 
 
 class SubstanceHomeView(LoginRequiredMixin, View):
@@ -89,18 +92,10 @@ class SubstanceListView(LoginRequiredMixin, View):
         storage_class = request.GET.get("storage_class", "")
         cmr_only = request.GET.get("cmr", "") == "1"
 
-        substances = (
-            Substance.objects.filter(base_filter)
-            .select_related("manufacturer")
-            .prefetch_related("identifiers")
-        )
+        substances = Substance.objects.filter(base_filter).select_related("manufacturer")
 
         if search:
-            substances = substances.filter(
-                Q(name__icontains=search)
-                | Q(trade_name__icontains=search)
-                | Q(identifiers__id_value__icontains=search)
-            ).distinct()
+            substances = substances.filter(search_condition(tenant_id, search))
 
         if status:
             substances = substances.filter(status=status)
@@ -416,13 +411,12 @@ class SubstanceSearchView(LoginRequiredMixin, View):
         query = request.GET.get("q", "")
 
         if len(query) < 2:
-            return render(request, "substances/partials/search_results.html", {"substances": []})
+            return render(request, "substances/partials/search_results.html", {"hits": []})
 
-        substances = SubstanceService.search(query, tenant_id, limit=10)
+        require_permission("substance.view")
+        hits = cached_search(tenant_id, query, limit=10)
 
-        return render(
-            request, "substances/partials/search_results.html", {"substances": substances}
-        )
+        return render(request, "substances/partials/search_results.html", {"hits": hits})
 
 
 class HazardRegisterView(LoginRequiredMixin, View):
@@ -436,11 +430,10 @@ class HazardRegisterView(LoginRequiredMixin, View):
 
         substances = (
             Substance.objects.filter(base_filter, status="active")
-            .select_related("manufacturer")
+            .select_related("manufacturer", "current_sds")
             .prefetch_related(
-                "identifiers",
-                "sds_revisions__hazard_statements",
-                "sds_revisions__pictograms",
+                "current_sds__hazard_statements",
+                "current_sds__pictograms",
                 "inventory_items",
             )
             .order_by("name")
@@ -0,0 +1,200 @@
+# substances/tests/test_exports.py
+"""Tests für den Gefahrstoffverzeichnis-Export (XLSX, CSV, ODS, ExportJob)."""
+
+import io
+import uuid
+import zipfile
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+from xml.etree import ElementTree
+
+import pytest
+
+from substances.exports.hazard_register import (
+    HEADERS,
+    iter_hazard_register_rows,
+    stream_hazard_register_csv,
+    write_hazard_register,
+)
+from substances.models import (
+    HazardStatementRef,
+    Identifier,
+    SdsRevision,
+    SiteInventoryItem,
+    Substance,
+)
+from tenancy.models import Organization, Site
+
+openpyxl = pytest.importorskip("openpyxl")
+
+pytestmark = pytest.mark.django_db
+
+ODS_TABLE = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+
+
+@pytest.fixture
+def tenant_id():
+    return uuid.uuid4()
+
+
+@pytest.fixture
+def sites(tenant_id):
+    org = Organization.objects.create(tenant_id=tenant_id, name="Test GmbH", slug="test-gmbh")
+    return [
+        Site.objects.create(tenant_id=tenant_id, organization=org, name=name, code=name[:2])
+        for name in ("Hauptwerk", "Lager Nord")
+    ]
+
+
+@pytest.fixture
+def register(tenant_id, sites):
+    """Aceton (CMR, SDS, Inventar in beiden Werken) und Toluol (ohne SDS)."""
+    h225 = HazardStatementRef.objects.create(code="H225", text_de="Entzündbar")
+    h319 = HazardStatementRef.objects.create(code="H319", text_de="Augenreizung")
+    acetone = Substance.objects.create(tenant_id=tenant_id, name="Aceton", is_cmr=True)
+    Identifier.objects.create(
+        tenant_id=tenant_id, substance=acetone, id_type=Identifier.IdType.CAS, id_value="67-64-1"
+    )
+    sds = SdsRevision.objects.create(
+        tenant_id=tenant_id,
+        substance=acetone,
+        revision_date=date(2024, 3, 1),
+        status=SdsRevision.Status.APPROVED,
+    )
+    sds.hazard_statements.add(h319, h225)
+    for site, quantity in zip(sites, ("12.500", "3"), strict=True):
+        SiteInventoryItem.objects.create(
+            tenant_id=tenant_id,
+            substance=acetone,
+            site=site,
+            quantity=Decimal(quantity),
+            unit="l",
+            storage_location=f"Lager {site.code}",
+        )
+    Substance.objects.create(tenant_id=tenant_id, name="Toluol")
+    Substance.objects.create(tenant_id=uuid.uuid4(), name="Fremdmandant")
+    return acetone
+
+
+class TestHazardRegisterRows:
+    def test_should_flatten_substances(self, tenant_id, register):
+        rows = list(iter_hazard_register_rows(tenant_id, chunk_size=1))
+
+        assert [row[1] for row in rows] == ["Aceton", "Toluol"]
+        assert rows[0] == [
+            1,
+            "Aceton",
+            "67-64-1",
+            "",
+            "",
+            "",
+            "Ja",
+            12.5,
+            "l",
+            "Lager Ha",
+            "H225, H319",
+            "",
+            "",
+            "01.03.2024",
+            "Freigegeben",
+        ]
+        assert rows[1][6:] == ["Nein", "", "", "", "", "", "", "", "Kein SDS"]
+
+    def test_should_use_inventory_of_requested_site(self, tenant_id, register, sites):
+        rows = list(iter_hazard_register_rows(tenant_id, sites[1].pk))
+
+        assert len(rows) == 1
+        assert rows[0][7:10] == [3.0, "l", "Lager La"]
+
+
+class TestHazardRegisterFormats:
+    def test_should_write_xlsx_with_named_styles(self, tenant_id, register):
+        buffer = io.BytesIO()
+        write_hazard_register(buffer, tenant_id, fmt="xlsx")
+
+        ws = openpyxl.load_workbook(buffer)["Gefahrstoffverzeichnis"]
+        assert [c.value for c in ws[1]] == list(HEADERS)
+        assert ws["A1"].style == "hr_header"
+        assert ws["G2"].style == "hr_cmr"
+        assert ws["G3"].style == "hr_cell"
+        assert ws.auto_filter.ref == "A1:O3"
+        assert ws.freeze_panes == "A2"
+
+    def test_should_stream_csv(self, tenant_id, register):
+        data = b"".join(stream_hazard_register_csv(iter_hazard_register_rows(tenant_id)))
+
+        lines = data.decode().splitlines()
+        assert lines[0].startswith("Nr.;Stoffname;CAS-Nr.")
+        assert lines[1].startswith("1;Aceton;67-64-1;")
+        assert len(lines) == 3
+
+    def test_should_write_ods(self, tenant_id, register):
+        buffer = io.BytesIO()
+        write_hazard_register(buffer, tenant_id, fmt="ods")
+
+        with zipfile.ZipFile(buffer) as zf:
+            assert zf.namelist()[0] == "mimetype"
+            assert zf.read("mimetype") == b"application/vnd.oasis.opendocument.spreadsheet"
+            content = ElementTree.fromstring(zf.read("content.xml"))
+        rows = content.iter(f"{ODS_TABLE}table-row")
+        assert len(list(rows)) == 3
+
+    def test_should_reject_unknown_format(self, tenant_id):
+        with pytest.raises(ValueError):
+            write_hazard_register(io.BytesIO(), tenant_id, fmt="pdf")
+
+
+class TestHazardRegisterExportJob:
+    def test_should_upload_export_to_s3(self, tenant_id, register):
+        from reporting.models import ExportJob
+        from reporting.tasks import process_export_job
+
+        job = ExportJob.objects.create(
+            tenant_id=tenant_id,
+            requested_by_user_id=uuid.uuid4(),
+            export_type="substances.hazard_register.csv",
+            params_json={"format": "csv", "site_id": None},
+            params_hash="h",
+        )
+        uploaded = {}
+
+        def upload_fileobj(fileobj, bucket, key, ExtraArgs):
+            uploaded[key] = fileobj.read()
+
+        with patch("common.s3.s3_client") as client:
+            client.return_value.upload_fileobj.side_effect = upload_fileobj
+            process_export_job.run(str(job.pk))
+
+        job.refresh_from_db()
+        assert job.status == ExportJob.Status.DONE
+        assert job.output_s3_key.endswith(f"/hazard_register/{job.pk}/Gefahrstoffverzeichnis.csv")
+        assert len(uploaded[job.output_s3_key].splitlines()) == 3
+        assert job.output_size_bytes == len(uploaded[job.output_s3_key])
+
+
+class TestHazardRegisterExportView:
+    def _get(self, tenant_id, user, **params):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+
+        from substances.views import HazardRegisterExportView
+
+        request = APIRequestFactory().get("/exports/hazard-register/", params)
+        request.tenant_id = tenant_id
+        force_authenticate(request, user=user)
+        return HazardRegisterExportView.as_view()(request)
+
+    def test_should_stream_csv(self, tenant_id, register, fixture_user):
+        response = self._get(tenant_id, fixture_user, export_format="csv")
+
+        assert response.streaming
+        assert b"".join(response.streaming_content).count(b"\n") == 3
+
+    def test_should_serve_xlsx_file(self, tenant_id, register, fixture_user):
+        response = self._get(tenant_id, fixture_user)
+
+        assert response["Content-Disposition"] == (
+            'attachment; filename="Gefahrstoffverzeichnis.xlsx"'
+        )
+        ws = openpyxl.load_workbook(io.BytesIO(b"".join(response.streaming_content))).active
+        assert ws.max_row == 3
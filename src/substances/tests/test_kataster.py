@@ -1,6 +1,7 @@
 # substances/tests/test_kataster.py
 """Tests für das Gefahrstoffkataster (UC-004): Services und Views."""
 
+import io
 import uuid
 
 import pytest
@@ -11,6 +12,7 @@ from substances.models import (
     Product,
     SubstanceUsage,
 )
+from substances.services.excel_reader import iter_sheet_rows, sample_rows
 from substances.services.kataster_service import (
     KatasterDashboardService,
     KatasterImportService,
@@ -249,3 +251,254 @@ class TestKatasterImportService:
         mapping = {}
         result = KatasterImportService._map_field(row, mapping, "trade_name")
         assert result == ""
+
+
+MAPPING = {
+    "trade_name": "Produkt",
+    "material_number": "Nummer",
+    "storage_location": "Lagerort",
+    "storage_class": "LGK",
+}
+
+
+def _rows(*names, start=2):
+    return [
+        {"_row_number": start + i, "Produkt": name, "Nummer": f"M-{i}", "Lagerort": "Halle 1"}
+        for i, name in enumerate(names)
+    ]
+
+
+@pytest.mark.django_db
+class TestKatasterProcessBatch:
+    """Bulk-Pipeline von KatasterImportService.process_batch."""
+
+    @pytest.fixture
+    def batch(self, tenant_id, user_id, site):
+        service = KatasterImportService(tenant_id=tenant_id, user_id=user_id)
+        return service.create_batch("kataster.xlsx", b"content", site.pk)[0]
+
+    def test_should_create_products_usages_and_rows(self, tenant_id, user_id, batch):
+        service = KatasterImportService(tenant_id=tenant_id, user_id=user_id)
+        rows = _rows("Aceton", "Ethanol", "") + [{"_row_number": 9, "Produkt": "Aceton"}]
+
+        stats = service.process_batch(batch, rows, MAPPING)
+
+        assert (stats.created, stats.updated, stats.skipped, stats.errors) == (2, 1, 1, [])
+        assert Product.objects.filter(tenant_id=tenant_id).count() == 2
+        usage = SubstanceUsage.objects.get(product__trade_name="Aceton")
+        assert usage.storage_location == ""  # last row for the product wins
+        assert batch.rows.count() == 4
+        assert batch.rows.get(row_number=4).status == "skipped"
+        batch.refresh_from_db()
+        assert batch.status == ImportBatch.Status.DONE
+        assert batch.stats == {"created": 2, "updated": 1, "skipped": 1, "errors": 0}
+
+    def test_should_update_existing_product_usage(self, tenant_id, user_id, site, batch):
+        product = Product.objects.create(tenant_id=tenant_id, trade_name="Aceton")
+        SubstanceUsage.objects.create(
+            tenant_id=tenant_id, product=product, site=site, storage_location="alt"
+        )
+        service = KatasterImportService(tenant_id=tenant_id, user_id=user_id)
+
+        stats = service.process_batch(batch, _rows("Aceton"), MAPPING)
+
+        assert (stats.created, stats.updated) == (0, 1)
+        usage = SubstanceUsage.objects.get(product=product)
+        assert usage.storage_location == "Halle 1"
+        assert usage.created_by == user_id
+        assert batch.rows.get().resolved_product == product
+
+    def test_should_isolate_invalid_rows(self, tenant_id, user_id, batch):
+        service = KatasterImportService(tenant_id=tenant_id, user_id=user_id)
+        rows = _rows("Aceton", "X" * 301)
+
+        stats = service.process_batch(batch, rows, MAPPING)
+
+        assert stats.created == 1
+        assert stats.errors == ["Zeile 3: trade_name länger als 300 Zeichen"]
+        assert batch.rows.get(row_number=3).status == "error"
+        batch.refresh_from_db()
+        assert batch.status == ImportBatch.Status.FAILED
+
+    def test_should_write_in_constant_queries(
+        self, tenant_id, user_id, batch, django_assert_max_num_queries
+    ):
+        service = KatasterImportService(tenant_id=tenant_id, user_id=user_id)
+        rows = _rows(*(f"Produkt {i}" for i in range(300)))
+
+        # staging + chunk lock/progress + bulk writes — independent of row count
+        with django_assert_max_num_queries(18):
+            stats = service.process_batch(batch, rows, MAPPING)
+
+        assert stats.created == 300
+
+    def test_should_fall_back_to_row_by_row(self, tenant_id, user_id, batch, monkeypatch):
+        service = KatasterImportService(tenant_id=tenant_id, user_id=user_id)
+        bulk = service._process_rows_bulk
+
+        def failing_bulk(*args):
+            bulk(*args)
+            raise RuntimeError("bulk write failed")
+
+        monkeypatch.setattr(service, "_process_rows_bulk", failing_bulk)
+        rows = _rows("Aceton", "Ethanol", "Aceton", "X" * 301)
+
+        stats = service.process_batch(batch, rows, MAPPING)
+
+        assert (stats.created, stats.updated, len(stats.errors)) == (2, 1, 1)
+        assert Product.objects.filter(tenant_id=tenant_id).count() == 2
+        assert batch.rows.count() == 4
+
+
+@pytest.mark.django_db
+class TestKatasterImportJob:
+    """Bereitgestellte Zeilen, Celery-Job und Fortschrittsanzeige."""
+
+    @pytest.fixture
+    def batch(self, tenant_id, user_id, site):
+        service = KatasterImportService(tenant_id=tenant_id, user_id=user_id)
+        batch = service.create_batch("kataster.xlsx", b"content", site.pk)[0]
+        service.stage_rows(batch, _rows("Aceton", "Ethanol", "Aceton", "", "X" * 301))
+        return batch
+
+    def test_should_stage_rows_as_pending(self, batch):
+        assert batch.total_rows == 5
+        assert set(batch.rows.values_list("status", flat=True)) == {"pending"}
+        assert "_row_number" not in batch.rows.first().raw_data
+
+    def test_should_resume_after_worker_failure(self, tenant_id, user_id, batch, monkeypatch):
+        service = KatasterImportService(tenant_id=tenant_id, user_id=user_id)
+        service.queue_import(batch, MAPPING)
+        monkeypatch.setattr(KatasterImportService, "BULK_CHUNK_SIZE", 2)
+        record = KatasterImportService._record_progress
+        calls = []
+
+        def crash_on_second_chunk(*args):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("worker lost")
+            record(*args)
+
+        monkeypatch.setattr(
+            KatasterImportService, "_record_progress", staticmethod(crash_on_second_chunk)
+        )
+        with pytest.raises(RuntimeError):
+            service.run_import(batch)
+
+        batch.refresh_from_db()
+        assert batch.processed_rows == 2
+        assert batch.rows.filter(status="pending").count() == 3
+
+        monkeypatch.setattr(KatasterImportService, "_record_progress", staticmethod(record))
+        stats = service.run_import(batch)
+
+        assert (stats.created, stats.updated, stats.skipped, len(stats.errors)) == (2, 1, 1, 1)
+        assert stats.errors == ["Zeile 6: trade_name länger als 300 Zeichen"]
+        batch.refresh_from_db()
+        assert batch.processed_rows == 5
+        assert batch.status == ImportBatch.Status.FAILED
+
+    def test_task_should_run_queued_batch(self, tenant_id, user_id, batch):
+        from substances.tasks import run_kataster_import
+
+        KatasterImportService(tenant_id=tenant_id, user_id=user_id).queue_import(batch, MAPPING)
+
+        result = run_kataster_import.delay(batch.pk).get()
+
+        assert result["created"] == 2
+        batch.refresh_from_db()
+        assert not batch.is_running
+        assert batch.progress_percent == 100
+
+    def test_task_should_skip_unconfirmed_batch(self, batch):
+        from substances.tasks import run_kataster_import
+
+        assert run_kataster_import.delay(batch.pk).get()["skipped"] is True
+        assert batch.rows.filter(status="pending").count() == 5
+
+    def test_confirm_should_queue_job_and_show_progress(
+        self, tenant_id, batch, django_capture_on_commit_callbacks
+    ):
+        from django.test import RequestFactory
+
+        from substances.kataster_views import ImportBatchProgressView, KatasterImportView
+        from tests.factories import UserFactory
+
+        user = UserFactory()
+        data = {"confirm_import": "1", "batch_id": batch.pk}
+        data.update({f"map_{field}": col for field, col in MAPPING.items()})
+        request = RequestFactory().post("/kataster/import/", data)
+        request.user, request.tenant_id = user, tenant_id
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            response = KatasterImportView.as_view()(request)
+
+        assert response.status_code == 302
+        batch.refresh_from_db()
+        assert batch.status == ImportBatch.Status.QUEUED
+        assert batch.column_mapping == MAPPING
+
+        request = RequestFactory().get("/", HTTP_HX_REQUEST="true")
+        request.user, request.tenant_id = user, tenant_id
+        response = ImportBatchProgressView.as_view()(request, pk=batch.pk)
+        assert "every 2s" in response.content.decode()
+        assert "HX-Refresh" not in response
+
+        callbacks[0]()
+        response = ImportBatchProgressView.as_view()(request, pk=batch.pk)
+        assert response["HX-Refresh"] == "true"
+
+
+def _xlsx(rows):
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    for row in rows:
+        wb.active.append(row)
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+class TestExcelStreaming:
+    """Streamender Excel-Reader und Kataster-Zeilenextraktion."""
+
+    def test_should_stream_sheet_rows(self):
+        rows = iter_sheet_rows(_xlsx([("a", 1), ("b", 2)]))
+        assert next(rows) == ("a", 1)
+        assert list(rows) == [("b", 2)]
+
+    def test_should_sample_without_consuming(self):
+        sample, rows = sample_rows(iter([(1,), (2,), (3,)]), 2)
+        assert sample == [(1,), (2,)]
+        assert list(rows) == [(1,), (2,), (3,)]
+
+    def test_should_analyze_only_sample(self, monkeypatch):
+        seen = []
+
+        def analyze(raw_rows):
+            seen.append(len(raw_rows))
+            return KatasterImportService._analyze_rule_based(raw_rows)
+
+        monkeypatch.setattr(KatasterImportService, "_analyze_structure", staticmethod(analyze))
+        content = _xlsx(
+            [("Lfdnr", "Handelsname", "Hersteller")]
+            + [(str(i), f"Produkt {i}", "ACME") for i in range(1, 101)]
+            + [("101", None, "ACME")]
+        )
+        service = KatasterImportService(tenant_id=uuid.uuid4())
+
+        rows = service.iter_excel_rows(content)
+
+        assert seen == [KatasterImportService.STRUCTURE_SAMPLE_ROWS]
+        first = next(rows)
+        assert first == {
+            "trade_name": "Produkt 1",
+            "_row_number": 2,
+            "manufacturer_name": "ACME",
+        }
+        assert len(list(rows)) == 99  # empty product cell skipped
+
+    def test_should_return_no_rows_for_empty_sheet(self):
+        service = KatasterImportService(tenant_id=uuid.uuid4())
+        assert service.parse_excel(_xlsx([])) == []
@@ -270,3 +270,99 @@ class TestReferenceData:
         """Test: Piktogramm String-Darstellung."""
         assert "GHS02" in str(pictogram)
         assert "Flamme" in str(pictogram)
+
+
+@pytest.mark.django_db
+class TestSubstanceProjections:
+    """Tests für die Projektionen current_sds / primary_cas."""
+
+    def _sds(self, substance, number, status=SdsRevision.Status.APPROVED):
+        return SdsRevision.objects.create(
+            tenant_id=substance.tenant_id,
+            substance=substance,
+            revision_number=number,
+            revision_date=date(2024, number, 1),
+            status=status,
+        )
+
+    def test_current_sds_follows_approval(self, substance):
+        """Test: Freigabe einer neuen Revision setzt current_sds um."""
+        from substances.services.sds_service import approve_sds_revision
+
+        first = self._sds(substance, 1)
+        second = self._sds(substance, 2, status=SdsRevision.Status.PENDING)
+        assert Substance.objects.get(pk=substance.pk).current_sds_id == first.pk
+
+        approve_sds_revision(second)
+
+        assert Substance.objects.get(pk=substance.pk).current_sds_id == second.pk
+
+    def test_primary_cas_follows_identifier(self, substance):
+        """Test: CAS-Kennung anlegen/löschen pflegt primary_cas."""
+        identifier = Identifier.objects.create(
+            tenant_id=substance.tenant_id,
+            substance=substance,
+            id_type=Identifier.IdType.CAS,
+            id_value="67-64-1",
+        )
+        assert Substance.objects.get(pk=substance.pk).primary_cas == "67-64-1"
+
+        identifier.delete()
+
+        assert Substance.objects.get(pk=substance.pk).cas_number is None
+
+    def test_save_keeps_projections(self, substance):
+        """Test: Speichern einer veralteten Instanz überschreibt Projektionen nicht."""
+        stale = Substance.objects.get(pk=substance.pk)
+        sds = self._sds(substance, 1)
+
+        stale.trade_name = "Aceton rein"
+        stale.save()
+
+        assert Substance.objects.get(pk=substance.pk).current_sds_id == sds.pk
+
+    def test_refresh_projections_matches_live_annotation(self, substance):
+        """Test: refresh_projections() korrigiert per update() umgangene Pflege."""
+        sds = self._sds(substance, 1)
+        Identifier.objects.create(
+            tenant_id=substance.tenant_id,
+            substance=substance,
+            id_type=Identifier.IdType.CAS,
+            id_value="67-64-1",
+        )
+        Substance.objects.filter(pk=substance.pk).update(current_sds=None, primary_cas="")
+
+        live = Substance.objects.with_live_projections().get(pk=substance.pk)
+        assert (live.live_current_sds_id, live.live_primary_cas) == (sds.pk, "67-64-1")
+
+        assert Substance.objects.filter(pk=substance.pk).refresh_projections() == 1
+        refreshed = Substance.objects.get(pk=substance.pk)
+        assert (refreshed.current_sds_id, refreshed.primary_cas) == (sds.pk, "67-64-1")
+
+    def test_hazard_register_export_uses_constant_queries(
+        self, tenant_id, h_statement, django_assert_max_num_queries
+    ):
+        """Test: Excel-Export ohne Queries pro Stoff."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from substances.exports.hazard_register_excel import generate_hazard_register_excel
+
+        def add_substances(start, count):
+            for i in range(start, start + count):
+                substance = Substance.objects.create(tenant_id=tenant_id, name=f"Stoff {i:04d}")
+                Identifier.objects.create(
+                    tenant_id=tenant_id,
+                    substance=substance,
+                    id_type=Identifier.IdType.CAS,
+                    id_value=f"{i}-00-0",
+                )
+                self._sds(substance, 1).hazard_statements.add(h_statement)
+
+        add_substances(0, 3)
+        with CaptureQueriesContext(connection) as small:
+            generate_hazard_register_excel(tenant_id)
+        add_substances(3, 30)
+
+        with django_assert_max_num_queries(len(small.captured_queries)):
+            generate_hazard_register_excel(tenant_id)
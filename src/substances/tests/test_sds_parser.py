@@ -1,6 +1,13 @@
 # src/substances/tests/test_sds_parser.py
 """Tests für SDS-Parser Service."""
 
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from substances.models import SdsParseCache
 from substances.services.sds_parser import SdsParserService, parse_sds_text
 
 
@@ -247,3 +254,117 @@ class TestSdsParserRealWorld:
         assert result["signal_word"] == "danger"
         assert result["flash_point_c"] == 12
         assert result["ignition_temperature_c"] == 400
+
+
+CORPUS = Path(__file__).parent / "sds_corpus"
+
+
+class TestSdsSectionScan:
+    """Abschnittsbezogene Suche — Ergebnisse gegen den Referenzkorpus."""
+
+    @pytest.mark.parametrize("name", sorted(p.stem for p in CORPUS.glob("*.txt")))
+    def test_should_match_corpus(self, name):
+        text = (CORPUS / f"{name}.txt").read_text(encoding="utf-8")
+        expected = json.loads((CORPUS / f"{name}.json").read_text(encoding="utf-8"))
+
+        result = asdict(SdsParserService()._parse_text(text))
+        result.pop("raw_text")
+
+        assert result == expected
+
+    def test_should_ignore_properties_outside_section_9(self):
+        text = (
+            "ABSCHNITT 5: Maßnahmen zur Brandbekämpfung\n"
+            "Bei Temperaturen über dem Flammpunkt: 20 °C Dämpfe absaugen.\n"
+            "ABSCHNITT 9: Physikalische und chemische Eigenschaften\n"
+            "Flammpunkt: 61 °C\n"
+        )
+
+        assert SdsParserService()._parse_text(text).flash_point_c == 61
+
+    def test_should_search_full_text_without_sections(self):
+        result = SdsParserService()._parse_text("Flammpunkt: 12 °C\nUN 1170\nH225 P210")
+
+        assert result.flash_point_c == 12
+        assert result.un_number == "UN 1170"
+        assert result.h_statements == ["H225"]
+
+    def test_should_keep_last_duplicate_section(self):
+        text = "ABSCHNITT 2: Gefahren\nalt\nABSCHNITT 3: Stoffe\nx\nABSCHNITT 2: Gefahren\nneu"
+
+        sections = SdsParserService()._extract_sections(text)
+
+        assert list(sections) == ["02_Gefahren", "03_Zusammensetzung"]
+        assert sections["02_Gefahren"].endswith("neu")
+
+
+@pytest.mark.django_db
+class TestSdsParseCache:
+    """Ergebnis-Cache nach SHA-256 und Batch-Parsing."""
+
+    @pytest.fixture
+    def parsed(self, monkeypatch):
+        calls = []
+
+        def fake_parse(self, data):
+            calls.append(data)
+            if data == b"broken":
+                raise ValueError("kein PDF")
+            return {"product_name": data.decode(), "parse_confidence": 1.0}
+
+        monkeypatch.setattr(SdsParserService, "_parse_bytes", fake_parse)
+        return calls
+
+    def test_should_parse_identical_pdf_once(self, parsed):
+        import io
+
+        parser = SdsParserService()
+        first = parser.parse_pdf(io.BytesIO(b"aceton"))
+        second = parser.parse_pdf_bytes(b"aceton")
+
+        assert first == second == {"product_name": "aceton", "parse_confidence": 1.0}
+        assert parsed == [b"aceton"]
+
+    def test_should_reparse_stale_parser_version(self, parsed, monkeypatch):
+        SdsParserService().parse_pdf_bytes(b"aceton")
+        monkeypatch.setattr(SdsParserService, "PARSER_VERSION", "next")
+
+        SdsParserService().parse_pdf_bytes(b"aceton")
+
+        assert parsed == [b"aceton", b"aceton"]
+        assert SdsParseCache.objects.get().parser_version == "next"
+
+    def test_should_batch_parse_in_input_order(self, parsed):
+        parser = SdsParserService()
+        parser.parse_pdf_bytes(b"aceton")
+
+        results = parser.parse_pdf_batch([b"ethanol", b"aceton", b"broken", b"ethanol"], workers=1)
+
+        assert [r.get("product_name") for r in results] == ["ethanol", "aceton", None, "ethanol"]
+        assert results[2]["_error"] == "ValueError: kein PDF"
+        assert parsed == [b"aceton", b"ethanol", b"broken"]
+        assert SdsParseCache.objects.count() == 2
+
+    def test_should_parse_sequentially_inside_atomic(self, parsed, monkeypatch):
+        from substances.services import sds_parser
+
+        def no_pool(*args, **kwargs):
+            raise AssertionError("Prozess-Pool innerhalb von transaction.atomic")
+
+        monkeypatch.setattr(sds_parser, "ProcessPoolExecutor", no_pool)
+
+        results = SdsParserService().parse_pdf_batch([b"ethanol", b"aceton"], workers=4)
+
+        assert [r["product_name"] for r in results] == ["ethanol", "aceton"]
+
+
+class TestSdsParsePool:
+    def test_should_not_fork_from_daemon_process(self, monkeypatch):
+        import multiprocessing
+
+        from substances.services.sds_parser import _pool_blocker
+
+        assert _pool_blocker() == ""
+        monkeypatch.setattr(multiprocessing.current_process(), "daemon", True)
+
+        assert _pool_blocker() == "daemon process"
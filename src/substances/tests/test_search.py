@@ -0,0 +1,151 @@
+# substances/tests/test_search.py
+"""Tests für die Suche (tsvector, Trigramme, Kennungen, Cache)."""
+
+import uuid
+
+import pytest
+from django.db import DatabaseError, connection
+
+from substances.models import Identifier, Party, Product, Substance
+from substances.services import search as search_module
+from substances.services.search import (
+    KIND_PRODUCT,
+    KIND_SUBSTANCE,
+    MATCH_IDENTIFIER,
+    cached_search,
+    search,
+    search_condition,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def tenant_id():
+    return uuid.uuid4()
+
+
+@pytest.fixture
+def pg_trgm():
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+
+@pytest.fixture
+def catalog(tenant_id):
+    """Aceton (mit CAS), Ethanol, ein Produkt und ein Stoff eines anderen Mandanten."""
+    acetone = Substance.objects.create(
+        tenant_id=tenant_id, name="Aceton", trade_name="Aceton technisch", is_cmr=True
+    )
+    Identifier.objects.create(
+        tenant_id=tenant_id, substance=acetone, id_type=Identifier.IdType.CAS, id_value="67-64-1"
+    )
+    Substance.objects.create(tenant_id=tenant_id, name="Ethanol", description="Lösemittel")
+    manufacturer = Party.objects.create(
+        tenant_id=tenant_id, name="Chemie AG", party_type=Party.PartyType.MANUFACTURER
+    )
+    Product.objects.create(
+        tenant_id=tenant_id,
+        trade_name="Acetonreiniger Plus",
+        material_number="M-4711",
+        manufacturer=manufacturer,
+    )
+    Substance.objects.create(tenant_id=uuid.uuid4(), name="Aceton")
+    return acetone
+
+
+class TestSearchIndex:
+    def test_should_index_on_save(self, tenant_id, catalog):
+        catalog.trade_name = "Propanon rein"
+        catalog.save()
+
+        assert Substance.objects.filter(search_condition(tenant_id, "propan")).get() == catalog
+        assert not Substance.objects.filter(search_condition(tenant_id, "technisch")).exists()
+
+    def test_should_normalize_identifier_values(self, catalog):
+        identifier = catalog.identifiers.get()
+        identifier.id_value = "ec 200-662-2"
+        identifier.save(update_fields=["id_value"])
+
+        identifier.refresh_from_db()
+        assert identifier.id_value_normalized == "EC2006622"
+
+    def test_should_index_queryset_update(self, tenant_id, catalog):
+        Substance.objects.filter(pk=catalog.pk).update(description="Nagellackentferner")
+
+        assert Substance.objects.filter(search_condition(tenant_id, "nagellack")).get() == catalog
+
+    def test_should_index_bulk_writes(self, tenant_id, catalog):
+        (product,) = Product.objects.bulk_create(
+            [Product(tenant_id=tenant_id, trade_name="Glasklar Spray")]
+        )
+        product.trade_name = "Fensterglanz Spray"
+        Product.objects.bulk_update([product], ["trade_name"])
+
+        assert Product.objects.filter(search_condition(tenant_id, "fensterglanz")).get() == product
+        assert not Product.objects.filter(search_condition(tenant_id, "glasklar")).exists()
+
+
+class TestSearch:
+    def test_should_rank_prefix_matches_with_highlight(self, tenant_id, catalog):
+        hits = search(tenant_id, "acet")
+
+        assert {(hit.kind, hit.title) for hit in hits} == {
+            (KIND_SUBSTANCE, "Aceton"),
+            (KIND_PRODUCT, "Acetonreiniger Plus"),
+        }
+        assert hits == sorted(hits, key=lambda hit: -hit.rank)
+        substance = next(hit for hit in hits if hit.kind == KIND_SUBSTANCE)
+        assert substance.highlight == "<mark>Aceton</mark>"
+        assert substance.cas_number == "67-64-1"
+        assert substance.is_cmr is True
+
+    def test_should_put_identifier_hits_first(self, tenant_id, catalog):
+        hits = search(tenant_id, "67-64-1")
+
+        assert hits[0].pk == catalog.pk
+        assert hits[0].match == MATCH_IDENTIFIER
+        assert [hit.pk for hit in search(tenant_id, "67641", kinds=(KIND_SUBSTANCE,))] == [
+            catalog.pk
+        ]
+
+    def test_should_find_products_by_material_number(self, tenant_id, catalog):
+        hits = search(tenant_id, "M-4711")
+
+        assert [(hit.kind, hit.subtitle) for hit in hits] == [(KIND_PRODUCT, "Chemie AG · M-4711")]
+
+    def test_should_escape_highlight(self, tenant_id):
+        Substance.objects.create(tenant_id=tenant_id, name="<b>Aceton</b>")
+
+        (hit,) = search(tenant_id, "aceton")
+
+        assert hit.highlight == "&lt;b&gt;<mark>Aceton</mark>&lt;/b&gt;"
+
+    def test_should_tolerate_typos_with_pg_trgm(self, tenant_id, catalog, pg_trgm):
+        hits = search(tenant_id, "Azeton", kinds=(KIND_SUBSTANCE,))
+
+        assert [hit.title for hit in hits] == ["Aceton"]
+
+    def test_should_fall_back_to_full_text(self, tenant_id, catalog, monkeypatch):
+        ranked = search_module._ranked
+
+        def without_trgm(qs, query, tsquery, fields, trigram):
+            if trigram:
+                raise DatabaseError("function similarity does not exist")
+            return ranked(qs, query, tsquery, fields, trigram)
+
+        monkeypatch.setattr(search_module, "_ranked", without_trgm)
+
+        assert [hit.title for hit in search(tenant_id, "ethan")] == ["Ethanol"]
+
+    def test_should_ignore_queries_without_words(self, tenant_id, catalog):
+        assert search(tenant_id, " -- ") == []
+
+    def test_should_cache_results(self, tenant_id, catalog, django_assert_num_queries):
+        first = cached_search(tenant_id, "Acet")
+
+        with django_assert_num_queries(0):
+            second = cached_search(tenant_id, " acet ")
+
+        assert second == first
+        assert second[0].highlight_html == first[0].highlight
@@ -281,3 +281,129 @@ class TestExSubstanceData:
             lower_explosion_limit=None,
         )
         assert data.is_flammable() is False
+
+
+@pytest.mark.django_db
+class TestSubstanceImportXlsx:
+    def test_should_stream_named_rows(self):
+        import io
+
+        import openpyxl
+
+        from substances.services.substance_import import SubstanceImportService
+
+        wb = openpyxl.Workbook()
+        wb.active.append(("Name", "CAS", "flash_point_c"))
+        wb.active.append(("Aceton", "67-64-1", -17))
+        wb.active.append((None, None, None))
+        buf = io.BytesIO()
+        wb.save(buf)
+        buf.seek(0)
+
+        stats = SubstanceImportService(tenant_id=uuid.uuid4()).import_from_xlsx(buf, dry_run=True)
+
+        assert (stats.skipped, stats.errors) == (1, [])
+
+    def test_should_reject_empty_workbook(self):
+        import io
+
+        import openpyxl
+
+        from substances.services.substance_import import SubstanceImportService
+
+        buf = io.BytesIO()
+        openpyxl.Workbook().save(buf)
+        buf.seek(0)
+
+        with pytest.raises(ValueError, match="leer"):
+            SubstanceImportService(tenant_id=uuid.uuid4()).import_from_xlsx(buf)
+
+
+@pytest.mark.django_db
+class TestSubstanceImportBatch:
+    @pytest.fixture(autouse=True)
+    def refs(self):
+        from substances.models import PictogramRef, PrecautionaryStatementRef
+
+        HazardStatementRef.objects.create(code="H225", text_de="Flüssigkeit und Dampf leicht")
+        HazardStatementRef.objects.create(code="H319", text_de="Verursacht Augenreizung")
+        PrecautionaryStatementRef.objects.create(code="P210", text_de="Von Hitze fernhalten")
+        PictogramRef.objects.create(code="GHS02", name_de="Flamme")
+
+    @pytest.fixture
+    def service(self, tenant_id):
+        from substances.services.substance_import import SubstanceImportService
+
+        return SubstanceImportService(tenant_id=tenant_id)
+
+    @staticmethod
+    def _record(name, **kwargs):
+        return {
+            "name": name,
+            "cas": kwargs.pop("cas", "67-64-1"),
+            "h_statements": ["H225", "H999"],
+            "p_statements": ["P210"],
+            "pictograms": ["GHS02"],
+            "signal_word": "danger",
+            **kwargs,
+        }
+
+    def test_should_write_substances_identifiers_and_sds(self, service, tenant_id):
+        stats = service.import_from_records(
+            [self._record("Aceton", ec="200-662-2", flash_point_c=-17.0)]
+        )
+
+        assert (stats.created, stats.updated, stats.errors) == (1, 0, [])
+        substance = Substance.objects.get(tenant_id=tenant_id, name="Aceton")
+        assert substance.flash_point_c == -17.0
+        assert dict(
+            Identifier.objects.filter(substance=substance).values_list("id_type", "id_value")
+        ) == {"cas": "67-64-1", "ec": "200-662-2"}
+        sds = SdsRevision.objects.get(substance=substance)
+        assert sds.signal_word == "danger"
+        assert [h.code for h in sds.hazard_statements.all()] == ["H225"]
+        assert [p.code for p in sds.precautionary_statements.all()] == ["P210"]
+        assert [p.code for p in sds.pictograms.all()] == ["GHS02"]
+
+    def test_should_upsert_like_update_or_create(self, service, tenant_id):
+        service.import_from_records([self._record("Aceton", flash_point_c=-17.0)])
+
+        stats = service.import_from_records(
+            [
+                self._record("Ethanol", cas="64-17-5"),
+                self._record("Aceton", cas="67-64-1", h_statements=["H319"]),
+                self._record("Ethanol", cas="64-17-5", description="zweiter Datensatz"),
+            ]
+        )
+
+        assert (stats.created, stats.updated) == (1, 2)
+        aceton = Substance.objects.get(tenant_id=tenant_id, name="Aceton")
+        assert aceton.flash_point_c == -17.0  # missing value keeps the stored one
+        sds = aceton.sds_revisions.get()
+        assert [h.code for h in sds.hazard_statements.all()] == ["H319"]
+        ethanol = Substance.objects.get(tenant_id=tenant_id, name="Ethanol")
+        assert ethanol.description == "zweiter Datensatz"
+
+    def test_should_import_in_constant_queries(
+        self, service, tenant_id, django_assert_max_num_queries
+    ):
+        records = [self._record(f"Stoff {i}", cas=f"{i}-00-0") for i in range(300)]
+
+        with django_assert_max_num_queries(16):
+            stats = service.import_from_records(records)
+
+        assert stats.created == 300
+        assert Substance.objects.filter(tenant_id=tenant_id).count() == 300
+
+    def test_should_fall_back_to_single_records(self, service, tenant_id, monkeypatch):
+
+        def failing_batch(*args):
+            raise RuntimeError("bulk write failed")
+
+        monkeypatch.setattr(service, "_import_batch", failing_batch)
+
+        stats = service.import_from_records([self._record("Aceton"), {"cas": "1-1-1"}])
+
+        assert (stats.created, len(stats.errors)) == (1, 1)
+        sds = Substance.objects.get(tenant_id=tenant_id, name="Aceton").sds_revisions.get()
+        assert [h.code for h in sds.hazard_statements.all()] == ["H225"]
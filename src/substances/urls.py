@@ -31,4 +31,9 @@ urlpatterns = [
         views.HazardRegisterExportView.as_view(),
         name="hazard-register-export",
     ),
+    path(
+        "exports/hazard-register/jobs/<int:job_id>/",
+        views.HazardRegisterExportJobView.as_view(),
+        name="hazard-register-export-job",
+    ),
 ]
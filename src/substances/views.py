@@ -1,7 +1,7 @@
 # src/substances/views.py
 """API Views für Substances Module."""
 
-from django.http import HttpResponse
+from django.http import FileResponse, StreamingHttpResponse
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -52,9 +52,7 @@ class PartyViewSet(TenantAwareViewSet):
 class SubstanceViewSet(TenantAwareViewSet):
     """API für Gefahrstoffe."""
 
-    queryset = Substance.objects.select_related("manufacturer", "supplier").prefetch_related(
-        "identifiers", "sds_revisions"
-    )
+    queryset = Substance.objects.select_related("manufacturer", "supplier", "current_sds")
     serializer_class = SubstanceSerializer
     filterset_fields = ["status", "storage_class", "is_cmr"]
     search_fields = ["name", "trade_name", "description"]
@@ -65,6 +63,22 @@ class SubstanceViewSet(TenantAwareViewSet):
             return SubstanceDetailSerializer
         return SubstanceSerializer
 
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """Ranglisten-Suche (``?q=``, ``?limit=`` ≤ 50, ``?kind=substance|product``)."""
+        from .services.search import KINDS, search
+
+        query = request.query_params.get("q", "")
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), 50)
+        except ValueError:
+            limit = 10
+        kind = request.query_params.get("kind")
+        kinds = (kind,) if kind in KINDS else KINDS
+
+        hits = search(getattr(request, "tenant_id", None), query, limit, kinds)
+        return Response({"query": query, "results": [hit.to_dict() for hit in hits]})
+
     @action(detail=True, methods=["get"])
     def sds_history(self, request, pk=None):
         """Gibt SDS-Revisionsverlauf zurück."""
@@ -227,22 +241,111 @@ class PictogramRefViewSet(ReadOnlyRefViewSet):
 
 
 class HazardRegisterExportView(APIView):
-    """Export Gefahrstoffverzeichnis als Excel."""
+    """
+    Export Gefahrstoffverzeichnis (``?export_format=xlsx|csv|ods``).
+
+    ``format`` ist bei DRF für die Content-Negotiation reserviert.
+
+    GET liefert die Datei direkt (CSV gestreamt, XLSX/ODS über eine
+    temporäre Datei). POST legt einen ``reporting.ExportJob`` an, der die
+    Datei nach S3 lädt; Status über ``HazardRegisterExportJobView``.
+    """
+
+    def _options(self, params) -> tuple[str, str | None]:
+        from .exports.hazard_register import FORMAT_XLSX, FORMATS
+
+        fmt = params.get("export_format", FORMAT_XLSX)
+        return (fmt if fmt in FORMATS else FORMAT_XLSX), params.get("site_id") or None
 
     def get(self, request):
-        """Generiert Excel-Export."""
-        from .exports import generate_hazard_register_excel
+        """Generiert den Export."""
+        import tempfile
+
+        from .exports.hazard_register import (
+            CONTENT_TYPES,
+            FORMAT_CSV,
+            export_filename,
+            iter_hazard_register_rows,
+            stream_hazard_register_csv,
+            write_hazard_register,
+        )
 
         tenant_id = getattr(request, "tenant_id", None)
-        site_id = request.query_params.get("site_id")
+        fmt, site_id = self._options(request.query_params)
 
-        try:
-            buffer = generate_hazard_register_excel(tenant_id, site_id)
-            response = HttpResponse(
-                buffer.getvalue(),
-                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        if fmt == FORMAT_CSV:
+            response = StreamingHttpResponse(
+                stream_hazard_register_csv(iter_hazard_register_rows(tenant_id, site_id)),
+                content_type=CONTENT_TYPES[fmt],
             )
-            response["Content-Disposition"] = 'attachment; filename="Gefahrstoffverzeichnis.xlsx"'
+            response["Content-Disposition"] = f'attachment; filename="{export_filename(fmt)}"'
             return response
+
+        # Ab 16 MB auf Platte; FileResponse liefert blockweise aus und schließt die Datei
+        buffer = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)  # noqa: SIM115
+        try:
+            write_hazard_register(buffer, tenant_id, site_id, fmt)
         except Exception as e:
+            buffer.close()
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        buffer.seek(0)
+        return FileResponse(
+            buffer,
+            as_attachment=True,
+            filename=export_filename(fmt),
+            content_type=CONTENT_TYPES[fmt],
+        )
+
+    def post(self, request):
+        """Startet den Export als ExportJob."""
+        import hashlib
+        import json
+
+        from django.db import transaction
+
+        from reporting.models import ExportJob
+        from reporting.tasks import process_export_job
+
+        tenant_id = getattr(request, "tenant_id", None)
+        if tenant_id is None:
+            return Response({"error": "Missing tenant"}, status=status.HTTP_403_FORBIDDEN)
+        fmt, site_id = self._options(request.data)
+        params = {"format": fmt, "site_id": site_id}
+
+        job = ExportJob.objects.create(
+            tenant_id=tenant_id,
+            requested_by_user_id=request.user.pk,
+            export_type=f"substances.hazard_register.{fmt}",
+            params_json=params,
+            params_hash=hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest(),
+        )
+        transaction.on_commit(lambda: process_export_job.delay(str(job.pk)))
+        return Response({"job_id": job.pk, "status": job.status}, status=status.HTTP_202_ACCEPTED)
+
+
+class HazardRegisterExportJobView(APIView):
+    """Status eines asynchronen Exports; S3-Link nach Abschluss."""
+
+    def get(self, request, job_id):
+        from django.conf import settings
+        from django.shortcuts import get_object_or_404
+
+        from reporting.models import ExportJob
+
+        job = get_object_or_404(
+            ExportJob,
+            pk=job_id,
+            tenant_id=getattr(request, "tenant_id", None),
+            export_type__startswith="substances.hazard_register.",
+        )
+        data = {"job_id": job.pk, "status": job.status, "error": job.error}
+        if job.status == ExportJob.Status.DONE and job.output_s3_key:
+            from common.s3 import s3_client
+
+            data["size_bytes"] = job.output_size_bytes
+            data["download_url"] = s3_client().generate_presigned_url(
+                "get_object",
+                Params={"Bucket": settings.S3_BUCKET, "Key": job.output_s3_key},
+                ExpiresIn=3600,
+            )
+        return Response(data)
@@ -0,0 +1,143 @@
+"""Cached Organization lookups for tenant resolution (hot path).
+
+``SubdomainTenantMiddleware`` resolves the tenant on every request. The
+lookups here return a small immutable ``TenantRef`` instead of a model
+instance and go through two tiers:
+
+1. an in-process LRU (per worker, short TTL, no I/O), then
+2. the shared Django cache, then
+3. a single ``values()`` query.
+
+Unknown slugs are cached as misses, too. ``tenancy.signals`` evicts both
+tiers on Organization save/delete; other workers' LRUs pick up the change
+after at most ``LOCAL_TTL`` seconds.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from django.core.cache import cache
+
+LOCAL_TTL = 30  # seconds
+LOCAL_MAXSIZE = 1024
+SHARED_TTL = 300  # seconds
+_KEY = "tenancy:ref:{kind}:{value}"
+_MISSING = "missing"
+
+_ACTIVE_STATUSES = ("trial", "active")
+
+
+@dataclass(frozen=True)
+class TenantRef:
+    """Cache-safe projection of an Organization."""
+
+    tenant_id: UUID
+    slug: str
+    is_active: bool
+    is_readonly: bool = False
+
+
+class _LocalLRU:
+    """Thread-safe LRU with per-entry expiry."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_local = _LocalLRU(LOCAL_MAXSIZE, LOCAL_TTL)
+
+
+def _load(**lookup) -> TenantRef | None:
+    from tenancy.models import Organization
+
+    row = (
+        Organization.objects.filter(**lookup)
+        .values("tenant_id", "slug", "status", "is_readonly")
+        .first()
+    )
+    if row is None:
+        return None
+    return TenantRef(
+        tenant_id=row["tenant_id"],
+        slug=row["slug"],
+        is_active=row["status"] in _ACTIVE_STATUSES,
+        is_readonly=row["is_readonly"],
+    )
+
+
+def _lookup(kind: str, value) -> TenantRef | None:
+    key = _KEY.format(kind=kind, value=value)
+    ref = _local.get(key)
+    if ref is None:
+        ref = cache.get(key)
+        if ref is None:
+            ref = _load(**{kind: value}) or _MISSING
+            cache.set(key, ref, SHARED_TTL)
+        _local.set(key, ref)
+    return None if ref == _MISSING else ref
+
+
+def get_tenant_ref_by_slug(slug: str) -> TenantRef | None:
+    """Organization by subdomain slug, or None if unknown."""
+    return _lookup("slug", slug.lower())
+
+
+def get_tenant_ref_by_tenant_id(tenant_id: UUID) -> TenantRef | None:
+    """Organization by tenant_id, or None if unknown."""
+    return _lookup("tenant_id", tenant_id)
+
+
+def invalidate_tenant_ref(tenant_id: UUID | None = None, slug: str | None = None) -> None:
+    """Evict an Organization from both cache tiers (old slug included)."""
+    keys = []
+    if tenant_id is not None:
+        id_key = _KEY.format(kind="tenant_id", value=tenant_id)
+        keys.append(id_key)
+        previous = _local.get(id_key) or cache.get(id_key)
+        if isinstance(previous, TenantRef):
+            keys.append(_KEY.format(kind="slug", value=previous.slug))
+    if slug:
+        keys.append(_KEY.format(kind="slug", value=slug.lower()))
+    _local.delete(*keys)
+    cache.delete_many(keys)
+
+
+def clear_local_cache() -> None:
+    """Drop this worker's LRU (tests, management commands)."""
+    _local.clear()
@@ -0,0 +1,32 @@
+"""Cache invalidation for tenant lookups and active module sets.
+
+Signals (not service hooks) because organizations, subscriptions and
+module memberships are also changed by staff views, the admin and the
+billing callbacks.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.tenant import invalidate_active_modules
+from tenancy.lookup import invalidate_tenant_ref
+from tenancy.models import Organization
+
+
+@receiver([post_save, post_delete], sender=Organization)
+def _organization_changed(sender, instance, **kwargs):
+    invalidate_tenant_ref(instance.tenant_id, instance.slug)
+
+
+def _module_access_changed(sender, instance, **kwargs):
+    invalidate_active_modules(instance.tenant_id)
+
+
+try:
+    from django_tenancy.module_models import ModuleMembership, ModuleSubscription
+except ImportError:  # pragma: no cover — platform package not installed
+    pass
+else:
+    for _model in (ModuleSubscription, ModuleMembership):
+        post_save.connect(_module_access_changed, sender=_model)
+        post_delete.connect(_module_access_changed, sender=_model)
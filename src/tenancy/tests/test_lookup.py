@@ -0,0 +1,53 @@
+"""Tests für tenancy/lookup.py — gecachte Organization-Auflösung."""
+
+import pytest
+
+from tenancy.lookup import get_tenant_ref_by_slug, get_tenant_ref_by_tenant_id
+from tenancy.models import Organization
+
+
+@pytest.mark.django_db
+class TestTenantRefLookup:
+    def test_should_return_ref_by_slug(self, fixture_tenant):
+        ref = get_tenant_ref_by_slug("test-corp")
+        assert ref.tenant_id == fixture_tenant.tenant_id
+        assert ref.is_active is True
+        assert ref.is_readonly is False
+
+    def test_should_serve_repeated_lookups_without_queries(
+        self, fixture_tenant, django_assert_num_queries
+    ):
+        get_tenant_ref_by_slug("test-corp")
+        get_tenant_ref_by_tenant_id(fixture_tenant.tenant_id)
+        with django_assert_num_queries(0):
+            get_tenant_ref_by_slug("test-corp")
+            get_tenant_ref_by_tenant_id(fixture_tenant.tenant_id)
+
+    def test_should_cache_unknown_slug(self, django_assert_num_queries):
+        assert get_tenant_ref_by_slug("nobody") is None
+        with django_assert_num_queries(0):
+            assert get_tenant_ref_by_slug("nobody") is None
+
+    def test_should_pick_up_new_organization(self):
+        assert get_tenant_ref_by_slug("neu") is None
+        Organization.objects.create(slug="neu", name="Neu")
+        assert get_tenant_ref_by_slug("neu") is not None
+
+    def test_should_invalidate_on_save(self, fixture_tenant):
+        get_tenant_ref_by_tenant_id(fixture_tenant.tenant_id)
+        fixture_tenant.status = Organization.Status.SUSPENDED
+        fixture_tenant.is_readonly = True
+        fixture_tenant.save()
+
+        ref = get_tenant_ref_by_tenant_id(fixture_tenant.tenant_id)
+        assert ref.is_active is False
+        assert ref.is_readonly is True
+
+    def test_should_drop_old_slug_on_rename(self, fixture_tenant):
+        get_tenant_ref_by_tenant_id(fixture_tenant.tenant_id)
+        get_tenant_ref_by_slug("test-corp")
+        fixture_tenant.slug = "renamed-corp"
+        fixture_tenant.save()
+
+        assert get_tenant_ref_by_slug("test-corp") is None
+        assert get_tenant_ref_by_slug("renamed-corp").tenant_id == fixture_tenant.tenant_id
@@ -0,0 +1,104 @@
+"""Tests für common.pdf_text — Textlayer je Seite, selektives OCR, Seiten-Cache."""
+
+import ctypes
+import io
+
+import pytest
+from django.test import override_settings
+
+from common import pdf_text
+from common.pdf_text import (
+    FileSystemPageCache,
+    extract_pdf_pages,
+    extract_pdf_text,
+    has_text_layer,
+)
+
+pdfium = pytest.importorskip("pypdfium2")
+pdfium_c = pytest.importorskip("pypdfium2.raw")
+
+TEXT_PAGE = "Sicherheitsdatenblatt Aceton Abschnitt eins Bezeichnung"
+
+
+def _pdf(*pages: str) -> bytes:
+    """PDF mit je einer Textzeile pro Seite; leerer String = Seite ohne Textlayer."""
+    doc = pdfium.PdfDocument.new()
+    for text in pages:
+        page = doc.new_page(595, 842)
+        if text:
+            obj = pdfium_c.FPDFPageObj_NewTextObj(doc.raw, b"Helvetica", 12)
+            buffer = ctypes.create_string_buffer((text + "\0").encode("utf-16-le"))
+            pdfium_c.FPDFText_SetText(obj, ctypes.cast(buffer, pdfium_c.FPDF_WIDESTRING))
+            pdfium_c.FPDFPageObj_Transform(obj, 1, 0, 0, 1, 50, 700)
+            pdfium_c.FPDFPage_InsertObject(page.raw, obj)
+            pdfium_c.FPDFPage_GenerateContent(page.raw)
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def ocr(monkeypatch):
+    calls = []
+
+    def fake_ocr(pdf, index):
+        calls.append(index)
+        return f"OCR Seite {index + 1}"
+
+    monkeypatch.setattr(pdf_text, "_ocr_page", fake_ocr)
+    return calls
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FileSystemPageCache(tmp_path)
+
+
+class TestHasTextLayer:
+    def test_should_accept_regular_text(self):
+        assert has_text_layer(TEXT_PAGE)
+
+    def test_should_reject_empty_and_garbled_text(self):
+        assert not has_text_layer("  12 ")
+        assert not has_text_layer(TEXT_PAGE + "�" * 5)
+
+
+class TestExtractPdfPages:
+    def test_should_ocr_only_pages_without_text_layer(self, ocr, cache):
+        pages = extract_pdf_pages(_pdf(TEXT_PAGE, "", TEXT_PAGE), cache=cache)
+
+        assert pages == [TEXT_PAGE, "OCR Seite 2", TEXT_PAGE]
+        assert ocr == [1]
+
+    def test_should_never_ocr_cached_document_again(self, ocr, cache):
+        data = _pdf("", TEXT_PAGE)
+        first = extract_pdf_text(data, cache=cache)
+
+        second = extract_pdf_text(data, cache=cache)
+
+        assert first == second == f"OCR Seite 1\n{TEXT_PAGE}"
+        assert ocr == [0]
+
+    def test_should_key_cache_by_ocr_engine_version(self, ocr, cache):
+        data = _pdf("")
+        extract_pdf_pages(data, cache=cache)
+
+        with override_settings(PDF_OCR_ENGINE_VERSION="tesseract-5.4"):
+            extract_pdf_pages(data, cache=cache)
+
+        assert ocr == [0, 0]
+
+    def test_should_retry_pages_whose_ocr_failed(self, monkeypatch, cache):
+        def broken_ocr(pdf, index):
+            raise RuntimeError("tesseract fehlt")
+
+        monkeypatch.setattr(pdf_text, "_ocr_page", broken_ocr)
+        data = _pdf(TEXT_PAGE, "")
+        assert extract_pdf_pages(data, cache=cache) == [TEXT_PAGE, ""]
+
+        monkeypatch.setattr(pdf_text, "_ocr_page", lambda pdf, index: "OCR nachgeholt")
+        assert extract_pdf_pages(data, cache=cache) == [TEXT_PAGE, "OCR nachgeholt"]
+
+    def test_should_reject_invalid_pdf(self, cache):
+        with pytest.raises(ValueError):
+            extract_pdf_pages(b"kein pdf", cache=cache)
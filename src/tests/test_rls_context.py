@@ -53,6 +53,31 @@ class TestSetDbTenant:
             val = cursor.fetchone()[0]
         assert val == "false"
 
+    @pytest.mark.django_db
+    def test_should_set_both_variables_in_one_round_trip(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            set_db_tenant(uuid.uuid4())
+
+    @pytest.mark.django_db(transaction=True)
+    def test_should_skip_when_session_already_carries_tenant(self, django_assert_num_queries):
+        tid = uuid.uuid4()
+        set_db_tenant(tid)
+        with django_assert_num_queries(0):
+            set_db_tenant(tid)
+        with django_assert_num_queries(1):
+            set_db_tenant(uuid.uuid4())
+
+    @pytest.mark.django_db(transaction=True)
+    def test_should_rewrite_after_service_account_toggle(self):
+        tid = uuid.uuid4()
+        set_db_tenant(tid)
+        set_db_service_account(True)
+        set_db_tenant(tid)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT current_setting('app.is_service_account', true)")
+            val = cursor.fetchone()[0]
+        assert val == "false"
+
 
 class TestSetDbServiceAccount:
     @pytest.mark.django_db
@@ -0,0 +1,129 @@
+"""Tests für common.tenant — aufgelöster Tenant + Modul-Cache."""
+
+import pytest
+from django.test import RequestFactory, override_settings
+
+from common.context import clear_context, set_tenant
+from common.middleware import SubdomainTenantMiddleware
+from common.tenant import (
+    SOURCE_CONTEXT,
+    SOURCE_MEMBERSHIP,
+    get_active_modules,
+    resolve_tenant,
+    resolve_tenant_id,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_context():
+    clear_context()
+    yield
+    clear_context()
+
+
+@pytest.fixture
+def request_for(fixture_user):
+    def make(**kwargs):
+        request = RequestFactory().get("/dashboard/", **kwargs)
+        request.user = fixture_user
+        return request
+
+    return make
+
+
+@pytest.fixture
+def subscribed(fixture_tenant, fixture_user):
+    from tenancy.services import add_module_subscription, grant_module_membership
+
+    add_module_subscription(fixture_tenant, "gbu")
+    add_module_subscription(fixture_tenant, "dsb")
+    grant_module_membership(fixture_tenant, fixture_user, "gbu", "member", granted_by=None)
+    return fixture_tenant
+
+
+@pytest.mark.django_db
+class TestResolveTenant:
+    @override_settings(TENANT_BASE_DOMAINS=["testserver"], ALLOWED_HOSTS=[".testserver"])
+    def test_should_attach_resolved_tenant_in_middleware(self, request_for, fixture_tenant):
+        request = request_for(HTTP_HOST=f"{fixture_tenant.slug}.testserver")
+        SubdomainTenantMiddleware(lambda r: None).process_request(request)
+
+        assert request.resolved_tenant.tenant_id == fixture_tenant.tenant_id
+        assert request.resolved_tenant.source == "subdomain"
+        assert resolve_tenant(request) is request.resolved_tenant
+
+    @override_settings(TENANT_BASE_DOMAINS=["testserver"], ALLOWED_HOSTS=[".testserver"])
+    def test_should_resolve_cached_subdomain_without_org_query(
+        self, request_for, fixture_tenant, django_assert_num_queries
+    ):
+        middleware = SubdomainTenantMiddleware(lambda r: None)
+        middleware.process_request(request_for(HTTP_HOST="test-corp.testserver"))
+
+        request = request_for(HTTP_HOST="test-corp.testserver")
+        with django_assert_num_queries(1):  # only the merged RLS set_config
+            middleware.process_request(request)
+        assert request.tenant.name == "Test Corp"  # lazy load on access
+
+    def test_should_fall_back_to_membership_once(
+        self, request_for, fixture_tenant, django_assert_num_queries
+    ):
+        request = request_for()
+        with django_assert_num_queries(1):
+            assert resolve_tenant_id(request) == fixture_tenant.tenant_id
+            assert resolve_tenant_id(request) == fixture_tenant.tenant_id
+        assert request.resolved_tenant.source == SOURCE_MEMBERSHIP
+
+    def test_should_prefer_context_tenant(self, request_for, fixture_tenant_b):
+        request = request_for()
+        set_tenant(fixture_tenant_b.tenant_id, fixture_tenant_b.slug)
+
+        resolved = resolve_tenant(request)
+        assert resolved.tenant_id == fixture_tenant_b.tenant_id
+        assert resolved.source == SOURCE_CONTEXT
+
+
+@pytest.mark.django_db
+class TestActiveModulesCache:
+    def test_should_intersect_subscription_and_membership(self, request_for, subscribed):
+        set_tenant(subscribed.tenant_id, subscribed.slug)
+        assert get_active_modules(request_for()) == {"gbu"}
+
+    def test_should_serve_repeated_requests_from_cache(
+        self, request_for, subscribed, django_assert_num_queries
+    ):
+        set_tenant(subscribed.tenant_id, subscribed.slug)
+        get_active_modules(request_for())
+        with django_assert_num_queries(0):
+            assert get_active_modules(request_for()) == {"gbu"}
+
+    def test_should_invalidate_on_grant_module_membership(
+        self, request_for, subscribed, fixture_user
+    ):
+        from tenancy.services import grant_module_membership
+
+        set_tenant(subscribed.tenant_id, subscribed.slug)
+        assert get_active_modules(request_for()) == {"gbu"}
+
+        grant_module_membership(subscribed, fixture_user, "dsb", "member", granted_by=None)
+        assert get_active_modules(request_for()) == {"gbu", "dsb"}
+
+    def test_should_invalidate_on_new_subscription(self, request_for, subscribed, fixture_user):
+        from tenancy.services import add_module_subscription, grant_module_membership
+
+        grant_module_membership(subscribed, fixture_user, "ex", "member", granted_by=None)
+        set_tenant(subscribed.tenant_id, subscribed.slug)
+        assert get_active_modules(request_for()) == {"gbu"}
+
+        add_module_subscription(subscribed, "ex")
+        assert get_active_modules(request_for()) == {"gbu", "ex"}
+
+    def test_should_invalidate_on_subscription_suspend(self, request_for, subscribed):
+        from django_tenancy.module_models import ModuleSubscription
+
+        set_tenant(subscribed.tenant_id, subscribed.slug)
+        assert get_active_modules(request_for()) == {"gbu"}
+
+        sub = ModuleSubscription.objects.get(tenant_id=subscribed.tenant_id, module="gbu")
+        sub.status = ModuleSubscription.Status.SUSPENDED
+        sub.save()
+        assert get_active_modules(request_for()) == set()